@@ -19,6 +19,7 @@ from pathlib import Path
 from typing import Optional
 
 from .agent_base import NHLAgent, AgentSignal, logistic, clamp
+from goalie_index import GoalieIndex, index_for
 
 BASE          = Path(r"C:\Users\shell\OneDrive\Documents\Code Projects\NHL & Sports\NHL_Player\Boxscores")
 GOALIE_PATH   = BASE / "goalie_features.parquet"
@@ -55,6 +56,7 @@ class GoalieFormAgent(NHLAgent):
         super().__init__("goalie_form", weight, confidence_floor)
         self._gl        = gl
         self._gl_loaded = gl is not None
+        self._index:    Optional[GoalieIndex] = None
 
     def _load_gl(self):
         if not self._gl_loaded:
@@ -66,44 +68,27 @@ class GoalieFormAgent(NHLAgent):
                 self._gl = pd.DataFrame()
             self._gl_loaded = True
 
-    def _get_h2h_save_pct(self, goalie_name: str, opp_team: str) -> Optional[float]:
+    @property
+    def index(self) -> GoalieIndex:
+        """(goalie_id, opponent) → H2H save% lookups, built once per loaded frame."""
+        if self._index is None:
+            self._load_gl()
+            gl = self._gl if self._gl is not None else pd.DataFrame()
+            self._index = index_for(gl)
+        return self._index
+
+    def _get_h2h_save_pct(self, goalie_name: str, opp_team: str,
+                          player_id: Optional[int] = None) -> Optional[float]:
         """
-        Find average save% for this goalie specifically against opp_team.
-        Uses last 3 such starts from historical parquet.
-        Returns None if <2 starts found.
+        Average save% for this goalie specifically against opp_team, over the
+        last 3 such starts in the historical parquet. Returns None if <2 starts.
+        Keyed by playerId; the name is only used to resolve a missing id.
         """
         if self._gl is None or self._gl.empty:
             return None
-
-        name_col = "goalie_name" if "goalie_name" in self._gl.columns else (
-                   "player_name" if "player_name" in self._gl.columns else None)
-        if name_col is None:
-            return None
-
-        last_name = goalie_name.strip().split()[-1] if goalie_name else ""
-        if not last_name:
-            return None
-
-        opp_col = "opponent" if "opponent" in self._gl.columns else None
-        if opp_col is None:
-            return None
-
-        mask = (
-            self._gl[name_col].str.contains(last_name, case=False, na=False) &
-            (self._gl[opp_col] == opp_team)
-        )
-        h2h = self._gl[mask]
-        if len(h2h) < 2:
-            return None
-
-        h2h_recent = h2h.sort_values("game_date").tail(3)
-        spp_col = "savePct" if "savePct" in h2h_recent.columns else (
-                  "save_pctg" if "save_pctg" in h2h_recent.columns else None)
-        if spp_col is None:
-            return None
-
-        vals = h2h_recent[spp_col].dropna()
-        return float(vals.mean()) if len(vals) > 0 else None
+        if player_id is None or not self.index.has_player(player_id):
+            player_id = self.index.resolve(goalie_name)
+        return self.index.h2h_save_pct(player_id, opp_team)
 
     def _shot_profile_adjustment(self, goalie_side_ctx, opp_ctx) -> float:
         """
@@ -146,7 +131,8 @@ class GoalieFormAgent(NHLAgent):
         factors["gsaa"] = gsaa
 
         # H2H save%
-        h2h_spp = self._get_h2h_save_pct(goalie_ctx.name, opp_team)
+        h2h_spp = self._get_h2h_save_pct(goalie_ctx.name, opp_team,
+                                         getattr(goalie_ctx, "player_id", None))
         factors["h2h_savePct"] = h2h_spp
 
         # Shot-profile adjustment
@@ -93,6 +93,35 @@ def compute_elo_ratings(as_of_date: date) -> dict:
     return ratings
 
 
+def compute_elo_history(outcomes: pd.DataFrame) -> dict:
+    """
+    Elo ratings as of every game date in one chronological pass.
+
+    Returns {game_date (date): {team_abbrev: elo_float}} where each snapshot
+    covers games strictly before that date — the same view
+    compute_elo_ratings(date) gives, without re-walking history per date.
+    """
+    if outcomes.empty:
+        return {}
+    df = outcomes[["game_date", "home_team", "away_team", "home_win"]].copy()
+    df["game_date"] = pd.to_datetime(df["game_date"]).dt.date
+    df = df.sort_values("game_date", kind="stable")
+
+    ratings: dict[str, float] = {}
+    history: dict[date, dict] = {}
+    for d, home, away, home_win in zip(df["game_date"], df["home_team"],
+                                       df["away_team"], df["home_win"]):
+        if d not in history:
+            history[d] = dict(ratings)
+        r_h = ratings.get(home, ELO_BASE)
+        r_a = ratings.get(away, ELO_BASE)
+        e_h = _elo_expected(r_h, r_a)
+        s_h = float(home_win) if pd.notna(home_win) else 0.5
+        ratings[home] = r_h + ELO_K * (s_h - e_h)
+        ratings[away] = r_a + ELO_K * ((1.0 - s_h) - (1.0 - e_h))
+    return history
+
+
 def elo_win_probability(elo_home: float, elo_away: float) -> float:
     """Returns expected home win probability based on Elo ratings."""
     return _elo_expected(elo_home, elo_away)
@@ -119,10 +148,12 @@ class TeamFormAgent(NHLAgent):
     }
 
     def __init__(self, weight: float = 1.0, confidence_floor: float = 0.52,
-                 target_date: Optional[date] = None):
+                 target_date: Optional[date] = None,
+                 elo_ratings: Optional[dict] = None):
         super().__init__("team_form", weight, confidence_floor)
         self._target_date = target_date or date.today()
-        self._elo_ratings: Optional[dict] = None
+        # Accept precomputed ratings (backtests) or compute lazily on first analyze()
+        self._elo_ratings: Optional[dict] = elo_ratings
 
     def _get_elo(self) -> dict:
         if self._elo_ratings is None:
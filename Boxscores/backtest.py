@@ -0,0 +1,709 @@
+"""
+backtest.py
+-----------
+Historical backtest harness for the NHL Prediction MAS.
+
+Replays the full pipeline — GameContext → 5 agents → MasterSynthesizer —
+for every game in a date range, from local data only:
+
+    game_outcomes.parquet     schedule, rest days, Elo, final results
+    goalie_features.parquet   actual starters + rolling goalie form
+    skater_features.parquet   rolling skater form (optional)
+    pbp_cache/<game_id>.json  CF% / FF% / xG over each team's last 5 games
+    odds_history.csv          moneylines, where snapshots exist
+
+Each date only sees rows dated before it (the parquet rolling columns are
+already shift(1)'d), so no result leaks into its own prediction. Elo is
+built for every date in one pass and PBP files are parsed once per game,
+which is what keeps a full season well under a minute.
+
+The synthesizer runs in weighted_avg mode with an in-memory DB by default —
+the live meta-learner in mas_picks.db was trained on outcomes the backtest
+is trying to predict.
+
+Entry points:
+    report = run_backtest("2025-10-07", "2026-04-16", workers=4)
+    print_backtest_report(report)
+    report.picks            # DataFrame, one row per game
+
+CLI:
+    python backtest.py --start 2025-10-07 --end 2026-04-16 --workers 4
+    python backtest.py --season 2025-26 --starters inferred --csv bt.csv
+"""
+
+import bisect
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Optional
+
+import numpy as np
+import pandas as pd
+
+BASE = Path(__file__).resolve().parent
+sys.path.insert(0, str(BASE))
+
+from game_context import GameContext, OddsContext
+from module1_ingest import (
+    american_to_implied, build_team_context, parse_pbp, summarize_advanced,
+    _safe_float,
+)
+from feedback import TierStats, compute_roi
+
+OUTCOMES_PATH = BASE / "game_outcomes.parquet"
+GOALIE_PATH   = BASE / "goalie_features.parquet"
+SKATER_PATH   = BASE / "skater_features.parquet"
+ODDS_PATH     = BASE / "odds_history.csv"
+PBP_DIR       = BASE / "pbp_cache"
+
+N_ADVANCED_GAMES = 5          # matches get_team_advanced_stats()
+CALIBRATION_BINS = 10
+TIERS            = ("HIGH", "MEDIUM", "LOW")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Local history (as-of views over the on-disk data)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _read_optional_parquet(path: Path) -> pd.DataFrame:
+    return pd.read_parquet(path) if path.exists() else pd.DataFrame()
+
+
+class LocalHistory:
+    """
+    Everything the backtest reads, loaded once and indexed by date.
+
+    All frames are injectable so tests (and notebooks) can run without the
+    parquets on disk. Every accessor is "as of" a date: rows on or after
+    that date are invisible.
+    """
+
+    def __init__(
+        self,
+        outcomes: Optional[pd.DataFrame] = None,
+        gl:       Optional[pd.DataFrame] = None,
+        sk:       Optional[pd.DataFrame] = None,
+        odds:     Optional[pd.DataFrame] = None,
+        pbp_dir:  Optional[Path]         = None,
+    ):
+        if outcomes is None:
+            outcomes = _read_optional_parquet(OUTCOMES_PATH)
+        if gl is None:
+            gl = _read_optional_parquet(GOALIE_PATH)
+        if sk is None:
+            sk = _read_optional_parquet(SKATER_PATH)
+        if odds is None:
+            odds = pd.read_csv(ODDS_PATH) if ODDS_PATH.exists() else pd.DataFrame()
+        self._pbp_dir = Path(pbp_dir) if pbp_dir is not None else PBP_DIR
+
+        self.outcomes = self._prep_outcomes(outcomes)
+        self.gl, self._gl_dates = self._prep_dated(gl)
+        self.sk, self._sk_dates = self._prep_dated(sk)
+
+        # date → row positions in outcomes
+        self._by_date: dict[date, np.ndarray] = (
+            dict(self.outcomes.groupby("_date", sort=True).indices)
+            if not self.outcomes.empty else {}
+        )
+
+        # team → (sorted game dates, game ids) for rest days and PBP windows
+        self._team_games: dict[str, tuple[list, list]] = {}
+        for d, gid, home, away in zip(self.outcomes["_date"], self.outcomes["game_pk"],
+                                      self.outcomes["home_team"], self.outcomes["away_team"]):
+            for team in (home, away):
+                dates, ids = self._team_games.setdefault(team, ([], []))
+                dates.append(d)
+                ids.append(int(gid))
+
+        self._starters = self._index_starters(self.gl)
+        self._odds     = self._index_odds(odds)
+        self._elo: Optional[dict] = None
+        self._pbp: dict[int, Optional[dict]] = {}
+
+    # ── Preparation ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _prep_outcomes(df: pd.DataFrame) -> pd.DataFrame:
+        if df.empty:
+            return pd.DataFrame(columns=["game_pk", "game_date", "home_team",
+                                         "away_team", "home_win", "_date"])
+        df = df.copy()
+        df["game_date"] = pd.to_datetime(df["game_date"])
+        df["_date"] = df["game_date"].dt.date
+        return df.sort_values(["game_date", "game_pk"], kind="stable").reset_index(drop=True)
+
+    @staticmethod
+    def _prep_dated(df: pd.DataFrame) -> tuple[pd.DataFrame, np.ndarray]:
+        """Sort by game_date so an as-of view is a positional slice."""
+        if df.empty or "game_date" not in df.columns:
+            return pd.DataFrame(), np.array([], dtype="datetime64[ns]")
+        df = df.copy()
+        df["game_date"] = pd.to_datetime(df["game_date"])
+        df = df.sort_values("game_date", kind="stable").reset_index(drop=True)
+        return df, df["game_date"].to_numpy()
+
+    @staticmethod
+    def _index_starters(gl: pd.DataFrame) -> dict:
+        """(game_pk, team) → starting goalie name."""
+        need = {"game_pk", "team", "goalie_name", "is_starter"}
+        if gl.empty or not need.issubset(gl.columns):
+            return {}
+        st = gl[gl["is_starter"] == 1]
+        return {
+            (int(pk), team): str(name).strip()
+            for pk, team, name in zip(st["game_pk"], st["team"], st["goalie_name"])
+        }
+
+    @staticmethod
+    def _index_odds(odds: pd.DataFrame) -> dict:
+        """game_id → (first snapshot, last snapshot) as dicts."""
+        if odds.empty or "game_id" not in odds.columns:
+            return {}
+        odds = odds.sort_values("snapshot_at", kind="stable")
+        out = {}
+        for gid, grp in odds.groupby("game_id", sort=False):
+            out[int(gid)] = (grp.iloc[0].to_dict(), grp.iloc[-1].to_dict())
+        return out
+
+    # ── As-of accessors ───────────────────────────────────────────────────
+
+    def game_dates(self, start=None, end=None) -> list[date]:
+        dates = sorted(self._by_date)
+        lo = _to_date(start) if start is not None else None
+        hi = _to_date(end) if end is not None else None
+        return [d for d in dates if (lo is None or d >= lo) and (hi is None or d <= hi)]
+
+    def games_on(self, d: date) -> pd.DataFrame:
+        idx = self._by_date.get(d)
+        return self.outcomes.iloc[idx] if idx is not None else self.outcomes.iloc[:0]
+
+    def gl_before(self, d: date, teams=None) -> pd.DataFrame:
+        gl = self.gl.iloc[:np.searchsorted(self._gl_dates, np.datetime64(d), "left")]
+        if teams is not None and not gl.empty:
+            gl = gl[gl["team"].isin(teams)]
+        return gl
+
+    def sk_before(self, d: date, teams=None) -> pd.DataFrame:
+        sk = self.sk.iloc[:np.searchsorted(self._sk_dates, np.datetime64(d), "left")]
+        if teams is not None and not sk.empty:
+            sk = sk[sk["team"].isin(teams)]
+        return sk
+
+    def rest(self, team: str, d: date) -> dict:
+        dates, _ = self._team_games.get(team, ([], []))
+        i = bisect.bisect_left(dates, d)
+        if i == 0:
+            return {"rest_days": None, "is_b2b": False, "last_game": None}
+        last = dates[i - 1]
+        rest = (d - last).days
+        return {"rest_days": rest, "is_b2b": rest == 1, "last_game": str(last)}
+
+    def elo_before(self, d: date) -> dict:
+        if self._elo is None:
+            from agents.team_form_agent import compute_elo_history
+            self._elo = compute_elo_history(self.outcomes)
+        return self._elo.get(d, {})
+
+    def starter(self, game_pk: int, team: str) -> Optional[str]:
+        return self._starters.get((int(game_pk), team))
+
+    def advanced(self, team: str, d: date, n_games: int = N_ADVANCED_GAMES) -> dict:
+        """CF% / xG over the team's last n completed games before d (cached PBP only)."""
+        dates, ids = self._team_games.get(team, ([], []))
+        i = bisect.bisect_left(dates, d)
+        parsed = [p for p in (self._parsed_pbp(gid) for gid in ids[max(0, i - n_games):i])
+                  if p is not None]
+        return summarize_advanced(team, parsed)
+
+    def odds(self, game_pk: int) -> dict:
+        snap = self._odds.get(int(game_pk))
+        if snap is None:
+            return {}
+        first, last = snap
+        out = {
+            "home_ml":      _safe_float(last.get("home_ml")),
+            "away_ml":      _safe_float(last.get("away_ml")),
+            "point_spread": _safe_float(last.get("point_spread")),
+        }
+        if first is not last and first.get("snapshot_at") != last.get("snapshot_at"):
+            open_ml = _safe_float(first.get("home_ml"))
+            out["opening_home_ml"] = open_ml
+            out["opening_away_ml"] = _safe_float(first.get("away_ml"))
+            if open_ml is not None and out["home_ml"] is not None:
+                out["line_movement"] = round(out["home_ml"] - open_ml, 1)
+        return out
+
+    def _parsed_pbp(self, game_id: int) -> Optional[dict]:
+        if game_id not in self._pbp:
+            path = self._pbp_dir / f"{game_id}.json"
+            parsed = None
+            if path.exists():
+                try:
+                    with open(path) as f:
+                        pbp = json.load(f)
+                    parsed = parse_pbp(pbp,
+                                       pbp.get("homeTeam", {}).get("abbrev", ""),
+                                       pbp.get("awayTeam", {}).get("abbrev", ""))
+                except (OSError, ValueError):
+                    parsed = None
+            self._pbp[game_id] = parsed
+        return self._pbp[game_id]
+
+
+def _to_date(value) -> date:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    return pd.to_datetime(value).date()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Context reconstruction
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def build_historical_contexts(
+    hist:     LocalHistory,
+    d:        date,
+    starters: str = "actual",
+    inference = None,
+) -> list[GameContext]:
+    """
+    Rebuild the GameContexts Module 1 would have produced on date d.
+
+    starters="actual"   → the goalie who really started, status "confirmed"
+                          (what run_picks sees once lines are posted)
+    starters="inferred" → GoalieInferenceEngine rotation guess as of d
+    """
+    games = hist.games_on(d)
+    if games.empty:
+        return []
+
+    teams = set(games["home_team"]) | set(games["away_team"])
+    # build_team_context only reads the playing teams' rows — pre-filter once per date
+    gl = hist.gl_before(d, teams)
+    sk = hist.sk_before(d, teams)
+
+    contexts = []
+    for row in games.itertuples(index=False):
+        sides = {}
+        for team, is_home in ((row.home_team, True), (row.away_team, False)):
+            rest = hist.rest(team, d)
+            scraped = _scraped_goalie(hist, row.game_pk, team, d, rest, starters, inference)
+            tctx = build_team_context(
+                team=team, is_home=is_home, rest=rest,
+                scraped_goalie=scraped, news="",
+                sk=sk, gl=gl, target_date=d,
+                fetch_advanced=False,
+            )
+            for key, val in hist.advanced(team, d).items():
+                setattr(tctx, key, val)
+            sides[is_home] = tctx
+        home_ctx, away_ctx = sides[True], sides[False]
+
+        o = hist.odds(row.game_pk)
+        odds_ctx = OddsContext(
+            home_ml         = o.get("home_ml"),
+            away_ml         = o.get("away_ml"),
+            point_spread    = o.get("point_spread"),
+            home_implied    = american_to_implied(o.get("home_ml")),
+            away_implied    = american_to_implied(o.get("away_ml")),
+            opening_home_ml = o.get("opening_home_ml"),
+            opening_away_ml = o.get("opening_away_ml"),
+            line_movement   = o.get("line_movement"),
+        )
+
+        contexts.append(GameContext(
+            game_id    = int(row.game_pk),
+            game_date  = str(d),
+            season     = _season_label(row.game_pk),
+            game_type  = int(str(row.game_pk)[4:6]) if len(str(row.game_pk)) >= 6 else 2,
+            home       = home_ctx,
+            away       = away_ctx,
+            odds       = odds_ctx,
+            goalie_confirmed   = home_ctx.goalie.is_trusted and away_ctx.goalie.is_trusted,
+            has_advanced_stats = (home_ctx.cf_pct_last5 is not None or
+                                  home_ctx.xg_for_last5 is not None),
+            has_odds           = odds_ctx.home_ml is not None,
+            has_news           = False,
+        ))
+    return contexts
+
+
+def _scraped_goalie(hist, game_pk, team, d, rest, starters, inference) -> dict:
+    """Stand-in for the DailyFaceoff scrape dict build_goalie_context() expects."""
+    if starters == "inferred" and inference is not None:
+        res = inference.infer(team, str(d), is_b2b=rest.get("is_b2b", False))
+        if res:
+            return {"name": res["name"], "status": res["status"]}
+        return {"name": "Unknown", "status": "unknown"}
+    name = hist.starter(game_pk, team)
+    if name:
+        return {"name": name, "status": "confirmed"}
+    return {"name": "Unknown", "status": "unknown"}
+
+
+def _season_label(game_pk) -> str:
+    y = int(str(game_pk)[:4])
+    return f"{y}{y + 1}"
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Replay
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def default_agents(hist: LocalHistory, d: date) -> list:
+    """The DEFAULT_AGENTS ensemble, wired to as-of-d data instead of the live parquets."""
+    from agents import (TeamFormAgent, PlayerFormAgent, GoalieFormAgent,
+                        ScheduleAgent, SentimentAgent)
+    return [
+        TeamFormAgent(weight=1.0, target_date=d, elo_ratings=hist.elo_before(d)),
+        PlayerFormAgent(weight=0.9, sk=hist.sk_before(d)),
+        GoalieFormAgent(weight=1.2, gl=hist.gl_before(d)),
+        ScheduleAgent(weight=0.8),
+        SentimentAgent(weight=0.5),
+    ]
+
+
+def replay_date(
+    hist:          LocalHistory,
+    d:             date,
+    synthesizer,
+    mode:          str = "weighted_avg",
+    starters:      str = "actual",
+    agent_factory: Optional[Callable] = None,
+    inference      = None,
+) -> list[dict]:
+    """Run agents + synthesis for every game on d. Returns one result row per game."""
+    contexts = build_historical_contexts(hist, d, starters=starters, inference=inference)
+    if not contexts:
+        return []
+
+    agents = (agent_factory or default_agents)(hist, d)
+    signal_lists = []
+    for ctx in contexts:
+        sigs = []
+        for agent in agents:
+            try:
+                sigs.append(agent.analyze(ctx))
+            except Exception:
+                continue            # one bad agent never drops the game
+        signal_lists.append(sigs)
+
+    cards = synthesizer.synthesize_batch(signal_lists, contexts, mode=mode, log=False)
+
+    home_wins = dict(zip(hist.games_on(d)["game_pk"].astype(int),
+                         hist.games_on(d)["home_win"]))
+    rows = []
+    for ctx, card in zip(contexts, cards):
+        home_win = home_wins.get(ctx.game_id)
+        row = {
+            "game_id":         ctx.game_id,
+            "game_date":       ctx.game_date,
+            "home_team":       ctx.home.team,
+            "away_team":       ctx.away.team,
+            "pick":            card.pick,
+            "pick_direction":  card.pick_direction,
+            "confidence_tier": card.confidence_tier,
+            "raw_score":       float(card.raw_score),
+            "edge_pct":        float(card.edge_pct),
+            "mode_used":       card.mode_used,
+            "home_win":        None if home_win is None or pd.isna(home_win) else int(home_win),
+            "home_ml":         ctx.odds.home_ml,
+            "away_ml":         ctx.odds.away_ml,
+        }
+        for aid, s in card.signal_summary.items():
+            row[f"{aid}_raw"] = s.get("raw_score")
+        rows.append(row)
+    return rows
+
+
+# ── Worker plumbing (one LocalHistory per process) ────────────────────────────
+
+_WORKER: dict = {}
+
+
+def _init_worker(options: dict) -> None:
+    # Forked workers inherit the parent's history; spawned ones (Windows) load their own
+    if "hist" not in _WORKER:
+        _WORKER["hist"] = LocalHistory()
+    _WORKER["options"] = options
+    _WORKER["synth"] = _make_synthesizer(options.get("weights"))
+    _WORKER["inference"] = _make_inference(_WORKER["hist"], options.get("starters"))
+
+
+def _replay_in_worker(d: date) -> list[dict]:
+    opts = _WORKER["options"]
+    return replay_date(_WORKER["hist"], d, _WORKER["synth"],
+                       mode=opts.get("mode", "weighted_avg"),
+                       starters=opts.get("starters", "actual"),
+                       inference=_WORKER["inference"])
+
+
+def _make_synthesizer(weights: Optional[dict] = None):
+    from module3_synthesizer import MasterSynthesizer
+    return MasterSynthesizer(weights_registry=weights, db_path=Path(":memory:"))
+
+
+def _make_inference(hist: LocalHistory, starters: Optional[str]):
+    if starters != "inferred" or hist.gl.empty:
+        return None
+    from goalie_inference import GoalieInferenceEngine
+    return GoalieInferenceEngine(df=hist.gl)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Report
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class CalibrationBin:
+    lo:        float
+    hi:        float
+    n:         int
+    mean_pred: float
+    observed:  float
+
+
+@dataclass
+class BacktestReport:
+    start:   str
+    end:     str
+    n_dates: int = 0
+    n_games: int = 0
+
+    # Straight-up, over resolved non-SKIP games only (n_scored): SKIP cards
+    # carry the 0.50 sentinel, not a probability, so they are left out of
+    # accuracy, Brier, log-loss and calibration (n_skipped)
+    n_scored:    int   = 0
+    n_skipped:   int   = 0
+    su_correct:  int   = 0
+    su_accuracy: float = 0.0
+    brier:       float = 0.0
+    log_loss:    float = 0.0
+
+    # Playable picks (non-SKIP), graded like FeedbackEngine at -110
+    total_picks:  int   = 0
+    total_wins:   int   = 0
+    total_losses: int   = 0
+    win_rate:     float = 0.0
+    roi_pct:      float = 0.0
+    tier_breakdown: dict = field(default_factory=dict)   # {tier: TierStats}
+
+    # Moneyline ROI where odds_history has a line for the game
+    n_with_odds:    int            = 0
+    ml_roi_pct:     Optional[float] = None
+
+    calibration: list = field(default_factory=list)       # [CalibrationBin]
+    elapsed_seconds: float = 0.0
+    picks: pd.DataFrame = field(default_factory=pd.DataFrame, repr=False)
+
+
+def _ml_profit(ml: Optional[float], won: bool) -> Optional[float]:
+    """Profit per 1 unit staked at American odds ml."""
+    if ml is None or (isinstance(ml, float) and math.isnan(ml)) or ml == 0:
+        return None
+    if not won:
+        return -1.0
+    return ml / 100.0 if ml > 0 else 100.0 / abs(ml)
+
+
+def summarize_backtest(picks: pd.DataFrame, start: str, end: str,
+                       n_bins: int = CALIBRATION_BINS) -> BacktestReport:
+    """Accuracy, ROI by tier and calibration from replay rows."""
+    report = BacktestReport(start=str(start), end=str(end), picks=picks)
+    if picks.empty:
+        return report
+
+    report.n_dates = picks["game_date"].nunique()
+    report.n_games = len(picks)
+
+    resolved = picks[picks["home_win"].notna()]
+    if resolved.empty:
+        return report
+    scored = resolved[resolved["confidence_tier"] != "SKIP"]
+    report.n_scored  = len(scored)
+    report.n_skipped = len(resolved) - len(scored)
+    if scored.empty:
+        return report
+    p = scored["raw_score"].to_numpy(dtype=float)
+    y = scored["home_win"].to_numpy(dtype=float)
+
+    report.su_correct  = int(((p > 0.5) == (y == 1)).sum())
+    report.su_accuracy = report.su_correct / len(scored)
+    report.brier       = float(np.mean((p - y) ** 2))
+    pc = np.clip(p, 1e-6, 1 - 1e-6)
+    report.log_loss    = float(-np.mean(y * np.log(pc) + (1 - y) * np.log(1 - pc)))
+
+    # Calibration — equal-width bins on P(home win)
+    edges = np.linspace(0.0, 1.0, n_bins + 1)
+    bin_idx = np.clip(np.digitize(p, edges[1:-1]), 0, n_bins - 1)
+    for b in range(n_bins):
+        m = bin_idx == b
+        if m.any():
+            report.calibration.append(CalibrationBin(
+                lo=float(edges[b]), hi=float(edges[b + 1]), n=int(m.sum()),
+                mean_pred=float(p[m].mean()), observed=float(y[m].mean()),
+            ))
+
+    # Playable picks
+    played = scored
+    won = ((played["pick_direction"] == "home") == (played["home_win"] == 1)).to_numpy()
+    tiers = {t: TierStats(tier=t) for t in TIERS}
+    for tier, w in zip(played["confidence_tier"], won):
+        ts = tiers.setdefault(tier, TierStats(tier=tier))
+        ts.n += 1
+        if w:
+            ts.wins += 1
+        else:
+            ts.losses += 1
+    report.tier_breakdown = tiers
+    report.total_wins   = int(won.sum())
+    report.total_losses = int(len(won) - won.sum())
+    report.total_picks  = len(won)
+    report.win_rate     = report.total_wins / report.total_picks if report.total_picks else 0.0
+    report.roi_pct      = compute_roi(report.total_wins, report.total_losses)
+
+    profits = []
+    for direction, home_ml, away_ml, w in zip(played["pick_direction"], played["home_ml"],
+                                              played["away_ml"], won):
+        ml = home_ml if direction == "home" else away_ml
+        profit = _ml_profit(_safe_float(ml), bool(w))
+        if profit is not None:
+            profits.append(profit)
+    report.n_with_odds = len(profits)
+    if profits:
+        report.ml_roi_pct = round(sum(profits) / len(profits) * 100, 2)
+
+    return report
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Main entry point
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def run_backtest(
+    start,
+    end,
+    workers:       int  = 0,
+    mode:          str  = "weighted_avg",
+    starters:      str  = "actual",
+    weights:       Optional[dict] = None,
+    hist:          Optional[LocalHistory] = None,
+    agent_factory: Optional[Callable] = None,
+    synthesizer    = None,
+) -> BacktestReport:
+    """
+    Replay every game date in [start, end] and grade the picks.
+
+    workers=0 → os.cpu_count() processes; workers=1 (or an injected
+    hist / agent_factory / synthesizer) runs in-process, which is what
+    tests and notebooks want.
+
+    mode="meta_learner" needs a fitted `synthesizer` (the replay's own is
+    built empty); anything else raises rather than silently falling back
+    to weighted_avg.
+    """
+    if mode == "meta_learner" and not getattr(synthesizer, "_is_fitted", False):
+        raise ValueError("mode='meta_learner' needs a fitted synthesizer; "
+                         "the backtest does not fit one from the replayed games")
+    t0 = time.monotonic()
+    in_process = workers == 1 or hist is not None or agent_factory or synthesizer
+    hist = hist or LocalHistory()
+    dates = hist.game_dates(start, end)
+
+    if not dates:
+        report = summarize_backtest(pd.DataFrame(), start, end)
+        report.elapsed_seconds = time.monotonic() - t0
+        return report
+
+    hist.elo_before(dates[0])            # build Elo history once before forking
+
+    if in_process:
+        synth = synthesizer or _make_synthesizer(weights)
+        inference = _make_inference(hist, starters)
+        per_date = [replay_date(hist, d, synth, mode=mode, starters=starters,
+                                agent_factory=agent_factory, inference=inference)
+                    for d in dates]
+    else:
+        n = workers or os.cpu_count() or 1
+        options = {"mode": mode, "starters": starters, "weights": weights}
+        _WORKER["hist"] = hist
+        try:
+            with ProcessPoolExecutor(max_workers=n, initializer=_init_worker,
+                                     initargs=(options,)) as pool:
+                chunk = max(1, len(dates) // (n * 4))
+                per_date = list(pool.map(_replay_in_worker, dates, chunksize=chunk))
+        finally:
+            _WORKER.clear()
+
+    rows = [r for day in per_date for r in day]
+    report = summarize_backtest(pd.DataFrame(rows), start, end)
+    report.elapsed_seconds = time.monotonic() - t0
+    return report
+
+
+def print_backtest_report(report: BacktestReport) -> None:
+    """Pretty-print a BacktestReport to stdout."""
+    print(f"\n{'═' * 62}")
+    print(f"  MAS BACKTEST  {report.start} → {report.end}")
+    print(f"{'═' * 62}")
+    print(f"  Dates / games    {report.n_dates} / {report.n_games}"
+          f"   ({report.elapsed_seconds:.1f}s)")
+    print(f"  Straight-up      {report.su_correct}/{report.n_scored} non-SKIP  "
+          f"({report.su_accuracy:.1%})  [{report.n_skipped} SKIP excluded]")
+    print(f"  Brier / log-loss {report.brier:.4f} / {report.log_loss:.4f}  (non-SKIP)")
+    print(f"  Picks            {report.total_wins}W–{report.total_losses}L  "
+          f"({report.win_rate:.1%})  ROI at -110 {report.roi_pct:+.1f}%")
+    if report.ml_roi_pct is not None:
+        print(f"  Moneyline ROI    {report.ml_roi_pct:+.1f}%  ({report.n_with_odds} priced picks)")
+
+    print(f"\n  BY TIER")
+    for tier in TIERS:
+        ts = report.tier_breakdown.get(tier)
+        if ts is not None and ts.n:
+            print(str(ts))
+
+    if report.calibration:
+        print(f"\n  CALIBRATION  (non-SKIP P(home win) bin → observed)")
+        for b in report.calibration:
+            print(f"    {b.lo:.1f}–{b.hi:.1f}  n={b.n:<5d} "
+                  f"pred {b.mean_pred:.3f}  obs {b.observed:.3f}")
+    print(f"{'═' * 62}\n")
+
+
+# ── CLI ───────────────────────────────────────────────────────────────────────
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="NHL MAS historical backtest")
+    parser.add_argument("--start",   type=str, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--end",     type=str, default=None, help="YYYY-MM-DD")
+    parser.add_argument("--season",  type=str, default=None,
+                        help="e.g. 2025-26 (Oct 1 → Jun 30); overrides --start/--end")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="process count (0 = all cores, 1 = in-process)")
+    parser.add_argument("--mode",    type=str, default="weighted_avg",
+                        choices=["weighted_avg"],
+                        help="meta_learner needs a fitted synthesizer (run_backtest API only)")
+    parser.add_argument("--starters", type=str, default="actual",
+                        choices=["actual", "inferred"])
+    parser.add_argument("--csv",     type=str, default=None,
+                        help="write per-game rows to this CSV")
+    args = parser.parse_args()
+
+    start, end = args.start, args.end
+    if args.season:
+        y0 = int(args.season[:4])
+        start, end = f"{y0}-10-01", f"{y0 + 1}-06-30"
+
+    report = run_backtest(start, end, workers=args.workers,
+                          mode=args.mode, starters=args.starters)
+    print_backtest_report(report)
+    if args.csv:
+        report.picks.to_csv(args.csv, index=False)
+        print(f"  ✅ {len(report.picks)} rows → {args.csv}")
@@ -24,6 +24,9 @@ CLI:
     python feedback.py --show-weights
         Print current weights_registry.json.
 
+    python feedback.py --resolve-range 2025-01-08 2025-01-15
+        Catch up a whole range: concurrent fetches, one write, one weight update.
+
     python feedback.py --resolve-date 2025-01-15 --dry-run
         Preview what would be written without touching the DB.
 """
@@ -34,6 +37,7 @@ import argparse
 import json
 import sqlite3
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
 from pathlib import Path
@@ -41,6 +45,8 @@ from typing import Callable, Optional
 
 import requests
 
+from picks_db import get_db, transaction, apply_pick_signals
+
 # ── Paths ─────────────────────────────────────────────────────────────────────
 BASE         = Path(r"C:\Users\shell\OneDrive\Documents\Code Projects\NHL & Sports\NHL_Player\Boxscores")
 DB_PATH      = BASE / "mas_picks.db"
@@ -74,6 +80,9 @@ JUICE_WIN     = 100
 # Minimum resolved picks before weight recalibration fires
 MIN_SAMPLE    = 10
 
+# Concurrent score fetches for resolve_range()
+FETCH_WORKERS = 8
+
 # ── DB schema ─────────────────────────────────────────────────────────────────
 # Mirrors Module 3 schema; outcomes gains home_score / away_score columns.
 # The `picks` table is owned by Module 3 — we only read from it here.
@@ -116,8 +125,79 @@ CREATE TABLE IF NOT EXISTS picks (
 );
 CREATE INDEX IF NOT EXISTS idx_picks_date ON picks(game_date);
 CREATE INDEX IF NOT EXISTS idx_picks_game ON picks(game_id);
+CREATE INDEX IF NOT EXISTS idx_picks_recent ON picks(game_date, created_at);
+"""
+
+# ── Daily summary ─────────────────────────────────────────────────────────────
+# One row per (pick date, tier). Date-window reports sum these rows instead of
+# re-grading every pick. Triggers rebuild the affected date(s) whenever a pick
+# or an outcome is written, so the table never goes stale regardless of which
+# module wrote the row.
+
+def _summary_rebuild_sql(date_filter: str) -> str:
+    """DELETE + re-aggregate daily_summary for the dates matched by date_filter."""
+    return f"""
+    DELETE FROM daily_summary WHERE game_date IN ({date_filter});
+    INSERT INTO daily_summary
+        (game_date, confidence_tier, n_picks, wins, losses, unresolved)
+    SELECT p.game_date, p.confidence_tier,
+           COUNT(*),
+           SUM(CASE WHEN (p.pick_direction = 'home' AND o.home_win = 1)
+                      OR (p.pick_direction = 'away' AND o.home_win = 0)
+                    THEN 1 ELSE 0 END),
+           SUM(CASE WHEN o.home_win IS NOT NULL THEN 1 ELSE 0 END)
+         - SUM(CASE WHEN (p.pick_direction = 'home' AND o.home_win = 1)
+                      OR (p.pick_direction = 'away' AND o.home_win = 0)
+                    THEN 1 ELSE 0 END),
+           SUM(CASE WHEN o.home_win IS NULL THEN 1 ELSE 0 END)
+    FROM picks p
+    LEFT JOIN outcomes o ON o.game_id = p.game_id
+    WHERE p.game_date IN ({date_filter})
+    GROUP BY p.game_date, p.confidence_tier;
+    """
+
+
+_SUMMARY_DDL = f"""
+CREATE TABLE IF NOT EXISTS daily_summary (
+    game_date        TEXT    NOT NULL,
+    confidence_tier  TEXT    NOT NULL,
+    n_picks          INTEGER NOT NULL DEFAULT 0,
+    wins             INTEGER NOT NULL DEFAULT 0,
+    losses           INTEGER NOT NULL DEFAULT 0,
+    unresolved       INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (game_date, confidence_tier)
+) WITHOUT ROWID;
+
+CREATE TRIGGER IF NOT EXISTS trg_summary_pick_ins
+AFTER INSERT ON picks
+BEGIN {_summary_rebuild_sql("NEW.game_date")} END;
+
+CREATE TRIGGER IF NOT EXISTS trg_summary_pick_del
+AFTER DELETE ON picks
+BEGIN {_summary_rebuild_sql("OLD.game_date")} END;
+
+CREATE TRIGGER IF NOT EXISTS trg_summary_pick_upd
+AFTER UPDATE OF game_date, confidence_tier, pick_direction, game_id ON picks
+BEGIN {_summary_rebuild_sql("OLD.game_date, NEW.game_date")} END;
+
+CREATE TRIGGER IF NOT EXISTS trg_summary_outcome_ins
+AFTER INSERT ON outcomes
+BEGIN {_summary_rebuild_sql("SELECT game_date FROM picks WHERE game_id = NEW.game_id")} END;
+
+CREATE TRIGGER IF NOT EXISTS trg_summary_outcome_del
+AFTER DELETE ON outcomes
+BEGIN {_summary_rebuild_sql("SELECT game_date FROM picks WHERE game_id = OLD.game_id")} END;
+
+CREATE TRIGGER IF NOT EXISTS trg_summary_outcome_upd
+AFTER UPDATE OF home_win, game_id ON outcomes
+BEGIN {_summary_rebuild_sql(
+    "SELECT game_date FROM picks WHERE game_id IN (OLD.game_id, NEW.game_id)")} END;
 """
 
+# Full rebuild — used once for DBs that had picks before daily_summary existed.
+_REBUILD_SUMMARY = _summary_rebuild_sql("SELECT DISTINCT game_date FROM picks")
+
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # Dataclasses — Module 4 output contracts
@@ -142,6 +222,28 @@ class ResolveResult:
         )
 
 
+@dataclass
+class RangeResolveResult:
+    """Summary returned by FeedbackEngine.resolve_range()."""
+    start:            str
+    end:              str
+    dates_fetched:    int  = 0
+    games_final:      int  = 0
+    outcomes_written: int  = 0      # inserted + corrected
+    picks_matched:    int  = 0      # changed games that have a pick
+    unchanged:        int  = 0      # already stored with the same result
+    changed:          list = field(default_factory=list)   # game dicts actually written
+    weights_updated:  dict = field(default_factory=dict)
+    errors:           list = field(default_factory=list)
+
+    def __str__(self) -> str:
+        return (
+            f"[{self.start} → {self.end}]  dates={self.dates_fetched}  "
+            f"final={self.games_final}  written={self.outcomes_written}  "
+            f"matched={self.picks_matched}  unchanged={self.unchanged}"
+        )
+
+
 @dataclass
 class AgentPerformance:
     """Per-agent accuracy over a rolling window."""
@@ -334,29 +436,37 @@ class FeedbackEngine:
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            try:
-                self._conn = sqlite3.connect(str(self._db_path))
-                self._conn.row_factory = sqlite3.Row
-                self._conn.executescript(_PICKS_DDL)
-                self._conn.executescript(_OUTCOMES_DDL)
-                # Migrate: add score columns if missing (safe on existing DBs)
-                for col, dtype in [("home_score", "INTEGER"), ("away_score", "INTEGER")]:
-                    try:
-                        self._conn.execute(
-                            f"ALTER TABLE outcomes ADD COLUMN {col} {dtype}"
-                        )
-                    except sqlite3.OperationalError:
-                        pass  # column already exists
-                self._conn.commit()
-            except Exception:
-                # Fallback in-memory for sandbox / tests
-                self._conn = sqlite3.connect(":memory:")
-                self._conn.row_factory = sqlite3.Row
-                self._conn.executescript(_PICKS_DDL)
-                self._conn.executescript(_OUTCOMES_DDL)
-                self._conn.commit()
+            # Shared per-path connection (WAL, busy_timeout); schema applied once
+            self._conn = get_db(self._db_path).connect(
+                migrations=[("feedback", self._apply_schema)]
+            )
         return self._conn
 
+    @classmethod
+    def _apply_schema(cls, conn: sqlite3.Connection) -> None:
+        conn.executescript(_PICKS_DDL)
+        conn.executescript(_OUTCOMES_DDL)
+        # Migrate: add score columns if missing (safe on existing DBs)
+        for col, dtype in [("home_score", "INTEGER"), ("away_score", "INTEGER")]:
+            try:
+                conn.execute(f"ALTER TABLE outcomes ADD COLUMN {col} {dtype}")
+            except sqlite3.OperationalError:
+                pass  # column already exists
+        cls._init_aggregates(conn)
+
+    @staticmethod
+    def _init_aggregates(conn: sqlite3.Connection) -> None:
+        """
+        Create pick_signals + daily_summary (and their triggers) on top of the
+        picks/outcomes tables, backfilling both for DBs that predate them.
+        """
+        apply_pick_signals(conn)
+        conn.executescript(_SUMMARY_DDL)
+        has_summary = conn.execute("SELECT 1 FROM daily_summary LIMIT 1").fetchone()
+        has_picks   = conn.execute("SELECT 1 FROM picks LIMIT 1").fetchone()
+        if has_picks and not has_summary:
+            conn.executescript(_REBUILD_SUMMARY)
+
     # ── Outcome resolution ────────────────────────────────────────────────────
 
     def resolve_date(
@@ -432,6 +542,8 @@ class FeedbackEngine:
             return result
 
         # 4. Write outcomes
+        for g in new_games:
+            g.setdefault("game_date", game_date)
         result.outcomes_written = self._write_outcomes(new_games)
 
         # 5. Auto-update weights after resolution
@@ -442,40 +554,142 @@ class FeedbackEngine:
         print(f"  ✅ {result}")
         return result
 
-    def _write_outcomes(self, games: list[dict]) -> int:
-        """INSERT OR REPLACE outcomes for each game. Returns count written."""
+    def resolve_range(
+        self,
+        start: str,
+        end:   str,
+        *,
+        dates:       Optional[list[str]] = None,
+        dry_run:     bool = False,
+        max_workers: int  = FETCH_WORKERS,
+    ) -> RangeResolveResult:
+        """
+        Resolve every date in [start, end] in one pass.
+
+        Scores are fetched concurrently, compared against stored outcomes,
+        and only new or corrected games are written — all in one
+        transaction — followed by a single weight update.
+
+        Args:
+            start, end:  "YYYY-MM-DD" (inclusive)
+            dates:       Optional subset to fetch (e.g. only dates with picks).
+            dry_run:     If True, preview without writing to DB.
+            max_workers: Concurrent NHL API requests.
+
+        Returns:
+            RangeResolveResult; `.changed` lists only the games written.
+        """
+        result = RangeResolveResult(start=start, end=end)
+        if dates is None:
+            d0, d1 = date.fromisoformat(start), date.fromisoformat(end)
+            dates = [(d0 + timedelta(days=i)).isoformat()
+                     for i in range((d1 - d0).days + 1)]
+        if not dates:
+            return result
+
+        # 1. Fetch concurrently — one failed date never blocks the rest
+        def _fetch(d: str):
+            try:
+                return d, fetch_scores_for_date(d, fetcher=self._fetcher), None
+            except RuntimeError as exc:
+                return d, [], str(exc)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(dates)))) as pool:
+            fetched = list(pool.map(_fetch, dates))
+
+        finals: dict[int, dict] = {}
+        for d, games, err in fetched:
+            if err:
+                result.errors.append(err)
+                continue
+            result.dates_fetched += 1
+            for g in games:
+                if g["is_final"] and g["game_id"] is not None:
+                    finals[g["game_id"]] = {**g, "game_date": d}
+        result.games_final = len(finals)
+        if not finals:
+            return result
+
+        # 2. Diff against stored outcomes (json_each → one bound parameter)
         conn    = self._get_conn()
-        now     = datetime.utcnow().isoformat()
-        written = 0
-
-        for g in games:
-            game_date_str = (str(g.get("game_id", ""))[:8]  # fallback: parse from ID
-                             if not g.get("game_date") else g["game_date"])
-            # Derive date from game_id if not provided (NHL ID format: SSSSTTGGGG)
-            # e.g., 2024020001 → season 2024 (doesn't encode date directly)
-            # Use passed-in date context instead
-            conn.execute(
+        ids_arg = json.dumps(list(finals))
+        stored  = {
+            row[0]: tuple(row[1:]) for row in conn.execute(
+                """
+                SELECT game_id, game_date, home_win, home_score, away_score
+                FROM outcomes
+                WHERE game_id IN (SELECT value FROM json_each(?))
+                """,
+                (ids_arg,),
+            )
+        }
+        changed = [
+            g for gid, g in finals.items()
+            if stored.get(gid) != (g["game_date"], g["home_win"],
+                                   g["home_score"], g["away_score"])
+        ]
+        result.unchanged = len(finals) - len(changed)
+        result.changed   = sorted(changed, key=lambda g: (g["game_date"], g["game_id"]))
+
+        picks_ids = {
+            row[0] for row in conn.execute(
+                "SELECT DISTINCT game_id FROM picks "
+                "WHERE game_id IN (SELECT value FROM json_each(?))",
+                (json.dumps([g["game_id"] for g in changed]),),
+            )
+        }
+        result.picks_matched = sum(1 for g in changed if g["game_id"] in picks_ids)
+
+        if dry_run:
+            print(f"  [DRY RUN] {result}")
+            for g in result.changed:
+                picked = "✓" if g["game_id"] in picks_ids else "·"
+                winner = g["home_team"] if g["home_win"] else g["away_team"]
+                print(f"    {picked} {g['game_date']}  {g['away_team']:3s}@{g['home_team']:3s}  "
+                      f"{g['away_score']}-{g['home_score']}  → {winner}")
+            return result
+
+        # 3. One transaction, then one weight update (only if anything changed)
+        result.outcomes_written = self._write_outcomes(result.changed)
+        if result.outcomes_written:
+            updated = self.update_weights()
+            if updated:
+                self.persist_weights(updated)
+                result.weights_updated = updated
+
+        print(f"  ✅ {result}")
+        return result
+
+    def _write_outcomes(self, games: list[dict]) -> int:
+        """INSERT OR REPLACE outcomes for all games in one transaction. Returns count written."""
+        if not games:
+            return 0
+        conn = self._get_conn()
+        now  = datetime.utcnow().isoformat()
+        rows = [
+            (
+                g["game_id"],
+                g.get("game_date", ""),
+                g["home_team"],
+                g["away_team"],
+                g["home_win"],
+                g.get("home_score"),
+                g.get("away_score"),
+                now,
+            )
+            for g in games
+        ]
+        with transaction(conn):
+            conn.executemany(
                 """
                 INSERT OR REPLACE INTO outcomes
                     (game_id, game_date, home_team, away_team,
                      home_win, home_score, away_score, added_at)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
                 """,
-                (
-                    g["game_id"],
-                    g.get("game_date", ""),
-                    g["home_team"],
-                    g["away_team"],
-                    g["home_win"],
-                    g.get("home_score"),
-                    g.get("away_score"),
-                    now,
-                ),
+                rows,
             )
-            written += 1
-
-        conn.commit()
-        return written
+        return len(rows)
 
     # ── Per-agent accuracy ────────────────────────────────────────────────────
 
@@ -495,43 +709,34 @@ class FeedbackEngine:
         conn = self._get_conn()
         current_weights = self.load_weights()
 
-        # Pull last window_n resolved picks (non-skip)
+        # Last window_n resolved picks (non-skip), graded per agent in SQL
+        # over the normalised pick_signals table.
         rows = conn.execute(
             """
-            SELECT p.signals_json, o.home_win
-            FROM picks p
-            JOIN outcomes o ON p.game_id = o.game_id
-            WHERE p.confidence_tier != 'SKIP'
-            ORDER BY p.game_date DESC, p.created_at DESC
-            LIMIT ?
+            WITH recent AS (
+                SELECT p.id, o.home_win
+                FROM picks p
+                JOIN outcomes o ON p.game_id = o.game_id
+                WHERE p.confidence_tier != 'SKIP'
+                ORDER BY p.game_date DESC, p.created_at DESC
+                LIMIT ?
+            )
+            SELECT s.agent_id,
+                   COUNT(*) AS n,
+                   SUM((COALESCE(s.raw_score, 0.5) > 0.5) = r.home_win) AS wins
+            FROM recent r
+            JOIN pick_signals s ON s.pick_id = r.id
+            WHERE r.home_win IS NOT NULL
+              AND COALESCE(s.confidence, 0.0) >= ?
+            GROUP BY s.agent_id
             """,
-            (window_n,),
+            (window_n, confidence_floor),
         ).fetchall()
-
-        # Per-agent: collect correct/total
-        correct_map: dict[str, list[int]] = {aid: [] for aid in AGENT_ORDER}
-
-        for row in rows:
-            try:
-                sig_dict = json.loads(row["signals_json"])
-                home_win = int(row["home_win"])
-                for aid in AGENT_ORDER:
-                    if aid not in sig_dict:
-                        continue
-                    raw  = float(sig_dict[aid].get("raw_score", 0.5))
-                    conf = float(sig_dict[aid].get("confidence", 0.0))
-                    if conf < confidence_floor:
-                        continue
-                    predicted_home = int(raw > 0.5)
-                    correct_map[aid].append(int(predicted_home == home_win))
-            except (json.JSONDecodeError, KeyError, TypeError, ValueError):
-                continue
+        counts = {row["agent_id"]: (int(row["n"]), int(row["wins"] or 0)) for row in rows}
 
         stats = []
         for aid in AGENT_ORDER:
-            picks  = correct_map[aid]
-            n      = len(picks)
-            wins   = sum(picks)
+            n, wins = counts.get(aid, (0, 0))
             rate   = wins / n if n > 0 else 0.0
             old_w  = current_weights.get(aid, DEFAULT_WEIGHTS.get(aid, 1.0))
 
@@ -645,23 +850,22 @@ class FeedbackEngine:
 
         conn = self._get_conn()
 
-        # All picks in window (including SKIP)
+        # Pre-aggregated per (date, tier) — kept current by the daily_summary
+        # triggers, so this is a range scan on the primary key, not a join.
         rows = conn.execute(
             """
-            SELECT
-                p.pick_direction,
-                p.confidence_tier,
-                p.signals_json,
-                o.home_win
-            FROM picks p
-            LEFT JOIN outcomes o ON p.game_id = o.game_id
-            WHERE p.game_date BETWEEN ? AND ?
-            ORDER BY p.game_date DESC
+            SELECT confidence_tier,
+                   SUM(n_picks)    AS n_picks,
+                   SUM(wins)       AS wins,
+                   SUM(losses)     AS losses,
+                   SUM(unresolved) AS unresolved
+            FROM daily_summary
+            WHERE game_date BETWEEN ? AND ?
+            GROUP BY confidence_tier
             """,
             (start_dt.isoformat(), end_dt.isoformat()),
         ).fetchall()
 
-        # Partition rows
         report = WeeklyReport(
             report_date  = today.isoformat(),
             period_start = start_dt.isoformat(),
@@ -673,37 +877,21 @@ class FeedbackEngine:
         }
 
         for row in rows:
-            tier      = row["confidence_tier"]
-            direction = row["pick_direction"]
-            home_win  = row["home_win"]
+            tier = row["confidence_tier"]
 
             if tier == "SKIP":
-                report.total_skips += 1
-                continue
-
-            report.total_picks += 1
-
-            if home_win is None:
-                report.unresolved += 1
+                report.total_skips += int(row["n_picks"])
                 continue
 
-            home_win = int(home_win)
-            correct  = int(
-                (direction == "home" and home_win == 1) or
-                (direction == "away" and home_win == 0)
-            )
-
-            if correct:
-                report.total_wins  += 1
-            else:
-                report.total_losses += 1
+            report.total_picks  += int(row["n_picks"])
+            report.unresolved   += int(row["unresolved"])
+            report.total_wins   += int(row["wins"])
+            report.total_losses += int(row["losses"])
 
             if tier in tier_map:
-                tier_map[tier].n += 1
-                if correct:
-                    tier_map[tier].wins   += 1
-                else:
-                    tier_map[tier].losses += 1
+                tier_map[tier].wins   = int(row["wins"])
+                tier_map[tier].losses = int(row["losses"])
+                tier_map[tier].n      = tier_map[tier].wins + tier_map[tier].losses
 
         report.tier_breakdown = {
             t: ts for t, ts in tier_map.items()
@@ -793,6 +981,10 @@ def _parse_args() -> argparse.Namespace:
         "--resolve-date", metavar="YYYY-MM-DD",
         help="Pull final scores for this date and write outcomes",
     )
+    p.add_argument(
+        "--resolve-range", nargs=2, metavar=("START", "END"),
+        help="Resolve every date in START..END (YYYY-MM-DD) in one pass",
+    )
     p.add_argument(
         "--weekly-report", action="store_true",
         help="Print last N weeks performance report",
@@ -839,6 +1031,13 @@ def main() -> None:
             for err in result.errors:
                 print(f"  ⚠  {err}")
 
+    if args.resolve_range:
+        start, end = args.resolve_range
+        print(f"\n  Resolving outcomes for {start} → {end} …")
+        result = engine.resolve_range(start, end, dry_run=args.dry_run)
+        for err in result.errors:
+            print(f"  ⚠  {err}")
+
     if args.update_weights:
         print(f"\n  Recalibrating weights (window={args.window}) …")
         updated = engine.update_weights(window_n=args.window)
@@ -849,7 +1048,7 @@ def main() -> None:
         report = engine.weekly_report(weeks=args.weeks, window_n=args.window)
         engine.print_report(report)
 
-    if not any([args.resolve_date, args.update_weights,
+    if not any([args.resolve_date, args.resolve_range, args.update_weights,
                 args.weekly_report, args.show_weights]):
         print("  No action specified. Use --help for options.")
 
@@ -0,0 +1,229 @@
+"""
+goalie_index.py
+---------------
+Precomputed goalie lookups over goalie_features.parquet — NHL MAS
+
+Three places used to scan the whole goalie history per game with a
+case-insensitive str.contains on the scraped last name:
+
+    GoalieFormAgent._get_h2h_save_pct   — name + opponent → last-3 save%
+    module1_ingest.get_goalie_features  — team + name → latest start row
+    predict_today (home / away goalie)  — team + name → latest start row
+    players/predict (opposing goalie)   — team + name → latest start row
+
+A GoalieIndex is built once per loaded frame and answers all of them from
+dicts keyed by playerId:
+
+    resolve(name, team)        → playerId   (last-name match, most recent start)
+    latest_start(pid, team)    → row        (most recent is_starter row for team)
+    fallback(team)             → row        (team's highest-TOI row, latest on ties)
+    latest_team_start(team)    → row        (team's most recent is_starter row, any goalie)
+    latest_for_team(team)      → row        (team's most recent row, for GSAA)
+    h2h_save_pct(pid, opp)     → float      (mean save% of last N starts vs opp)
+
+Name matching keeps the old semantics (case-insensitive substring of the
+last name), but only over the handful of distinct goalies per team instead
+of every row.
+
+Entry points:
+    idx = GoalieIndex(gl)
+    idx = index_for(gl)        # memoised per DataFrame object
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Optional, Union
+
+import pandas as pd
+
+H2H_WINDOW     = 3   # most recent starts vs the same opponent
+H2H_MIN_STARTS = 2   # fewer than this → no H2H signal
+
+NAME_COLS = ("goalie_name", "player_name")
+SPP_COLS  = ("savePct", "save_pctg")
+
+GoalieKey = Union[int, str]   # playerId, or full name when the frame has no ids
+
+
+def _first_col(df: pd.DataFrame, candidates) -> Optional[str]:
+    return next((c for c in candidates if c in df.columns), None)
+
+
+def last_name(name: Optional[str]) -> str:
+    """Lower-cased last token of a scraped name ('' for blank / Unknown)."""
+    if not name or name == "Unknown":
+        return ""
+    parts = name.strip().split()
+    return parts[-1].lower() if parts else ""
+
+
+class GoalieIndex:
+    """
+    Read-only lookups over one goalie game-log frame.
+
+    Args:
+        gl:             goalie_features.parquet rows (playerId, team, opponent,
+                        game_date, is_starter, goalie_name, savePct, toi_min, …)
+        h2h_window:     Starts averaged for the H2H save%
+        h2h_min_starts: Minimum starts vs an opponent for an H2H value
+    """
+
+    def __init__(self, gl: pd.DataFrame,
+                 h2h_window: int = H2H_WINDOW,
+                 h2h_min_starts: int = H2H_MIN_STARTS):
+        self.gl        = gl
+        self._name_col = _first_col(gl, NAME_COLS)
+        # Goalie key: playerId; frames without it (old exports, test fixtures)
+        # fall back to the full name
+        self._key_col  = "playerId" if "playerId" in gl.columns else self._name_col
+        # (team, key) → positional row of latest start; team → [(name, key, date)]
+        self._latest:    dict[tuple[str, GoalieKey], int] = {}
+        self._roster:    dict[Optional[str], list[tuple[str, GoalieKey, pd.Timestamp]]] = {}
+        self._fallback:  dict[str, int] = {}
+        self._team_last: dict[str, int] = {}
+        self._team_start: dict[str, int] = {}
+        self._h2h:       dict[tuple[GoalieKey, str], float] = {}
+        self._players:   set[GoalieKey] = set()
+
+        if gl.empty:
+            return
+        self._build_fallback(gl)
+        self._build_team_last(gl)
+        if self._key_col is None:
+            return
+        self._players = {self._key(v) for v in gl[self._key_col].dropna()}
+        self._build_starts(gl)
+        self._build_h2h(gl, h2h_window, h2h_min_starts)
+
+    def _key(self, v) -> GoalieKey:
+        return int(v) if self._key_col == "playerId" else str(v)
+
+    # ── Build ────────────────────────────────────────────────────────────────
+
+    def _build_starts(self, gl: pd.DataFrame) -> None:
+        if self._name_col is None or "team" not in gl.columns or "game_date" not in gl.columns:
+            return
+        starters = gl.assign(row_pos=range(len(gl)))
+        if "is_starter" in gl.columns:
+            starters = starters[starters["is_starter"] == 1]
+        # Stable sort so equal dates keep file order — matches sort_values().iloc[-1]
+        starters = starters.sort_values("game_date", kind="stable")
+        latest = starters.groupby(["team", self._key_col], sort=False).tail(1)
+        last   = starters.groupby("team", sort=False).tail(1)
+        self._team_start = dict(zip(last["team"], last["row_pos"].astype(int)))
+
+        for team, pid, pos, name, day in zip(latest["team"], latest[self._key_col],
+                                             latest["row_pos"], latest[self._name_col],
+                                             latest["game_date"]):
+            pid = self._key(pid)
+            self._latest[(team, pid)] = int(pos)
+            entry = (str(name or "").lower(), pid, day)
+            self._roster.setdefault(team, []).append(entry)
+            self._roster.setdefault(None, []).append(entry)
+
+    def _build_fallback(self, gl: pd.DataFrame) -> None:
+        if "team" not in gl.columns or "toi_min" not in gl.columns:
+            return
+        # Highest TOI per team; ties go to the most recent game
+        order = ["toi_min", "game_date"] if "game_date" in gl.columns else ["toi_min"]
+        df    = gl[["team"] + order].assign(row_pos=range(len(gl))).dropna(subset=["toi_min"])
+        best  = df.sort_values(order, kind="stable").groupby("team", sort=False).tail(1)
+        self._fallback = dict(zip(best["team"], best["row_pos"].astype(int)))
+
+    def _build_team_last(self, gl: pd.DataFrame) -> None:
+        if "team" not in gl.columns or "game_date" not in gl.columns:
+            return
+        df   = gl[["team", "game_date"]].assign(row_pos=range(len(gl)))
+        last = df.sort_values("game_date", kind="stable").groupby("team", sort=False).tail(1)
+        self._team_last = dict(zip(last["team"], last["row_pos"].astype(int)))
+
+    def _build_h2h(self, gl: pd.DataFrame, window: int, min_starts: int) -> None:
+        spp_col = _first_col(gl, SPP_COLS)
+        if spp_col is None or "opponent" not in gl.columns or "game_date" not in gl.columns:
+            return
+        keys = list(dict.fromkeys([self._key_col, "opponent"]))
+        df   = gl[keys + ["game_date", spp_col]].sort_values("game_date", kind="stable")
+        n    = df.groupby(keys, sort=False).size()
+        mean = df.groupby(keys, sort=False).tail(window).groupby(keys, sort=False)[spp_col].mean()
+        ok   = mean[(n.reindex(mean.index) >= min_starts) & mean.notna()]
+        self._h2h = {(self._key(pid), opp): float(v) for (pid, opp), v in ok.items()}
+
+    # ── Lookups ──────────────────────────────────────────────────────────────
+
+    def has_player(self, player_id: Optional[GoalieKey]) -> bool:
+        return player_id is not None and self._key(player_id) in self._players
+
+    def resolve(self, name: Optional[str], team: Optional[str] = None) -> Optional[GoalieKey]:
+        """
+        Goalie key (playerId) for a scraped name: goalies (on `team`, or league-wide when
+        team is None) whose name contains the last name; most recent start wins.
+        """
+        last = last_name(name)
+        if not last:
+            return None
+        hits = [(d, pid) for nm, pid, d in self._roster.get(team, ()) if last in nm]
+        return max(hits)[1] if hits else None
+
+    def latest_start(self, player_id: Optional[GoalieKey], team: str) -> Optional[pd.Series]:
+        """Most recent starter row for this goalie with `team`."""
+        if player_id is None:
+            return None
+        pos = self._latest.get((team, self._key(player_id)))
+        return self.gl.iloc[pos] if pos is not None else None
+
+    def match_starter(self, team: str, name: Optional[str]) -> Optional[pd.Series]:
+        """resolve() + latest_start() — the old per-game str.contains lookup."""
+        return self.latest_start(self.resolve(name, team), team)
+
+    def fallback(self, team: str) -> Optional[pd.Series]:
+        """Team's highest-TOI row (used when the scraped name doesn't match)."""
+        pos = self._fallback.get(team)
+        return self.gl.iloc[pos] if pos is not None else None
+
+    def latest_team_start(self, team: str) -> Optional[pd.Series]:
+        """Team's most recent starter row, any goalie (players/predict fallback)."""
+        pos = self._team_start.get(team)
+        return self.gl.iloc[pos] if pos is not None else None
+
+    def latest_for_team(self, team: str) -> Optional[pd.Series]:
+        """Team's most recent row, any goalie (season aggregates for GSAA)."""
+        pos = self._team_last.get(team)
+        return self.gl.iloc[pos] if pos is not None else None
+
+    def h2h_save_pct(self, player_id: Optional[GoalieKey], opponent: str) -> Optional[float]:
+        """Mean save% over the goalie's last N starts vs `opponent` (None if too few)."""
+        if player_id is None:
+            return None
+        return self._h2h.get((self._key(player_id), opponent))
+
+
+# ── Memoised per frame ────────────────────────────────────────────────────────
+
+INDEX_CACHE_SIZE = 4   # frames kept (live run = 1; backtest = one per slate date)
+
+_CACHE: "OrderedDict[int, GoalieIndex]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def index_for(gl: pd.DataFrame) -> GoalieIndex:
+    """
+    The GoalieIndex for this DataFrame object, built on first request.
+    Keyed by object identity, so every caller handed the same loaded frame
+    shares one index. Small LRU: the index holds its frame, so only the most
+    recent INDEX_CACHE_SIZE frames stay alive.
+    """
+    key = id(gl)
+    with _CACHE_LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None and hit.gl is gl:
+            _CACHE.move_to_end(key)
+            return hit
+    idx = GoalieIndex(gl)
+    with _CACHE_LOCK:
+        _CACHE[key] = idx
+        _CACHE.move_to_end(key)
+        while len(_CACHE) > INDEX_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return idx
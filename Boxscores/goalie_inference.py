@@ -17,12 +17,25 @@ Public API:
     engine = GoalieInferenceEngine()
     result = engine.infer(team="BOS", game_date="2026-04-14", is_b2b=False)
     # → {"name": "Jeremy Swayman", "status": "Inferred", "confidence": 0.80, "reason": "..."}
+
+    state = engine.rotation_state("BOS", as_of="2026-04-14")   # RotationState or None
+    engine.record_start("BOS", "2026-04-14", "Jeremy Swayman")  # incremental update
+    frame = engine.backtest("2025-10-01", "2026-04-15")         # per-start accuracy
+
+Rotation index:
+    The starter history is folded into a per-team rotation index once per
+    load. Every start stores the running consecutive count and the most
+    recent distinct backup as of that game, so the state before any date
+    is one bisect over that team's start dates — no DataFrame filtering or
+    row iteration per infer() call.
 """
 
+import bisect
 import logging
 import pandas as pd
+from dataclasses import dataclass, field
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Optional
 
 log = logging.getLogger("nhl_mas.goalie_inference")
@@ -38,55 +51,141 @@ P_REPEAT_IF_STREAK3  = 0.70   # 3+ starts in a row — rotation risk rises
 P_REPEAT_IF_LONG_REST = 0.72  # >5 days since team's last game — uncertain
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Rotation index
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class RotationState:
+    """A team's goalie rotation as of its most recent start before some date."""
+    team:        str
+    last_name:   str
+    last_date:   date
+    consecutive: int          # straight starts by last_name, ending at last_date
+    backup_name: str          # most recent starter who isn't last_name ("" if none)
+    n_starts:    int          # starts in history up to and including last_date
+
+
+@dataclass
+class _TeamRotation:
+    """
+    Append-only start log for one team, sorted by date.
+
+    consec[i] / backup[i] describe the rotation right after start i, so any
+    as-of lookup is a bisect on dates.
+    """
+    dates:  list = field(default_factory=list)
+    names:  list = field(default_factory=list)
+    consec: list = field(default_factory=list)
+    backup: list = field(default_factory=list)
+
+    def append(self, game_date: date, name: str) -> None:
+        if self.names and name == self.names[-1]:
+            consec, backup = self.consec[-1] + 1, self.backup[-1]
+        elif self.names:
+            consec, backup = 1, self.names[-1]
+        else:
+            consec, backup = 1, ""
+        self.dates.append(game_date)
+        self.names.append(name)
+        self.consec.append(consec)
+        self.backup.append(backup)
+
+    def state_before(self, team: str, target: Optional[date]) -> Optional[RotationState]:
+        i = len(self.dates) if target is None else bisect.bisect_left(self.dates, target)
+        if i == 0:
+            return None
+        i -= 1
+        return RotationState(
+            team        = team,
+            last_name   = self.names[i],
+            last_date   = self.dates[i],
+            consecutive = self.consec[i],
+            backup_name = self.backup[i],
+            n_starts    = i + 1,
+        )
+
+
+def _build_rotation_index(df: pd.DataFrame) -> dict:
+    """One pass over the (team, game_date)-sorted starter frame → {team: _TeamRotation}."""
+    index: dict[str, _TeamRotation] = {}
+    for team, game_date, name in zip(df["team"], df["game_date"], df["goalie_name"]):
+        rot = index.get(team)
+        if rot is None:
+            rot = index[team] = _TeamRotation()
+        rot.append(game_date, name)
+    return index
+
+
+def _to_date(value) -> date:
+    if isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    return pd.to_datetime(value).date()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Engine
+# ═══════════════════════════════════════════════════════════════════════════════
+
 class GoalieInferenceEngine:
     """
     Loads goalie history once, then answers infer() calls quickly.
     Singleton-safe: instantiate once and reuse across all teams.
     """
 
-    def __init__(self):
+    def __init__(self, df: Optional[pd.DataFrame] = None):
+        """Pass df (starter rows with goalie_name/game_date/team/is_starter) to skip the parquet."""
         self._df: Optional[pd.DataFrame] = None
+        self._rotation: dict[str, _TeamRotation] = {}
         self._loaded = False
+        if df is not None:
+            self._index_frame(df)
+            self._loaded = True
 
     def _load(self):
         if self._loaded:
             return
         try:
             # Prefer features parquet (has rolling stats + is_starter flag)
-            df = pd.read_parquet(FEATURES_PATH)
-            # Normalise column names across parquet versions
-            # Rename legacy column names; add is_starter from gamesStarted only
-            # if is_starter doesn't already exist (avoid duplicate-column bug)
-            renames = {}
-            if "goalieFullName" in df.columns and "goalie_name" not in df.columns:
-                renames["goalieFullName"] = "goalie_name"
-            if "gameDate" in df.columns and "game_date" not in df.columns:
-                renames["gameDate"] = "game_date"
-            if "teamAbbrev" in df.columns and "team" not in df.columns:
-                renames["teamAbbrev"] = "team"
-            if "gamesStarted" in df.columns and "is_starter" not in df.columns:
-                renames["gamesStarted"] = "is_starter"
-            if renames:
-                df = df.rename(columns=renames)
-            required = {"goalie_name", "game_date", "team", "is_starter"}
-            if not required.issubset(df.columns):
-                raise ValueError(f"Missing columns: {required - set(df.columns)}")
-
-            df["game_date"] = pd.to_datetime(df["game_date"]).dt.date
-            df = df[df["is_starter"] == 1].copy()
-            # Drop duplicate (team, game_date, goalie) rows that arise from
-            # multi-period boxscore joins — keep one record per starter per game
-            df = df.drop_duplicates(subset=["team", "game_date", "goalie_name"])
-            df = df.reset_index(drop=True)
-            df = df.sort_values(["team", "game_date"])
-            self._df = df
+            self._index_frame(pd.read_parquet(FEATURES_PATH))
             log.info("GoalieInferenceEngine: loaded %d starter records (%s → %s)",
-                     len(df), df["game_date"].min(), df["game_date"].max())
+                     len(self._df), self._df["game_date"].min(), self._df["game_date"].max())
         except Exception as e:
             log.warning("GoalieInferenceEngine: could not load parquet — %s", e)
             self._df = None
+            self._rotation = {}
         self._loaded = True
 
+    def _index_frame(self, df: pd.DataFrame) -> None:
+        """Normalise a goalie history frame and build the rotation index from it."""
+        # Normalise column names across parquet versions
+        # Rename legacy column names; add is_starter from gamesStarted only
+        # if is_starter doesn't already exist (avoid duplicate-column bug)
+        renames = {}
+        if "goalieFullName" in df.columns and "goalie_name" not in df.columns:
+            renames["goalieFullName"] = "goalie_name"
+        if "gameDate" in df.columns and "game_date" not in df.columns:
+            renames["gameDate"] = "game_date"
+        if "teamAbbrev" in df.columns and "team" not in df.columns:
+            renames["teamAbbrev"] = "team"
+        if "gamesStarted" in df.columns and "is_starter" not in df.columns:
+            renames["gamesStarted"] = "is_starter"
+        df = df.rename(columns=renames)       # always a copy — never mutate the caller's frame
+        required = {"goalie_name", "game_date", "team", "is_starter"}
+        if not required.issubset(df.columns):
+            raise ValueError(f"Missing columns: {required - set(df.columns)}")
+
+        df["game_date"] = pd.to_datetime(df["game_date"]).dt.date
+        df = df[df["is_starter"] == 1].copy()
+        df["goalie_name"] = df["goalie_name"].astype(str).str.strip()
+        # Drop duplicate (team, game_date, goalie) rows that arise from
+        # multi-period boxscore joins — keep one record per starter per game
+        df = df.drop_duplicates(subset=["team", "game_date", "goalie_name"])
+        df = df.reset_index(drop=True)
+        df = df.sort_values(["team", "game_date"], kind="stable")
+        self._df = df
+        self._rotation = _build_rotation_index(df)
+
     # ── Public API ────────────────────────────────────────────────────────────
 
     def infer(
@@ -112,73 +211,15 @@ class GoalieInferenceEngine:
         dict with keys: name, status, confidence (0-1), reason
         OR None if insufficient history.
         """
-        self._load()
-        if self._df is None:
-            return None
-
-        target_date = pd.to_datetime(game_date).date()
+        target_date = _to_date(game_date)
+        state = self.rotation_state(team, target_date)
+        n_hist = state.n_starts if state else 0
 
-        # Pull this team's history before today
-        team_hist = self._df[
-            (self._df["team"] == team) &
-            (self._df["game_date"] < target_date)
-        ].sort_values("game_date", ascending=False)
-
-        if len(team_hist) < 3:
-            log.debug("  [%s] Inference skipped: only %d historical starts", team, len(team_hist))
+        if n_hist < 3:
+            log.debug("  [%s] Inference skipped: only %d historical starts", team, n_hist)
             return None
 
-        last_game   = team_hist.iloc[0]
-        last_date   = last_game["game_date"]
-        last_name   = str(last_game["goalie_name"]).strip()
-        days_since  = (target_date - last_date).days
-
-        # Consecutive starts for last_name
-        consecutive = 0
-        for _, row in team_hist.iterrows():
-            if str(row["goalie_name"]).strip() == last_name:
-                consecutive += 1
-            else:
-                break
-
-        # Find backup: most-recent starter who isn't last_name
-        backup_rows = team_hist[team_hist["goalie_name"].str.strip() != last_name]
-        backup_name = str(backup_rows.iloc[0]["goalie_name"]).strip() if len(backup_rows) else ""
-
-        # ── Decision tree ─────────────────────────────────────────────────────
-        if days_since > 5:
-            # Long rest — teams sometimes shuffle but starter still likely
-            inferred_name = last_name
-            confidence    = P_REPEAT_IF_LONG_REST
-            reason        = (f"Long rest ({days_since}d since last game) — "
-                             f"{last_name} likely but rotation possible")
-
-        elif is_b2b:
-            if backup_name:
-                inferred_name = backup_name
-                confidence    = P_BACKUP_IF_B2B
-                reason        = (f"B2B → backup rotation. "
-                                 f"Last starter: {last_name} ({consecutive} straight). "
-                                 f"Backup: {backup_name}")
-            else:
-                # No known backup — starter might play anyway
-                inferred_name = last_name
-                confidence    = 1 - P_BACKUP_IF_B2B  # inverted — low confidence
-                reason        = (f"B2B → backup expected but no backup found in history. "
-                                 f"Defaulting to {last_name} (low confidence)")
-
-        elif consecutive >= 3:
-            # Starter is on a run — slight pullback risk
-            inferred_name = last_name
-            confidence    = P_REPEAT_IF_STREAK3
-            reason        = (f"{last_name} on {consecutive}-game streak — "
-                             f"likely repeats but rotation watch")
-
-        else:
-            inferred_name = last_name
-            confidence    = P_REPEAT_IF_RESTED
-            reason        = (f"{last_name} started last game ({last_date}) — "
-                             f"not B2B, {consecutive} straight, repeating")
+        inferred_name, confidence, reason, _ = _decide(state, target_date, is_b2b)
 
         # ── Cross-validate with DFO name ──────────────────────────────────────
         dfo_last = _last_name(current_dfo_name)
@@ -209,6 +250,75 @@ class GoalieInferenceEngine:
             "reason":     reason,
         }
 
+    def rotation_state(self, team: str, as_of=None) -> Optional[RotationState]:
+        """
+        Rotation state from starts strictly before `as_of` (date or ISO string).
+        as_of=None → state after the most recent start on record.
+        """
+        self._load()
+        rot = self._rotation.get(team)
+        if rot is None:
+            return None
+        return rot.state_before(team, None if as_of is None else _to_date(as_of))
+
+    def record_start(self, team: str, game_date, goalie_name: str) -> None:
+        """
+        Add a confirmed start without reloading the parquet.
+
+        In-order starts (the normal nightly case) are an O(1) append; a start
+        dated before the team's latest one rebuilds that team's log.
+        """
+        self._load()
+        game_date = _to_date(game_date)
+        name      = str(goalie_name).strip()
+        rot       = self._rotation.setdefault(team, _TeamRotation())
+
+        if not rot.dates or game_date > rot.dates[-1]:
+            rot.append(game_date, name)
+            return
+        pairs = list(zip(rot.dates, rot.names))
+        if (game_date, name) in pairs:
+            return
+        pairs.append((game_date, name))
+        pairs.sort(key=lambda p: p[0])
+        rebuilt = _TeamRotation()
+        for d, n in pairs:
+            rebuilt.append(d, n)
+        self._rotation[team] = rebuilt
+
+    def backtest(self, start=None, end=None) -> pd.DataFrame:
+        """
+        Replay infer()'s decision tree over every recorded start in
+        [start, end], using only the rotation state before each game.
+
+        B2B is taken from the team's previous start (every game has one).
+        No DFO cross-validation. Returns one row per start:
+        team, game_date, actual, inferred, confidence, rule, correct.
+        """
+        self._load()
+        cols = ["team", "game_date", "actual", "inferred", "confidence", "rule", "correct"]
+        lo = _to_date(start) if start is not None else None
+        hi = _to_date(end) if end is not None else None
+
+        rows = []
+        for team, rot in self._rotation.items():
+            i0 = 0 if lo is None else bisect.bisect_left(rot.dates, lo)
+            i1 = len(rot.dates) if hi is None else bisect.bisect_right(rot.dates, hi)
+            for i in range(i0, i1):
+                game_date = rot.dates[i]
+                # start i-1 may share game_date only on a same-night goalie swap
+                j = bisect.bisect_left(rot.dates, game_date) - 1
+                if j < 2:
+                    continue
+                state = RotationState(team, rot.names[j], rot.dates[j],
+                                      rot.consec[j], rot.backup[j], j + 1)
+                is_b2b = (game_date - state.last_date).days == 1
+                name, conf, _, rule = _decide(state, game_date, is_b2b)
+                rows.append((team, game_date, rot.names[i], name, conf, rule,
+                             name == rot.names[i]))
+        frame = pd.DataFrame(rows, columns=cols)
+        return frame.sort_values(["game_date", "team"], kind="stable").reset_index(drop=True)
+
     def team_rotation_summary(self, team: str, n: int = 10) -> str:
         """Quick human-readable summary of a team's recent goalie rotation."""
         self._load()
@@ -229,6 +339,47 @@ def _last_name(full_name: str) -> str:
     return parts[-1].lower() if parts else ""
 
 
+def _decide(state: RotationState, target_date: date, is_b2b: bool) -> tuple:
+    """Decision tree → (inferred_name, confidence, reason, rule)."""
+    last_name   = state.last_name
+    last_date   = state.last_date
+    consecutive = state.consecutive
+    backup_name = state.backup_name
+    days_since  = (target_date - last_date).days
+
+    if days_since > 5:
+        # Long rest — teams sometimes shuffle but starter still likely
+        return (last_name, P_REPEAT_IF_LONG_REST,
+                f"Long rest ({days_since}d since last game) — "
+                f"{last_name} likely but rotation possible",
+                "long_rest")
+
+    if is_b2b:
+        if backup_name:
+            return (backup_name, P_BACKUP_IF_B2B,
+                    f"B2B → backup rotation. "
+                    f"Last starter: {last_name} ({consecutive} straight). "
+                    f"Backup: {backup_name}",
+                    "b2b_backup")
+        # No known backup — starter might play anyway
+        return (last_name, 1 - P_BACKUP_IF_B2B,   # inverted — low confidence
+                f"B2B → backup expected but no backup found in history. "
+                f"Defaulting to {last_name} (low confidence)",
+                "b2b_no_backup")
+
+    if consecutive >= 3:
+        # Starter is on a run — slight pullback risk
+        return (last_name, P_REPEAT_IF_STREAK3,
+                f"{last_name} on {consecutive}-game streak — "
+                f"likely repeats but rotation watch",
+                "streak")
+
+    return (last_name, P_REPEAT_IF_RESTED,
+            f"{last_name} started last game ({last_date}) — "
+            f"not B2B, {consecutive} straight, repeating",
+            "repeat")
+
+
 # ── Convenience function (mirrors scraper API style) ──────────────────────────
 _engine: Optional[GoalieInferenceEngine] = None
 
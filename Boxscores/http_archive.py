@@ -0,0 +1,323 @@
+"""
+http_archive.py
+---------------
+Record / replay layer for every HTTP GET made by Module 1 (nhl_get) and the
+goalie scrapers (scrape_goalies_v2).
+
+All of those call http_archive.get() instead of requests.get(). In the
+default "live" mode that is a plain requests.get. Two other modes exist:
+
+    record  — pass through to the network and store each response
+              (status, content-type, body) under  <root>/<date>/<key>.json.gz
+    replay  — never touch the network: serve stored responses, after a
+              configurable simulated latency (fixed + deterministic jitter
+              per URL). A URL that was never recorded raises ArchiveMiss
+              at once, with no simulated latency (a requests.RequestException;
+              nhl_get returns None for it without retrying).
+
+That makes build_today_contexts runnable offline and reproducibly, so the
+ingestion path can be benchmarked and regression-tested without hitting
+api-web.nhle.com or the goalie sites, and latency work (pooling, de-dup)
+can be measured against a fixed, realistic per-request delay.
+
+Entry points:
+    with recording(ARCHIVE_ROOT, "2025-01-15"):
+        build_today_contexts("2025-01-15")
+
+    with replaying(ARCHIVE_ROOT, "2025-01-15", latency_ms=80, jitter_ms=40):
+        build_today_contexts("2025-01-15")
+
+CLI:
+    python http_archive.py record --date 2025-01-15 [--no-advanced]
+        Build contexts live, archiving every response (PBP cache bypassed
+        so play-by-play is captured too).
+
+    python http_archive.py replay --date 2025-01-15 [--latency-ms 80]
+                          [--jitter-ms 40] [--workers 8] [--repeat 3]
+        Build contexts offline from the archive; print timings per run.
+
+    python http_archive.py ls --date 2025-01-15
+        List archived URLs for a date.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import gzip
+import hashlib
+import io
+import json
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Iterator, Optional, Union
+from urllib.parse import urlencode
+
+import requests
+
+import tracing
+
+# ── Paths ─────────────────────────────────────────────────────────────────────
+BASE         = Path(__file__).resolve().parent
+ARCHIVE_ROOT = BASE / "http_archive"
+
+MODES = ("live", "record", "replay")
+
+
+class ArchiveMiss(requests.RequestException):
+    """Replay mode was asked for a URL that was never recorded."""
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Stored responses
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class ReplayResponse:
+    """The subset of requests.Response the ingest code uses."""
+
+    def __init__(self, url: str, status_code: int, content: bytes,
+                 encoding: Optional[str] = "utf-8", headers: Optional[dict] = None):
+        self.url         = url
+        self.status_code = status_code
+        self.content     = content
+        self.encoding    = encoding or "utf-8"
+        self.headers     = requests.structures.CaseInsensitiveDict(headers or {})
+
+    @property
+    def ok(self) -> bool:
+        return self.status_code < 400
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding, errors="replace")
+
+    def json(self):
+        return json.loads(self.content)
+
+    def raise_for_status(self) -> None:
+        if not self.ok:
+            raise requests.HTTPError(f"{self.status_code} for url: {self.url}", response=self)
+
+
+def request_key(url: str, params: Optional[dict] = None) -> str:
+    """Stable file key for a GET (URL + sorted query params)."""
+    full = url + ("?" + urlencode(sorted(params.items())) if params else "")
+    return hashlib.sha1(full.encode()).hexdigest()[:20]
+
+
+class HttpArchive:
+    """One directory of recorded responses (conventionally one per slate date)."""
+
+    def __init__(self, root: Union[str, Path], day: Union[str, date]):
+        self.day  = str(day)
+        self.dir  = Path(root) / self.day
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.json.gz"
+
+    def save(self, url: str, params: Optional[dict], resp, elapsed_ms: float) -> None:
+        payload = {
+            "url":          url,
+            "params":       params or {},
+            "status":       resp.status_code,
+            "encoding":     resp.encoding or "utf-8",
+            "content_type": resp.headers.get("Content-Type", ""),
+            "elapsed_ms":   round(elapsed_ms, 1),
+            "recorded_at":  datetime.utcnow().isoformat(),
+            "body":         resp.content.decode(resp.encoding or "utf-8", errors="replace"),
+        }
+        path = self._path(request_key(url, params))
+        with self._lock:
+            self.dir.mkdir(parents=True, exist_ok=True)
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                json.dump(payload, f)
+
+    def load(self, url: str, params: Optional[dict] = None) -> Optional[dict]:
+        path = self._path(request_key(url, params))
+        if not path.exists():
+            return None
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return json.load(f)
+
+    def entries(self) -> list[dict]:
+        """Every stored response's metadata (body omitted), sorted by URL."""
+        out = []
+        for path in sorted(self.dir.glob("*.json.gz")):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                rec = json.load(f)
+            rec["bytes"] = len(rec.pop("body", "").encode())
+            out.append(rec)
+        return sorted(out, key=lambda r: r["url"])
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Mode switch + get()
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class _State:
+    mode:       str                   = "live"
+    archive:    Optional[HttpArchive] = None
+    latency_ms: float                 = 0.0
+    jitter_ms:  float                 = 0.0
+
+
+_STATE      = _State()
+_STATE_LOCK = threading.Lock()
+
+
+def _jitter(url: str, jitter_ms: float) -> float:
+    """Deterministic per-URL jitter in [0, jitter_ms) — same delay every replay."""
+    if jitter_ms <= 0:
+        return 0.0
+    h = int(hashlib.sha1(url.encode()).hexdigest()[:8], 16)
+    return (h / 0xFFFFFFFF) * jitter_ms
+
+
+def get(url: str, params: Optional[dict] = None, **kwargs):
+    """
+    Drop-in for requests.get(url, params=..., headers=..., timeout=...).
+    Behaviour depends on the active mode (see module docstring).
+    """
+    st = _STATE
+    if st.mode == "replay":
+        rec = st.archive.load(url, params) if st.archive is not None else None
+        if rec is None:                 # fail fast: no simulated latency for a miss
+            tracing.count("replay_misses")
+            raise ArchiveMiss(f"not in archive: {url}")
+        delay = (st.latency_ms + _jitter(url, st.jitter_ms)) / 1000
+        if delay > 0:
+            time.sleep(delay)
+        tracing.count("replay_hits")
+        return ReplayResponse(url, rec["status"], rec["body"].encode(rec["encoding"]),
+                              rec["encoding"], {"Content-Type": rec.get("content_type", "")})
+
+    t0   = time.perf_counter()
+    resp = requests.get(url, params=params, **kwargs)
+    if st.mode == "record" and st.archive is not None:
+        st.archive.save(url, params, resp, (time.perf_counter() - t0) * 1000)
+    return resp
+
+
+@contextlib.contextmanager
+def _mode(state: _State) -> Iterator[_State]:
+    global _STATE
+    with _STATE_LOCK:
+        prev, _STATE = _STATE, state
+    try:
+        yield state
+    finally:
+        with _STATE_LOCK:
+            _STATE = prev
+
+
+def recording(root: Union[str, Path], day: Union[str, date]):
+    """Live requests, each response saved to <root>/<day>/."""
+    return _mode(_State(mode="record", archive=HttpArchive(root, day)))
+
+
+def replaying(root: Union[str, Path], day: Union[str, date],
+              latency_ms: float = 0.0, jitter_ms: float = 0.0):
+    """Serve <root>/<day>/ offline with simulated latency per request."""
+    return _mode(_State(mode="replay", archive=HttpArchive(root, day),
+                        latency_ms=latency_ms, jitter_ms=jitter_ms))
+
+
+def current_mode() -> str:
+    return _STATE.mode
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Isolated context build (record / replay CLI)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@contextlib.contextmanager
+def isolated_ingest() -> Iterator[Path]:
+    """
+    Point Module 1's pbp_cache/ and odds_history.csv at a throwaway directory,
+    so every PBP request goes through get() (recorded / replayed) and runs
+    don't append to the real odds log.
+    """
+    import module1_ingest as m1
+    saved = (m1.PBP_CACHE, m1.ODDS_LOG)
+    with tempfile.TemporaryDirectory(prefix="mas_ingest_") as tmp:
+        m1.PBP_CACHE = Path(tmp) / "pbp_cache"
+        m1.ODDS_LOG  = Path(tmp) / "odds_history.csv"
+        try:
+            yield Path(tmp)
+        finally:
+            m1.PBP_CACHE, m1.ODDS_LOG = saved
+
+
+def replay_build(day: Union[str, date], root: Union[str, Path] = ARCHIVE_ROOT,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0,
+                 fetch_advanced: bool = True, max_workers: Optional[int] = None,
+                 quiet: bool = True):
+    """
+    Offline build_today_contexts(day) from the archive.
+    Returns (contexts, tracer) — the tracer holds per-stage spans and counters.
+    """
+    import module1_ingest as m1
+    kwargs = {"fetch_advanced": fetch_advanced}
+    if max_workers is not None:
+        kwargs["max_workers"] = max_workers
+    tracer = tracing.Tracer("replay_build", day=str(day), latency_ms=latency_ms)
+    out    = contextlib.redirect_stdout(io.StringIO()) if quiet else contextlib.nullcontext()
+    with isolated_ingest(), replaying(root, day, latency_ms, jitter_ms), out:
+        with tracer.activate():
+            contexts = m1.build_today_contexts(day, **kwargs)
+    return contexts, tracer
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Record / replay Module 1 HTTP traffic")
+    parser.add_argument("command", choices=("record", "replay", "ls"))
+    parser.add_argument("--date",        required=True, help="Slate date YYYY-MM-DD")
+    parser.add_argument("--root",        default=str(ARCHIVE_ROOT))
+    parser.add_argument("--no-advanced", action="store_true")
+    parser.add_argument("--latency-ms",  type=float, default=0.0)
+    parser.add_argument("--jitter-ms",   type=float, default=0.0)
+    parser.add_argument("--workers",     type=int,   default=None)
+    parser.add_argument("--repeat",      type=int,   default=1)
+    args = parser.parse_args()
+
+    if args.command == "ls":
+        entries = HttpArchive(args.root, args.date).entries()
+        for e in entries:
+            print(f"  {e['status']:3d}  {e['bytes']:>9,d} B  {e['elapsed_ms']:>7.0f} ms  {e['url']}")
+        print(f"\n  {len(entries)} responses archived for {args.date}")
+        return
+
+    if args.command == "record":
+        import module1_ingest as m1
+        with isolated_ingest(), recording(args.root, args.date):
+            contexts = m1.build_today_contexts(args.date,
+                                               fetch_advanced=not args.no_advanced)
+        n = len(HttpArchive(args.root, args.date).entries())
+        print(f"  💾 {n} responses → {Path(args.root) / args.date}  "
+              f"({len(contexts)} contexts)")
+        return
+
+    for i in range(args.repeat):
+        t0 = time.perf_counter()
+        contexts, tracer = replay_build(args.date, args.root, args.latency_ms,
+                                        args.jitter_ms, not args.no_advanced,
+                                        args.workers)
+        print(f"  run {i + 1}: {len(contexts)} contexts in "
+              f"{time.perf_counter() - t0:.2f}s  "
+              f"(hits={int(tracer.root.counters.get('replay_hits', 0))}  "
+              f"misses={int(tracer.root.counters.get('replay_misses', 0))})")
+    tracer.print_summary()
+
+
+if __name__ == "__main__":
+    main()
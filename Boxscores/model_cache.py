@@ -0,0 +1,196 @@
+"""
+model_cache.py
+--------------
+Warm, in-process cache for the trained game / player models.
+
+Every prediction script used to deserialize its model from disk on every
+run. This module keeps each loaded model in memory, keyed on
+(resolved path, mtime), so:
+    - repeat calls in the same process (notebooks, run_picks, a REPL) are free
+    - a retrained model on disk is picked up automatically (mtime changes)
+
+Entry points:
+    model = load_xgb_classifier(path)        # xgb_game_model_v2.json
+    cal   = load_pickle(path)                # game_calibrator.pkl, nhl_player_models.pkl
+    bst   = load_lgbm_booster(path)          # lgbm_fantasy_pts.txt
+
+    result = score_batch(X, model_path, calibrator_path)
+    result.probs       # calibrated P(class 1), one per row
+    result.raw_probs   # raw model output
+    result.timings     # {"load_ms", "predict_ms", "calibrate_ms"}
+
+xgboost / lightgbm are imported lazily so scripts that only need one of
+them don't pay for (or require) the other.
+"""
+
+import pickle
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import numpy as np
+
+# (resolved_path, loader_name) → (mtime_ns, model)
+_CACHE: dict[tuple[str, str], tuple[int, Any]] = {}
+_LOCK = threading.Lock()
+_STATS = {"hits": 0, "misses": 0}
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Generic cache
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _cached(path, loader_name: str, loader: Callable[[Path], Any]) -> Any:
+    """Return the cached object for path, reloading if the file changed."""
+    p = Path(path).resolve()
+    mtime = p.stat().st_mtime_ns          # raises FileNotFoundError like open() would
+    key = (str(p), loader_name)
+
+    with _LOCK:
+        hit = _CACHE.get(key)
+        if hit is not None and hit[0] == mtime:
+            _STATS["hits"] += 1
+            return hit[1]
+
+    obj = loader(p)
+    with _LOCK:
+        _CACHE[key] = (mtime, obj)
+        _STATS["misses"] += 1
+    return obj
+
+
+def clear_cache() -> None:
+    """Drop every cached model (mainly for tests)."""
+    with _LOCK:
+        _CACHE.clear()
+        _STATS["hits"] = 0
+        _STATS["misses"] = 0
+
+
+def cache_info() -> dict:
+    """Hit/miss counters and the paths currently held warm."""
+    with _LOCK:
+        return {
+            "hits":   _STATS["hits"],
+            "misses": _STATS["misses"],
+            "models": sorted(k[0] for k in _CACHE),
+        }
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Loaders
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def _read_pickle(p: Path) -> Any:
+    with open(p, "rb") as f:
+        return pickle.load(f)
+
+
+def _read_xgb_classifier(p: Path) -> Any:
+    import xgboost as xgb
+    model = xgb.XGBClassifier()
+    model.load_model(str(p))
+    return model
+
+
+def _read_lgbm_booster(p: Path) -> Any:
+    import lightgbm as lgb
+    return lgb.Booster(model_file=str(p))
+
+
+def load_pickle(path) -> Any:
+    """Unpickle path once per mtime (calibrators, player model bundles)."""
+    return _cached(path, "pickle", _read_pickle)
+
+
+def load_xgb_classifier(path) -> Any:
+    """Load an XGBClassifier saved with save_model() once per mtime."""
+    return _cached(path, "xgb", _read_xgb_classifier)
+
+
+def load_lgbm_booster(path) -> Any:
+    """Load a LightGBM Booster text model once per mtime."""
+    return _cached(path, "lgbm", _read_lgbm_booster)
+
+
+_LOADERS = {
+    ".json": load_xgb_classifier,
+    ".ubj":  load_xgb_classifier,
+    ".txt":  load_lgbm_booster,
+    ".pkl":  load_pickle,
+}
+
+
+def load_model(path) -> Any:
+    """Dispatch on file extension (.json/.ubj → XGB, .txt → LGBM, .pkl → pickle)."""
+    loader = _LOADERS.get(Path(path).suffix.lower())
+    if loader is None:
+        raise ValueError(f"Unsupported model format: {path}")
+    return loader(path)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Batch scoring
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class ScoreResult:
+    """Probabilities for one batch plus where the time went."""
+    probs:     np.ndarray
+    raw_probs: np.ndarray
+    timings:   dict = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.probs)
+
+
+def _predict_raw(model: Any, X, **predict_kwargs) -> np.ndarray:
+    """P(class 1) for sklearn-style classifiers, raw output for Boosters."""
+    if hasattr(model, "predict_proba"):
+        return np.asarray(model.predict_proba(X)[:, 1], dtype=float)
+    return np.asarray(model.predict(X, **predict_kwargs), dtype=float)
+
+
+def score_batch(
+    X,
+    model_path=None,
+    calibrator_path=None,
+    model: Any = None,
+    calibrator: Any = None,
+    **predict_kwargs,
+) -> ScoreResult:
+    """
+    Score a whole feature frame in one predict call.
+
+    Pass either model_path (loaded through the cache) or an already-loaded
+    model. The calibrator is optional — anything with .predict(raw) works
+    (IsotonicRegression, the per-target calibrators in nhl_player_models.pkl).
+    """
+    t0 = time.perf_counter()
+    if model is None:
+        if model_path is None:
+            raise ValueError("score_batch needs model_path or model")
+        model = load_model(model_path)
+    if calibrator is None and calibrator_path is not None:
+        cal_path = Path(calibrator_path)
+        calibrator = load_pickle(cal_path) if cal_path.exists() else None
+    t1 = time.perf_counter()
+
+    raw = _predict_raw(model, X, **predict_kwargs)
+    t2 = time.perf_counter()
+
+    probs = np.asarray(calibrator.predict(raw), dtype=float) if calibrator is not None else raw
+    t3 = time.perf_counter()
+
+    return ScoreResult(
+        probs=probs,
+        raw_probs=raw,
+        timings={
+            "load_ms":      round((t1 - t0) * 1000, 3),
+            "predict_ms":   round((t2 - t1) * 1000, 3),
+            "calibrate_ms": round((t3 - t2) * 1000, 3),
+            "rows":         len(raw),
+        },
+    )
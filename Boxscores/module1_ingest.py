@@ -20,16 +20,19 @@ Advanced stats derived from play-by-play:
 Play-by-play results are cached to pbp_cache/ so we don't re-pull on every run.
 """
 
+import contextvars
 import json
 import math
 import sys
+import threading
 import time
 import requests
 import numpy as np
 import pandas as pd
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional
 
 # ── Path setup ──────────────────────────────────────────────────────────────
 BASE      = Path(r"C:\Users\shell\OneDrive\Documents\Code Projects\NHL & Sports\NHL_Player\Boxscores")
@@ -47,6 +50,9 @@ sys.path.insert(0, str(BASE))
 from game_context import (
     GameContext, TeamContext, GoalieContext, OddsContext
 )
+import http_archive
+import tracing
+from goalie_index import index_for
 
 # ── Try loading the existing goalie scraper ──────────────────────────────────
 try:
@@ -60,7 +66,8 @@ try:
 except ImportError:
     GOALIE_OVERRIDES = {}
 
-DELAY = 0.25   # polite delay between NHL API calls
+DELAY = 0.25   # polite delay between NHL API calls (process-wide, see _NHL_RATE)
+INGEST_WORKERS = 8   # shared pool size for build_today_contexts (network-bound)
 
 # ── xG shot-type multipliers ──────────────────────────────────────────────────
 # Derived from public xG research (MoneyPuck / Manny's model references).
@@ -84,20 +91,87 @@ NET_X         = 89.0    # NHL net x-coordinate (attacking zone)
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def nhl_get(url: str, retries: int = 3) -> Optional[dict]:
-    """GET wrapper with retry logic for the NHL API."""
+    """
+    GET wrapper with retry logic for the NHL API. In replay mode an
+    unrecorded URL (http_archive.ArchiveMiss) returns None at once — no
+    retries, no back-off sleep; the miss is counted as replay_misses.
+    """
     for attempt in range(retries):
+        t0 = time.perf_counter()
         try:
-            r = requests.get(url, timeout=15)
+            r = http_archive.get(url, timeout=15)
+            tracing.count("http_calls")
+            tracing.count("bytes_read", len(r.content))
             if r.status_code == 200:
                 return r.json()
             if r.status_code == 404:
                 return None   # game not found — don't retry
+        except http_archive.ArchiveMiss:
+            return None       # not recorded — retrying can't help
         except requests.RequestException as e:
+            tracing.count("http_errors")
             if attempt < retries - 1:
                 time.sleep(1.0)
+        finally:
+            tracing.count("http_ms", (time.perf_counter() - t0) * 1000)
     return None
 
 
+def fetch_score_day(day: date) -> Optional[dict]:
+    """Scoreboard for one date (/v1/score/{day}) — every game's state + teams."""
+    return nhl_get(f"https://api-web.nhle.com/v1/score/{day}")
+
+
+class _RateLimiter:
+    """
+    Spaces calls at least DELAY seconds apart across every thread, so the
+    shared ingest pool keeps the same request rate as a serial build.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._last = float("-inf")
+
+    def wait(self) -> None:
+        with self._lock:
+            now  = time.monotonic()
+            wait = self._last + DELAY - now
+            if wait > 0:
+                time.sleep(wait)
+                now += wait
+            self._last = now
+
+
+_NHL_RATE = _RateLimiter()
+
+
+class _SingleFlight:
+    """
+    Per-build memo around a fetch function: the first caller for a key runs
+    it, concurrent callers for the same key wait on that result. Every team's
+    rest-day walk and recent-games scan read the same /score/{day} pages,
+    and both teams in a game read the same PBP — this pulls each once.
+    """
+
+    def __init__(self, fn: Callable):
+        self._fn      = fn
+        self._lock    = threading.Lock()
+        self._futures: dict = {}
+
+    def __call__(self, key):
+        with self._lock:
+            fut   = self._futures.get(key)
+            owner = fut is None
+            if owner:
+                fut = self._futures[key] = Future()
+        if owner:
+            try:
+                fut.set_result(self._fn(key))
+            except BaseException as exc:
+                fut.set_exception(exc)
+        return fut.result()
+
+
 def get_schedule(target_date: date) -> list[dict]:
     """Return list of regular-season games for target_date."""
     url  = f"https://api-web.nhle.com/v1/schedule/{target_date}"
@@ -121,17 +195,20 @@ def get_schedule(target_date: date) -> list[dict]:
     return games
 
 
-def get_team_rest(teams: list[str], as_of: date, lookback: int = 8) -> dict:
+def get_team_rest(teams: list[str], as_of: date, lookback: int = 8,
+                  fetch_score: Optional[Callable] = None) -> dict:
     """
     For each team, find days since last completed game.
     Reuses the same logic already in predict_today.py.
+    fetch_score(day) overrides the scoreboard fetch (shared per-build memo).
     Returns {team: {rest_days, is_b2b, last_game}}
     """
+    fetch_score = fetch_score or fetch_score_day
     result = {t: {"rest_days": None, "is_b2b": False, "last_game": None} for t in teams}
 
     for offset in range(1, lookback + 1):
         check = as_of - timedelta(days=offset)
-        data  = nhl_get(f"https://api-web.nhle.com/v1/score/{check}")
+        data  = fetch_score(check)
         if not data:
             continue
         for g in data.get("games", []):
@@ -272,27 +349,36 @@ def fetch_pbp_cached(game_id: int) -> Optional[dict]:
     _ensure_dirs()
     cache_file = PBP_CACHE / f"{game_id}.json"
     if cache_file.exists():
+        tracing.count("cache_hits")
+        tracing.count("bytes_read", cache_file.stat().st_size)
         with open(cache_file) as f:
             return json.load(f)
+    tracing.count("cache_misses")
 
     url  = f"https://api-web.nhle.com/v1/gamecenter/{game_id}/play-by-play"
+    _NHL_RATE.wait()
     data = nhl_get(url)
     if data:
         with open(cache_file, "w") as f:
             json.dump(data, f)
-        time.sleep(DELAY)
     return data
 
 
 def get_recent_game_ids(team: str, as_of_date: date,
-                        n_games: int = 5, lookback_days: int = 40) -> list[int]:
+                        n_games: int = 5, lookback_days: int = 40,
+                        fetch_score: Optional[Callable] = None) -> list[int]:
     """
     Find the last n completed game IDs for a team by scanning recent schedule.
+    A supplied fetch_score(day) is expected to handle its own rate limiting.
     """
+    polite      = fetch_score is None
+    fetch_score = fetch_score or fetch_score_day
     game_ids = []
     for offset in range(1, lookback_days + 1):
         check = as_of_date - timedelta(days=offset)
-        data  = nhl_get(f"https://api-web.nhle.com/v1/score/{check}")
+        if polite:
+            _NHL_RATE.wait()
+        data  = fetch_score(check)
         if not data:
             continue
         for g in data.get("games", []):
@@ -304,43 +390,54 @@ def get_recent_game_ids(team: str, as_of_date: date,
                 game_ids.append(g["id"])
         if len(game_ids) >= n_games:
             break
-        time.sleep(DELAY)
     return game_ids[:n_games]
 
 
 def get_team_advanced_stats(team: str, as_of_date: date,
-                            n_games: int = 5) -> dict:
+                            n_games: int = 5,
+                            fetch_score: Optional[Callable] = None,
+                            fetch_pbp:   Optional[Callable] = None) -> dict:
     """
     Compute rolling advanced stats for a team over their last n_games
-    using the NHL play-by-play API.
+    using the NHL play-by-play API. fetch_score / fetch_pbp override the
+    scoreboard and PBP fetches (build_today_contexts passes shared memos).
 
     Returns:
         {cf_pct, ff_pct, xg_for, xg_against, xg_pct, sh_attempts_per_game}
     """
+    fetch_pbp = fetch_pbp or fetch_pbp_cached
     print(f"    [{team}] Pulling play-by-play for last {n_games} games ...")
-    game_ids = get_recent_game_ids(team, as_of_date, n_games)
+    game_ids = get_recent_game_ids(team, as_of_date, n_games, fetch_score=fetch_score)
 
     if not game_ids:
         print(f"    [{team}] No recent games found.")
         return {}
 
-    totals = {"cf": 0, "ff": 0, "xgf": 0.0, "xga": 0.0, "sog": 0,
-              "opp_cf": 0, "opp_ff": 0}
-    games_found = 0
-
+    parsed = []
     for gid in game_ids:
-        pbp = fetch_pbp_cached(gid)
+        pbp = fetch_pbp(gid)
         if not pbp:
             continue
-
-        # Identify opponent
         home_abbrev = pbp.get("homeTeam", {}).get("abbrev", "")
         away_abbrev = pbp.get("awayTeam", {}).get("abbrev", "")
-        if team not in (home_abbrev, away_abbrev):
-            continue
-        opp = away_abbrev if team == home_abbrev else home_abbrev
+        parsed.append(parse_pbp(pbp, home_abbrev, away_abbrev))
+
+    return summarize_advanced(team, parsed)
 
-        game_stats = parse_pbp(pbp, home_abbrev, away_abbrev)
+
+def summarize_advanced(team: str, parsed_games: list[dict]) -> dict:
+    """
+    Roll parse_pbp() outputs for a team's recent games into the
+    TeamContext advanced-stat fields. Games the team didn't play are ignored.
+    """
+    totals = {"cf": 0, "ff": 0, "xgf": 0.0, "xga": 0.0, "sog": 0,
+              "opp_cf": 0, "opp_ff": 0}
+    games_found = 0
+
+    for game_stats in parsed_games:
+        if team not in game_stats:
+            continue
+        opp = next((t for t in game_stats if t != team), None)
         t_stats   = game_stats.get(team, {})
         opp_stats = game_stats.get(opp, {})
 
@@ -381,6 +478,9 @@ def _load_parquets():
 
     sk = pd.read_parquet(sk_path) if sk_path.exists() else pd.DataFrame()
     gl = pd.read_parquet(gl_path) if gl_path.exists() else pd.DataFrame()
+    for path in (sk_path, gl_path):
+        if path.exists():
+            tracing.count("bytes_read", path.stat().st_size)
 
     if not sk.empty:
         sk["game_date"] = pd.to_datetime(sk["game_date"])
@@ -422,43 +522,27 @@ def get_skater_features(team: str, sk: pd.DataFrame) -> dict:
     return out
 
 
-def get_goalie_features(team: str, goalie_name: str,
-                        gl: pd.DataFrame) -> tuple[dict, Optional[str]]:
+def _match_goalie_row(team: str, goalie_name: str,
+                      gl: pd.DataFrame) -> Optional[pd.Series]:
     """
-    Match scraped goalie name to parquet rolling features.
-    Returns (rolling_feature_dict, matched_name).
-    Falls back to highest-TOI goalie for team if name match fails.
+    Parquet row for a scraped goalie: latest start on `team` whose name
+    contains the scraped last name, else the team's highest-TOI row.
+    Served from the frame's GoalieIndex (built once per loaded parquet).
     """
     if gl.empty:
-        return {}, None
-
-    starters = gl[gl.get("is_starter", pd.Series(dtype=int)) == 1] if "is_starter" in gl.columns else gl
-    team_gl  = starters[starters["team"] == team] if "team" in starters.columns else pd.DataFrame()
-
-    matched = None
-    name_col = "goalie_name" if "goalie_name" in team_gl.columns else (
-               "player_name" if "player_name" in team_gl.columns else None)
-
-    # Try last-name match
-    if goalie_name and goalie_name != "Unknown" and name_col:
-        last = goalie_name.strip().split()[-1]
-        hits = team_gl[team_gl[name_col].str.contains(last, case=False, na=False)]
-        if not hits.empty:
-            matched = hits.sort_values("game_date").iloc[-1]
+        return None
+    idx = index_for(gl)
+    matched = idx.match_starter(team, goalie_name)
+    return matched if matched is not None else idx.fallback(team)
 
-    # Fallback: highest TOI
-    if matched is None:
-        fallback = gl[gl["team"] == team] if "team" in gl.columns else pd.DataFrame()
-        if "toi_min" in fallback.columns and not fallback.empty:
-            matched = fallback.sort_values("toi_min", ascending=False).iloc[0]
 
+def _goalie_row_features(matched: Optional[pd.Series]) -> tuple[dict, Optional[str]]:
     if matched is None:
         return {}, None
 
-    goalie_rolling = [c for c in gl.columns if c.startswith("g_")]
     feats = {}
-    for col in goalie_rolling:
-        if col in matched.index:
+    for col in matched.index:
+        if col.startswith("g_"):
             val = matched[col]
             if pd.notna(val):
                 feats[col] = round(float(val), 4)
@@ -470,6 +554,16 @@ def get_goalie_features(team: str, goalie_name: str,
     return feats, matched_name
 
 
+def get_goalie_features(team: str, goalie_name: str,
+                        gl: pd.DataFrame) -> tuple[dict, Optional[str]]:
+    """
+    Match scraped goalie name to parquet rolling features.
+    Returns (rolling_feature_dict, matched_name).
+    Falls back to highest-TOI goalie for team if name match fails.
+    """
+    return _goalie_row_features(_match_goalie_row(team, goalie_name, gl))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # SECTION 4 — Odds persistence (line movement foundation)
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -599,19 +693,20 @@ def build_goalie_context(team: str, scraped: dict, gl: pd.DataFrame) -> GoalieCo
     name   = scraped.get("name", "Unknown") or "Unknown"
     status = str(scraped.get("status", "unknown"))
 
-    rolling_feats, matched_name = get_goalie_features(team, name, gl)
+    matched = _match_goalie_row(team, name, gl)
+    rolling_feats, matched_name = _goalie_row_features(matched)
+    matched_id = (int(matched["playerId"]) if matched is not None and
+                  pd.notna(matched.get("playerId")) else None)
 
-    # Try to find the matched goalie row for GSAA
+    # Most recent team row for GSAA (season aggregates)
     gsaa_season = None
-    if not gl.empty and "team" in gl.columns:
-        team_gl = gl[gl["team"] == team]
-        if not team_gl.empty:
-            # Use most recent season aggregates
-            latest = team_gl.sort_values("game_date").iloc[-1]
+    if not gl.empty:
+        latest = index_for(gl).latest_for_team(team)
+        if latest is not None:
             gsaa_season = compute_gsaa(latest)
 
     ctx = GoalieContext(
-        player_id   = scraped.get("id"),
+        player_id   = scraped.get("id") or matched_id,
         name        = matched_name or name,
         status      = status,
         gaa_live    = _safe_float(scraped.get("gaa")),
@@ -641,9 +736,11 @@ def build_team_context(team: str, is_home: bool, rest: dict,
                        scraped_goalie: dict, news: str,
                        sk: pd.DataFrame, gl: pd.DataFrame,
                        target_date: date,
-                       fetch_advanced: bool = True) -> TeamContext:
+                       fetch_advanced: bool = True,
+                       advanced: Optional[dict] = None) -> TeamContext:
     """
     Assemble a TeamContext for one team.
+    `advanced` = precomputed get_team_advanced_stats() result (skips the fetch).
     """
     # Situational
     rest_days = rest.get("rest_days")
@@ -656,10 +753,11 @@ def build_team_context(team: str, is_home: bool, rest: dict,
     goalie_ctx = build_goalie_context(team, scraped_goalie, gl)
 
     # Advanced stats from play-by-play
-    adv = {}
-    if fetch_advanced:
+    adv = advanced if advanced is not None else {}
+    if fetch_advanced and advanced is None:
         try:
-            adv = get_team_advanced_stats(team, target_date)
+            with tracing.span("advanced_stats", team=team):
+                adv = get_team_advanced_stats(team, target_date)
         except Exception as e:
             print(f"    [{team}] Advanced stats error: {e}")
 
@@ -713,51 +811,22 @@ def build_team_context(team: str, is_home: bool, rest: dict,
 # SECTION 9 — Main entry point
 # ═══════════════════════════════════════════════════════════════════════════════
 
-def build_today_contexts(target_date: Optional[date] = None,
-                         fetch_advanced: bool = True) -> list[GameContext]:
-    """
-    Build one GameContext per game for target_date (default: today).
-    This is the Module 1 entry point consumed by all downstream modules.
-
-    Args:
-        target_date:    Date to predict. Defaults to today.
-        fetch_advanced: Set False to skip play-by-play (faster, no xG/CF%).
+def _submit(pool: ThreadPoolExecutor, span_name: str, fn: Callable, *args,
+            span_attrs: Optional[dict] = None, **kwargs) -> Future:
+    """Run fn on the shared pool inside a tracing span on the caller's trace."""
+    def run():
+        with tracing.span(span_name, **(span_attrs or {})):
+            return fn(*args, **kwargs)
+    return pool.submit(contextvars.copy_context().run, run)
 
-    Returns:
-        list[GameContext]
-    """
-    if target_date is None:
-        target_date = date.today()
-    elif isinstance(target_date, str):
-        target_date = date.fromisoformat(target_date)
 
-    _ensure_dirs()
+def _fetch_score_polite(day: date) -> Optional[dict]:
+    _NHL_RATE.wait()
+    return fetch_score_day(day)
 
-    print(f"\n{'='*65}")
-    print(f"  MODULE 1 — Data Ingestion  [{target_date}]")
-    print(f"{'='*65}\n")
 
-    # ── 1. Schedule ─────────────────────────────────────────────────────
-    print("[ 1/6 ] Fetching schedule ...")
-    games = get_schedule(target_date)
-    if not games:
-        print("  No regular season games found.")
-        return []
-    print(f"  {len(games)} games: " +
-          "  ".join(f"{g['away_team']}@{g['home_team']}" for g in games))
-
-    # ── 2. Rest days ─────────────────────────────────────────────────────
-    print("\n[ 2/6 ] Calculating rest days ...")
-    all_teams = list({t for g in games for t in [g["home_team"], g["away_team"]]})
-    rest_data = get_team_rest(all_teams, target_date)
-    b2b = [t for t, v in rest_data.items() if v["is_b2b"]]
-    if b2b:
-        print(f"  ⚠  Back-to-back: {', '.join(sorted(b2b))}")
-    else:
-        print("  ✅ No back-to-back teams")
-
-    # ── 3. Goalies + odds (multi-source: DailyFaceoff + NHL API + GoaliePost) ──
-    print("\n[ 3/6 ] Scraping goalies (multi-source) ...")
+def _scrape_goalies(games: list[dict], target_date: date) -> tuple[list, dict]:
+    """Stage 3: multi-source goalie + odds scrape. Returns (scraped_games, scraped_goalies)."""
     scraped_games   = []
     scraped_goalies = {}
 
@@ -769,7 +838,8 @@ def build_today_contexts(target_date: Optional[date] = None,
                 for g in games
             }
             scraped_games = scrape_starting_goalies(
-                game_ids_by_matchup=game_ids_by_matchup
+                game_ids_by_matchup=game_ids_by_matchup,
+                game_date=target_date,
             ) or []
             if scraped_games:
                 scraped_goalies = get_goalie_dict(scraped_games)
@@ -792,6 +862,119 @@ def build_today_contexts(target_date: Optional[date] = None,
     else:
         print("  ⚠  scrape_goalies_v2.py not found — no live goalie data")
 
+    return scraped_games, scraped_goalies
+
+
+def _advanced_or_empty(team: str, target_date: date,
+                       fetch_score: Callable, fetch_pbp: Callable) -> dict:
+    try:
+        return get_team_advanced_stats(team, target_date,
+                                       fetch_score=fetch_score, fetch_pbp=fetch_pbp)
+    except Exception as e:
+        print(f"    [{team}] Advanced stats error: {e}")
+        return {}
+
+
+def build_today_contexts(target_date: Optional[date] = None,
+                         fetch_advanced: bool = True,
+                         max_workers: int = INGEST_WORKERS) -> list[GameContext]:
+    """
+    Build one GameContext per game for target_date (default: today).
+    This is the Module 1 entry point consumed by all downstream modules.
+
+    Stages run as a small dependency graph on one bounded thread pool:
+
+        parquets ─────────────────────────────────────┐
+        schedule ─┬─ rest days ──────────────────────┤
+                  ├─ goalie / odds scrape ────────────┼─► assemble contexts
+                  └─ advanced stats (one task / team) ┘
+
+    /score/{day} pages and PBP games are fetched once per build and shared
+    across rest days and every team's recent-games scan.
+
+    Args:
+        target_date:    Date to predict. Defaults to today.
+        fetch_advanced: Set False to skip play-by-play (faster, no xG/CF%).
+        max_workers:    Pool size shared by every stage (1 = sequential).
+
+    Returns:
+        list[GameContext]
+    """
+    if target_date is None:
+        target_date = date.today()
+    elif isinstance(target_date, str):
+        target_date = date.fromisoformat(target_date)
+
+    _ensure_dirs()
+
+    print(f"\n{'='*65}")
+    print(f"  MODULE 1 — Data Ingestion  [{target_date}]")
+    print(f"{'='*65}\n")
+
+    pool = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                              thread_name_prefix="ingest")
+    try:
+        # No dependencies — start loading parquets straight away
+        parquets_f = _submit(pool, "parquets", _load_parquets)
+
+        # ── 1. Schedule ─────────────────────────────────────────────────
+        print("[ 1/6 ] Fetching schedule ...")
+        with tracing.span("schedule"):
+            games = get_schedule(target_date)
+        if not games:
+            print("  No regular season games found.")
+            return []
+        print(f"  {len(games)} games: " +
+              "  ".join(f"{g['away_team']}@{g['home_team']}" for g in games))
+
+        # ── 2-5. Fan out: rest days, goalies, advanced stats ────────────
+        all_teams = sorted({t for g in games for t in [g["home_team"], g["away_team"]]})
+        score_day = _SingleFlight(_fetch_score_polite)
+        pbp       = _SingleFlight(fetch_pbp_cached)
+
+        print(f"\n[ 2-5/6 ] Rest days, goalies, parquets"
+              f"{', advanced stats' if fetch_advanced else ''} "
+              f"— concurrent ({max_workers} workers) ...")
+        rest_f   = _submit(pool, "rest_days", get_team_rest, all_teams, target_date,
+                           fetch_score=score_day, span_attrs={"teams": len(all_teams)})
+        goalie_f = _submit(pool, "goalie_scrape", _scrape_goalies, games, target_date)
+        adv_f = {
+            team: _submit(pool, "advanced_stats", _advanced_or_empty,
+                          team, target_date, score_day, pbp,
+                          span_attrs={"team": team})
+            for team in all_teams
+        } if fetch_advanced else {}
+
+        # ── 2. Rest days ─────────────────────────────────────────────────
+        rest_data = rest_f.result()
+        print("\n[ 2/6 ] Rest days")
+        b2b = [t for t, v in rest_data.items() if v["is_b2b"]]
+        if b2b:
+            print(f"  ⚠  Back-to-back: {', '.join(sorted(b2b))}")
+        else:
+            print("  ✅ No back-to-back teams")
+
+        # ── 3. Goalies + odds (multi-source: DailyFaceoff + NHL API + GoaliePost) ──
+        scraped_games, scraped_goalies = goalie_f.result()
+        print(f"\n[ 3/6 ] Goalies scraped: {len(scraped_goalies)} teams")
+
+        # ── 4. Parquets ──────────────────────────────────────────────────
+        sk, gl = parquets_f.result()
+        print(f"\n[ 4/6 ] Feature parquets")
+        print(f"  Skaters: {sk.shape[0]:,} rows   Goalies: {gl.shape[0]:,} rows")
+
+        # ── 5. Advanced stats (play-by-play) ────────────────────────────
+        advanced = {team: f.result() for team, f in adv_f.items()}
+        if fetch_advanced:
+            print(f"\n[ 5/6 ] Advanced stats from NHL play-by-play")
+            print(f"  (CF%, FF%, xG for {len(all_teams)} teams × last 5 games; "
+                  f"{sum(1 for v in advanced.values() if v)} with data)")
+            print(f"  Results cached to pbp_cache/ — only new games hit the API")
+        else:
+            print(f"\n[ 5/6 ] Advanced stats skipped (fetch_advanced=False)")
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
     # Build odds lookup keyed by (away, home)
     odds_lookup = {
         (g.get("away_team"), g.get("home_team")): g
@@ -805,96 +988,87 @@ def build_today_contexts(target_date: Optional[date] = None,
         if g.get("away_team"):
             news_lookup[g["away_team"]] = g.get("away_news", "")
 
-    # ── 4. Load parquets ─────────────────────────────────────────────────
-    print("\n[ 4/6 ] Loading feature parquets ...")
-    sk, gl = _load_parquets()
-    print(f"  Skaters: {sk.shape[0]:,} rows   Goalies: {gl.shape[0]:,} rows")
-
-    # ── 5. Advanced stats (play-by-play) ────────────────────────────────
-    if fetch_advanced:
-        print(f"\n[ 5/6 ] Deriving advanced stats from NHL play-by-play API ...")
-        print(f"  (CF%, FF%, xG for {len(all_teams)} teams × last 5 games)")
-        print(f"  Results cached to pbp_cache/ — only new games hit the API")
-    else:
-        print(f"\n[ 5/6 ] Advanced stats skipped (fetch_advanced=False)")
-
     # ── 6. Assemble GameContext per game ─────────────────────────────────
     print(f"\n[ 6/6 ] Assembling GameContext objects ...")
     contexts = []
 
     for game in games:
-        home_team = game["home_team"]
-        away_team = game["away_team"]
-        game_id   = game["game_id"]
-
-        home_scraped = scraped_goalies.get(home_team, {"name": "Unknown", "status": "unknown"})
-        away_scraped = scraped_goalies.get(away_team, {"name": "Unknown", "status": "unknown"})
-
-        odds_raw = odds_lookup.get((away_team, home_team), {})
-
-        # Build team contexts
-        home_ctx = build_team_context(
-            team=home_team, is_home=True,
-            rest=rest_data.get(home_team, {}),
-            scraped_goalie=home_scraped,
-            news=news_lookup.get(home_team, ""),
-            sk=sk, gl=gl,
-            target_date=target_date,
-            fetch_advanced=fetch_advanced,
-        )
-        away_ctx = build_team_context(
-            team=away_team, is_home=False,
-            rest=rest_data.get(away_team, {}),
-            scraped_goalie=away_scraped,
-            news=news_lookup.get(away_team, ""),
-            sk=sk, gl=gl,
-            target_date=target_date,
-            fetch_advanced=fetch_advanced,
-        )
-
-        # Build odds context
-        home_ml = _safe_float(odds_raw.get("home_moneyline"))
-        away_ml = _safe_float(odds_raw.get("away_moneyline"))
-        movement = get_line_movement(game_id, target_date)
-
-        odds_ctx = OddsContext(
-            home_ml        = home_ml,
-            away_ml        = away_ml,
-            point_spread   = _safe_float(odds_raw.get("point_spread")),
-            home_implied   = american_to_implied(home_ml),
-            away_implied   = american_to_implied(away_ml),
-            opening_home_ml = movement.get("opening_home_ml"),
-            opening_away_ml = movement.get("opening_away_ml"),
-            line_movement   = movement.get("line_movement"),
-            scraped_at      = datetime.utcnow() if odds_raw else None,
-        )
-
-        # Data quality flags
-        goalie_confirmed = (
-            home_ctx.goalie is not None and home_ctx.goalie.is_trusted and
-            away_ctx.goalie is not None and away_ctx.goalie.is_trusted
-        )
-        has_advanced = (
-            home_ctx.cf_pct_last5 is not None or
-            home_ctx.xg_for_last5 is not None
-        )
-        has_any_news = bool(home_ctx.news_headlines or away_ctx.news_headlines)
-
-        ctx = GameContext(
-            game_id    = game_id,
-            game_date  = str(target_date),
-            start_time = game.get("start_time", "TBD"),
-            season     = game.get("season", ""),
-            game_type  = game.get("game_type", 2),
-            home       = home_ctx,
-            away       = away_ctx,
-            odds       = odds_ctx,
-            goalie_confirmed   = goalie_confirmed,
-            has_advanced_stats = has_advanced,
-            has_odds           = home_ml is not None,
-            has_news           = has_any_news,
-        )
-        contexts.append(ctx)
+        with tracing.span("game_context",
+                          game=f"{game['away_team']}@{game['home_team']}"):
+            home_team = game["home_team"]
+            away_team = game["away_team"]
+            game_id   = game["game_id"]
+
+            home_scraped = scraped_goalies.get(home_team, {"name": "Unknown", "status": "unknown"})
+            away_scraped = scraped_goalies.get(away_team, {"name": "Unknown", "status": "unknown"})
+
+            odds_raw = odds_lookup.get((away_team, home_team), {})
+
+            # Build team contexts
+            home_ctx = build_team_context(
+                team=home_team, is_home=True,
+                rest=rest_data.get(home_team, {}),
+                scraped_goalie=home_scraped,
+                news=news_lookup.get(home_team, ""),
+                sk=sk, gl=gl,
+                target_date=target_date,
+                fetch_advanced=fetch_advanced,
+                advanced=advanced.get(home_team, {}) if fetch_advanced else None,
+            )
+            away_ctx = build_team_context(
+                team=away_team, is_home=False,
+                rest=rest_data.get(away_team, {}),
+                scraped_goalie=away_scraped,
+                news=news_lookup.get(away_team, ""),
+                sk=sk, gl=gl,
+                target_date=target_date,
+                fetch_advanced=fetch_advanced,
+                advanced=advanced.get(away_team, {}) if fetch_advanced else None,
+            )
+
+            # Build odds context
+            home_ml = _safe_float(odds_raw.get("home_moneyline"))
+            away_ml = _safe_float(odds_raw.get("away_moneyline"))
+            movement = get_line_movement(game_id, target_date)
+
+            odds_ctx = OddsContext(
+                home_ml        = home_ml,
+                away_ml        = away_ml,
+                point_spread   = _safe_float(odds_raw.get("point_spread")),
+                home_implied   = american_to_implied(home_ml),
+                away_implied   = american_to_implied(away_ml),
+                opening_home_ml = movement.get("opening_home_ml"),
+                opening_away_ml = movement.get("opening_away_ml"),
+                line_movement   = movement.get("line_movement"),
+                scraped_at      = datetime.utcnow() if odds_raw else None,
+            )
+
+            # Data quality flags
+            goalie_confirmed = (
+                home_ctx.goalie is not None and home_ctx.goalie.is_trusted and
+                away_ctx.goalie is not None and away_ctx.goalie.is_trusted
+            )
+            has_advanced = (
+                home_ctx.cf_pct_last5 is not None or
+                home_ctx.xg_for_last5 is not None
+            )
+            has_any_news = bool(home_ctx.news_headlines or away_ctx.news_headlines)
+
+            ctx = GameContext(
+                game_id    = game_id,
+                game_date  = str(target_date),
+                start_time = game.get("start_time", "TBD"),
+                season     = game.get("season", ""),
+                game_type  = game.get("game_type", 2),
+                home       = home_ctx,
+                away       = away_ctx,
+                odds       = odds_ctx,
+                goalie_confirmed   = goalie_confirmed,
+                has_advanced_stats = has_advanced,
+                has_odds           = home_ml is not None,
+                has_news           = has_any_news,
+            )
+            contexts.append(ctx)
         print(f"  {ctx}")
 
     print(f"\n{'='*65}")
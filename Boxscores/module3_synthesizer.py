@@ -3,8 +3,9 @@ module3_synthesizer.py
 ----------------------
 Module 3: Master Synthesizer — NHL MAS meta-learner.
 
-Entry point:
-    card = synthesizer.synthesize(signals, game_context)
+Entry points:
+    card  = synthesizer.synthesize(signals, game_context)
+    cards = synthesizer.synthesize_batch(signal_lists, contexts)   # whole slate
 
 Two synthesis modes:
     1. weighted_avg  — weighted mean of agent raw_scores + sentiment multiplier
@@ -18,6 +19,10 @@ SQLite log:
     Outcomes can be added later (by track_results.py) to enable meta-learner training
     and weight recalibration.
 
+Meta-learner persistence:
+    fit_from_db() saves the fitted model to mas_picks.meta.pkl with a watermark
+    (last outcome id, resolved count) and only refits when new outcomes arrive.
+
 Weights registry:
     {agent_id: float} — start from DEFAULT_WEIGHTS, updated by update_weights()
     after each batch of resolved outcomes.
@@ -25,6 +30,7 @@ Weights registry:
 
 import json
 import math
+import pickle
 import sqlite3
 import warnings
 from dataclasses import dataclass, field, asdict
@@ -46,6 +52,7 @@ except ImportError:
     SKLEARN_AVAILABLE = False
 
 from agents.agent_base import AgentSignal
+from picks_db import get_db, transaction, PICK_SIGNALS_DDL, BACKFILL_PICK_SIGNALS
 
 # ── Paths ─────────────────────────────────────────────────────────────────────
 BASE    = Path(r"C:\Users\shell\OneDrive\Documents\Code Projects\NHL & Sports\NHL_Player\Boxscores")
@@ -70,6 +77,9 @@ TIER_LOW    = 0.52
 # Sentinel for SKIP confidence
 SKIP_SCORE = 0.50
 
+# Bump when the persisted meta-learner payload / feature layout changes
+META_MODEL_VERSION = 1
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # PickCard — Module 3 output contract
@@ -175,16 +185,39 @@ CREATE TABLE IF NOT EXISTS outcomes (
 
 CREATE INDEX IF NOT EXISTS idx_picks_date    ON picks(game_date);
 CREATE INDEX IF NOT EXISTS idx_picks_game    ON picks(game_id);
+CREATE INDEX IF NOT EXISTS idx_picks_tier    ON picks(confidence_tier, game_id);
 CREATE INDEX IF NOT EXISTS idx_outcomes_game ON outcomes(game_id);
-"""
+""" + PICK_SIGNALS_DDL      # shared with Module 4 (picks_db)
 
 
-def _init_db(db_path: Path) -> sqlite3.Connection:
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(db_path))
+def _apply_schema(conn: sqlite3.Connection) -> None:
     conn.executescript(_SCHEMA)
-    conn.commit()
-    return conn
+    conn.execute(BACKFILL_PICK_SIGNALS)
+
+
+def _resolved_feature_query() -> str:
+    """
+    SQL that pivots pick_signals into the meta-learner feature matrix.
+
+    One row per resolved, non-SKIP pick:
+        pick_id, home_win, <agent>_raw, <agent>_conf, ... (AGENT_ORDER)
+    Missing agents → (0.5, 0.0), matching _signals_to_feature_vector().
+    """
+    cols = []
+    for aid in AGENT_ORDER:
+        cols.append(f"COALESCE(MAX(CASE WHEN s.agent_id = '{aid}' "
+                    f"THEN s.raw_score END), 0.5)")
+        cols.append(f"COALESCE(MAX(CASE WHEN s.agent_id = '{aid}' "
+                    f"THEN s.confidence END), 0.0)")
+    return f"""
+        SELECT p.id, o.home_win, {", ".join(cols)}
+        FROM picks p
+        JOIN outcomes o ON p.game_id = o.game_id
+        LEFT JOIN pick_signals s ON s.pick_id = p.id
+        WHERE p.confidence_tier != 'SKIP'
+        GROUP BY p.id
+        ORDER BY p.id
+    """
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -248,18 +281,18 @@ class MasterSynthesizer:
         # Meta-learner (populated by fit())
         self._model:     Optional[Pipeline] = None
         self._is_fitted: bool               = False
+        # (last outcome id, n resolved picks) the current model was trained on
+        self._watermark: Optional[tuple[int, int]] = None
 
     # ── DB connection (lazy) ──────────────────────────────────────────
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            try:
-                self._conn = _init_db(self._db_path)
-            except Exception:
-                # Fallback to in-memory DB if path not writable (e.g. sandbox)
-                self._conn = sqlite3.connect(":memory:")
-                self._conn.executescript(_SCHEMA)
-                self._conn.commit()
+            # Shared per-path connection (WAL, busy_timeout); schema applied once.
+            # Falls back to in-memory if the path isn't writable (e.g. sandbox).
+            self._conn = get_db(self._db_path).connect(
+                migrations=[("synthesizer", _apply_schema)]
+            )
         return self._conn
 
     # ── Public API ────────────────────────────────────────────────────
@@ -279,14 +312,7 @@ class MasterSynthesizer:
             "weighted_avg" — always use weighted average
             "meta_learner" — always use meta-learner (must call fit() first)
         """
-        effective_mode = mode
-        if mode == "auto":
-            effective_mode = "meta_learner" if self._is_fitted else "weighted_avg"
-
-        if effective_mode == "meta_learner":
-            if not self._is_fitted:
-                warnings.warn("Meta-learner not fitted — falling back to weighted_avg")
-                effective_mode = "weighted_avg"
+        effective_mode = self._resolve_mode(mode)
 
         if effective_mode == "meta_learner":
             card = self._synthesize_meta(signals, game_context)
@@ -298,6 +324,69 @@ class MasterSynthesizer:
 
         return card
 
+    def synthesize_batch(
+        self,
+        signal_lists: list[list[AgentSignal]],
+        contexts:     Optional[list] = None,
+        mode:         str  = "auto",
+        log:          bool = True,
+    ) -> list[PickCard]:
+        """
+        Synthesize a whole slate at once. Returns PickCards in input order.
+
+        Same per-game logic as synthesize(), but the meta-learner scores every
+        eligible game with a single predict_proba call and all cards are
+        written to the DB in one transaction.
+        """
+        if contexts is None:
+            contexts = [None] * len(signal_lists)
+        if len(contexts) != len(signal_lists):
+            raise ValueError(f"{len(signal_lists)} signal lists but "
+                             f"{len(contexts)} contexts")
+
+        effective_mode = self._resolve_mode(mode)
+
+        probs: dict[int, float] = {}
+        if effective_mode == "meta_learner":
+            eligible = [
+                i for i, sigs in enumerate(signal_lists)
+                if sum(1 for s in sigs if s.confidence >= self.confidence_floor)
+                   >= self.min_agents
+            ]
+            if eligible:
+                X = _build_feature_matrix([signal_lists[i] for i in eligible])
+                try:
+                    p_home = self._model.predict_proba(X)[:, 1]
+                    probs  = {i: float(p) for i, p in zip(eligible, p_home)}
+                except Exception as e:
+                    warnings.warn(f"Meta-learner predict failed ({e}) — "
+                                  "falling back to weighted_avg")
+                    effective_mode = "weighted_avg"
+
+        cards = []
+        for i, (sigs, ctx) in enumerate(zip(signal_lists, contexts)):
+            if effective_mode == "meta_learner":
+                cards.append(self._synthesize_meta(sigs, ctx, prob_home=probs.get(i)))
+            else:
+                cards.append(self._synthesize_weighted(sigs, ctx))
+
+        if log:
+            self._log_picks(cards)
+
+        return cards
+
+    def _resolve_mode(self, mode: str) -> str:
+        """Map "auto" and an unfitted "meta_learner" to the mode actually used."""
+        effective_mode = mode
+        if mode == "auto":
+            effective_mode = "meta_learner" if self._is_fitted else "weighted_avg"
+
+        if effective_mode == "meta_learner":
+            if not self._is_fitted:
+                warnings.warn("Meta-learner not fitted — falling back to weighted_avg")
+                effective_mode = "weighted_avg"
+        return effective_mode
+
     def fit(
         self,
         historical_signals: list[list[AgentSignal]],
@@ -313,17 +402,22 @@ class MasterSynthesizer:
         Returns:
             self (for chaining)
         """
+        X = _build_feature_matrix(historical_signals)
+        y = np.array(outcomes, dtype=int)
+        return self._fit_matrix(X, y)
+
+    def _fit_matrix(self, X: np.ndarray, y: np.ndarray) -> "MasterSynthesizer":
+        """Fit the meta-learner Pipeline on a prebuilt (n_games × 10) matrix."""
         if not SKLEARN_AVAILABLE:
             raise ImportError("scikit-learn is required for meta-learner mode. "
                               "Run: pip install scikit-learn")
 
-        X = _build_feature_matrix(historical_signals)
-        y = np.array(outcomes, dtype=int)
-
         if len(X) < 20:
             warnings.warn(f"Only {len(X)} training samples — meta-learner may be unreliable. "
                           "Recommend 100+ games for stable weights.")
 
+        self._watermark = None   # no longer tied to a DB snapshot
+
         # Pipeline: scale features → logistic regression → isotonic calibration
         base_lr = LogisticRegression(
             max_iter=1000,
@@ -345,58 +439,118 @@ class MasterSynthesizer:
         print(f"  ✅ Meta-learner fitted on {len(X)} games")
         return self
 
-    def fit_from_db(self) -> "MasterSynthesizer":
+    def _load_resolved_matrix(self) -> tuple[np.ndarray, np.ndarray]:
         """
-        Train the meta-learner using picks + outcomes already in the SQLite DB.
-        Only uses rows where both a pick AND outcome exist for the same game_id.
+        Feature matrix + outcomes for every resolved, non-SKIP pick.
+        One pivot query over pick_signals — no per-row JSON decoding.
         """
         conn = self._get_conn()
+        rows = conn.execute(_resolved_feature_query()).fetchall()
+        if not rows:
+            return (np.empty((0, len(AGENT_ORDER) * 2), dtype=np.float32),
+                    np.empty(0, dtype=int))
+        arr = np.array(rows, dtype=np.float64)
+        return arr[:, 2:].astype(np.float32), arr[:, 1].astype(int)
 
-        query = """
-            SELECT p.game_id, p.signals_json, o.home_win
-            FROM picks p
-            JOIN outcomes o ON p.game_id = o.game_id
-            WHERE p.confidence_tier != 'SKIP'
+    def fit_from_db(self, force: bool = False) -> "MasterSynthesizer":
         """
-        rows = conn.execute(query).fetchall()
-        if not rows:
+        Train the meta-learner using picks + outcomes already in the SQLite DB.
+        Only uses rows where both a pick AND outcome exist for the same game_id.
+
+        Incremental: the fitted model is persisted next to the DB together
+        with a watermark (last outcome id, resolved-pick count). If nothing
+        new has been resolved since, the persisted model is loaded instead
+        of refitting. force=True always refits.
+        """
+        watermark = self._outcome_watermark()
+
+        if not force:
+            if self._is_fitted and self._watermark == watermark:
+                return self
+            if self._load_meta_model(watermark):
+                print(f"  ✅ Meta-learner loaded ({watermark[1]} games, no new outcomes)")
+                return self
+
+        X, y = self._load_resolved_matrix()
+        if len(X) == 0:
             print("  ⚠  No resolved picks in DB — meta-learner not trained")
             return self
 
-        historical_signals = []
-        outcomes = []
-
-        for game_id, signals_json, home_win in rows:
-            try:
-                sig_dicts = json.loads(signals_json)
-                # Reconstruct minimal AgentSignal objects for feature building
-                signals = [
-                    AgentSignal(
-                        agent_id       = aid,
-                        pick_direction = v.get("direction", "neutral"),
-                        raw_score      = float(v.get("raw_score", 0.5)),
-                        confidence     = float(v.get("confidence", 0.0)),
-                        reasoning      = "",
-                    )
-                    for aid, v in sig_dicts.items()
-                ]
-                historical_signals.append(signals)
-                outcomes.append(int(home_win))
-            except (json.JSONDecodeError, KeyError, TypeError):
-                continue
+        n_classes = len(set(y.tolist()))
+        if n_classes < 2:
+            print(f"  ⚠  Only 1 outcome class in {len(y)} resolved games "
+                  f"— skipping meta-learner fit (need both wins and losses)")
+            return self
+        try:
+            self._fit_matrix(X, y)
+        except Exception as exc:
+            print(f"  ⚠  Meta-learner fit failed ({exc}) — continuing without it")
+            return self
 
-        if historical_signals:
-            n_classes = len(set(outcomes))
-            if n_classes < 2:
-                print(f"  ⚠  Only 1 outcome class in {len(outcomes)} resolved games "
-                      f"— skipping meta-learner fit (need both wins and losses)")
-                return self
-            try:
-                self.fit(historical_signals, outcomes)
-            except Exception as exc:
-                print(f"  ⚠  Meta-learner fit failed ({exc}) — continuing without it")
+        self._watermark = watermark
+        self._save_meta_model()
         return self
 
+    # ── Meta-learner persistence ──────────────────────────────────────
+
+    def _meta_model_path(self) -> Optional[Path]:
+        """<db stem>.meta.pkl next to the DB; None for in-memory DBs."""
+        if str(self._db_path) == ":memory:":
+            return None
+        return Path(self._db_path).with_suffix(".meta.pkl")
+
+    def _outcome_watermark(self) -> tuple[int, int]:
+        """(max outcome id, count) over resolved, non-SKIP picks."""
+        conn = self._get_conn()
+        last_id, n = conn.execute("""
+            SELECT COALESCE(MAX(o.id), 0), COUNT(*)
+            FROM picks p
+            JOIN outcomes o ON p.game_id = o.game_id
+            WHERE p.confidence_tier != 'SKIP'
+        """).fetchone()
+        return int(last_id), int(n)
+
+    def _load_meta_model(self, watermark: tuple[int, int]) -> bool:
+        """Load the persisted model if it was trained at this watermark."""
+        path = self._meta_model_path()
+        if path is None or not path.exists():
+            return False
+        try:
+            with open(path, "rb") as f:
+                payload = pickle.load(f)
+        except Exception as exc:
+            warnings.warn(f"Could not read persisted meta-learner ({exc}) — refitting")
+            return False
+
+        if (payload.get("version") != META_MODEL_VERSION
+                or payload.get("agent_order") != AGENT_ORDER
+                or tuple(payload.get("watermark", ())) != watermark):
+            return False
+
+        self._model     = payload["model"]
+        self._is_fitted = True
+        self._watermark = watermark
+        return True
+
+    def _save_meta_model(self) -> None:
+        path = self._meta_model_path()
+        if path is None or not self._is_fitted:
+            return
+        payload = {
+            "version":     META_MODEL_VERSION,
+            "agent_order": list(AGENT_ORDER),
+            "watermark":   self._watermark,
+            "fitted_at":   datetime.utcnow().isoformat(),
+            "model":       self._model,
+        }
+        try:
+            tmp = path.with_suffix(".tmp")
+            with open(tmp, "wb") as f:
+                pickle.dump(payload, f)
+            tmp.replace(path)
+        except OSError as exc:
+            warnings.warn(f"Could not persist meta-learner: {exc}")
+
     def update_weights(self) -> dict:
         """
         Recalibrate agent weights based on historical accuracy in the DB.
@@ -411,43 +565,38 @@ class MasterSynthesizer:
         """
         conn = self._get_conn()
 
-        query = """
-            SELECT p.signals_json, o.home_win
+        n_rows = conn.execute("""
+            SELECT COUNT(*)
             FROM picks p
             JOIN outcomes o ON p.game_id = o.game_id
             WHERE p.confidence_tier != 'SKIP'
-        """
-        rows = conn.execute(query).fetchall()
-        if len(rows) < 10:
-            print(f"  ⚠  Only {len(rows)} resolved games — weights not updated (need 10+)")
+        """).fetchone()[0]
+        if n_rows < 10:
+            print(f"  ⚠  Only {n_rows} resolved games — weights not updated (need 10+)")
             return self.weights_registry
 
-        # Per-agent: collect (predicted_direction, actual_outcome)
-        agent_correct: dict[str, list[int]] = {aid: [] for aid in AGENT_ORDER}
-
-        for signals_json, home_win in rows:
-            try:
-                sig_dicts = json.loads(signals_json)
-                for aid in AGENT_ORDER:
-                    if aid in sig_dicts:
-                        raw = float(sig_dicts[aid].get("raw_score", 0.5))
-                        conf = float(sig_dicts[aid].get("confidence", 0.0))
-                        if conf >= self.confidence_floor:
-                            predicted_home = int(raw > 0.5)
-                            correct = int(predicted_home == int(home_win))
-                            agent_correct[aid].append(correct)
-            except (json.JSONDecodeError, KeyError, TypeError):
-                continue
+        # Per-agent (n, correct) over above-floor signals, aggregated in SQL
+        agent_rows = conn.execute("""
+            SELECT s.agent_id,
+                   COUNT(*),
+                   SUM((COALESCE(s.raw_score, 0.5) > 0.5) = o.home_win)
+            FROM picks p
+            JOIN outcomes o      ON p.game_id = o.game_id
+            JOIN pick_signals s  ON s.pick_id = p.id
+            WHERE p.confidence_tier != 'SKIP'
+              AND COALESCE(s.confidence, 0.0) >= ?
+            GROUP BY s.agent_id
+        """, (self.confidence_floor,)).fetchall()
+        agent_counts = {aid: (int(n), int(c or 0)) for aid, n, c in agent_rows}
 
         updated = {}
         for aid in AGENT_ORDER:
-            outcomes_for_agent = agent_correct[aid]
-            if len(outcomes_for_agent) < 5:
+            n, n_correct = agent_counts.get(aid, (0, 0))
+            if n < 5:
                 updated[aid] = self.weights_registry.get(aid, DEFAULT_WEIGHTS.get(aid, 1.0))
                 continue
 
-            accuracy = sum(outcomes_for_agent) / len(outcomes_for_agent)
-            n        = len(outcomes_for_agent)
+            accuracy = n_correct / n
 
             # Weight = accuracy / 0.5 (normalized so random = 1.0)
             # Clamp to [0.3, 2.5] to avoid runaway weights
@@ -467,14 +616,13 @@ class MasterSynthesizer:
     def log_outcome(self, game_id: int, game_date: str,
                     home_team: str, away_team: str, home_win: int) -> None:
         """Add an actual game outcome to the DB for meta-learner training."""
-        conn = self._get_conn()
-        conn.execute("""
-            INSERT OR REPLACE INTO outcomes
-                (game_id, game_date, home_team, away_team, home_win, added_at)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (game_id, game_date, home_team, away_team, int(home_win),
-              datetime.utcnow().isoformat()))
-        conn.commit()
+        with transaction(self._get_conn()) as conn:
+            conn.execute("""
+                INSERT OR REPLACE INTO outcomes
+                    (game_id, game_date, home_team, away_team, home_win, added_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (game_id, game_date, home_team, away_team, int(home_win),
+                  datetime.utcnow().isoformat()))
 
     # ── Weighted average synthesis ────────────────────────────────────
 
@@ -538,11 +686,13 @@ class MasterSynthesizer:
         self,
         signals:     list[AgentSignal],
         game_context = None,
+        prob_home:   Optional[float] = None,
     ) -> PickCard:
         """
         LogisticRegression meta-learner synthesis.
         Inputs: raw_score + confidence per agent (10 features).
         Output: P(home_win).
+        prob_home: precomputed by synthesize_batch() — skips the predict call.
         """
         meta = _extract_game_meta(game_context)
 
@@ -555,13 +705,14 @@ class MasterSynthesizer:
                 mode="meta_learner",
             )
 
-        feat_vec = np.array([_signals_to_feature_vector(signals)], dtype=np.float32)
+        if prob_home is None:
+            feat_vec = np.array([_signals_to_feature_vector(signals)], dtype=np.float32)
 
-        try:
-            prob_home = float(self._model.predict_proba(feat_vec)[0, 1])
-        except Exception as e:
-            warnings.warn(f"Meta-learner predict failed ({e}) — falling back to weighted_avg")
-            return self._synthesize_weighted(signals, game_context)
+            try:
+                prob_home = float(self._model.predict_proba(feat_vec)[0, 1])
+            except Exception as e:
+                warnings.warn(f"Meta-learner predict failed ({e}) — falling back to weighted_avg")
+                return self._synthesize_weighted(signals, game_context)
 
         return self._make_pick_card(
             prob_home, signals, meta, mode="meta_learner"
@@ -640,16 +791,14 @@ class MasterSynthesizer:
     # ── SQLite logging ────────────────────────────────────────────────
 
     def _log_pick(self, card: PickCard) -> None:
-        try:
-            conn = self._get_conn()
-            conn.execute("""
-                INSERT INTO picks (
-                    created_at, game_id, game_date, home_team, away_team,
-                    pick, pick_direction, raw_score, edge_pct, confidence_tier,
-                    agent_agreement, agents_above_floor, mode_used,
-                    skip_reason, signals_json, weights_json
-                ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
-            """, (
+        self._log_picks([card])
+
+    def _log_picks(self, cards: list[PickCard]) -> None:
+        """INSERT all cards in one transaction (one commit per slate)."""
+        if not cards:
+            return
+        rows = [
+            (
                 card.produced_at,
                 card.game_id,
                 card.game_date,
@@ -666,10 +815,21 @@ class MasterSynthesizer:
                 card.skip_reason,
                 json.dumps(card.signal_summary),
                 json.dumps(card.weights_used),
-            ))
-            conn.commit()
+            )
+            for card in cards
+        ]
+        try:
+            with transaction(self._get_conn()) as conn:
+                conn.executemany("""
+                    INSERT INTO picks (
+                        created_at, game_id, game_date, home_team, away_team,
+                        pick, pick_direction, raw_score, edge_pct, confidence_tier,
+                        agent_agreement, agents_above_floor, mode_used,
+                        skip_reason, signals_json, weights_json
+                    ) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)
+                """, rows)
         except Exception as e:
-            warnings.warn(f"Failed to log pick to DB: {e}")
+            warnings.warn(f"Failed to log {len(cards)} pick(s) to DB: {e}")
 
     # ── Reporting ─────────────────────────────────────────────────────
 
@@ -803,11 +963,9 @@ if __name__ == "__main__":
 
     contexts = build_today_contexts(target, fetch_advanced=not args.no_advanced)
 
-    all_cards = []
-    for ctx in contexts:
-        signals = [agent.analyze(ctx) for agent in DEFAULT_AGENTS]
-        card    = synthesizer.synthesize(signals, ctx, mode=args.mode)
-        all_cards.append(card)
+    signal_lists = [[agent.analyze(ctx) for agent in DEFAULT_AGENTS] for ctx in contexts]
+    all_cards    = synthesizer.synthesize_batch(signal_lists, contexts, mode=args.mode)
+    for card in all_cards:
         print(f"  {card}")
 
     playable = [c for c in all_cards if c.is_playable]
@@ -0,0 +1,408 @@
+"""
+picks_db.py
+-----------
+Shared SQLite connection manager for mas_picks.db — NHL MAS
+
+Module 3 (synthesizer), Module 4 (feedback) and Module 6 (orchestrator) all
+read and write the same picks/outcomes DB. Opening it through here gives
+every caller in a process ONE connection to that file, configured once:
+
+    • WAL journal + synchronous=NORMAL — readers never block the writer, and
+      commits don't fsync the main DB file every time
+    • busy_timeout — a second process (e.g. --mode report while --mode full
+      is logging picks) waits for the write lock instead of raising
+      "database is locked"
+    • a larger prepared-statement cache — sqlite3 keeps compiled statements
+      per connection keyed by SQL text, so the fixed queries used by each
+      module are parsed once per process, not once per call
+    • schema migrations registered by name, applied once per file per process
+    • per-statement timing (calls / total ms / max ms) — see query_stats()
+
+If the file can't be opened (read-only sandbox, missing drive) the manager
+falls back to an in-memory DB and says so, instead of each module doing it
+silently on its own.
+
+Entry points:
+    db   = get_db(DB_PATH)                                # shared per path
+    conn = db.connect(migrations=[("feedback", apply_fn)])
+    with transaction(conn):                               # BEGIN IMMEDIATE … COMMIT
+        conn.executemany(...)
+    print_query_stats(conn)
+
+CLI:
+    python picks_db.py --db mas_picks.db
+        Open the DB, report journal mode / page counts per table.
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import sqlite3
+import threading
+import time
+import warnings
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterator, Optional, Union
+
+# ── Config ────────────────────────────────────────────────────────────────────
+BUSY_TIMEOUT_MS   = 5_000   # wait this long for another writer before failing
+STATEMENT_CACHE   = 256     # compiled statements kept per connection
+QUERY_KEY_CHARS   = 96      # normalised SQL prefix used as the stats key
+
+Migration = tuple[str, Callable[[sqlite3.Connection], None]]
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Shared schema: pick_signals
+# ═══════════════════════════════════════════════════════════════════════════════
+# One row per (pick, agent), kept in sync with picks.signals_json by trigger,
+# so any writer of `picks` (including raw INSERTs) populates it and per-agent
+# accuracy is a GROUP BY instead of json.loads per row. Module 3 and Module 4
+# both create it on top of their `picks` table — defined once here.
+
+PICK_SIGNALS_DDL = """
+CREATE TABLE IF NOT EXISTS pick_signals (
+    pick_id     INTEGER NOT NULL,
+    agent_id    TEXT    NOT NULL,
+    raw_score   REAL,
+    confidence  REAL,
+    direction   TEXT,
+    PRIMARY KEY (pick_id, agent_id)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_pick_signals_agent ON pick_signals(agent_id, pick_id);
+
+CREATE TRIGGER IF NOT EXISTS trg_picks_signals_ins
+AFTER INSERT ON picks
+WHEN json_valid(NEW.signals_json)
+BEGIN
+    INSERT OR REPLACE INTO pick_signals
+        (pick_id, agent_id, raw_score, confidence, direction)
+    SELECT NEW.id, j.key,
+           json_extract(j.value, '$.raw_score'),
+           json_extract(j.value, '$.confidence'),
+           json_extract(j.value, '$.direction')
+    FROM json_each(NEW.signals_json) AS j
+    WHERE j.type = 'object';
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_picks_signals_del
+AFTER DELETE ON picks
+BEGIN
+    DELETE FROM pick_signals WHERE pick_id = OLD.id;
+END;
+"""
+
+# Backfill pick_signals for picks logged before the table existed.
+BACKFILL_PICK_SIGNALS = """
+INSERT OR IGNORE INTO pick_signals
+    (pick_id, agent_id, raw_score, confidence, direction)
+SELECT p.id, j.key,
+       json_extract(j.value, '$.raw_score'),
+       json_extract(j.value, '$.confidence'),
+       json_extract(j.value, '$.direction')
+FROM picks p,
+     json_each(CASE WHEN json_valid(p.signals_json) THEN p.signals_json ELSE '{}' END) AS j
+WHERE j.type = 'object'
+  AND NOT EXISTS (SELECT 1 FROM pick_signals s WHERE s.pick_id = p.id)
+"""
+
+
+def apply_pick_signals(conn: sqlite3.Connection) -> None:
+    """Create pick_signals + triggers (needs `picks`) and backfill older picks."""
+    conn.executescript(PICK_SIGNALS_DDL)
+    conn.execute(BACKFILL_PICK_SIGNALS)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Query timing
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class QueryStat:
+    """Accumulated timing for one SQL statement (keyed by normalised text)."""
+    sql:      str
+    calls:    int   = 0
+    total_ms: float = 0.0
+    max_ms:   float = 0.0
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.calls if self.calls else 0.0
+
+    def __str__(self) -> str:
+        return (f"  {self.calls:6d} × {self.mean_ms:7.2f} ms  "
+                f"(total {self.total_ms:8.1f}, max {self.max_ms:7.2f})  {self.sql}")
+
+
+_WS = re.compile(r"\s+")
+
+
+def _query_key(sql: str) -> str:
+    return _WS.sub(" ", sql).strip()[:QUERY_KEY_CHARS]
+
+
+class TimedConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that records wall time for execute / executemany /
+    executescript. Time covers statement preparation and execution up to the
+    first row (fetch time for large SELECTs is not included).
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.query_stats: dict[str, QueryStat] = {}
+        self.write_lock = threading.RLock()
+        self._stats_lock = threading.Lock()
+
+    def _record(self, sql: str, t0: float) -> None:
+        ms  = (time.perf_counter() - t0) * 1000
+        key = _query_key(sql)
+        with self._stats_lock:
+            st = self.query_stats.get(key)
+            if st is None:
+                st = self.query_stats[key] = QueryStat(sql=key)
+            st.calls    += 1
+            st.total_ms += ms
+            st.max_ms    = max(st.max_ms, ms)
+
+    def execute(self, sql, parameters=(), /):
+        t0 = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, t0)
+
+    def executemany(self, sql, seq_of_parameters, /):
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, t0)
+
+    def executescript(self, sql_script, /):
+        t0 = time.perf_counter()
+        try:
+            return super().executescript(sql_script)
+        finally:
+            self._record(sql_script, t0)
+
+
+def query_stats(conn: sqlite3.Connection) -> list[QueryStat]:
+    """Timing per statement, slowest total first. Empty for plain connections."""
+    stats = getattr(conn, "query_stats", {})
+    return sorted(stats.values(), key=lambda s: s.total_ms, reverse=True)
+
+
+def print_query_stats(conn: sqlite3.Connection, top: int = 10) -> None:
+    stats = query_stats(conn)
+    if not stats:
+        print("  (no query timings recorded)")
+        return
+    total = sum(s.total_ms for s in stats)
+    calls = sum(s.calls for s in stats)
+    print(f"\n  SQLite: {calls} statements, {total:.1f} ms total — top {min(top, len(stats))}:")
+    for st in stats[:top]:
+        print(st)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Transactions
+# ═══════════════════════════════════════════════════════════════════════════════
+
+# id(conn) → open transaction() depth (sqlite3.Connection takes no attributes
+# or weakrefs); entries live only while the outermost block is open.
+_TX_DEPTH: dict[int, int] = {}
+
+
+@contextmanager
+def transaction(conn: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    One write transaction: BEGIN IMMEDIATE … COMMIT (ROLLBACK on error).
+
+    IMMEDIATE takes the write lock up front, so a concurrent writer waits on
+    busy_timeout here rather than failing half-way through. Nested use joins
+    the outer transaction() block — tracked by depth, not in_transaction, so
+    an implicit transaction left open by an unlocked write elsewhere is
+    committed first rather than mistaken for an outer block. Works on any
+    sqlite3 connection; threads sharing a TimedConnection are serialised on
+    its write lock.
+    """
+    lock = getattr(conn, "write_lock", None) or threading.RLock()
+    key  = id(conn)
+    with lock:
+        depth = _TX_DEPTH.get(key, 0)
+        if depth:
+            _TX_DEPTH[key] = depth + 1
+            try:
+                yield conn
+            finally:
+                _TX_DEPTH[key] = depth
+            return
+        if conn.in_transaction:
+            conn.commit()
+        conn.execute("BEGIN IMMEDIATE")
+        _TX_DEPTH[key] = 1
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        else:
+            conn.commit()
+        finally:
+            _TX_DEPTH.pop(key, None)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# PicksDB
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class PicksDB:
+    """
+    Lazily-opened, shared connection to one SQLite file.
+
+    Args:
+        path:             DB file (":memory:" = private in-memory DB)
+        busy_timeout_ms:  How long a writer waits on another process's lock
+        wal:              Enable WAL journal mode (file DBs only)
+    """
+
+    def __init__(
+        self,
+        path:            Union[str, Path],
+        busy_timeout_ms: int  = BUSY_TIMEOUT_MS,
+        wal:             bool = True,
+    ):
+        self.path             = str(path)
+        self.busy_timeout_ms  = busy_timeout_ms
+        self.wal              = wal
+        self.in_memory        = self.path == ":memory:"
+        self.journal_mode:    Optional[str] = None
+        self._conn:           Optional[TimedConnection] = None
+        self._applied:        set[str] = set()
+        self._lock            = threading.RLock()
+
+    # ── Connection ───────────────────────────────────────────────────────────
+
+    def _open(self) -> TimedConnection:
+        if not self.in_memory:
+            try:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                conn = self._configure(self._new_conn(self.path))
+                return conn
+            except Exception as exc:
+                warnings.warn(f"Could not open {self.path} ({exc}) — using in-memory DB")
+                self.in_memory = True
+        return self._configure(self._new_conn(":memory:"))
+
+    def _new_conn(self, target: str) -> TimedConnection:
+        return sqlite3.connect(
+            target,
+            timeout           = self.busy_timeout_ms / 1000,
+            factory           = TimedConnection,
+            cached_statements = STATEMENT_CACHE,
+            check_same_thread = False,
+        )
+
+    def _configure(self, conn: TimedConnection) -> TimedConnection:
+        conn.row_factory = sqlite3.Row
+        conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+        if self.wal and not self.in_memory:
+            self.journal_mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+            conn.execute("PRAGMA synchronous = NORMAL")
+        else:
+            self.journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        return conn
+
+    def connect(self, migrations: tuple[Migration, ...] | list[Migration] = ()) -> TimedConnection:
+        """
+        The shared connection, opened on first use. Each (name, fn) migration
+        runs once — fn(conn), then COMMIT — the first time any caller passes
+        that name. Migrations may use executescript (which commits on its own),
+        so they must be idempotent DDL (CREATE … IF NOT EXISTS, guarded ALTERs).
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = self._open()
+            for name, fn in migrations:
+                if name in self._applied:
+                    continue
+                fn(self._conn)
+                self._conn.commit()
+                self._applied.add(name)
+            return self._conn
+
+    def transaction(self):
+        return transaction(self.connect())
+
+    def query_stats(self) -> list[QueryStat]:
+        return query_stats(self._conn) if self._conn is not None else []
+
+    @property
+    def applied_migrations(self) -> frozenset[str]:
+        return frozenset(self._applied)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+            self._conn = None
+            self._applied.clear()
+
+
+# ── Process-wide registry ─────────────────────────────────────────────────────
+
+_REGISTRY: dict[str, PicksDB] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+
+def get_db(path: Union[str, Path], **kwargs) -> PicksDB:
+    """
+    The PicksDB for `path`, shared by every caller in this process.
+    ":memory:" always returns a new private instance (tests rely on isolation).
+    """
+    if str(path) == ":memory:":
+        return PicksDB(path, **kwargs)
+    key = str(Path(path).expanduser().resolve())
+    with _REGISTRY_LOCK:
+        db = _REGISTRY.get(key)
+        if db is None:
+            db = _REGISTRY[key] = PicksDB(key, **kwargs)
+        return db
+
+
+def close_all() -> None:
+    """Close every shared connection (tests / interpreter shutdown)."""
+    with _REGISTRY_LOCK:
+        for db in _REGISTRY.values():
+            db.close()
+        _REGISTRY.clear()
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# CLI
+# ═══════════════════════════════════════════════════════════════════════════════
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Inspect the MAS picks DB")
+    parser.add_argument("--db", required=True, help="Path to mas_picks.db")
+    args = parser.parse_args()
+
+    db   = get_db(args.db)
+    conn = db.connect()
+    print(f"  DB           : {db.path}")
+    print(f"  journal_mode : {db.journal_mode}")
+    tables = [r[0] for r in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")]
+    for name in tables:
+        n = conn.execute(f'SELECT COUNT(*) FROM "{name}"').fetchone()[0]
+        print(f"  {name:<16s} {n:>8,d} rows")
+    print_query_stats(conn)
+
+
+if __name__ == "__main__":
+    main()
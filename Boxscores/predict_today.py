@@ -5,9 +5,7 @@ Usage: python predict_today.py [--date YYYY-MM-DD]
 """
 import pandas as pd
 import numpy as np
-import pickle
 import requests
-import xgboost as xgb
 from pathlib import Path
 from datetime import date, datetime, timedelta
 import sys
@@ -23,6 +21,10 @@ except ImportError:
     SCRAPER_AVAILABLE = False
     print("  ⚠ scrape_goalies_v2.py not found — will use historical goalie data")
 
+# Models are loaded through the warm cache (keyed on path + mtime)
+from model_cache import load_xgb_classifier, load_pickle, score_batch
+from goalie_index import GoalieIndex
+
 # Import manual goalie overrides (managed by Alexis daily)
 try:
     from manual_overrides import GOALIE_OVERRIDES
@@ -53,14 +55,12 @@ def american_to_implied(odds):
 
 # ── 1. LOAD MODEL AND DATA ────────────────────────────────
 print("Loading model and data ...")
-model = xgb.XGBClassifier()
-model.load_model(str(BASE / "xgb_game_model_v2.json"))
+model = load_xgb_classifier(BASE / "xgb_game_model_v2.json")
 
 # Load probability calibrator (trained on 2024-25 test set)
 cal_path = BASE / "game_calibrator.pkl"
 if cal_path.exists():
-    with open(cal_path, "rb") as f:
-        game_calibrator = pickle.load(f)
+    game_calibrator = load_pickle(cal_path)
     print("  ✅ Calibrator loaded")
 else:
     game_calibrator = None
@@ -234,8 +234,8 @@ goalie_rolling = [c for c in gl.columns if c.startswith("g_")]
 sk_latest = sk.sort_values(["player_id", "game_date"]).groupby("player_id").last().reset_index()
 gl_latest = gl.sort_values(["playerId", "game_date"]).groupby("playerId").last().reset_index()
 
-# Pre-sort goalie starters for matching
-gl_starters = gl[gl["is_starter"] == 1].sort_values("game_date").copy()
+# Goalie lookups (scraped name → latest start) indexed once for the whole slate
+gl_index = GoalieIndex(gl)
 
 predictions = []
 
@@ -292,20 +292,7 @@ for game in games:
         home_goalie_svpct_live = home_scraped.get('svpct')
 
         # Match by last name in parquet
-        last_name = home_goalie_name.strip().split()[-1] if home_goalie_name.strip() else ''
-        if last_name:
-            team_gl = gl_starters[gl_starters["team"] == home_team]
-            name_match = team_gl[
-                team_gl["goalie_name"].str.contains(last_name, case=False, na=False)
-            ] if "goalie_name" in team_gl.columns else pd.DataFrame()
-
-            if "player_name" in team_gl.columns and len(name_match) == 0:
-                name_match = team_gl[
-                    team_gl["player_name"].str.contains(last_name, case=False, na=False)
-                ]
-
-            if len(name_match) > 0:
-                home_matched = name_match.iloc[-1]
+        home_matched = gl_index.match_starter(home_team, home_goalie_name)
 
     # Fallback: highest TOI goalie for team
     if home_matched is None:
@@ -331,20 +318,7 @@ for game in games:
         away_goalie_gaa_live = away_scraped.get('gaa')
         away_goalie_svpct_live = away_scraped.get('svpct')
 
-        last_name = away_goalie_name.strip().split()[-1] if away_goalie_name.strip() else ''
-        if last_name:
-            team_gl = gl_starters[gl_starters["team"] == away_team]
-            name_match = team_gl[
-                team_gl["goalie_name"].str.contains(last_name, case=False, na=False)
-            ] if "goalie_name" in team_gl.columns else pd.DataFrame()
-
-            if "player_name" in team_gl.columns and len(name_match) == 0:
-                name_match = team_gl[
-                    team_gl["player_name"].str.contains(last_name, case=False, na=False)
-                ]
-
-            if len(name_match) > 0:
-                away_matched = name_match.iloc[-1]
+        away_matched = gl_index.match_starter(away_team, away_goalie_name)
 
     if away_matched is None:
         away_goalies_fb = gl_latest[gl_latest["team"] == away_team].sort_values("toi_min", ascending=False)
@@ -387,11 +361,9 @@ for game in games:
     feat_vector = feat_vector[feature_cols]
 
     # Predict — apply isotonic calibration if available
-    raw_prob = model.predict_proba(feat_vector)[:, 1][0]
-    if game_calibrator is not None:
-        prob = float(game_calibrator.predict([raw_prob])[0])
-    else:
-        prob = raw_prob
+    scored = score_batch(feat_vector, model=model, calibrator=game_calibrator)
+    raw_prob = float(scored.raw_probs[0])
+    prob = float(scored.probs[0])
     # raw_prob is stored in the log so the calibrator can be retrained
     # directly on XGB outputs (not on already-calibrated values)
 
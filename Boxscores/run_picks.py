@@ -23,10 +23,14 @@ Flags:
     --tone       Script tone: hype (default) or analytical.
     --weeks N    Weeks of history for report mode (default 1).
     --no-advanced  Skip NHL play-by-play (faster, less accurate).
+    --db-stats   Print per-query SQLite timings (shared mas_picks.db connection).
+    --trace PATH Append per-stage / per-game timing spans (JSONL) for full mode.
+    --profile M  CPU profile the run: cprofile | pyinstrument.
 
 Config (.env):
     DB_PATH, WEIGHTS_FILE_PATH, LOG_LEVEL, CONFIDENCE_FLOOR,
-    MIN_AGENTS, SYNTHESIS_MODE, SCRIPT_TONE, FETCH_ADVANCED
+    MIN_AGENTS, SYNTHESIS_MODE, SCRIPT_TONE, FETCH_ADVANCED,
+    AGENT_WORKERS, AGENT_TIMEOUT
 """
 
 from __future__ import annotations
@@ -38,11 +42,15 @@ import os
 import sqlite3
 import sys
 import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import date, datetime
 from pathlib import Path
 from typing import Callable, Optional
 
+import tracing
+from picks_db import get_db, print_query_stats
+
 # ── Paths ─────────────────────────────────────────────────────────────────────
 BASE         = Path(r"C:\Users\shell\OneDrive\Documents\Code Projects\NHL & Sports\NHL_Player\Boxscores")
 DB_PATH      = BASE / "mas_picks.db"
@@ -78,6 +86,8 @@ class Config:
     synthesis_mode:    str   = "auto"
     script_tone:       str   = "hype"
     fetch_advanced:    bool  = True
+    agent_workers:     int   = 4       # threads for per-game agent evaluation (1 = serial)
+    agent_timeout:     float = 60.0    # seconds one agent may run on one game (0 = no limit)
 
 
 def load_config(env_path: Optional[Path] = None) -> Config:
@@ -121,6 +131,8 @@ def load_config(env_path: Optional[Path] = None) -> Config:
         synthesis_mode    = _get("SYNTHESIS_MODE",     "auto"),
         script_tone       = _get("SCRIPT_TONE",        "hype"),
         fetch_advanced    = _bool("FETCH_ADVANCED",    True),
+        agent_workers     = int(_get("AGENT_WORKERS",     "4")),
+        agent_timeout     = float(_get("AGENT_TIMEOUT",   "60")),
     )
 
 
@@ -144,6 +156,8 @@ class RunResult:
     pick_cards:      list  = field(default_factory=list)
     script:          str   = ""
     elapsed_seconds: float = 0.0
+    stage_seconds:   dict  = field(default_factory=dict)   # {span name: total s}
+    trace_path:      str   = ""
     errors:          list  = field(default_factory=list)
 
     def __str__(self) -> str:
@@ -264,8 +278,10 @@ class MASOrchestrator:
         agents:           Optional[list]     = None,
         synthesizer                          = None,
         feedback_engine                      = None,
+        trace_path:       Optional[Path]     = None,
     ):
         self.config   = config
+        self.trace_path = trace_path   # JSONL span trace appended per run_full
         self._db_path = db_path or config.db_path
         self._wt_path = weights_path or config.weights_file_path
         self._conn: Optional[sqlite3.Connection] = None
@@ -319,13 +335,8 @@ class MASOrchestrator:
 
     def _get_conn(self) -> sqlite3.Connection:
         if self._conn is None:
-            try:
-                self._db_path.parent.mkdir(parents=True, exist_ok=True)
-                self._conn = sqlite3.connect(str(self._db_path))
-                self._conn.row_factory = sqlite3.Row
-            except Exception:
-                self._conn = sqlite3.connect(":memory:")
-                self._conn.row_factory = sqlite3.Row
+            # Same shared connection the synthesizer + feedback engine use
+            self._conn = get_db(self._db_path).connect()
         return self._conn
 
     # ── Full mode ─────────────────────────────────────────────────────────────
@@ -338,58 +349,73 @@ class MASOrchestrator:
     ) -> RunResult:
         """
         Full pipeline: fetch → agents → synthesize → (write) → script → table.
+
+        Every stage (and each game / agent) runs in a tracing span; the
+        per-stage totals land in result.stage_seconds, a summary table is
+        printed at the end, and the full span list is appended to
+        self.trace_path (JSONL) when set.
         """
         t0     = time.monotonic()
         result = RunResult(mode="full", target_date=target_date, dry_run=dry_run)
         log.info("=== FULL MODE  date=%s  dry_run=%s ===", target_date, dry_run)
 
-        self._ensure_pipeline()
+        tracer = tracing.Tracer("run_full", target_date=target_date, dry_run=dry_run)
+        with tracer.activate():
+            self._run_full_stages(target_date, dry_run, tone, result)
+
+        result.elapsed_seconds = time.monotonic() - t0
+        result.stage_seconds   = tracer.stage_seconds()
+        if self.trace_path is not None:
+            try:
+                result.trace_path = str(tracer.write_jsonl(self.trace_path))
+            except OSError as exc:
+                log.warning("Could not write trace: %s", exc)
+        tracer.print_summary()
+        log.info("Done. %s", result)
+        return result
+
+    def _run_full_stages(
+        self,
+        target_date: str,
+        dry_run:     bool,
+        tone:        str,
+        result:      RunResult,
+    ) -> None:
+        """run_full body — each step runs inside a tracing span."""
+        with tracing.span("load_pipeline"):
+            self._ensure_pipeline()
 
         # 1 — Fetch game contexts
         log.info("Step 1: fetching game contexts for %s …", target_date)
         try:
-            contexts = self._context_builder(
-                target_date,
-                fetch_advanced=self.config.fetch_advanced,
-            )
+            with tracing.span("fetch_contexts"):
+                contexts = self._context_builder(
+                    target_date,
+                    fetch_advanced=self.config.fetch_advanced,
+                )
         except Exception as exc:
             import traceback
             msg = f"Context fetch failed: {exc}"
             log.error(msg)
             log.error("Full traceback:\n%s", traceback.format_exc())
             result.errors.append(msg)
-            return result
+            return
 
         result.n_games = len(contexts)
         log.info("  %d games found", result.n_games)
 
-        # 2 — Run agents + synthesize per game
+        # 2 — Run agents across the slate, then synthesize it all at once
         all_cards  = []
-        all_sigs   = {}
-
-        for ctx in contexts:
-            game_label = f"{getattr(getattr(ctx,'away',None),'team','?')} @ " \
-                         f"{getattr(getattr(ctx,'home',None),'team','?')}"
-            log.debug("  Processing %s …", game_label)
-
-            try:
-                signals = [agent.analyze(ctx) for agent in self._agents]
-                card    = self._synthesizer.synthesize(
-                    signals,
-                    ctx,
-                    mode = self.config.synthesis_mode,
-                    log  = not dry_run,      # only write to DB when not dry-run
-                )
-            except Exception as exc:
-                log.warning("  ⚠  %s skipped: %s", game_label, exc)
-                result.errors.append(f"{game_label}: {exc}")
-                continue
+        with tracing.span("agent_slate", games=len(contexts)):
+            slate = self._analyze_slate(contexts, result)
+        all_sigs   = {label: signals for label, _, signals in slate}
 
+        with tracing.span("synthesis", games=len(slate)):
+            synthesized = self._synthesize_slate(slate, dry_run, result)
+        for game_label, card in synthesized:
             all_cards.append(card)
-            all_sigs[game_label] = signals
-
             if dry_run:
-                self._print_dry_run_signals(game_label, signals, card)
+                self._print_dry_run_signals(game_label, all_sigs[game_label], card)
 
         result.pick_cards = all_cards
         result.n_picks    = sum(1 for c in all_cards if c.is_playable)
@@ -399,11 +425,12 @@ class MASOrchestrator:
         # 3 — Generate Alexis script
         log.info("Step 2: generating Alexis script …")
         try:
-            from script_generator import generate_script, filter_picks, preview_picks
-            script           = generate_script(all_cards, tone=tone,
-                                               game_date=target_date)
-            result.script    = script
-            result.n_in_script = len(filter_picks(all_cards))
+            with tracing.span("script"):
+                from script_generator import generate_script, filter_picks, preview_picks
+                script           = generate_script(all_cards, tone=tone,
+                                                   game_date=target_date)
+                result.script    = script
+                result.n_in_script = len(filter_picks(all_cards))
         except Exception as exc:
             log.warning("Script generation failed: %s", exc)
             result.errors.append(f"script: {exc}")
@@ -420,9 +447,150 @@ class MASOrchestrator:
             print(result.script)
             print(f"\n{'═' * 62}\n")
 
-        result.elapsed_seconds = time.monotonic() - t0
-        log.info("Done. %s", result)
-        return result
+    @staticmethod
+    def _run_agent(agent, ctx, game_label: str = ""):
+        """agent.analyze(ctx) inside its own span (per-agent timing)."""
+        name = "agent:" + str(getattr(agent, "agent_id", type(agent).__name__))
+        with tracing.span(name, game=game_label):
+            return agent.analyze(ctx)
+
+    def _analyze_slate(self, contexts: list, result: RunResult) -> list:
+        """
+        Run every agent on every game. Returns [(game_label, ctx, signals)]
+        in context order, signals in agent order; games where any agent
+        raised or timed out are dropped and recorded in result.errors.
+
+        With agent_workers > 1 the first game runs serially — that triggers
+        each agent's one-time lazy loads (parquets, Elo rebuild) before any
+        thread can race on them — and the remaining (game, agent) pairs fan
+        out over a thread pool sharing the already-loaded agents. A pair
+        still running after agent_timeout seconds is abandoned (its thread
+        is left to finish in the background) so it can't hold up the slate.
+        """
+        labels = [
+            f"{getattr(getattr(ctx,'away',None),'team','?')} @ "
+            f"{getattr(getattr(ctx,'home',None),'team','?')}"
+            for ctx in contexts
+        ]
+        agents  = list(self._agents)
+        n_work  = max(1, int(getattr(self.config, "agent_workers", 1) or 1))
+        outcome: dict[tuple[int, int], object] = {}   # (game i, agent j) → signal | Exception
+
+        n_serial = len(contexts) if n_work == 1 or len(contexts) <= 1 else 1
+        for i in range(n_serial):
+            log.debug("  Processing %s …", labels[i])
+            with tracing.span("agents", game=labels[i]):
+                for j, agent in enumerate(agents):
+                    try:
+                        outcome[i, j] = self._run_agent(agent, contexts[i], labels[i])
+                    except Exception as exc:
+                        outcome[i, j] = exc
+                        break       # game is dropped — skip its remaining agents
+
+        pairs = [(i, j) for i in range(n_serial, len(contexts))
+                 for j in range(len(agents))]
+        if pairs:
+            outcome.update(self._analyze_parallel(contexts, labels, agents, pairs, n_work))
+
+        slate = []
+        for i, ctx in enumerate(contexts):
+            signals = []
+            for j in range(len(agents)):
+                res = outcome.get((i, j))
+                if isinstance(res, Exception):
+                    log.warning("  ⚠  %s skipped: %s", labels[i], res)
+                    result.errors.append(f"{labels[i]}: {res}")
+                    break
+                signals.append(res)
+            else:
+                slate.append((labels[i], ctx, signals))
+        return slate
+
+    def _analyze_parallel(self, contexts, labels, agents, pairs, n_work) -> dict:
+        """
+        Thread-pool leg of _analyze_slate. Returns {(i, j): signal | Exception}.
+        Each game keeps one "agents" span around its agent calls; it closes
+        once all of that game's pairs have finished or timed out.
+        """
+        timeout = float(getattr(self.config, "agent_timeout", 0) or 0)
+        started: dict[tuple[int, int], float] = {}
+        games   = sorted({i for i, _ in pairs})
+        spans   = {i: tracing.open_span("agents", game=labels[i]) for i in games}
+        left    = {i: sum(1 for g, _ in pairs if g == i) for i in games}
+
+        def _call(i, j):
+            started[i, j] = time.monotonic()
+            return spans[i].run(self._run_agent, agents[j], contexts[i], labels[i])
+
+        def _settle(key, res):
+            out[key] = res
+            left[key[0]] -= 1
+            if not left[key[0]]:
+                spans[key[0]].close()
+
+        pool    = ThreadPoolExecutor(max_workers=n_work, thread_name_prefix="mas-agent")
+        futures = {pool.submit(_call, i, j): (i, j) for i, j in pairs}
+        out:     dict[tuple[int, int], object] = {}
+        pending  = set(futures)
+        try:
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED,
+                                     timeout=min(timeout, 0.25) if timeout else None)
+                for fut in done:
+                    exc = fut.exception()
+                    _settle(futures[fut], exc if exc is not None else fut.result())
+                if not timeout:
+                    continue
+                now = time.monotonic()
+                for fut in list(pending):
+                    key = futures[fut]
+                    if key in started and now - started[key] > timeout:
+                        agent_id = getattr(agents[key[1]], "agent_id", "agent")
+                        _settle(key, TimeoutError(f"{agent_id} timed out after {timeout:g}s"))
+                        pending.discard(fut)
+        finally:
+            # Don't wait on abandoned (timed-out) agents; drop queued work
+            pool.shutdown(wait=False, cancel_futures=True)
+            for sp in spans.values():
+                sp.close()
+        return out
+
+    def _synthesize_slate(self, slate: list, dry_run: bool, result: RunResult) -> list:
+        """
+        Synthesize every (game_label, ctx, signals) in one batch when the
+        synthesizer supports it, else game by game. Returns [(label, card)].
+        """
+        if not slate:
+            return []
+
+        if hasattr(self._synthesizer, "synthesize_batch"):
+            try:
+                cards = self._synthesizer.synthesize_batch(
+                    [sigs for _, _, sigs in slate],
+                    [ctx for _, ctx, _ in slate],
+                    mode = self.config.synthesis_mode,
+                    log  = not dry_run,      # only write to DB when not dry-run
+                )
+                return [(label, card) for (label, _, _), card in zip(slate, cards)]
+            except Exception as exc:
+                log.warning("  ⚠  batch synthesis failed (%s) — retrying per game", exc)
+                result.errors.append(f"synthesize_batch: {exc}")
+
+        out = []
+        for game_label, ctx, signals in slate:
+            try:
+                card = self._synthesizer.synthesize(
+                    signals,
+                    ctx,
+                    mode = self.config.synthesis_mode,
+                    log  = not dry_run,
+                )
+            except Exception as exc:
+                log.warning("  ⚠  %s skipped: %s", game_label, exc)
+                result.errors.append(f"{game_label}: {exc}")
+                continue
+            out.append((game_label, card))
+        return out
 
     # ── Script-only mode ──────────────────────────────────────────────────────
 
@@ -489,17 +657,13 @@ class MASOrchestrator:
         start = end - _td(days=weeks * 7)
 
         # Only hit dates that actually have picks in the DB (fast + avoids API noise)
-        conn = self._get_conn() if hasattr(self, "_get_conn") else None
         try:
-            from sqlite3 import connect as _connect
-            _conn = _connect(str(self._db_path))
-            rows = _conn.execute(
+            rows = self._get_conn().execute(
                 "SELECT DISTINCT game_date FROM picks "
                 "WHERE game_date BETWEEN ? AND ? ORDER BY game_date",
                 (start.isoformat(), end.isoformat()),
             ).fetchall()
             dates = [r[0] for r in rows]
-            _conn.close()
         except Exception as exc:
             log.warning("Could not enumerate pick dates (%s) — falling back to single date", exc)
             dates = [target_date]
@@ -507,6 +671,17 @@ class MASOrchestrator:
         log.info("Resolving outcomes for %d date(s) from %s → %s …",
                  len(dates), start.isoformat(), end.isoformat())
 
+        if hasattr(self._feedback, "resolve_range"):
+            try:
+                result = self._feedback.resolve_range(start.isoformat(), end.isoformat(),
+                                                      dates=dates)
+                log.info("  %s", result)
+                for err in result.errors:
+                    log.warning("  %s", err)
+            except Exception as exc:
+                log.warning("  resolve_range(%s → %s) failed: %s", start, end, exc)
+            return self._weekly_report(weeks)
+
         totals = {"fetched": 0, "final": 0, "written": 0}
         for d in dates:
             try:
@@ -521,8 +696,9 @@ class MASOrchestrator:
 
         log.info("Range totals  fetched=%(fetched)d  final=%(final)d  written=%(written)d",
                  totals)
+        return self._weekly_report(weeks)
 
-        # Weekly report
+    def _weekly_report(self, weeks: int):
         log.info("Building %d-week performance report …", weeks)
         report = self._feedback.weekly_report(weeks=weeks)
         self._feedback.print_report(report)
@@ -672,6 +848,18 @@ def _parse_args() -> argparse.Namespace:
         "--quiet", "-q", action="store_true",
         help="Set log level to WARNING",
     )
+    p.add_argument(
+        "--trace", default=None, metavar="PATH",
+        help="Append per-stage / per-game timing spans to this JSONL file",
+    )
+    p.add_argument(
+        "--profile", default=None, choices=tracing.PROFILE_MODES,
+        help="CPU-profile the run (saved next to --trace if given)",
+    )
+    p.add_argument(
+        "--db-stats", action="store_true",
+        help="Print per-query SQLite timings after the run",
+    )
     p.add_argument(
         "--env", default=None, metavar="PATH",
         help="Path to .env config file (default: Boxscores/.env)",
@@ -704,21 +892,29 @@ def main() -> int:
     tone = args.tone or config.script_tone
 
     # Build orchestrator with real modules
-    orch = MASOrchestrator(config=config)
+    trace_path = Path(args.trace) if args.trace else None
+    orch = MASOrchestrator(config=config, trace_path=trace_path)
+
+    profile_path = (trace_path.with_name(f"{trace_path.stem}_{args.mode}")
+                    if trace_path else None)
+
+    rc = 0
+    with tracing.profiled(args.profile, profile_path):
+        if args.mode == "full":
+            result = orch.run_full(target_date, dry_run=args.dry_run, tone=tone)
+            rc = 0 if not result.errors else 1
 
-    if args.mode == "full":
-        result = orch.run_full(target_date, dry_run=args.dry_run, tone=tone)
-        return 0 if not result.errors else 1
+        elif args.mode == "script-only":
+            script = orch.run_script_only(target_date, tone=tone)
+            rc = 0 if script else 1
 
-    elif args.mode == "script-only":
-        script = orch.run_script_only(target_date, tone=tone)
-        return 0 if script else 1
+        elif args.mode == "report":
+            orch.run_report(target_date, weeks=args.weeks)
 
-    elif args.mode == "report":
-        orch.run_report(target_date, weeks=args.weeks)
-        return 0
+    if args.db_stats:
+        print_query_stats(orch._get_conn())
 
-    return 0
+    return rc
 
 
 if __name__ == "__main__":
@@ -24,7 +24,6 @@ game_ids_by_matchup (optional):
     When provided, the NHL API source is enabled.
 """
 
-import requests
 import re
 import json
 import time
@@ -32,6 +31,7 @@ import logging
 from bs4 import BeautifulSoup
 from datetime import datetime
 from typing import Optional
+import http_archive
 
 log = logging.getLogger("nhl_mas.goalies")
 
@@ -133,7 +133,7 @@ def _scrape_dailyfaceoff() -> list[dict]:
 
     try:
         log.debug("DailyFaceoff: fetching %s", url)
-        response = requests.get(url, headers=headers, timeout=15)
+        response = http_archive.get(url, headers=headers, timeout=15)
         if response.status_code != 200:
             log.warning("DailyFaceoff: HTTP %d", response.status_code)
             return []
@@ -231,7 +231,7 @@ def _scrape_nhl_api(game_ids_by_matchup: dict) -> dict:
         url = f"https://api-web.nhle.com/v1/gamecenter/{game_id}/landing"
         try:
             log.debug("NHL API: fetching game %d (%s @ %s)", game_id, away, home)
-            r = requests.get(url, timeout=10)
+            r = http_archive.get(url, timeout=10)
             if r.status_code != 200:
                 log.debug("NHL API: %d for game %d", r.status_code, game_id)
                 time.sleep(0.2)
@@ -288,7 +288,7 @@ def _scrape_nhl_api(game_ids_by_matchup: dict) -> dict:
                 boxscore_url = (
                     f"https://api-web.nhle.com/v1/gamecenter/{game_id}/boxscore"
                 )
-                bs = requests.get(boxscore_url, timeout=10)
+                bs = http_archive.get(boxscore_url, timeout=10)
                 if bs.status_code == 200:
                     bs_data = bs.json()
                     for side, abbrev in [("homeTeam", home), ("awayTeam", away)]:
@@ -344,7 +344,7 @@ def _get_roster_goalies(team_abbrev: str) -> set:
 
     url = f"https://api-web.nhle.com/v1/roster/{team_abbrev}/current"
     try:
-        r = requests.get(url, timeout=8)
+        r = http_archive.get(url, timeout=8)
         if r.status_code != 200:
             _roster_cache[team_abbrev] = set()
             return set()
@@ -449,7 +449,7 @@ def _scrape_goaliepost() -> dict:
     results = {}
     try:
         log.debug("GoaliePost: fetching %s", url)
-        r = requests.get(url, headers=headers, timeout=12)
+        r = http_archive.get(url, headers=headers, timeout=12)
         if r.status_code != 200:
             log.warning("GoaliePost: HTTP %d", r.status_code)
             return results
@@ -660,7 +660,7 @@ def _scrape_rotowire() -> dict:
     }
     results = {}
     try:
-        r = requests.get(url, headers=headers, timeout=12)
+        r = http_archive.get(url, headers=headers, timeout=12)
         if r.status_code != 200:
             log.warning("RotoWire: HTTP %d", r.status_code)
             return results
@@ -760,7 +760,7 @@ def _scrape_gamedaytweets() -> dict:
     }
     results = {}
     try:
-        r = requests.get(url, headers=headers, timeout=12)
+        r = http_archive.get(url, headers=headers, timeout=12)
         if r.status_code != 200:
             log.warning("GameDayTweets: HTTP %d", r.status_code)
             return results
@@ -866,7 +866,7 @@ def _scrape_nhlfantasydata() -> dict:
     results = {}
     for url in urls:
         try:
-            r = requests.get(url, headers=headers, timeout=10)
+            r = http_archive.get(url, headers=headers, timeout=10)
             if r.status_code != 200:
                 continue
 
@@ -936,12 +936,16 @@ def _scrape_nhlfantasydata() -> dict:
 # SOURCE 7 — Inference Engine (fills remaining TBD / Unconfirmed slots)
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _apply_inference(merged_games: list, game_ids_by_matchup: dict = None) -> list:
+def _apply_inference(merged_games: list, game_ids_by_matchup: dict = None,
+                     game_date=None) -> list:
     """
     After all external sources are merged, apply the GoalieInferenceEngine
     to any team that still has an Unconfirmed, Fallback, or TBD goalie.
     Adds status = "Inferred" (rank 3 — between Probable and Unconfirmed).
 
+    game_date is the slate date inference runs as of (default today), so a
+    replayed build for an archived date infers as of that date.
+
     game_ids_by_matchup is used only to detect B2B: not needed for inference
     itself, but the B2B flag comes from the scrape pipeline's rest-day data.
     """
@@ -952,7 +956,7 @@ def _apply_inference(merged_games: list, game_ids_by_matchup: dict = None) -> li
         return merged_games
 
     from datetime import date
-    today = str(date.today())
+    slate_date = str(game_date or date.today())
 
     # Build a quick B2B lookup from the game list itself if available
     # (module1_ingest passes rest_days; here we just use the DFO game data)
@@ -976,7 +980,7 @@ def _apply_inference(merged_games: list, game_ids_by_matchup: dict = None) -> li
             is_b2b = team in b2b_teams
             result = get_inferred_goalie(
                 team           = team,
-                game_date      = today,
+                game_date      = slate_date,
                 is_b2b         = is_b2b,
                 current_dfo_name = cur_name,
             )
@@ -1013,7 +1017,7 @@ STATUS_RANK.setdefault("inferred", 3)   # between probable(3) and unconfirmed(2)
 # PUBLIC API
 # ─────────────────────────────────────────────────────────────────────────────
 
-def scrape_starting_goalies(game_ids_by_matchup=None):
+def scrape_starting_goalies(game_ids_by_matchup=None, game_date=None):
     """
     Main entry point — drop-in replacement for the original scrape_starting_goalies().
 
@@ -1022,6 +1026,8 @@ def scrape_starting_goalies(game_ids_by_matchup=None):
     game_ids_by_matchup : dict, optional
         { (away_abbrev, home_abbrev): game_id_int }
         Enables the NHL API source when supplied.
+    game_date : date or "YYYY-MM-DD", optional
+        Slate date the inference engine runs as of (default today).
 
     Returns
     -------
@@ -1083,7 +1089,7 @@ def scrape_starting_goalies(game_ids_by_matchup=None):
 
     # Source 7: Inference Engine — fill any remaining Unconfirmed/TBD slots
     print("  [ Goalie Scraper ] Running Inference Engine ...")
-    merged = _apply_inference(merged, game_ids_by_matchup)
+    merged = _apply_inference(merged, game_ids_by_matchup, game_date)
 
     # Summary
     all_statuses = []
@@ -0,0 +1,215 @@
+"""
+test_backtest.py
+----------------
+Tests for backtest.py (historical replay harness).
+
+Builds a tiny LocalHistory from in-memory frames and a temp pbp_cache —
+no parquets, no network.
+
+Run:
+    python test_backtest.py -v
+"""
+
+import json
+import sys
+import tempfile
+import unittest
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from backtest import (
+    LocalHistory, build_historical_contexts, run_backtest, summarize_backtest,
+)
+from agents.agent_base import AgentSignal
+from agents.team_form_agent import compute_elo_history, ELO_BASE
+
+
+def _outcomes() -> pd.DataFrame:
+    rows = [
+        # game_pk,   date,         home,  away,  home_win
+        (2024020001, "2024-10-08", "BOS", "TOR", 1),
+        (2024020002, "2024-10-09", "TOR", "MTL", 0),
+        (2024020003, "2024-10-10", "BOS", "MTL", 1),
+        (2024020004, "2024-10-10", "TOR", "OTT", 1),
+        (2024020005, "2024-10-12", "MTL", "BOS", 0),
+    ]
+    return pd.DataFrame(rows, columns=["game_pk", "game_date", "home_team",
+                                       "away_team", "home_win"])
+
+
+def _goalies() -> pd.DataFrame:
+    starters = {"BOS": "Jeremy Swayman", "TOR": "Joseph Woll",
+                "MTL": "Sam Montembeault", "OTT": "Linus Ullmark"}
+    rows = []
+    for r in _outcomes().itertuples(index=False):
+        for team, opp in ((r.home_team, r.away_team), (r.away_team, r.home_team)):
+            rows.append({"game_pk": r.game_pk, "game_date": r.game_date, "team": team,
+                         "opponent": opp, "goalie_name": starters[team], "is_starter": 1,
+                         "savePct": 0.91, "toi_min": 60.0, "g_savePct_avg5": 0.905})
+    return pd.DataFrame(rows)
+
+
+def _pbp(home_id, away_id, home, away, home_shots, away_shots) -> dict:
+    plays = ([{"typeDescKey": "shot-on-goal", "situationCode": "1515",
+               "details": {"eventOwnerTeamId": home_id, "xCoord": 80, "yCoord": 0}}] * home_shots +
+             [{"typeDescKey": "missed-shot", "situationCode": "1515",
+               "details": {"eventOwnerTeamId": away_id}}] * away_shots)
+    return {"homeTeam": {"id": home_id, "abbrev": home},
+            "awayTeam": {"id": away_id, "abbrev": away},
+            "plays": plays}
+
+
+class _FixedAgent:
+    """Always leans home with the same score — isolates the harness from agent logic."""
+    def __init__(self, agent_id, raw):
+        self.agent_id, self.raw = agent_id, raw
+
+    def analyze(self, ctx):
+        return AgentSignal(agent_id=self.agent_id, pick_direction="home",
+                           raw_score=self.raw, confidence=0.80, reasoning="fixed")
+
+
+def _fixed_agents(hist, d):
+    return [_FixedAgent(a, 0.66) for a in
+            ("team_form", "player_form", "goalie_form", "schedule", "sentiment")]
+
+
+class TestLocalHistory(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        pbp_dir = Path(self.tmp.name)
+        with open(pbp_dir / "2024020001.json", "w") as f:
+            json.dump(_pbp(6, 10, "BOS", "TOR", 3, 1), f)
+        self.hist = LocalHistory(outcomes=_outcomes(), gl=_goalies(),
+                                 sk=pd.DataFrame(), odds=pd.DataFrame(), pbp_dir=pbp_dir)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_game_dates_window(self):
+        self.assertEqual(self.hist.game_dates("2024-10-09", "2024-10-10"),
+                         [date(2024, 10, 9), date(2024, 10, 10)])
+
+    def test_rest_and_b2b(self):
+        self.assertEqual(self.hist.rest("TOR", date(2024, 10, 10))["rest_days"], 1)
+        self.assertTrue(self.hist.rest("TOR", date(2024, 10, 10))["is_b2b"])
+        self.assertIsNone(self.hist.rest("OTT", date(2024, 10, 10))["rest_days"])
+
+    def test_goalie_slice_excludes_target_date(self):
+        gl = self.hist.gl_before(date(2024, 10, 10))
+        self.assertTrue((gl["game_date"] < pd.Timestamp("2024-10-10")).all())
+        self.assertEqual(len(gl), 4)
+
+    def test_advanced_stats_from_cached_pbp(self):
+        adv = self.hist.advanced("BOS", date(2024, 10, 10))
+        self.assertAlmostEqual(adv["cf_pct_last5"], 0.75)
+        self.assertEqual(self.hist.advanced("BOS", date(2024, 10, 8)), {})
+
+    def test_elo_history_is_pre_game(self):
+        self.assertEqual(self.hist.elo_before(date(2024, 10, 8)), {})
+        after_first = self.hist.elo_before(date(2024, 10, 9))
+        self.assertGreater(after_first["BOS"], ELO_BASE)
+        self.assertLess(after_first["TOR"], ELO_BASE)
+
+    def test_elo_history_snapshots_before_same_day_games(self):
+        hist = compute_elo_history(_outcomes())
+        self.assertNotIn("OTT", hist[date(2024, 10, 10)])
+        self.assertIn("OTT", hist[date(2024, 10, 12)])
+
+    def test_contexts_use_actual_starters(self):
+        ctxs = build_historical_contexts(self.hist, date(2024, 10, 10))
+        self.assertEqual([c.game_id for c in ctxs], [2024020003, 2024020004])
+        bos = ctxs[0].home
+        self.assertEqual(bos.goalie.name, "Jeremy Swayman")
+        self.assertEqual(bos.goalie.status, "confirmed")
+        self.assertTrue(ctxs[0].goalie_confirmed)
+        self.assertTrue(ctxs[0].has_advanced_stats)
+        self.assertEqual(bos.rest_days, 2)
+
+
+class TestRunBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.hist = LocalHistory(outcomes=_outcomes(), gl=_goalies(),
+                                 sk=pd.DataFrame(), odds=pd.DataFrame(),
+                                 pbp_dir=Path(tempfile.gettempdir()) / "no_pbp_here")
+
+    def test_replays_every_game(self):
+        report = run_backtest("2024-10-01", "2024-10-31", hist=self.hist,
+                              agent_factory=_fixed_agents)
+        self.assertEqual(report.n_games, 5)
+        self.assertEqual(report.n_dates, 4)
+        self.assertEqual(report.su_correct, 3)       # always home; home won 3 of 5
+        self.assertEqual(report.n_scored, 5)
+        self.assertEqual(sum(b.n for b in report.calibration), 5)
+
+    def test_meta_learner_needs_fitted_synthesizer(self):
+        with self.assertRaises(ValueError):
+            run_backtest("2024-10-01", "2024-10-31", hist=self.hist,
+                         agent_factory=_fixed_agents, mode="meta_learner")
+
+    def test_tier_breakdown_matches_picks(self):
+        report = run_backtest("2024-10-01", "2024-10-31", hist=self.hist,
+                              agent_factory=_fixed_agents)
+        n_tiered = sum(ts.n for ts in report.tier_breakdown.values())
+        self.assertEqual(n_tiered, report.total_picks)
+        self.assertEqual(report.total_wins + report.total_losses, report.total_picks)
+
+    def test_agents_see_only_prior_rows(self):
+        seen = []
+        def factory(hist, d):
+            gl = hist.gl_before(d)
+            seen.append((d, gl["game_date"].max() if not gl.empty else None))
+            return _fixed_agents(hist, d)
+        run_backtest("2024-10-01", "2024-10-31", hist=self.hist, agent_factory=factory)
+        for d, latest in seen:
+            if latest is not None:
+                self.assertLess(latest, pd.Timestamp(d))
+
+    def test_empty_window(self):
+        report = run_backtest("2030-01-01", "2030-01-31", hist=self.hist,
+                              agent_factory=_fixed_agents)
+        self.assertEqual(report.n_games, 0)
+
+
+class TestSummarize(unittest.TestCase):
+
+    def test_moneyline_roi(self):
+        picks = pd.DataFrame([
+            {"game_date": "2024-10-08", "raw_score": 0.60, "home_win": 1,
+             "confidence_tier": "MEDIUM", "pick_direction": "home",
+             "home_ml": 150.0, "away_ml": -170.0},
+            {"game_date": "2024-10-08", "raw_score": 0.60, "home_win": 0,
+             "confidence_tier": "MEDIUM", "pick_direction": "home",
+             "home_ml": -120.0, "away_ml": 100.0},
+        ])
+        report = summarize_backtest(picks, "2024-10-08", "2024-10-08")
+        self.assertEqual(report.n_with_odds, 2)
+        self.assertAlmostEqual(report.ml_roi_pct, 25.0)      # (+1.5 − 1) / 2
+        self.assertEqual(report.tier_breakdown["MEDIUM"].wins, 1)
+
+    def test_skip_rows_excluded_from_accuracy_and_calibration(self):
+        row = {"game_date": "2024-10-08", "home_ml": None, "away_ml": None}
+        picks = pd.DataFrame([
+            {**row, "raw_score": 0.62, "home_win": 1, "confidence_tier": "MEDIUM",
+             "pick_direction": "home"},
+            {**row, "raw_score": 0.50, "home_win": 1, "confidence_tier": "SKIP",
+             "pick_direction": "neutral"},
+            {**row, "raw_score": 0.50, "home_win": 1, "confidence_tier": "SKIP",
+             "pick_direction": "neutral"},
+        ])
+        report = summarize_backtest(picks, "2024-10-08", "2024-10-08")
+        self.assertEqual((report.n_scored, report.n_skipped), (1, 2))
+        self.assertEqual(report.su_correct, 1)
+        self.assertAlmostEqual(report.su_accuracy, 1.0)
+        self.assertAlmostEqual(report.brier, 0.38 ** 2)
+        self.assertEqual(sum(b.n for b in report.calibration), 1)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
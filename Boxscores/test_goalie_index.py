@@ -0,0 +1,152 @@
+"""
+test_goalie_index.py
+--------------------
+Tests for goalie_index.py (precomputed goalie lookups) and the callers that
+use it: GoalieFormAgent H2H, Module 1 goalie feature matching and the
+players/predict opposing-goalie lookup.
+
+Builds a tiny in-memory goalie log — no parquets.
+
+Run:
+    python test_goalie_index.py -v
+"""
+
+import contextlib
+import importlib.util
+import io
+import sys
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from goalie_index import GoalieIndex, index_for
+from agents.goalie_form_agent import GoalieFormAgent
+import module1_ingest as m1
+
+
+def _gl() -> pd.DataFrame:
+    rows = [
+        # pid,  name,                team,  opp,   date,         starter, sv%,   toi
+        (8001, "Jeremy Swayman",    "BOS", "TOR", "2024-10-08", 1, 0.930, 60.0),
+        (8001, "Jeremy Swayman",    "BOS", "TOR", "2024-11-02", 1, 0.900, 60.0),
+        (8001, "Jeremy Swayman",    "BOS", "TOR", "2024-12-01", 1, 0.880, 60.0),
+        (8001, "Jeremy Swayman",    "BOS", "TOR", "2025-01-15", 1, 0.920, 60.0),
+        (8001, "Jeremy Swayman",    "BOS", "MTL", "2025-01-20", 1, 0.950, 60.0),
+        (8002, "Joonas Korpisalo",  "BOS", "MTL", "2025-01-22", 1, 0.910, 65.0),
+        (8003, "Joseph Woll",       "TOR", "BOS", "2025-01-15", 1, 0.890, 60.0),
+        (8004, "Ilya Samsonov",     "TOR", "BOS", "2024-10-08", 1, 0.870, 58.0),
+        (8004, "Ilya Samsonov",     "TOR", "BOS", "2024-11-02", 0, None,  12.0),
+    ]
+    df = pd.DataFrame(rows, columns=["playerId", "goalie_name", "team", "opponent",
+                                     "game_date", "is_starter", "savePct", "toi_min"])
+    df["game_date"] = pd.to_datetime(df["game_date"])
+    df["g_savePct_avg5"] = df["savePct"]
+    return df
+
+
+def _load_players_predict():
+    """players/predict.py as a module (its import-time makedirs is stubbed)."""
+    path = Path(__file__).resolve().parent.parent / "players" / "predict.py"
+    spec = importlib.util.spec_from_file_location("players_predict", path)
+    mod  = importlib.util.module_from_spec(spec)
+    with mock.patch("os.makedirs"), contextlib.redirect_stdout(io.StringIO()):
+        spec.loader.exec_module(mod)
+    return mod
+
+
+class TestGoalieIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.idx = GoalieIndex(_gl())
+
+    def test_resolve_by_last_name_case_insensitive(self):
+        self.assertEqual(self.idx.resolve("J. SWAYMAN", "BOS"), 8001)
+        self.assertEqual(self.idx.resolve("Swayman"), 8001)
+        self.assertIsNone(self.idx.resolve("Swayman", "TOR"))
+        self.assertIsNone(self.idx.resolve("Unknown", "BOS"))
+
+    def test_latest_start_for_team(self):
+        row = self.idx.match_starter("BOS", "Jeremy Swayman")
+        self.assertEqual(row["game_date"], pd.Timestamp("2025-01-20"))
+
+    def test_latest_team_start_any_goalie(self):
+        self.assertEqual(self.idx.latest_team_start("BOS")["playerId"], 8002)
+        # Samsonov's later relief appearance is not a start
+        self.assertEqual(self.idx.latest_team_start("TOR")["playerId"], 8003)
+        self.assertIsNone(self.idx.latest_team_start("MTL"))
+
+    def test_h2h_uses_last_three_starts(self):
+        self.assertAlmostEqual(self.idx.h2h_save_pct(8001, "TOR"), (0.90 + 0.88 + 0.92) / 3)
+
+    def test_h2h_needs_two_starts(self):
+        self.assertIsNone(self.idx.h2h_save_pct(8001, "MTL"))
+        self.assertIsNone(self.idx.h2h_save_pct(None, "TOR"))
+
+    def test_h2h_skips_missing_save_pct(self):
+        self.assertAlmostEqual(self.idx.h2h_save_pct(8004, "BOS"), 0.87)
+
+    def test_fallback_is_highest_toi(self):
+        self.assertEqual(self.idx.fallback("BOS")["playerId"], 8002)
+        self.assertIsNone(self.idx.fallback("NYR"))
+
+    def test_frame_without_player_ids_keys_by_name(self):
+        idx = GoalieIndex(_gl().drop(columns="playerId"))
+        key = idx.resolve("Swayman", "BOS")
+        self.assertEqual(key, "Jeremy Swayman")
+        self.assertAlmostEqual(idx.h2h_save_pct(key, "TOR"), (0.90 + 0.88 + 0.92) / 3)
+
+    def test_empty_frame(self):
+        idx = GoalieIndex(pd.DataFrame())
+        self.assertIsNone(idx.resolve("Swayman"))
+        self.assertIsNone(idx.fallback("BOS"))
+
+    def test_index_for_memoises_per_frame(self):
+        gl = _gl()
+        self.assertIs(index_for(gl), index_for(gl))
+        self.assertIsNot(index_for(gl), index_for(_gl()))
+
+
+class TestCallers(unittest.TestCase):
+
+    def test_agent_h2h_by_player_id(self):
+        agent = GoalieFormAgent(gl=_gl())
+        by_id   = agent._get_h2h_save_pct("Someone Else", "TOR", player_id=8001)
+        by_name = agent._get_h2h_save_pct("Jeremy Swayman", "TOR")
+        self.assertAlmostEqual(by_id, by_name)
+
+    def test_agent_unknown_id_falls_back_to_name(self):
+        agent = GoalieFormAgent(gl=_gl())
+        self.assertIsNotNone(agent._get_h2h_save_pct("Jeremy Swayman", "TOR", player_id=1))
+
+    def test_module1_goalie_context_carries_player_id(self):
+        ctx = m1.build_goalie_context("BOS", {"name": "Korpisalo", "status": "confirmed"}, _gl())
+        self.assertEqual(ctx.player_id, 8002)
+        self.assertEqual(ctx.name, "Joonas Korpisalo")
+        self.assertAlmostEqual(ctx.rolling_savePct_avg5, 0.91)
+
+    def test_module1_unmatched_name_uses_fallback(self):
+        feats, name = m1.get_goalie_features("BOS", "Nobody Here", _gl())
+        self.assertEqual(name, "Joonas Korpisalo")
+        self.assertIn("g_savePct_avg5", feats)
+
+    def test_players_predict_matches_through_index(self):
+        predict = _load_players_predict()
+        gl = _gl()
+        with mock.patch.object(pd.Series.str, "contains",
+                               side_effect=AssertionError("str.contains scan")):
+            lookup = predict.build_goalie_lookup(
+                gl, ["BOS", "TOR"], {"BOS": {"name": "J. Swayman", "status": "Confirmed"},
+                                     "TOR": {"name": "Nobody Here", "status": "Likely"}})
+        self.assertEqual(lookup["BOS"]["goalie_status"], "Confirmed")
+        self.assertAlmostEqual(lookup["BOS"]["opp_g_savePct_avg5"], 0.95)
+        # unmatched name → team's most recent starter
+        self.assertEqual(lookup["TOR"]["goalie_status"], "Fallback")
+        self.assertAlmostEqual(lookup["TOR"]["opp_g_savePct_avg5"], 0.89)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,132 @@
+"""
+test_goalie_inference.py
+------------------------
+Tests for goalie_inference.py (rotation index, infer, backtest).
+
+Builds the engine from a small in-memory starter frame — no parquet needed.
+
+Run:
+    python test_goalie_inference.py -v
+"""
+
+import sys
+import unittest
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from goalie_inference import GoalieInferenceEngine, P_BACKUP_IF_B2B, P_REPEAT_IF_STREAK3
+
+
+def _history() -> pd.DataFrame:
+    """BOS: Swayman x3, Korpisalo, Swayman x2. TOR: only two starts."""
+    rows = [
+        ("BOS", "2024-10-01", "Jeremy Swayman"),
+        ("BOS", "2024-10-03", "Jeremy Swayman "),       # stray whitespace
+        ("BOS", "2024-10-05", "Jeremy Swayman"),
+        ("BOS", "2024-10-06", "Joonas Korpisalo"),
+        ("BOS", "2024-10-09", "Jeremy Swayman"),
+        ("BOS", "2024-10-11", "Jeremy Swayman"),
+        ("BOS", "2024-10-11", "Jeremy Swayman"),        # duplicate join row
+        ("TOR", "2024-10-02", "Anthony Stolarz"),
+        ("TOR", "2024-10-04", "Joseph Woll"),
+    ]
+    df = pd.DataFrame(rows, columns=["team", "gameDate", "goalieFullName"])
+    df["gamesStarted"] = 1
+    return df
+
+
+class TestRotationState(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = GoalieInferenceEngine(df=_history())
+
+    def test_latest_state(self):
+        st = self.engine.rotation_state("BOS")
+        self.assertEqual(st.last_name, "Jeremy Swayman")
+        self.assertEqual(st.last_date, date(2024, 10, 11))
+        self.assertEqual(st.consecutive, 2)
+        self.assertEqual(st.backup_name, "Joonas Korpisalo")
+        self.assertEqual(st.n_starts, 6)
+
+    def test_as_of_excludes_that_date(self):
+        st = self.engine.rotation_state("BOS", as_of="2024-10-06")
+        self.assertEqual(st.last_date, date(2024, 10, 5))
+        self.assertEqual(st.consecutive, 3)
+        self.assertEqual(st.backup_name, "")
+
+    def test_as_of_before_history_is_none(self):
+        self.assertIsNone(self.engine.rotation_state("BOS", as_of="2024-09-01"))
+
+    def test_unknown_team_is_none(self):
+        self.assertIsNone(self.engine.rotation_state("XXX"))
+
+    def test_record_start_appends(self):
+        self.engine.record_start("BOS", "2024-10-12", "Joonas Korpisalo")
+        st = self.engine.rotation_state("BOS")
+        self.assertEqual(st.last_name, "Joonas Korpisalo")
+        self.assertEqual(st.consecutive, 1)
+        self.assertEqual(st.backup_name, "Jeremy Swayman")
+
+    def test_record_start_out_of_order_rebuilds(self):
+        self.engine.record_start("BOS", "2024-10-08", "Joonas Korpisalo")
+        st = self.engine.rotation_state("BOS")
+        self.assertEqual(st.consecutive, 2)
+        self.assertEqual(st.n_starts, 7)
+        mid = self.engine.rotation_state("BOS", as_of="2024-10-09")
+        self.assertEqual(mid.last_name, "Joonas Korpisalo")
+        self.assertEqual(mid.consecutive, 2)
+
+    def test_record_start_duplicate_ignored(self):
+        self.engine.record_start("BOS", "2024-10-09", "Jeremy Swayman")
+        self.assertEqual(self.engine.rotation_state("BOS").n_starts, 6)
+
+
+class TestInfer(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = GoalieInferenceEngine(df=_history())
+
+    def test_b2b_picks_backup(self):
+        res = self.engine.infer("BOS", "2024-10-12", is_b2b=True)
+        self.assertEqual(res["name"], "Joonas Korpisalo")
+        self.assertAlmostEqual(res["confidence"], P_BACKUP_IF_B2B)
+        self.assertEqual(res["status"], "Inferred")
+
+    def test_streak_reduces_confidence(self):
+        res = self.engine.infer("BOS", "2024-10-06")
+        self.assertEqual(res["name"], "Jeremy Swayman")
+        self.assertAlmostEqual(res["confidence"], P_REPEAT_IF_STREAK3)
+
+    def test_insufficient_history_returns_none(self):
+        self.assertIsNone(self.engine.infer("TOR", "2024-10-06"))
+
+    def test_dfo_conflict_uses_dfo_name(self):
+        res = self.engine.infer("BOS", "2024-10-13", current_dfo_name="Joonas Korpisalo")
+        self.assertEqual(res["name"], "Joonas Korpisalo")
+        self.assertIn("conflict", res["reason"])
+
+
+class TestBacktest(unittest.TestCase):
+
+    def test_rows_use_only_prior_history(self):
+        frame = GoalieInferenceEngine(df=_history()).backtest()
+        # BOS starts 4-6 have >= 3 prior starts; TOR never does
+        self.assertEqual(len(frame), 3)
+        self.assertEqual(set(frame["team"]), {"BOS"})
+        first = frame.iloc[0]
+        self.assertEqual(first["game_date"], date(2024, 10, 6))
+        self.assertEqual(first["rule"], "b2b_no_backup")     # 10-05 → 10-06, no backup yet
+        self.assertFalse(first["correct"])
+
+    def test_date_window(self):
+        frame = GoalieInferenceEngine(df=_history()).backtest("2024-10-10", "2024-10-11")
+        self.assertEqual(list(frame["game_date"]), [date(2024, 10, 11)])
+        self.assertTrue(frame.iloc[0]["correct"])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
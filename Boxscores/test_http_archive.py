@@ -0,0 +1,209 @@
+"""
+test_http_archive.py
+--------------------
+Tests for http_archive.py (record / replay of Module 1 HTTP traffic).
+
+requests.get is replaced by a canned fake while recording; replay runs with
+requests.get patched to fail, so anything that reaches the network is a bug.
+
+Run:
+    python test_http_archive.py -v
+"""
+
+import json
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from datetime import date
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+import requests
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import http_archive
+from http_archive import (
+    ArchiveMiss, HttpArchive, recording, replaying, replay_build, request_key,
+)
+import module1_ingest as m1
+
+TARGET = date(2024, 11, 10)
+
+
+class _FakeResponse:
+    def __init__(self, url, payload, status=200):
+        self.url         = url
+        self.status_code = status
+        self.encoding    = "utf-8"
+        self.headers     = {"Content-Type": "application/json"}
+        self.content     = json.dumps(payload).encode() if payload is not None else b""
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class _FakeNetwork:
+    """Stands in for requests.get: a two-game slate with a tiny score history."""
+
+    def __init__(self):
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, url, params=None, **kwargs):
+        with self._lock:
+            self.calls += 1
+        tail = url.rsplit("/v1/", 1)[-1]
+        if tail.startswith("schedule/"):
+            return _FakeResponse(url, {"gameWeek": [{"date": str(TARGET), "games": [
+                self._game(1, "BOS", "TOR"), self._game(2, "NYR", "NJD")]}]})
+        if tail.startswith("score/"):
+            day = date.fromisoformat(tail.split("/")[1])
+            games = [dict(self._game(901, "BOS", "NYR"), gameState="FINAL")] \
+                if day == date(2024, 11, 9) else []
+            return _FakeResponse(url, {"games": games})
+        if tail.startswith("gamecenter/"):
+            return _FakeResponse(url, {"homeTeam": {"id": 1, "abbrev": "BOS"},
+                                       "awayTeam": {"id": 2, "abbrev": "NYR"}, "plays": []})
+        return _FakeResponse(url, None, status=404)
+
+    @staticmethod
+    def _game(gid, home, away):
+        return {"id": gid, "gameType": 2, "season": 20242025,
+                "homeTeam": {"abbrev": home}, "awayTeam": {"abbrev": away}}
+
+
+def _offline(*_a, **_kw):
+    raise AssertionError("replay touched the network")
+
+
+class TestArchive(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.url  = "https://api-web.nhle.com/v1/score/2024-11-09"
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_record_then_replay_roundtrip(self):
+        with patch.object(http_archive.requests, "get", _FakeNetwork()):
+            with recording(self.root, TARGET):
+                live = http_archive.get(self.url, timeout=5).json()
+        with patch.object(http_archive.requests, "get", _offline):
+            with replaying(self.root, TARGET):
+                r = http_archive.get(self.url, timeout=5)
+        self.assertEqual(r.status_code, 200)
+        self.assertEqual(r.json(), live)
+
+    def test_status_codes_preserved(self):
+        url = "https://api-web.nhle.com/v1/unknown"
+        with patch.object(http_archive.requests, "get", _FakeNetwork()):
+            with recording(self.root, TARGET):
+                http_archive.get(url)
+        with replaying(self.root, TARGET):
+            r = http_archive.get(url)
+        self.assertEqual(r.status_code, 404)
+        with self.assertRaises(requests.HTTPError):
+            r.raise_for_status()
+
+    def test_miss_is_a_request_exception(self):
+        with replaying(self.root, TARGET):
+            with self.assertRaises(requests.RequestException) as cm:
+                http_archive.get(self.url)
+        self.assertIsInstance(cm.exception, ArchiveMiss)
+
+    def test_nhl_get_miss_costs_nothing(self):
+        with patch.object(m1.time, "sleep") as sleep, replaying(self.root, TARGET, latency_ms=50):
+            t0 = time.perf_counter()
+            self.assertIsNone(m1.nhl_get(self.url))
+            elapsed = time.perf_counter() - t0
+        sleep.assert_not_called()
+        self.assertLess(elapsed, 0.05)
+
+    def test_params_are_part_of_the_key(self):
+        self.assertNotEqual(request_key(self.url, {"a": 1}), request_key(self.url, {"a": 2}))
+        self.assertEqual(request_key(self.url, {"a": 1, "b": 2}),
+                         request_key(self.url, {"b": 2, "a": 1}))
+
+    def test_replay_latency_applied(self):
+        with patch.object(http_archive.requests, "get", _FakeNetwork()):
+            with recording(self.root, TARGET):
+                http_archive.get(self.url)
+        with replaying(self.root, TARGET, latency_ms=30):
+            t0 = time.perf_counter()
+            http_archive.get(self.url)
+        self.assertGreaterEqual(time.perf_counter() - t0, 0.03)
+
+    def test_jitter_is_deterministic(self):
+        self.assertEqual(http_archive._jitter(self.url, 50), http_archive._jitter(self.url, 50))
+        self.assertLess(http_archive._jitter(self.url, 50), 50)
+
+    def test_mode_restored_after_block(self):
+        with replaying(self.root, TARGET):
+            self.assertEqual(http_archive.current_mode(), "replay")
+        self.assertEqual(http_archive.current_mode(), "live")
+
+
+class TestReplayDate(unittest.TestCase):
+    """The goalie scrape infers as of the slate date, not the wall clock."""
+
+    def test_scrape_gets_target_date(self):
+        seen = {}
+        def fake_scrape(game_ids_by_matchup=None, game_date=None):
+            seen["game_date"] = game_date
+            return []
+        games = [{"away_team": "TOR", "home_team": "BOS", "game_id": 1}]
+        with patch.object(m1, "SCRAPER_AVAILABLE", True), \
+                patch.object(m1, "scrape_starting_goalies", fake_scrape, create=True):
+            m1._scrape_goalies(games, TARGET)
+        self.assertEqual(seen["game_date"], TARGET)
+
+
+class TestReplayBuild(unittest.TestCase):
+    """build_today_contexts recorded once, then rebuilt offline."""
+
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.patches = [
+            patch.object(m1, "DELAY", 0.0),
+            patch.object(m1, "SCRAPER_AVAILABLE", False),
+            patch.object(m1, "_load_parquets", lambda: (pd.DataFrame(), pd.DataFrame())),
+        ]
+        for p in self.patches:
+            p.start()
+        self.net = _FakeNetwork()
+        with patch.object(http_archive.requests, "get", self.net), patch("builtins.print"):
+            with http_archive.isolated_ingest(), recording(self.root, TARGET):
+                self.live = m1.build_today_contexts(TARGET)
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_every_request_archived(self):
+        self.assertEqual(len(HttpArchive(self.root, TARGET).entries()), self.net.calls)
+
+    def test_replay_matches_live(self):
+        with patch.object(http_archive.requests, "get", _offline):
+            ctxs, tracer = replay_build(TARGET, self.root, max_workers=4)
+        self.assertEqual([(c.game_id, c.home.rest_days, c.away.rest_days) for c in ctxs],
+                         [(c.game_id, c.home.rest_days, c.away.rest_days) for c in self.live])
+        self.assertEqual(tracer.root.counters.get("replay_misses", 0), 0)
+        self.assertEqual(tracer.root.counters["replay_hits"], self.net.calls)
+
+    def test_replay_leaves_real_pbp_cache_alone(self):
+        before = m1.PBP_CACHE
+        with patch.object(http_archive.requests, "get", _offline):
+            replay_build(TARGET, self.root)
+        self.assertEqual(m1.PBP_CACHE, before)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
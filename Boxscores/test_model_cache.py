@@ -0,0 +1,110 @@
+"""
+test_model_cache.py
+-------------------
+Tests for model_cache.py (warm in-process model cache + batch scoring).
+
+Uses small sklearn models pickled to a temp dir — no real model files.
+
+Run:
+    python test_model_cache.py -v
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from model_cache import load_pickle, load_model, score_batch, clear_cache, cache_info
+
+try:
+    from sklearn.linear_model import LogisticRegression
+    from sklearn.isotonic import IsotonicRegression
+    SKLEARN_OK = True
+except ImportError:
+    SKLEARN_OK = False
+
+
+def _fit_model_and_calibrator():
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 3))
+    y = (X[:, 0] + rng.normal(scale=0.5, size=200) > 0).astype(int)
+    model = LogisticRegression().fit(X, y)
+    raw = model.predict_proba(X)[:, 1]
+    cal = IsotonicRegression(out_of_bounds="clip").fit(raw, y)
+    return X, model, cal
+
+
+@unittest.skipUnless(SKLEARN_OK, "sklearn not installed")
+class TestModelCache(unittest.TestCase):
+
+    def setUp(self):
+        clear_cache()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self.tmp.name)
+        self.X, self.model, self.cal = _fit_model_and_calibrator()
+        self.model_path = self.dir / "model.pkl"
+        self.cal_path = self.dir / "cal.pkl"
+        for obj, path in ((self.model, self.model_path), (self.cal, self.cal_path)):
+            with open(path, "wb") as f:
+                pickle.dump(obj, f)
+
+    def tearDown(self):
+        clear_cache()
+        self.tmp.cleanup()
+
+    def test_second_load_is_cache_hit(self):
+        first = load_pickle(self.model_path)
+        second = load_pickle(self.model_path)
+        self.assertIs(first, second)
+        info = cache_info()
+        self.assertEqual(info["misses"], 1)
+        self.assertEqual(info["hits"], 1)
+
+    def test_mtime_change_reloads(self):
+        first = load_pickle(self.model_path)
+        with open(self.model_path, "wb") as f:
+            pickle.dump(self.model, f)
+        st = os.stat(self.model_path)
+        os.utime(self.model_path, ns=(st.st_atime_ns, st.st_mtime_ns + 10_000_000))
+        second = load_pickle(self.model_path)
+        self.assertIsNot(first, second)
+
+    def test_missing_file_raises(self):
+        with self.assertRaises(FileNotFoundError):
+            load_pickle(self.dir / "nope.pkl")
+
+    def test_unknown_extension_raises(self):
+        with self.assertRaises(ValueError):
+            load_model(self.dir / "model.bin")
+
+    def test_score_batch_matches_direct_predict(self):
+        result = score_batch(self.X, self.model_path, self.cal_path)
+        raw = self.model.predict_proba(self.X)[:, 1]
+        np.testing.assert_allclose(result.raw_probs, raw)
+        np.testing.assert_allclose(result.probs, self.cal.predict(raw))
+        self.assertEqual(len(result), len(self.X))
+
+    def test_score_batch_reports_timings(self):
+        result = score_batch(self.X, self.model_path, self.cal_path)
+        for key in ("load_ms", "predict_ms", "calibrate_ms"):
+            self.assertIn(key, result.timings)
+            self.assertGreaterEqual(result.timings[key], 0.0)
+        self.assertEqual(result.timings["rows"], len(self.X))
+
+    def test_missing_calibrator_returns_raw(self):
+        result = score_batch(self.X, self.model_path, self.dir / "absent.pkl")
+        np.testing.assert_allclose(result.probs, result.raw_probs)
+
+    def test_requires_model_or_path(self):
+        with self.assertRaises(ValueError):
+            score_batch(self.X)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
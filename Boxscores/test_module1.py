@@ -8,6 +8,7 @@ Tests are grouped into:
   B. NHL API connectivity tests (live network) — skipped if offline
   C. GameContext construction tests (dataclass integrity)
   D. Parquet integration tests (skipped if files absent)
+  E. Concurrent context build (mocked NHL API, no network)
 
 Run with:
     python test_module1.py
@@ -17,8 +18,10 @@ Run with:
 import sys
 import math
 import json
+import threading
 import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import date, datetime
 from unittest.mock import patch, MagicMock
@@ -520,6 +523,148 @@ class TestGoalieParquet(unittest.TestCase):
             self.assertIsInstance(gsaa, float)
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# SECTION E — Concurrent context build (mocked NHL API)
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class _FakeNHL:
+    """Routes nhl_get URLs to canned payloads and counts calls per URL."""
+
+    TARGET = date(2024, 11, 10)
+
+    def __init__(self):
+        self.calls: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, url, retries=3):
+        with self._lock:
+            self.calls[url] = self.calls.get(url, 0) + 1
+        tail = url.rsplit("/v1/", 1)[1]
+        if tail.startswith("schedule/"):
+            return {"gameWeek": [{"date": str(self.TARGET), "games": [
+                self._sched(1, "BOS", "TOR"), self._sched(2, "NYR", "NJD")]}]}
+        if tail.startswith("score/"):
+            day = date.fromisoformat(tail.split("/")[1])
+            if day == date(2024, 11, 9):
+                return {"games": [self._final(901, "BOS", "NYR")]}
+            if day == date(2024, 11, 7):
+                return {"games": [self._final(902, "TOR", "NJD")]}
+            return {"games": []}
+        if tail.startswith("gamecenter/"):
+            gid = int(tail.split("/")[1])
+            return {"homeTeam": {"id": 1, "abbrev": "X"},
+                    "awayTeam": {"id": 2, "abbrev": "Y"}, "plays": [], "id": gid}
+        return None
+
+    @staticmethod
+    def _sched(gid, home, away):
+        return {"id": gid, "gameType": 2, "season": 20242025,
+                "homeTeam": {"abbrev": home}, "awayTeam": {"abbrev": away}}
+
+    @staticmethod
+    def _final(gid, home, away):
+        return {"id": gid, "gameState": "FINAL",
+                "homeTeam": {"abbrev": home}, "awayTeam": {"abbrev": away}}
+
+
+class TestSingleFlight(unittest.TestCase):
+
+    def test_concurrent_callers_share_one_fetch(self):
+        calls = []
+        gate  = threading.Event()
+        def slow(key):
+            calls.append(key)
+            gate.wait(1)
+            return key * 2
+        memo = m1._SingleFlight(slow)
+        with ThreadPoolExecutor(max_workers=4) as ex:
+            futs = [ex.submit(memo, 21) for _ in range(4)]
+            time.sleep(0.05)
+            gate.set()
+            results = [f.result() for f in futs]
+        self.assertEqual(results, [42] * 4)
+        self.assertEqual(calls, [21])
+
+    def test_exception_propagates_to_waiters(self):
+        def boom(key):
+            raise ValueError(key)
+        memo = m1._SingleFlight(boom)
+        with self.assertRaises(ValueError):
+            memo("x")
+        with self.assertRaises(ValueError):
+            memo("x")
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_pool_keeps_serial_request_rate(self):
+        stamps = []
+        with patch.object(m1, "DELAY", 0.05), \
+                patch.object(m1, "_NHL_RATE", m1._RateLimiter()), \
+                patch.object(m1, "fetch_score_day", lambda day: stamps.append(time.monotonic())):
+            with ThreadPoolExecutor(max_workers=8) as ex:
+                list(ex.map(m1._fetch_score_polite, range(8)))
+        stamps.sort()
+        gaps = [b - a for a, b in zip(stamps, stamps[1:])]
+        self.assertGreaterEqual(min(gaps), 0.045)
+
+
+class TestConcurrentBuild(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        import pandas as pd
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.fake = _FakeNHL()
+        self.patches = [
+            patch.object(m1, "nhl_get", self.fake),
+            patch.object(m1, "DELAY", 0.0),
+            patch.object(m1, "SCRAPER_AVAILABLE", False),
+            patch.object(m1, "PBP_CACHE", Path(self.tmp.name) / "pbp"),
+            patch.object(m1, "ODDS_LOG", Path(self.tmp.name) / "odds.csv"),
+            patch.object(m1, "_load_parquets", lambda: (pd.DataFrame(), pd.DataFrame())),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def _build(self, **kw):
+        with patch("builtins.print"):
+            return m1.build_today_contexts(_FakeNHL.TARGET, **kw)
+
+    def test_contexts_in_schedule_order(self):
+        ctxs = self._build()
+        self.assertEqual([c.game_id for c in ctxs], [1, 2])
+        self.assertEqual(ctxs[0].home.team, "BOS")
+
+    def test_rest_days_from_shared_scoreboard(self):
+        ctxs = self._build(fetch_advanced=False)
+        self.assertEqual(ctxs[0].home.rest_days, 1)       # BOS played 11-09
+        self.assertTrue(ctxs[0].home.is_b2b)
+        self.assertEqual(ctxs[0].away.rest_days, 3)       # TOR played 11-07
+
+    def test_each_scoreboard_day_fetched_once(self):
+        self._build(max_workers=8)
+        score_calls = {u: n for u, n in self.fake.calls.items() if "/score/" in u}
+        self.assertTrue(score_calls)
+        self.assertEqual(set(score_calls.values()), {1})
+
+    def test_each_pbp_game_fetched_once(self):
+        self._build(max_workers=8)
+        pbp_calls = [n for u, n in self.fake.calls.items() if "play-by-play" in u]
+        self.assertEqual(sorted(pbp_calls), [1, 1])        # games 901 + 902
+
+    def test_sequential_pool_matches_concurrent(self):
+        one  = self._build(max_workers=1)
+        many = self._build(max_workers=8)
+        self.assertEqual([(c.game_id, c.home.rest_days, c.away.rest_days) for c in one],
+                         [(c.game_id, c.home.rest_days, c.away.rest_days) for c in many])
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # RUNNER
 # ═══════════════════════════════════════════════════════════════════════════════
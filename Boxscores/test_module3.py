@@ -7,8 +7,8 @@ Groups:
   A. PickCard dataclass
   B. Weighted average synthesis
   C. SKIP logic
-  D. Meta-learner (fit / predict)
-  E. SQLite logging
+  D. Meta-learner (fit / predict / persistence)
+  E. SQLite logging + batch synthesis
   F. Weight recalibration
   G. Full M1→M2→M3 pipeline smoke test
 
@@ -25,6 +25,7 @@ from pathlib import Path
 from datetime import date
 from dataclasses import dataclass, field
 from typing import Optional
+from unittest.mock import patch
 
 BASE = Path(__file__).parent
 sys.path.insert(0, str(BASE))
@@ -434,6 +435,83 @@ class TestMetaLearner(unittest.TestCase):
         # The key check is that it doesn't silently corrupt state
 
 
+@unittest.skipUnless(SKLEARN_OK, "sklearn not installed")
+class TestMetaLearnerPersistence(unittest.TestCase):
+
+    def setUp(self):
+        import tempfile
+        self.tmp   = tempfile.TemporaryDirectory()
+        self.db    = Path(self.tmp.name) / "picks.db"
+        self.synth = make_synthesizer(self.db)
+        self._populate(40)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _populate(self, n, start=0):
+        import random
+        random.seed(start)
+        for i in range(start, start + n):
+            home_win = int(random.random() > 0.45)
+            score    = 0.62 if home_win else 0.38
+            signals  = [make_signal(aid, "home" if home_win else "away",
+                                    score + random.gauss(0, 0.03), 0.70)
+                        for aid in AGENT_ORDER]
+            ctx = MockGameCtx(game_id=5000 + i)
+            self.synth.synthesize(signals, ctx, mode="weighted_avg", log=True)
+            self.synth.log_outcome(5000 + i, ctx.game_date, "BOS", "TOR", home_win)
+
+    def _fresh(self) -> MasterSynthesizer:
+        """New synthesizer sharing the same DB connection (simulates restart)."""
+        synth = make_synthesizer(self.db)
+        synth._conn = self.synth._conn
+        return synth
+
+    def test_fit_persists_model_file(self):
+        self.synth.fit_from_db()
+        self.assertTrue(self.synth._is_fitted)
+        self.assertTrue(self.db.with_suffix(".meta.pkl").exists())
+
+    def test_restart_without_new_outcomes_loads_persisted(self):
+        self.synth.fit_from_db()
+        fresh = self._fresh()
+        with patch.object(MasterSynthesizer, "_fit_matrix",
+                          side_effect=AssertionError("should not refit")):
+            fresh.fit_from_db()
+        self.assertTrue(fresh._is_fitted)
+        self.assertEqual(fresh._watermark, self.synth._watermark)
+
+    def test_new_outcome_triggers_refit(self):
+        self.synth.fit_from_db()
+        old_mark = self.synth._watermark
+        self._populate(1, start=100)
+        fresh = self._fresh()
+        with patch.object(MasterSynthesizer, "_fit_matrix",
+                          wraps=fresh._fit_matrix) as fit:
+            fresh.fit_from_db()
+            self.assertEqual(fit.call_count, 1)
+        self.assertNotEqual(fresh._watermark, old_mark)
+
+    def test_same_process_no_new_outcomes_is_noop(self):
+        self.synth.fit_from_db()
+        model = self.synth._model
+        self.synth.fit_from_db()
+        self.assertIs(self.synth._model, model)
+
+    def test_force_refits(self):
+        self.synth.fit_from_db()
+        model = self.synth._model
+        self.synth.fit_from_db(force=True)
+        self.assertIsNot(self.synth._model, model)
+
+    def test_in_memory_db_does_not_persist(self):
+        synth = make_synthesizer()
+        synth._conn = self.synth._conn
+        synth.fit_from_db()
+        self.assertTrue(synth._is_fitted)
+        self.assertIsNone(synth._meta_model_path())
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # E. SQLite logging
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -511,6 +589,106 @@ class TestSQLiteLogging(unittest.TestCase):
         df = self.synth.picks_dataframe(days=30)
         self.assertIsNotNone(df)
 
+    def test_pick_signals_rows_written_per_agent(self):
+        signals = make_full_signals("home", conf=0.72)
+        self.synth.synthesize(signals, self.ctx, mode="weighted_avg", log=True)
+        rows = self.synth._conn.execute(
+            "SELECT agent_id, raw_score, confidence, direction FROM pick_signals"
+        ).fetchall()
+        self.assertEqual(sorted(r[0] for r in rows), sorted(AGENT_ORDER))
+        by_agent = {s.agent_id: s for s in signals}
+        for aid, raw, conf, direction in rows:
+            self.assertAlmostEqual(raw,  by_agent[aid].raw_score,  places=4)
+            self.assertAlmostEqual(conf, by_agent[aid].confidence, places=4)
+            self.assertEqual(direction, by_agent[aid].pick_direction)
+
+    def test_pick_signals_backfilled_for_legacy_rows(self):
+        from picks_db import BACKFILL_PICK_SIGNALS
+        conn = self.synth._conn
+        conn.execute("DROP TRIGGER trg_picks_signals_ins")
+        conn.execute("""
+            INSERT INTO picks (created_at, game_id, confidence_tier, signals_json)
+            VALUES (datetime('now'), 1, 'HIGH', ?)
+        """, (json.dumps({"team_form": {"raw_score": 0.6, "confidence": 0.7,
+                                        "direction": "home"}}),))
+        conn.execute("""
+            INSERT INTO picks (created_at, game_id, confidence_tier, signals_json)
+            VALUES (datetime('now'), 2, 'HIGH', 'not json')
+        """)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM pick_signals").fetchone()[0], 0)
+        conn.execute(BACKFILL_PICK_SIGNALS)
+        rows = conn.execute("SELECT agent_id, raw_score FROM pick_signals").fetchall()
+        self.assertEqual(rows, [("team_form", 0.6)])
+
+    def test_resolved_matrix_matches_json_features(self):
+        signals = make_full_signals("home", conf=0.72)
+        card = self.synth.synthesize(signals, self.ctx, mode="weighted_avg", log=True)
+        self.synth.log_outcome(card.game_id, card.game_date, "BOS", "TOR", 1)
+        X, y = self.synth._load_resolved_matrix()
+        self.assertEqual(X.shape, (1, len(AGENT_ORDER) * 2))
+        self.assertEqual(y.tolist(), [1])
+        expected = [round(v, 4) for v in _signals_to_feature_vector(signals)]
+        for got, want in zip(X[0].tolist(), expected):
+            self.assertAlmostEqual(got, want, places=4)
+
+
+class TestBatchSynthesis(unittest.TestCase):
+
+    def setUp(self):
+        self.synth = make_synthesizer()
+        self.slate = [make_full_signals("home", conf=0.72),
+                      make_full_signals("away", conf=0.72),
+                      [make_signal(aid, "home", 0.63, 0.30) for aid in AGENT_ORDER]]
+        self.ctxs  = [MockGameCtx(game_id=100 + i) for i in range(len(self.slate))]
+
+    def _fit(self):
+        sigs, outs = TestMetaLearner._make_training_data(self)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.synth.fit(sigs, outs)
+
+    def test_batch_matches_single_weighted(self):
+        cards  = self.synth.synthesize_batch(self.slate, self.ctxs, mode="weighted_avg", log=False)
+        single = [self.synth.synthesize(s, c, mode="weighted_avg", log=False)
+                  for s, c in zip(self.slate, self.ctxs)]
+        self.assertEqual([c.game_id for c in cards], [100, 101, 102])
+        for b, o in zip(cards, single):
+            self.assertEqual((b.pick, b.raw_score, b.confidence_tier),
+                             (o.pick, o.raw_score, o.confidence_tier))
+
+    @unittest.skipUnless(SKLEARN_OK, "sklearn not installed")
+    def test_batch_matches_single_meta_with_one_predict(self):
+        self._fit()
+        single = [self.synth.synthesize(s, c, mode="meta_learner", log=False)
+                  for s, c in zip(self.slate, self.ctxs)]
+        with patch.object(self.synth._model, "predict_proba",
+                          wraps=self.synth._model.predict_proba) as pp:
+            cards = self.synth.synthesize_batch(self.slate, self.ctxs,
+                                                mode="meta_learner", log=False)
+            self.assertEqual(pp.call_count, 1)
+        for b, o in zip(cards, single):
+            self.assertEqual(b.mode_used, o.mode_used)
+            self.assertAlmostEqual(b.raw_score, o.raw_score, places=4)
+        self.assertEqual(cards[2].confidence_tier, "SKIP")
+
+    def test_batch_logs_all_cards(self):
+        self.synth.synthesize_batch(self.slate, self.ctxs, mode="weighted_avg", log=True)
+        n = self.synth._conn.execute("SELECT COUNT(*) FROM picks").fetchone()[0]
+        self.assertEqual(n, len(self.slate))
+        n_sig = self.synth._conn.execute("SELECT COUNT(*) FROM pick_signals").fetchone()[0]
+        self.assertEqual(n_sig, len(self.slate) * len(AGENT_ORDER))
+
+    def test_batch_without_contexts(self):
+        cards = self.synth.synthesize_batch(self.slate, mode="weighted_avg", log=False)
+        self.assertEqual(len(cards), len(self.slate))
+
+    def test_batch_length_mismatch_raises(self):
+        with self.assertRaises(ValueError):
+            self.synth.synthesize_batch(self.slate, self.ctxs[:1], log=False)
+
+    def test_empty_slate(self):
+        self.assertEqual(self.synth.synthesize_batch([], [], log=True), [])
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # F. Weight recalibration
@@ -24,6 +24,7 @@ from unittest.mock import patch
 from feedback import (
     FeedbackEngine,
     ResolveResult,
+    RangeResolveResult,
     AgentPerformance,
     TierStats,
     WeeklyReport,
@@ -54,6 +55,7 @@ def _make_engine(fetcher=None) -> FeedbackEngine:
     from feedback import _PICKS_DDL, _OUTCOMES_DDL
     conn.executescript(_PICKS_DDL)
     conn.executescript(_OUTCOMES_DDL)
+    FeedbackEngine._init_aggregates(conn)
     conn.commit()
     engine._conn = conn
     return engine
@@ -321,6 +323,109 @@ class TestResolveDate(unittest.TestCase):
         self.assertIn("written=3", str(r))
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# TestResolveRange
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestResolveRange(unittest.TestCase):
+
+    DAYS = {
+        "2024-11-14": [{"game_id": 11, "home_team": "BOS", "away_team": "TOR",
+                        "home_score": 4, "away_score": 2}],
+        "2024-11-15": [{"game_id": 21, "home_team": "EDM", "away_team": "VAN",
+                        "home_score": 1, "away_score": 3},
+                       {"game_id": 22, "home_team": "NYR", "away_team": "NJD",
+                        "home_score": 2, "away_score": 2, "gameState": "LIVE"}],
+        "2024-11-16": [],
+    }
+
+    def _engine(self, days=None, fail=()):
+        days  = days or self.DAYS
+        calls = []
+        def fetcher(url):
+            d = url.rsplit("/", 1)[-1]
+            calls.append(d)
+            if d in fail:
+                raise ConnectionError("down")
+            return _make_nhl_api_response(days.get(d, []))
+        engine = _make_engine(fetcher=fetcher)
+        engine.persist_weights = lambda w: None
+        return engine, calls
+
+    def _outcome_rows(self, engine):
+        return engine._get_conn().execute(
+            "SELECT game_id, game_date, home_win, home_score, away_score "
+            "FROM outcomes ORDER BY game_id"
+        ).fetchall()
+
+    def test_fetches_every_date_once(self):
+        engine, calls = self._engine()
+        engine.resolve_range("2024-11-14", "2024-11-16")
+        self.assertEqual(sorted(calls), ["2024-11-14", "2024-11-15", "2024-11-16"])
+
+    def test_writes_finals_with_their_date(self):
+        engine, _ = self._engine()
+        result = engine.resolve_range("2024-11-14", "2024-11-16")
+        self.assertIsInstance(result, RangeResolveResult)
+        self.assertEqual(result.games_final, 2)
+        self.assertEqual(result.outcomes_written, 2)
+        rows = [tuple(r) for r in self._outcome_rows(engine)]
+        self.assertEqual(rows, [(11, "2024-11-14", 1, 4, 2),
+                                (21, "2024-11-15", 0, 1, 3)])
+
+    def test_second_run_reports_no_changes(self):
+        engine, _ = self._engine()
+        engine.resolve_range("2024-11-14", "2024-11-16")
+        result = engine.resolve_range("2024-11-14", "2024-11-16")
+        self.assertEqual(result.changed, [])
+        self.assertEqual(result.unchanged, 2)
+        self.assertEqual(result.outcomes_written, 0)
+
+    def test_corrected_score_is_rewritten(self):
+        engine, _ = self._engine()
+        _insert_outcome(engine, 11, "2024-11-14", "BOS", "TOR",
+                        home_win=0, home_score=1, away_score=2)
+        result = engine.resolve_range("2024-11-14", "2024-11-14")
+        self.assertEqual([g["game_id"] for g in result.changed], [11])
+        self.assertEqual(tuple(self._outcome_rows(engine)[0]), (11, "2024-11-14", 1, 4, 2))
+
+    def test_weights_recomputed_once(self):
+        engine, _ = self._engine()
+        calls = []
+        engine.update_weights = lambda *a, **kw: calls.append(1) or {}
+        engine.resolve_range("2024-11-14", "2024-11-16")
+        self.assertEqual(calls, [1])
+        engine.resolve_range("2024-11-14", "2024-11-16")     # nothing changed
+        self.assertEqual(calls, [1])
+
+    def test_picks_matched_counts_changed_games_only(self):
+        engine, _ = self._engine()
+        _insert_pick(engine, 11, "2024-11-14", "BOS", "TOR")
+        _insert_pick(engine, 21, "2024-11-15", "EDM", "VAN")
+        _insert_outcome(engine, 11, "2024-11-14", "BOS", "TOR",
+                        home_win=1, home_score=4, away_score=2)
+        result = engine.resolve_range("2024-11-14", "2024-11-15")
+        self.assertEqual(result.picks_matched, 1)
+
+    def test_failed_date_does_not_block_others(self):
+        engine, _ = self._engine(fail={"2024-11-14"})
+        result = engine.resolve_range("2024-11-14", "2024-11-16")
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(result.dates_fetched, 2)
+        self.assertEqual(result.outcomes_written, 1)
+
+    def test_dates_subset(self):
+        engine, calls = self._engine()
+        engine.resolve_range("2024-11-14", "2024-11-16", dates=["2024-11-15"])
+        self.assertEqual(calls, ["2024-11-15"])
+
+    def test_dry_run_does_not_write(self):
+        engine, _ = self._engine()
+        result = engine.resolve_range("2024-11-14", "2024-11-16", dry_run=True)
+        self.assertEqual(len(result.changed), 2)
+        self.assertEqual(self._outcome_rows(engine), [])
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TestAgentAccuracy
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -735,6 +840,89 @@ class TestWeeklyReport(unittest.TestCase):
         self.assertEqual(len(report.weight_updates), len(AGENT_ORDER))
 
 
+# ═══════════════════════════════════════════════════════════════════════════════
+# Daily summary + SQL aggregation
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestDailySummary(unittest.TestCase):
+
+    def _summary(self, engine, game_date) -> dict:
+        rows = engine._get_conn().execute(
+            "SELECT confidence_tier, n_picks, wins, losses, unresolved "
+            "FROM daily_summary WHERE game_date = ?", (game_date,)
+        ).fetchall()
+        return {r["confidence_tier"]: tuple(r)[1:] for r in rows}
+
+    def test_pick_insert_adds_unresolved_row(self):
+        engine = _make_engine()
+        _insert_pick(engine, 1, "2025-01-10", "BOS", "TOR", confidence_tier="HIGH")
+        _insert_pick(engine, 2, "2025-01-10", "NYR", "NJD", confidence_tier="HIGH")
+        self.assertEqual(self._summary(engine, "2025-01-10"), {"HIGH": (2, 0, 0, 2)})
+
+    def test_written_outcomes_resolve_summary(self):
+        engine = _make_engine()
+        _insert_pick(engine, 1, "2025-01-10", "BOS", "TOR", pick_direction="home")
+        _insert_pick(engine, 2, "2025-01-10", "NYR", "NJD", pick_direction="away")
+        engine._write_outcomes([
+            {"game_id": 1, "game_date": "2025-01-10", "home_team": "BOS",
+             "away_team": "TOR", "home_win": 1},
+            {"game_id": 2, "game_date": "2025-01-10", "home_team": "NYR",
+             "away_team": "NJD", "home_win": 1},
+        ])
+        self.assertEqual(self._summary(engine, "2025-01-10"), {"MEDIUM": (2, 1, 1, 0)})
+
+    def test_replaced_outcome_regrades(self):
+        engine = _make_engine()
+        _insert_pick(engine, 1, "2025-01-10", "BOS", "TOR")
+        _insert_outcome(engine, 1, "2025-01-10", "BOS", "TOR", home_win=0)
+        _insert_outcome(engine, 1, "2025-01-10", "BOS", "TOR", home_win=1)
+        self.assertEqual(self._summary(engine, "2025-01-10"), {"MEDIUM": (1, 1, 0, 0)})
+
+    def test_deleted_pick_leaves_summary(self):
+        engine = _make_engine()
+        _insert_pick(engine, 1, "2025-01-10", "BOS", "TOR")
+        engine._get_conn().execute("DELETE FROM picks WHERE game_id = 1")
+        self.assertEqual(self._summary(engine, "2025-01-10"), {})
+
+    def test_legacy_db_is_backfilled(self):
+        conn = sqlite3.connect(":memory:")
+        conn.row_factory = sqlite3.Row
+        from feedback import _PICKS_DDL, _OUTCOMES_DDL
+        conn.executescript(_PICKS_DDL)
+        conn.executescript(_OUTCOMES_DDL)
+        engine = _make_engine()
+        engine._conn = conn
+        _insert_pick(engine, 1, "2025-01-10", "BOS", "TOR", confidence_tier="LOW")
+        _insert_outcome(engine, 1, "2025-01-10", "BOS", "TOR", home_win=1)
+        FeedbackEngine._init_aggregates(conn)
+        self.assertEqual(self._summary(engine, "2025-01-10"), {"LOW": (1, 1, 0, 0)})
+        n_signals = conn.execute("SELECT COUNT(*) FROM pick_signals").fetchone()[0]
+        self.assertEqual(n_signals, len(AGENT_ORDER))
+
+    def test_agent_stats_respect_confidence_floor(self):
+        engine = _make_engine()
+        sig = json.dumps({
+            "team_form":   {"raw_score": 0.70, "confidence": 0.80},
+            "goalie_form": {"raw_score": 0.70, "confidence": 0.40},
+        })
+        for gid in range(10):
+            _insert_pick(engine, gid, "2025-01-10", "BOS", "TOR", signals_json=sig)
+            _insert_outcome(engine, gid, "2025-01-10", "BOS", "TOR",
+                            home_win=int(gid < 8))
+        stats = {ap.agent_id: ap for ap in engine.compute_agent_stats(window_n=20)}
+        self.assertEqual(stats["team_form"].n_picks, 10)
+        self.assertEqual(stats["team_form"].n_wins, 8)
+        self.assertEqual(stats["goalie_form"].n_picks, 0)
+
+    def test_agent_stats_window_limits_picks(self):
+        engine = _make_engine()
+        for gid in range(10):
+            _insert_pick(engine, gid, f"2025-01-{gid + 1:02d}", "BOS", "TOR")
+            _insert_outcome(engine, gid, f"2025-01-{gid + 1:02d}", "BOS", "TOR", home_win=1)
+        stats = engine.compute_agent_stats(window_n=4)
+        self.assertTrue(all(ap.n_picks == 4 for ap in stats))
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TestTierStats
 # ═══════════════════════════════════════════════════════════════════════════════
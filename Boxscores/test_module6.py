@@ -597,6 +597,121 @@ class TestRunFull(unittest.TestCase):
         result = orch.run_full("2024-11-01")
         self.assertGreater(result.elapsed_seconds, 0.0)
 
+    def test_batch_synthesis_used_when_available(self):
+        calls = []
+        class BatchSynth(MockSynthesizer):
+            def synthesize(self, *a, **kw):
+                raise AssertionError("per-game path should not be used")
+            def synthesize_batch(self, signal_lists, contexts, mode="auto", log=True):
+                calls.append(len(signal_lists))
+                return [MockCard() for _ in signal_lists]
+        contexts = [MockContext(), MockContext(), MockContext()]
+        orch   = _make_orch(contexts=contexts, synthesizer=BatchSynth())
+        result = orch.run_full("2024-11-01")
+        self.assertEqual(calls, [3])
+        self.assertEqual(len(result.pick_cards), 3)
+
+    def test_batch_failure_falls_back_per_game(self):
+        class FlakyBatch(MockSynthesizer):
+            def synthesize_batch(self, *a, **kw):
+                raise RuntimeError("batch down")
+        contexts = [MockContext(), MockContext()]
+        orch   = _make_orch(contexts=contexts, synthesizer=FlakyBatch())
+        result = orch.run_full("2024-11-01")
+        self.assertEqual(len(result.pick_cards), 2)
+        self.assertTrue(any("batch" in e.lower() for e in result.errors))
+
+    def test_stage_seconds_recorded(self):
+        orch   = _make_orch(contexts=[MockContext(), MockContext()])
+        result = orch.run_full("2024-11-01")
+        for stage in ("fetch_contexts", "agents", "synthesis", "script"):
+            self.assertIn(stage, result.stage_seconds)
+
+    def test_trace_written_as_jsonl(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            orch = _make_orch(contexts=[MockContext(), MockContext()])
+            orch.trace_path = Path(tmp) / "trace.jsonl"
+            result = orch.run_full("2024-11-01")
+            rows = [json.loads(line) for line in
+                    orch.trace_path.read_text().splitlines()]
+        self.assertEqual(result.trace_path, str(orch.trace_path))
+        self.assertEqual(rows[0]["name"], "run_full")
+        self.assertEqual(sum(r["name"] == "agents" for r in rows), 2)
+
+    def test_parallel_agents_keep_context_order(self):
+        import time as _time
+        class SlowFirstAgent(MockAgent):
+            def analyze(self, ctx):
+                # later games finish first
+                _time.sleep(0.02 * (ord(ctx.home.team[0]) % 5))
+                return MockSignal(self.agent_id)
+        contexts = [MockContext(home=h, away="X") for h in "ABCDEFGH"]
+        seen = []
+        class RecordingSynth(MockSynthesizer):
+            def synthesize(self, signals, ctx, mode="auto", log=True):
+                seen.append(ctx.home.team)
+                return super().synthesize(signals, ctx, mode=mode, log=log)
+        orch = _make_orch(config=_make_config(agent_workers=4), contexts=contexts,
+                          agents=[SlowFirstAgent(), MockAgent("goalie_form")],
+                          synthesizer=RecordingSynth())
+        orch.run_full("2024-11-01")
+        self.assertEqual(seen, list("ABCDEFGH"))
+
+    def test_parallel_agents_one_span_per_game(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            contexts = [MockContext(home=h, away="X") for h in "ABCD"]
+            orch = _make_orch(config=_make_config(agent_workers=3), contexts=contexts,
+                              agents=[MockAgent("team_form"), MockAgent("goalie_form")])
+            orch.trace_path = Path(tmp) / "trace.jsonl"
+            orch.run_full("2024-11-01")
+            rows = [json.loads(line) for line in
+                    orch.trace_path.read_text().splitlines()]
+        games = {r["span_id"]: r["attrs"]["game"] for r in rows if r["name"] == "agents"}
+        self.assertEqual(sorted(games.values()), ["X @ A", "X @ B", "X @ C", "X @ D"])
+        agent_rows = [r for r in rows if r["name"].startswith("agent:")]
+        self.assertEqual(len(agent_rows), 8)
+        for r in agent_rows:
+            self.assertEqual(games[r["parent_id"]], r["attrs"]["game"])
+
+    def test_failing_agent_drops_only_its_game(self):
+        class PickyAgent(MockAgent):
+            def analyze(self, ctx):
+                if ctx.home.team == "C":
+                    raise ValueError("bad feed")
+                return MockSignal(self.agent_id)
+        contexts = [MockContext(home=h, away="X") for h in "ABCD"]
+        orch   = _make_orch(config=_make_config(agent_workers=3), contexts=contexts,
+                            agents=[PickyAgent()])
+        result = orch.run_full("2024-11-01")
+        self.assertEqual(len(result.pick_cards), 3)
+        self.assertEqual(result.errors, ["X @ C: bad feed"])
+
+    def test_slow_agent_times_out_without_blocking(self):
+        import threading
+        release = threading.Event()
+        class StuckAgent(MockAgent):
+            def analyze(self, ctx):
+                if ctx.home.team == "B":
+                    release.wait(5)
+                return MockSignal(self.agent_id)
+        contexts = [MockContext(home=h, away="X") for h in "ABC"]
+        orch = _make_orch(config=_make_config(agent_workers=2, agent_timeout=0.2),
+                          contexts=contexts, agents=[StuckAgent()])
+        try:
+            result = orch.run_full("2024-11-01")
+        finally:
+            release.set()
+        self.assertEqual(len(result.pick_cards), 2)
+        self.assertTrue(any("timed out" in e for e in result.errors))
+        self.assertLess(result.elapsed_seconds, 3.0)
+
+    def test_serial_mode_matches_parallel(self):
+        contexts = [MockContext(home=h, away="X") for h in "ABCD"]
+        serial   = _make_orch(config=_make_config(agent_workers=1), contexts=contexts)
+        parallel = _make_orch(config=_make_config(agent_workers=4), contexts=contexts)
+        self.assertEqual(len(serial.run_full("2024-11-01").pick_cards),
+                         len(parallel.run_full("2024-11-01").pick_cards))
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # 8. run_script_only
@@ -664,6 +779,20 @@ class TestRunReport(unittest.TestCase):
         orch.run_report("2024-11-01")
         self.assertEqual(calls, ["2024-11-01"])
 
+    def test_prefers_resolve_range(self):
+        calls = []
+        class RangeFeedback(MockFeedback):
+            def resolve_date(self, game_date, dry_run=False):
+                raise AssertionError("per-date path should not be used")
+            def resolve_range(self, start, end, dates=None, dry_run=False):
+                calls.append((start, end, dates))
+                return types.SimpleNamespace(errors=[])
+
+        orch = _make_orch(feedback=RangeFeedback())
+        orch.run_report("2024-11-08")
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(calls[0][:2], ("2024-11-01", "2024-11-08"))
+
     def test_calls_weekly_report(self):
         calls = []
         class TrackingFeedback(MockFeedback):
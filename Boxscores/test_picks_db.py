@@ -0,0 +1,172 @@
+"""
+test_picks_db.py
+----------------
+Tests for picks_db.py (shared SQLite connection manager).
+
+Uses temp-dir DB files so WAL / busy_timeout behave as on disk.
+
+Run:
+    python test_picks_db.py -v
+"""
+
+import sqlite3
+import sys
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from picks_db import (
+    get_db, close_all, transaction, query_stats, BUSY_TIMEOUT_MS,
+    PICK_SIGNALS_DDL, apply_pick_signals,
+)
+
+
+class TestPicksDB(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "mas_picks.db"
+
+    def tearDown(self):
+        close_all()
+        self.tmp.cleanup()
+
+    def test_same_path_shares_connection(self):
+        a = get_db(self.path).connect()
+        b = get_db(str(self.path)).connect()
+        self.assertIs(a, b)
+
+    def test_memory_is_private(self):
+        self.assertIsNot(get_db(":memory:").connect(), get_db(":memory:").connect())
+
+    def test_wal_and_busy_timeout(self):
+        db   = get_db(self.path)
+        conn = db.connect()
+        self.assertEqual(db.journal_mode, "wal")
+        self.assertEqual(conn.execute("PRAGMA busy_timeout").fetchone()[0], BUSY_TIMEOUT_MS)
+
+    def test_migration_runs_once(self):
+        calls = []
+        def migrate(conn):
+            calls.append(1)
+            conn.execute("CREATE TABLE IF NOT EXISTS t (x INTEGER)")
+        db = get_db(self.path)
+        db.connect(migrations=[("m", migrate)])
+        db.connect(migrations=[("m", migrate)])
+        self.assertEqual(len(calls), 1)
+        self.assertIn("m", db.applied_migrations)
+
+    def test_transaction_commits_and_rolls_back(self):
+        conn = get_db(self.path).connect()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        with transaction(conn):
+            conn.execute("INSERT INTO t VALUES (1)")
+        with self.assertRaises(RuntimeError):
+            with transaction(conn):
+                conn.execute("INSERT INTO t VALUES (2)")
+                raise RuntimeError("boom")
+        self.assertEqual([r[0] for r in conn.execute("SELECT x FROM t")], [1])
+
+    def test_nested_transaction_joins_outer(self):
+        conn = get_db(self.path).connect()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        with transaction(conn):
+            conn.execute("INSERT INTO t VALUES (1)")
+            with transaction(conn):
+                conn.execute("INSERT INTO t VALUES (2)")
+            self.assertTrue(conn.in_transaction)
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM t").fetchone()[0], 2)
+
+    def test_stray_implicit_transaction_is_not_an_outer_block(self):
+        conn = get_db(self.path).connect()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.commit()
+        conn.execute("INSERT INTO t VALUES (1)")      # unlocked write, left open
+        self.assertTrue(conn.in_transaction)
+        with transaction(conn):
+            conn.execute("INSERT INTO t VALUES (2)")
+        self.assertFalse(conn.in_transaction)
+        other = sqlite3.connect(str(self.path))
+        try:
+            self.assertEqual(other.execute("SELECT COUNT(*) FROM t").fetchone()[0], 2)
+        finally:
+            other.close()
+
+    def test_reader_not_blocked_by_open_write(self):
+        conn = get_db(self.path).connect()
+        conn.execute("CREATE TABLE t (x INTEGER)")
+        conn.execute("INSERT INTO t VALUES (1)")
+        conn.commit()
+        other = sqlite3.connect(str(self.path), timeout=0.1)
+        try:
+            with transaction(conn):
+                conn.execute("INSERT INTO t VALUES (2)")
+                self.assertEqual(other.execute("SELECT COUNT(*) FROM t").fetchone()[0], 1)
+        finally:
+            other.close()
+
+    def test_query_stats_recorded(self):
+        conn = get_db(self.path).connect()
+        for _ in range(3):
+            conn.execute("SELECT   1")
+        stat = next(s for s in query_stats(conn) if s.sql == "SELECT 1")
+        self.assertEqual(stat.calls, 3)
+        self.assertGreaterEqual(stat.max_ms, 0.0)
+
+    def test_unwritable_path_falls_back_with_warning(self):
+        blocker = Path(self.tmp.name) / "file"
+        blocker.write_text("x")
+        db = get_db(blocker / "sub" / "mas_picks.db")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            conn = db.connect()
+        self.assertTrue(db.in_memory)
+        self.assertTrue(any("in-memory" in str(w.message) for w in caught))
+        self.assertEqual(conn.execute("SELECT 1").fetchone()[0], 1)
+
+
+class TestSharedAcrossModules(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "mas_picks.db"
+
+    def tearDown(self):
+        close_all()
+        self.tmp.cleanup()
+
+    def test_synthesizer_and_feedback_share_one_connection(self):
+        from module3_synthesizer import MasterSynthesizer
+        from feedback import FeedbackEngine
+        synth  = MasterSynthesizer(db_path=self.path)
+        engine = FeedbackEngine(db_path=self.path,
+                                weights_path=Path(self.tmp.name) / "w.json")
+        self.assertIs(synth._get_conn(), engine._get_conn())
+        tables = {r[0] for r in engine._get_conn().execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertTrue({"picks", "outcomes", "pick_signals", "daily_summary"} <= tables)
+
+    def test_outcome_logged_by_synthesizer_visible_to_feedback(self):
+        from module3_synthesizer import MasterSynthesizer
+        from feedback import FeedbackEngine
+        synth  = MasterSynthesizer(db_path=self.path)
+        engine = FeedbackEngine(db_path=self.path,
+                                weights_path=Path(self.tmp.name) / "w.json")
+        synth.log_outcome(1, "2025-01-10", "BOS", "TOR", 1)
+        n = engine._get_conn().execute("SELECT COUNT(*) FROM outcomes").fetchone()[0]
+        self.assertEqual(n, 1)
+
+    def test_pick_signals_schema_defined_once(self):
+        import feedback
+        import module3_synthesizer as m3
+        self.assertIn(PICK_SIGNALS_DDL, m3._SCHEMA)
+        self.assertIs(feedback.apply_pick_signals, apply_pick_signals)
+        self.assertFalse(hasattr(feedback, "_SIGNALS_DDL"))
+        self.assertFalse(hasattr(m3, "_BACKFILL_SIGNALS"))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
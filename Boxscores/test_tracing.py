@@ -0,0 +1,126 @@
+"""
+test_tracing.py
+---------------
+Tests for tracing.py (timing spans, counters, JSONL trace, profiling).
+
+Run:
+    python test_tracing.py -v
+"""
+
+import contextvars
+import json
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+from io import StringIO
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import tracing
+from tracing import Tracer, profiled
+
+
+class TestTracer(unittest.TestCase):
+
+    def test_helpers_are_noops_without_tracer(self):
+        with tracing.span("x"):
+            tracing.count("http_calls")
+        self.assertIsNone(tracing.current_tracer())
+
+    def test_nested_spans_link_to_parent(self):
+        tracer = Tracer()
+        with tracer.activate():
+            with tracing.span("stage") as outer:
+                with tracing.span("game", game="TOR@BOS") as inner:
+                    pass
+        self.assertEqual(inner.parent_id, outer.span_id)
+        self.assertEqual(outer.parent_id, tracer.root.span_id)
+        self.assertEqual(inner.attrs, {"game": "TOR@BOS"})
+
+    def test_counters_roll_up(self):
+        tracer = Tracer()
+        with tracer.activate():
+            with tracing.span("stage") as stage:
+                for _ in range(2):
+                    with tracing.span("game"):
+                        tracing.count("http_calls")
+                        tracing.count("bytes_read", 500)
+        self.assertEqual(stage.counters, {"http_calls": 2, "bytes_read": 1000})
+        self.assertEqual(tracer.root.counters["http_calls"], 2)
+
+    def test_summary_groups_by_name(self):
+        tracer = Tracer()
+        with tracer.activate():
+            for _ in range(3):
+                with tracing.span("agents"):
+                    pass
+            with tracing.span("synthesis"):
+                pass
+        summary = {st.name: st for st in tracer.summary()}
+        self.assertEqual(summary["agents"].n, 3)
+        self.assertEqual(list(tracer.stage_seconds()), ["agents", "synthesis"])
+
+    def test_error_recorded_and_reraised(self):
+        tracer = Tracer()
+        with self.assertRaises(ValueError):
+            with tracer.activate():
+                with tracing.span("bad"):
+                    raise ValueError("boom")
+        self.assertIn("boom", tracer.spans[0].error)
+
+    def test_copied_context_attaches_worker_spans(self):
+        tracer = Tracer()
+        with tracer.activate():
+            with tracing.span("pool") as pool_span:
+                def work():
+                    with tracing.span("task"):
+                        tracing.count("http_calls")
+                ctxs = [contextvars.copy_context() for _ in range(3)]
+                with ThreadPoolExecutor(max_workers=2) as ex:
+                    list(ex.map(lambda c: c.run(work), ctxs))
+        tasks = [s for s in tracer.spans if s.name == "task"]
+        self.assertEqual(len(tasks), 3)
+        self.assertTrue(all(t.parent_id == pool_span.span_id for t in tasks))
+        self.assertEqual(pool_span.counters["http_calls"], 3)
+
+    def test_write_jsonl_appends(self):
+        tracer = Tracer("run_full", target_date="2024-11-01")
+        with tracer.activate():
+            with tracing.span("fetch_contexts"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "t.jsonl"
+            tracer.write_jsonl(path)
+            tracer.write_jsonl(path)
+            rows = [json.loads(l) for l in path.read_text().splitlines()]
+        self.assertEqual(len(rows), 4)
+        self.assertEqual(rows[0]["attrs"], {"target_date": "2024-11-01"})
+        self.assertEqual(rows[1]["name"], "fetch_contexts")
+
+
+class TestProfiled(unittest.TestCase):
+
+    def test_off_is_passthrough(self):
+        with profiled(None):
+            x = 1
+        self.assertEqual(x, 1)
+
+    def test_cprofile_writes_stats(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            out = Path(tmp) / "run"
+            with redirect_stdout(StringIO()):
+                with profiled("cprofile", out):
+                    sum(range(1000))
+            self.assertTrue(out.with_suffix(".prof").exists())
+
+    def test_unknown_mode_raises(self):
+        with self.assertRaises(ValueError):
+            with profiled("perf"):
+                pass
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,323 @@
+"""
+tracing.py
+----------
+Lightweight stage / per-game timing spans for the NHL MAS pipeline.
+
+run_full used to record one elapsed_seconds. A Tracer records nested spans
+(schedule fetch → rest-day walk → goalie scrape → parquet load → per-game
+context → agents → synthesis → script), each with wall time and counters
+(http_calls, cache_hits, bytes_read, …). Counters roll up into the enclosing
+spans, so a stage total includes everything done inside it.
+
+Instrumented code never needs a Tracer handle — it calls the module-level
+span() / count() helpers, which are no-ops unless a tracer is active in the
+current context:
+
+    with tracing.span("advanced_stats", team=team):
+        ...
+        tracing.count("http_calls")
+        tracing.count("bytes_read", len(r.content))
+
+Entry points:
+    tracer = Tracer()
+    with tracer.activate():          # make it current for this context
+        ...
+    tracer.write_jsonl(path)         # one JSON object per span
+    tracer.print_summary()           # per-stage table
+
+    with profiled("cprofile", out_path): ...   # optional CPU profile
+
+Threads: spans follow contextvars, so work submitted to a pool must run in a
+copied context (contextvars.copy_context().run) to attach to the caller's span,
+or through an open_span(...).run(fn) handle when several pool tasks belong to
+one span that the caller closes once they are all done.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import cProfile
+import io
+import itertools
+import json
+import pstats
+import threading
+import time
+import uuid
+import warnings
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Iterator, Optional
+
+try:
+    from pyinstrument import Profiler as _PyInstrumentProfiler
+    PYINSTRUMENT_AVAILABLE = True
+except ImportError:
+    PYINSTRUMENT_AVAILABLE = False
+
+PROFILE_MODES = ("cprofile", "pyinstrument")
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Spans
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@dataclass
+class Span:
+    """One timed region. Counters are inclusive of child spans."""
+    name:        str
+    span_id:     int
+    parent_id:   Optional[int]
+    start_ms:    float                      # offset from tracer start
+    duration_ms: float = 0.0
+    attrs:       dict  = field(default_factory=dict)
+    counters:    dict  = field(default_factory=dict)
+    thread:      str   = ""
+    error:       str   = ""
+
+    def add(self, key: str, n: float = 1) -> None:
+        self.counters[key] = self.counters.get(key, 0) + n
+
+
+@dataclass
+class StageSummary:
+    """All spans sharing one name, aggregated."""
+    name:     str
+    n:        int   = 0
+    total_ms: float = 0.0
+    max_ms:   float = 0.0
+    counters: dict  = field(default_factory=dict)
+
+    @property
+    def mean_ms(self) -> float:
+        return self.total_ms / self.n if self.n else 0.0
+
+
+_CURRENT: contextvars.ContextVar[Optional[tuple["Tracer", Span]]] = \
+    contextvars.ContextVar("mas_trace_span", default=None)
+
+
+class Tracer:
+    """Collects spans for one run. Thread-safe; spans nest via contextvars."""
+
+    def __init__(self, name: str = "run", **attrs):
+        self.trace_id  = uuid.uuid4().hex[:12]
+        self._t0       = time.perf_counter()
+        self._ids      = itertools.count(1)
+        self._lock     = threading.Lock()
+        self.spans:    list[Span] = []
+        self.root      = Span(name=name, span_id=0, parent_id=None, start_ms=0.0,
+                              attrs=dict(attrs), thread=threading.current_thread().name)
+
+    def _now_ms(self) -> float:
+        return (time.perf_counter() - self._t0) * 1000
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """Make this tracer (root span) current; closes the root span on exit."""
+        token = _CURRENT.set((self, self.root))
+        try:
+            yield self
+        finally:
+            _CURRENT.reset(token)
+            self.root.duration_ms = self._now_ms()
+
+    def _start(self, name: str, parent: Optional[Span], attrs: dict) -> tuple[Span, Span]:
+        cur = _CURRENT.get()
+        if parent is None:
+            parent = cur[1] if cur is not None and cur[0] is self else self.root
+        sp = Span(name=name, span_id=next(self._ids), parent_id=parent.span_id,
+                  start_ms=self._now_ms(), attrs=attrs,
+                  thread=threading.current_thread().name)
+        return sp, parent
+
+    def _finish(self, sp: Span, parent: Span) -> None:
+        sp.duration_ms = self._now_ms() - sp.start_ms
+        with self._lock:
+            for k, v in sp.counters.items():
+                parent.add(k, v)
+            self.spans.append(sp)
+
+    @contextmanager
+    def span(self, name: str, parent: Optional[Span] = None, **attrs) -> Iterator[Span]:
+        sp, parent = self._start(name, parent, attrs)
+        token = _CURRENT.set((self, sp))
+        try:
+            yield sp
+        except BaseException as exc:
+            sp.error = f"{type(exc).__name__}: {exc}"
+            raise
+        finally:
+            _CURRENT.reset(token)
+            self._finish(sp, parent)
+
+    # ── Output ───────────────────────────────────────────────────────────────
+
+    def records(self) -> list[dict]:
+        """Root first, then spans in start order — one dict per span."""
+        rows = []
+        for sp in [self.root] + sorted(self.spans, key=lambda s: s.start_ms):
+            d = asdict(sp)
+            d["trace_id"]    = self.trace_id
+            d["start_ms"]    = round(d["start_ms"], 3)
+            d["duration_ms"] = round(d["duration_ms"], 3)
+            rows.append(d)
+        return rows
+
+    def write_jsonl(self, path: Path) -> Path:
+        """Append this trace to `path` (one JSON object per line)."""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for rec in self.records():
+                f.write(json.dumps(rec, default=str) + "\n")
+        return path
+
+    def summary(self) -> list[StageSummary]:
+        """Aggregate spans by name, in order of first appearance."""
+        out: dict[str, StageSummary] = {}
+        for sp in sorted(self.spans, key=lambda s: s.start_ms):
+            st = out.setdefault(sp.name, StageSummary(name=sp.name))
+            st.n        += 1
+            st.total_ms += sp.duration_ms
+            st.max_ms    = max(st.max_ms, sp.duration_ms)
+            for k, v in sp.counters.items():
+                st.counters[k] = st.counters.get(k, 0) + v
+        return list(out.values())
+
+    def stage_seconds(self) -> dict[str, float]:
+        """{span name: total seconds} — compact form stored on RunResult."""
+        return {st.name: round(st.total_ms / 1000, 3) for st in self.summary()}
+
+    def print_summary(self) -> None:
+        total = self.root.duration_ms or self._now_ms()
+        print(f"\n  {'STAGE':<22s} {'N':>4s} {'TOTAL':>9s} {'MEAN':>8s} {'MAX':>8s}  COUNTERS")
+        print(f"  {'─' * 74}")
+        for st in self.summary():
+            ctrs = "  ".join(f"{k}={_fmt_count(k, v)}" for k, v in sorted(st.counters.items()))
+            print(f"  {st.name:<22s} {st.n:>4d} {st.total_ms / 1000:>8.2f}s "
+                  f"{st.mean_ms:>7.0f}ms {st.max_ms:>7.0f}ms  {ctrs}")
+        root = "  ".join(f"{k}={_fmt_count(k, v)}" for k, v in sorted(self.root.counters.items()))
+        print(f"  {'─' * 74}")
+        print(f"  {'run total':<22s} {'':>4s} {total / 1000:>8.2f}s  {root}")
+
+
+def _fmt_count(key: str, v: float) -> str:
+    if key.startswith("bytes"):
+        return f"{v / 1e6:.1f}MB" if v >= 1e6 else f"{v / 1e3:.0f}kB"
+    return f"{int(v)}"
+
+
+# ── Module-level helpers (no-ops when no tracer is active) ────────────────────
+
+def current_tracer() -> Optional[Tracer]:
+    cur = _CURRENT.get()
+    return cur[0] if cur is not None else None
+
+
+def span(name: str, **attrs):
+    """Child span of the current span, or a null context when not tracing."""
+    cur = _CURRENT.get()
+    if cur is None:
+        return nullcontext()
+    return cur[0].span(name, parent=cur[1], **attrs)
+
+
+class OpenSpan:
+    """
+    A span opened here and closed explicitly later, for work fanned out over
+    threads: run(fn, ...) calls fn (from any thread) with this span current,
+    so spans fn opens become its children. close() is idempotent.
+    """
+
+    def __init__(self, tracer: Optional[Tracer], name: str, parent: Optional[Span], attrs: dict):
+        self._tracer = tracer
+        self._closed = tracer is None
+        if tracer is not None:
+            self.span, self._parent = tracer._start(name, parent, attrs)
+
+    def run(self, fn, *args, **kwargs):
+        if self._tracer is None:
+            return fn(*args, **kwargs)
+        return contextvars.copy_context().run(self._run, fn, args, kwargs)
+
+    def _run(self, fn, args, kwargs):
+        _CURRENT.set((self._tracer, self.span))
+        return fn(*args, **kwargs)
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._tracer._finish(self.span, self._parent)
+
+
+def open_span(name: str, **attrs) -> OpenSpan:
+    """Child span of the current span, closed by the caller (no-op when not tracing)."""
+    cur = _CURRENT.get()
+    if cur is None:
+        return OpenSpan(None, name, None, attrs)
+    return OpenSpan(cur[0], name, cur[1], attrs)
+
+
+def count(key: str, n: float = 1) -> None:
+    """Add to a counter on the current span (rolled up to its ancestors on exit)."""
+    cur = _CURRENT.get()
+    if cur is not None:
+        with cur[0]._lock:
+            cur[1].add(key, n)
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# Profiling
+# ═══════════════════════════════════════════════════════════════════════════════
+
+@contextmanager
+def profiled(mode: Optional[str], out_path: Optional[Path] = None, top: int = 25):
+    """
+    Optional CPU profile around a block.
+
+    mode: None (off) | "cprofile" | "pyinstrument" (falls back to cProfile
+    if pyinstrument isn't installed). cProfile stats are dumped to
+    out_path (.prof, loadable with snakeviz / pstats); pyinstrument writes
+    an HTML report. The top functions are printed either way.
+    """
+    if not mode:
+        yield
+        return
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"profile mode must be one of {PROFILE_MODES}, got {mode!r}")
+
+    if mode == "pyinstrument" and not PYINSTRUMENT_AVAILABLE:
+        warnings.warn("pyinstrument not installed — falling back to cProfile")
+        mode = "cprofile"
+
+    if mode == "pyinstrument":
+        prof = _PyInstrumentProfiler()
+        prof.start()
+        try:
+            yield
+        finally:
+            prof.stop()
+            print(prof.output_text(unicode=True, color=False))
+            if out_path is not None:
+                out_path = Path(out_path).with_suffix(".html")
+                out_path.parent.mkdir(parents=True, exist_ok=True)
+                out_path.write_text(prof.output_html(), encoding="utf-8")
+                print(f"  💾 Profile → {out_path}")
+        return
+
+    prof = cProfile.Profile()
+    prof.enable()
+    try:
+        yield
+    finally:
+        prof.disable()
+        buf = io.StringIO()
+        pstats.Stats(prof, stream=buf).sort_stats("cumulative").print_stats(top)
+        print(buf.getvalue())
+        if out_path is not None:
+            out_path = Path(out_path).with_suffix(".prof")
+            out_path.parent.mkdir(parents=True, exist_ok=True)
+            prof.dump_stats(str(out_path))
+            print(f"  💾 Profile → {out_path}")
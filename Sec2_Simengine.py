@@ -11,6 +11,8 @@ import numpy as np
 # NOTE: to avoid circular imports, Sec5 data are pulled lazily inside functions.
 from Sec1_Core_Inj import apply_injury_adjustments, injuries, season_injury_impact
 from Sec1_Core_Inj import predict_xg as _predict_xg
+from playlog import GameLog
+from rosters import roster_for
 
 # =========================
 # SECTION 2 CONSTANTS
@@ -36,18 +38,9 @@ def predict_xg(features):
 # --- Shot-by-shot simulation with xg + shooter multipliers ---
 def simulate_game_shots(h_exp, a_exp, h_goalie, a_goalie, h_team, a_team):
     # lazy import to avoid circular dependency
-    from Sec5_endstats import team_stats, goalies, team_rosters
+    from Sec5_endstats import team_stats, goalies
 
-    play_log = []
-
-    def pick_shooter(team):
-        roster = team_rosters.get(team, [])
-        if not roster:
-            return {"name": "Generic Player", "factor": 1.0}
-        shot = random.choice(roster)
-        if isinstance(shot, str):
-            return {"name": shot, "factor": 1.0}
-        return shot
+    play_log = GameLog()     # columnar; reads back as event dicts
 
     h_shots = int(np.random.normal(SHOTS_PER_GAME, 5) * (h_exp / 3.0))
     a_shots = int(np.random.normal(SHOTS_PER_GAME, 5) * (a_exp / 3.0))
@@ -65,12 +58,17 @@ def simulate_game_shots(h_exp, a_exp, h_goalie, a_goalie, h_team, a_team):
     h_pp_boost = (team_stats[h_team]["PP"] - team_stats[a_team]["PK"]) / 200.0
     a_pp_boost = (team_stats[a_team]["PP"] - team_stats[h_team]["PK"]) / 200.0
 
+    # Shooters for every shot (+1 empty-net attempt) in one weighted draw per team
+    h_roster, a_roster = roster_for(h_team), roster_for(a_team)
+    h_pick = h_roster.draw(h_shots + 1)
+    a_pick = a_roster.draw(a_shots + 1)
+
     h_goals = 0
     a_goals = 0
 
     # Home EV
-    for _ in range(h_ev_shots):
-        shooter = pick_shooter(h_team)
+    for k in h_pick[:h_ev_shots]:
+        shooter, factor = h_roster.names[k], h_roster.factors[k]
         features = {
             "distance_ft": np.random.uniform(5, 60),
             "angle_deg": np.random.uniform(0, 60),
@@ -79,17 +77,15 @@ def simulate_game_shots(h_exp, a_exp, h_goalie, a_goalie, h_team, a_team):
             "rush": random.random() < 0.15,
             "strength": "5v5"
         }
-        xg = predict_xg(features) * shooter.get("factor",1.0)
+        xg = predict_xg(features) * factor
         prob_goal = xg * (1 - a_goalie_sv)
         is_goal = np.random.rand() < prob_goal
         if is_goal: h_goals += 1
-        play_log.append({"team":h_team,"type":"EV","result":"GOAL" if is_goal else "MISS",
-                         "goalie":goalies[a_team][h_goalie]["name"],
-                         "shooter":shooter["name"],"xg":xg,"prob_goal":prob_goal})
+        play_log.add(h_team, "EV", is_goal, goalies[a_team][h_goalie]["name"], shooter, xg, prob_goal)
 
     # Home PP
-    for _ in range(h_pp_shots):
-        shooter = pick_shooter(h_team)
+    for k in h_pick[h_ev_shots:h_shots]:
+        shooter, factor = h_roster.names[k], h_roster.factors[k]
         features = {
             "distance_ft": np.random.uniform(5, 60),
             "angle_deg": np.random.uniform(0, 60),
@@ -98,17 +94,15 @@ def simulate_game_shots(h_exp, a_exp, h_goalie, a_goalie, h_team, a_team):
             "rush": random.random() < 0.15,
             "strength": "PP"
         }
-        xg = predict_xg(features) * shooter.get("factor",1.0) * (1 + h_pp_boost)
+        xg = predict_xg(features) * factor * (1 + h_pp_boost)
         prob_goal = xg * (1 - a_goalie_sv)
         is_goal = np.random.rand() < prob_goal
         if is_goal: h_goals += 1
-        play_log.append({"team":h_team,"type":"PP","result":"GOAL" if is_goal else "MISS",
-                         "goalie":goalies[a_team][h_goalie]["name"],
-                         "shooter":shooter["name"],"xg":xg,"prob_goal":prob_goal})
+        play_log.add(h_team, "PP", is_goal, goalies[a_team][h_goalie]["name"], shooter, xg, prob_goal)
 
     # Away EV
-    for _ in range(a_ev_shots):
-        shooter = pick_shooter(a_team)
+    for k in a_pick[:a_ev_shots]:
+        shooter, factor = a_roster.names[k], a_roster.factors[k]
         features = {
             "distance_ft": np.random.uniform(5, 60),
             "angle_deg": np.random.uniform(0, 60),
@@ -117,17 +111,15 @@ def simulate_game_shots(h_exp, a_exp, h_goalie, a_goalie, h_team, a_team):
             "rush": random.random() < 0.15,
             "strength": "5v5"
         }
-        xg = predict_xg(features) * shooter.get("factor",1.0)
+        xg = predict_xg(features) * factor
         prob_goal = xg * (1 - h_goalie_sv)
         is_goal = np.random.rand() < prob_goal
         if is_goal: a_goals += 1
-        play_log.append({"team":a_team,"type":"EV","result":"GOAL" if is_goal else "MISS",
-                         "goalie":goalies[h_team][a_goalie]["name"],
-                         "shooter":shooter["name"],"xg":xg,"prob_goal":prob_goal})
+        play_log.add(a_team, "EV", is_goal, goalies[h_team][a_goalie]["name"], shooter, xg, prob_goal)
 
     # Away PP
-    for _ in range(a_pp_shots):
-        shooter = pick_shooter(a_team)
+    for k in a_pick[a_ev_shots:a_shots]:
+        shooter, factor = a_roster.names[k], a_roster.factors[k]
         features = {
             "distance_ft": np.random.uniform(5, 60),
             "angle_deg": np.random.uniform(0, 60),
@@ -136,40 +128,36 @@ def simulate_game_shots(h_exp, a_exp, h_goalie, a_goalie, h_team, a_team):
             "rush": random.random() < 0.15,
             "strength": "PP"
         }
-        xg = predict_xg(features) * shooter.get("factor",1.0) * (1 + a_pp_boost)
+        xg = predict_xg(features) * factor * (1 + a_pp_boost)
         prob_goal = xg * (1 - h_goalie_sv)
         is_goal = np.random.rand() < prob_goal
         if is_goal: a_goals += 1
-        play_log.append({"team":a_team,"type":"PP","result":"GOAL" if is_goal else "MISS",
-                         "goalie":goalies[h_team][a_goalie]["name"],
-                         "shooter":shooter["name"],"xg":xg,"prob_goal":prob_goal})
+        play_log.add(a_team, "PP", is_goal, goalies[h_team][a_goalie]["name"], shooter, xg, prob_goal)
 
     # Pulled goalie EN
     if abs(h_goals - a_goals) <= 2:
         if h_goals < a_goals:
-            shooter = pick_shooter(a_team)
+            k = a_pick[a_shots]
+            shooter, factor = a_roster.names[k], a_roster.factors[k]
             features = {"distance_ft": np.random.uniform(60, 200),
                         "angle_deg": 0, "shot_type": "EN",
                         "rebound": False, "rush": False, "strength": "EN"}
-            xg = predict_xg(features) * shooter.get("factor",1.0)
+            xg = predict_xg(features) * factor
             prob_goal = min(0.9, xg + 0.1)
             is_goal = np.random.rand() < prob_goal
             if is_goal: a_goals += 1
-            play_log.append({"team":a_team,"type":"EN","result":"GOAL" if is_goal else "MISS",
-                             "goalie":"Empty Net","shooter":shooter["name"],
-                             "xg":xg,"prob_goal":prob_goal})
+            play_log.add(a_team, "EN", is_goal, "Empty Net", shooter, xg, prob_goal)
         elif a_goals < h_goals:
-            shooter = pick_shooter(h_team)
+            k = h_pick[h_shots]
+            shooter, factor = h_roster.names[k], h_roster.factors[k]
             features = {"distance_ft": np.random.uniform(60, 200),
                         "angle_deg": 0, "shot_type": "EN",
                         "rebound": False, "rush": False, "strength": "EN"}
-            xg = predict_xg(features) * shooter.get("factor",1.0)
+            xg = predict_xg(features) * factor
             prob_goal = min(0.9, xg + 0.1)
             is_goal = np.random.rand() < prob_goal
             if is_goal: h_goals += 1
-            play_log.append({"team":h_team,"type":"EN","result":"GOAL" if is_goal else "MISS",
-                             "goalie":"Empty Net","shooter":shooter["name"],
-                             "xg":xg,"prob_goal":prob_goal})
+            play_log.add(h_team, "EN", is_goal, "Empty Net", shooter, xg, prob_goal)
 
     return h_goals, a_goals, h_shots, a_shots, play_log
 
@@ -7,6 +7,7 @@ from datetime import datetime
 
 # Section 2 (simulation engine)
 from Sec2_Simengine import simulate_result
+from playlog import SeasonLog
 
 def parse_date(date_str):
     return datetime.strptime(date_str, "%m/%d/%Y").date()
@@ -48,8 +49,35 @@ def update_streak(team, outcome, streak_state, season_streaks):
         streak_state[team]["current_type"] = outcome
         streak_state[team]["length"] = 1
 
+# --- Per-game results rows ---
+def _fatigue_flags(note, home, visitor):
+    """(home, visitor) fatigue flags from the Doctor's Note team sections."""
+    home_part, _, away_part = note.partition(f"\n{visitor}:")
+    return "Fatigue" in home_part, "Fatigue" in away_part
+
+def _result_rows(date, home, visitor, result, hs, vs, hshots, ashots, note):
+    """One row per side: the table Sec5 summaries group by team."""
+    ot = result in ("OTW", "OTL")
+    h_win = result in ("H", "OTW")
+    h_fat, a_fat = _fatigue_flags(note, home, visitor)
+    return [
+        {"date": date, "team": home, "opponent": visitor, "home": True,
+         "GF": hs, "GA": vs, "SF": hshots, "SA": ashots, "W": h_win, "OT": ot, "fatigue": h_fat},
+        {"date": date, "team": visitor, "opponent": home, "home": False,
+         "GF": vs, "GA": hs, "SF": ashots, "SA": hshots, "W": not h_win, "OT": ot, "fatigue": a_fat},
+    ]
+
 # --- Full League Simulation ---
-def simulate_full_league(schedule_by_date, verbose=False, track_shots=False):
+def simulate_full_league(schedule_by_date, verbose=False, track_shots=False, game_results=None,
+                         initial_state=None):
+    """
+    game_results (list or None): if given, one row per team per game is
+        appended (date, team, opponent, home, GF, GA, SF, SA, W, OT, fatigue)
+        -- the input for Sec5 team_summary / print_team_averages.
+    initial_state (season_state.SeasonState or None): start from real
+        standings / streaks / game_history (pass only the remaining schedule).
+        A private copy is used, so one state can start many runs.
+    """
     # lazy imports to avoid circular deps
     from Sec5_endstats import team_stats, team_rosters, goalies
     from Sec1_Core_Inj import (
@@ -63,12 +91,18 @@ def simulate_full_league(schedule_by_date, verbose=False, track_shots=False):
     season_injury_impact = {}
     standings = {team: {"W":0,"L":0,"OT":0,"PTS":0} for team in team_stats.keys()}
     season_stats = {team: {"GF":0,"GA":0,"SF":0,"SA":0} for team in team_stats.keys()}
-    season_logs = {}
+    season_logs = SeasonLog()     # columnar play-by-play, Mapping {(date,home,visitor): events}
     # 🔽 streak lists (for distribution) + maxima (for legacy)
     season_streaks = {team: {"W":[],"L":[],"OT":[],"maxW":0,"maxL":0,"maxOT":0} for team in team_stats.keys()}
     season_notes = {}
     streak_state = {team: {"current_type":None,"length":0} for team in team_stats.keys()}
     game_history = {}
+    if initial_state is not None:
+        state = initial_state.copy()
+        standings.update(state.standings)
+        season_streaks.update(state.season_streaks)
+        streak_state.update(state.streak_state)
+        game_history.update(state.game_history)
     injuries.clear()
 
     for date in sorted(schedule_by_date.keys()):
@@ -141,7 +175,9 @@ def simulate_full_league(schedule_by_date, verbose=False, track_shots=False):
                 season_stats[visitor]["GA"] += hs
                 season_stats[visitor]["SF"] += ashots
                 season_stats[visitor]["SA"] += hshots
-                season_logs[(date,home,visitor)] = log
+                season_logs.add((date,home,visitor), log)
+            if game_results is not None:
+                game_results.extend(_result_rows(date, home, visitor, result, hs, vs, hshots, ashots, note))
 
             if verbose:
                 print(f"{date}: {home} vs {visitor} → {hs}-{vs} ({result}), Shots {hshots}-{ashots}")
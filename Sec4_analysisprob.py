@@ -4,7 +4,16 @@
 
 import numpy as np
 import datetime
+import time
 from collections import defaultdict, Counter
+from statistics import NormalDist
+
+# --- Adaptive stopping ---
+ADAPTIVE_BATCH = 50          # runs between standard-error checks
+LEAGUE_SE_STATS  = ("avg", "median", "p25", "p75", "playoff_pct")
+MATCHUP_SE_STATS = ("team1_wins", "team2_wins", "team1_OT", "team2_OT",
+                    "one_goal_pct", "ot_pct", "avg_margin")
+_QUANTILES = {"median": 0.5, "p25": 0.25, "p75": 0.75}
 
 # ============================================================
 # Helper: bucket streak lengths into threshold labels
@@ -24,10 +33,48 @@ def _compute_probabilities(streak_values, thresholds, label_prefix):
             probs[key] = 0.0
     return probs
 
+# ============================================================
+# Helpers: standard errors for adaptive stopping
+# ============================================================
+def _se_targets(target_se, default_stat, allowed):
+    """target_se as {stat: se}; a bare number applies to default_stat."""
+    if target_se is None:
+        return None
+    targets = {default_stat: float(target_se)} if isinstance(target_se, (int, float)) else dict(target_se)
+    unknown = set(targets) - set(allowed)
+    if unknown:
+        raise ValueError(f"Unknown target_se stat(s) {sorted(unknown)}; expected {allowed}")
+    return targets
+
+
+def _pct_se(count, n):
+    """SE (percentage points) of a count/n rate; (k+1)/(n+2) keeps 0% / 100% from reading as exact."""
+    p = (count + 1) / (n + 2)
+    return float(100 * np.sqrt(p * (1 - p) / n))
+
+
+def _value_se(values, stat):
+    """SE of the mean, or of a quantile (normal approximation of the density)."""
+    arr = np.asarray(values, dtype=float)
+    n = len(arr)
+    if n < 2:
+        return float("inf")
+    sd = arr.std(ddof=1)
+    if stat not in _QUANTILES:
+        return float(sd / np.sqrt(n))
+    q = _QUANTILES[stat]
+    dens = NormalDist().pdf(NormalDist().inv_cdf(q))
+    return float(sd * np.sqrt(q * (1 - q) / n) / dens)
+
+
+def _within(se, targets):
+    return all(se[k] <= t for k, t in targets.items())
+
 # ============================================================
 # Monte Carlo League Simulation
 # ============================================================
-def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None):
+def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None, as_of=None,
+                       target_se=None, batch=ADAPTIVE_BATCH, time_budget=None):
     """
     Run Monte Carlo simulations of a full season.
     
@@ -37,12 +84,23 @@ def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None):
         debug (bool): if True, prints extra debug info
         seed (int or None): optional deterministic seed for np.random. 
             If provided, ensures reproducible results across runs.
+        as_of (date / "YYYY-MM-DD" or None): rest-of-season mode. Real
+            results before as_of seed standings, streaks and game_history
+            (season_state.season_state_as_of); only remaining games are simulated.
+        target_se (float, dict or None): adaptive mode. Seasons run in batches
+            of `batch` and stop once every team's requested statistics are
+            within their standard error, e.g. {"playoff_pct": 1.0, "median": 0.5}
+            (a number = playoff_pct, in percentage points). `runs` becomes the cap.
+        time_budget (seconds or None): hard stop after the run that crosses it.
 
     Returns:
         dict: keyed by team with summary info:
             - avg/median/p25/p75/std of points
             - streak_probs: dict with win/loss/ot probabilities
             - playoff_pct: % of runs finishing top-8 in points
+            - sampling (adaptive / time_budget only): runs used, per-stat se,
+              runs_to_target (run count from which the team stayed within target_se, or
+              None), stopped ("target" / "time" / "runs")
     """
     # optional deterministic seed
     if seed is not None:
@@ -60,10 +118,25 @@ def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None):
     }
     playoff_counts = {team: 0 for team in team_stats.keys()}
 
+    initial_state = None
+    if as_of is not None:
+        from season_state import season_state_as_of, games_left
+        initial_state, schedule_by_date = season_state_as_of(schedule_by_date, as_of)
+        if debug:
+            print(f"As of {initial_state.as_of}: {initial_state.games_played} games played, "
+                  f"{games_left(schedule_by_date)} left to simulate")
+
+    targets = _se_targets(target_se, "playoff_pct", LEAGUE_SE_STATS)
+    check_every = batch if targets else runs
+    met_at = {team: None for team in team_stats.keys()}
+    stopped = "runs"
+    t0 = time.perf_counter()
+
+    n = 0
     for i in range(runs):
         # simulate one season
         standings, _, _, season_streaks, _ = simulate_full_league(
-            schedule_by_date, verbose=False, track_shots=True
+            schedule_by_date, verbose=False, track_shots=True, initial_state=initial_state
         )
         # collect points
         team_points = {team: rec["PTS"] for team, rec in standings.items()}
@@ -84,7 +157,22 @@ def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None):
             pct = (i+1) / runs * 100
             print(f"\rMonte Carlo progress: {i+1}/{runs} ({pct:.0f}%)",
                   end="", flush=True)
+        n = i + 1
+        # adaptive stop: every team within target_se
+        if targets and (n % check_every == 0 or n == runs):
+            for team in met_at:
+                se = _league_se(final_points[team], playoff_counts[team], n, targets)
+                ok = _within(se, targets)
+                met_at[team] = (met_at[team] or n) if ok else None
+            if all(met_at.values()):
+                stopped = "target"
+                break
+        if time_budget is not None and time.perf_counter() - t0 >= time_budget:
+            stopped = "time"
+            break
     print()
+    if debug and (targets or time_budget is not None):
+        print(f"Monte Carlo stopped after {n} runs ({stopped}, {time.perf_counter() - t0:.1f}s)")
 
     # aggregate results
     results = {}
@@ -96,7 +184,7 @@ def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None):
             "p25": float(round(np.percentile(arr, 25), 1)),
             "p75": float(round(np.percentile(arr, 75), 1)),
             "std": float(round(np.std(arr), 2)),
-            "playoff_pct": round(playoff_counts[team] / runs * 100, 1)
+            "playoff_pct": round(playoff_counts[team] / n * 100, 1)
         }
         # streak probability buckets
         res["streak_probs"] = {}
@@ -109,9 +197,26 @@ def monte_carlo_league(schedule_by_date, runs=500, debug=False, seed=None):
         res["streak_probs"].update(
             _compute_probabilities(streak_collections[team]["maxOT"], [2,3,4], "ot")
         )
+        if targets or time_budget is not None:
+            se = _league_se(pts, playoff_counts[team], n, targets or {})
+            res["sampling"] = {
+                "runs": n,
+                "se": {k: round(v, 3) for k, v in se.items()},
+                "runs_to_target": met_at[team],
+                "stopped": stopped,
+            }
         results[team] = res
     return results
 
+
+def _league_se(points, playoff_count, n, targets):
+    """Current SE of each targeted league stat (playoff_pct always included)."""
+    se = {"playoff_pct": _pct_se(playoff_count, n)}
+    for stat in targets:
+        if stat != "playoff_pct":
+            se[stat] = _value_se(points, stat)
+    return se
+
 # ============================================================
 # Printer: Monte Carlo summary
 # ============================================================
@@ -140,17 +245,32 @@ def print_monte_carlo_results(results):
 # ============================================================
 # Head-to-head matchup simulation
 # ============================================================
-def simulate_matchup_probs(team1, team2, runs=500, date=None, scoreline_top_n=5):
+def simulate_matchup_probs(team1, team2, runs=500, date=None, scoreline_top_n=5, matrix=None,
+                           target_se=None, batch=ADAPTIVE_BATCH, time_budget=None):
     """
     Run Monte Carlo style H2H between two teams.
 
+    matrix (MatchupMatrix or None): precomputed home/away matrix (see
+        matchup_matrix.load_or_build). When given and it covers both teams,
+        the answer is a lookup (team1 = home) instead of `runs` fresh sims
+        (a team against itself has no matrix cell and is simulated).
+    target_se (float, dict or None): adaptive mode — simulate in batches of
+        `batch` until each requested stat is within its standard error
+        (a number = team1_wins, in percentage points; avg_margin in goals).
+        `runs` becomes the cap.
+    time_budget (seconds or None): hard stop after the game that crosses it.
+
     Returns dict with:
         - % chances of each outcome (W/L/OT split)
         - avg_margin: average (team1 goals - team2 goals) across sims
                       >0 means team1 favored, <0 means team2 favored
         - score_dist: dict of Top N most common final scorelines with %
         - close_games: grouped stats like one-goal frequency and OT%
+        - sampling (adaptive / time_budget only): runs used, se, stopped
     """
+    if matrix is not None and team1 != team2 and team1 in matrix and team2 in matrix:
+        return matrix.probs(team1, team2, scoreline_top_n=scoreline_top_n)
+
     # lazy imports
     from Sec1_Core_Inj import choose_goalie
     from Sec2_Simengine import simulate_result
@@ -161,6 +281,11 @@ def simulate_matchup_probs(team1, team2, runs=500, date=None, scoreline_top_n=5)
     one_goal_count = 0
     ot_count = 0
 
+    targets = _se_targets(target_se, "team1_wins", MATCHUP_SE_STATS)
+    stopped = "runs"
+    t0 = time.perf_counter()
+
+    n = 0
     for _ in range(runs):
         h_g = choose_goalie(team1, date or datetime.date.today(), {})
         a_g = choose_goalie(team2, date or datetime.date.today(), {})
@@ -192,9 +317,20 @@ def simulate_matchup_probs(team1, team2, runs=500, date=None, scoreline_top_n=5)
             results["team1_OT"] += 1
             ot_count += 1
 
+        n += 1
+        if targets and (n % batch == 0 or n == runs):
+            if _within(_matchup_se(results, one_goal_count, ot_count, margins, n), targets):
+                stopped = "target"
+                break
+        if time_budget is not None and time.perf_counter() - t0 >= time_budget:
+            stopped = "time"
+            break
+
+    se = _matchup_se(results, one_goal_count, ot_count, margins, n) if n else {}
+
     # convert counts to %
     for k in results:
-        results[k] = round(results[k]/runs*100, 1)
+        results[k] = round(results[k]/n*100, 1)
 
     # add average margin
     results["avg_margin"] = float(round(np.mean(margins), 2)) if margins else 0.0
@@ -202,17 +338,30 @@ def simulate_matchup_probs(team1, team2, runs=500, date=None, scoreline_top_n=5)
     # score distribution (Top N)
     most_common = score_counter.most_common(scoreline_top_n)
     results["score_dist"] = {
-        s: round(c/runs*100, 1) for s, c in most_common
+        s: round(c/n*100, 1) for s, c in most_common
     }
 
     # close games grouping
     results["close_games"] = {
-        "one_goal_pct": round(one_goal_count / runs * 100, 1),
-        "ot_pct": round(ot_count / runs * 100, 1)
+        "one_goal_pct": round(one_goal_count / n * 100, 1),
+        "ot_pct": round(ot_count / n * 100, 1)
     }
 
+    if targets or time_budget is not None:
+        results["sampling"] = {"runs": n, "se": {k: round(v, 3) for k, v in se.items()},
+                               "stopped": stopped}
+
     return results
 
+
+def _matchup_se(counts, one_goal_count, ot_count, margins, n):
+    """Current SE of every MATCHUP_SE_STATS entry."""
+    se = {k: _pct_se(c, n) for k, c in counts.items()}
+    se["one_goal_pct"] = _pct_se(one_goal_count, n)
+    se["ot_pct"] = _pct_se(ot_count, n)
+    se["avg_margin"] = _value_se(margins, "avg")
+    return se
+
 # ============================================================
 # Explicit exports
 # ============================================================
@@ -1,6 +1,10 @@
 # ============================================================
 # SECTION 5: DATA + PRINTERS
 # ============================================================
+# The literals below are fallbacks. league_state.load_league_state(as_of)
+# builds team_stats / goalies / rosters from the Boxscores parquets and
+# nhl_*_team_stats.csv; `with apply_league_state(...)` swaps them in for a
+# block. LITERAL_TEAM_STATS / LITERAL_GOALIES keep the untouched values.
 
 # --- Injury profiles ---
 injury_profiles = {
@@ -135,10 +139,16 @@ goalies = {
     "Utah Mammoth":{"starter":{"SV":0.905,"name":"Generic Starter"},"backup":{"SV":0.895,"name":"Generic Backup"}}
 }
 
+# --- Import-time copies (apply_league_state rewrites the dicts above in place) ---
+LITERAL_TEAM_STATS = {t: dict(v) for t, v in team_stats.items()}
+LITERAL_GOALIES    = {t: {k: dict(g) for k, g in v.items()} for t, v in goalies.items()}
+
 # =========================
 # IMPORTS FOR HELPERS
 # =========================
-import numpy as np
+import json
+
+import pandas as pd
 from Sec1_Core_Inj import season_injury_impact
 
 # --- Key mapping for JSON-safe exports ---
@@ -157,67 +167,123 @@ _json_key_map = {
     "H2HΔ(top8)": "h2h_delta_top8"
 }
 
+def _json_key(k):
+    return _json_key_map.get(k, k.replace("/", "_").lower())
+
 def sanitize_keys(record: dict) -> dict:
     """Return JSON-safe snake_case keys for API/export use."""
-    return {_json_key_map.get(k, k.replace("/", "_").lower()): v for k, v in record.items()}
+    return {_json_key(k): v for k, v in record.items()}
+# --- Per-game results table -> team summary ---
+TOP_TIER = {"Boston Bruins","Colorado Avalanche","Edmonton Oilers","Toronto Maple Leafs",
+            "New York Rangers","Dallas Stars","Florida Panthers","Carolina Hurricanes"}
+
+GAME_RESULT_COLUMNS = ["date", "team", "opponent", "home", "GF", "GA", "SF", "SA", "W", "OT", "fatigue"]
+
+SUMMARY_COLUMNS = ["GP", "SF/G", "SA/G", "Sh%", "Sv%", "OT%", "Diff/G", "Pace/G", "ST%", "MOV",
+                   "InjAdj", "CloseG%", "FatigueG%", "1G%", "H2HΔ(top8)"]
+
+def game_results_frame(game_results):
+    """DataFrame from the rows simulate_full_league(game_results=[...]) collects."""
+    if isinstance(game_results, pd.DataFrame):
+        return game_results
+    return pd.DataFrame(list(game_results), columns=GAME_RESULT_COLUMNS)
+
+def team_summary(game_results):
+    """
+    Per-team season metrics from the per-game results table, one group-by
+    pass (O(games)). Index = team, columns = SUMMARY_COLUMNS.
+    OT% counts OT/SO losses, matching standings["OT"].
+    """
+    df = game_results_frame(game_results)
+    if df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS).rename_axis("team")
+
+    diff = df["GF"] - df["GA"]
+    df = df.assign(
+        one_goal=(diff.abs() == 1) | df["OT"],          # OT/SO games are one-goal decisions
+        otl=df["OT"] & ~df["W"],
+        h2h=diff.where(df["opponent"].isin(TOP_TIER)),
+    )
+    g = df.groupby("team", sort=False)
+    out = g.agg(GP=("GF", "size"), GF=("GF", "sum"), GA=("GA", "sum"), SF=("SF", "sum"),
+                SA=("SA", "sum"), OTL=("otl", "sum"), one_goal=("one_goal", "mean"),
+                fatigue=("fatigue", "mean"), h2h=("h2h", "mean"))
+
+    gp = out["GP"]
+    st = pd.Series({t: team_stats[t]["PP"] + team_stats[t]["PK"] for t in out.index if t in team_stats},
+                   dtype=float)
+    inj = pd.Series({t: season_injury_impact.get(t, 0.0) for t in out.index}, dtype=float)
+
+    summary = pd.DataFrame(index=out.index)
+    summary["GP"]          = gp
+    summary["SF/G"]        = out["SF"] / gp
+    summary["SA/G"]        = out["SA"] / gp
+    summary["Sh%"]         = (out["GF"] / out["SF"] * 100).where(out["SF"] > 0, 0.0)
+    summary["Sv%"]         = (1 - out["GA"] / out["SA"]).where(out["SA"] > 0, 0.0)
+    summary["OT%"]         = out["OTL"] / gp * 100
+    summary["Diff/G"]      = (out["GF"] - out["GA"]) / gp
+    summary["Pace/G"]      = summary["SF/G"] + summary["SA/G"]
+    summary["ST%"]         = st.reindex(out.index).fillna(0.0)
+    summary["MOV"]         = summary["Diff/G"]
+    summary["InjAdj"]      = inj / gp
+    summary["CloseG%"]     = out["one_goal"] * 100
+    summary["FatigueG%"]   = out["fatigue"].astype(float) * 100
+    summary["1G%"]         = out["one_goal"] * 100
+    summary["H2HΔ(top8)"]  = out["h2h"].fillna(0.0)
+    return summary
+
+def league_ot_pct(summary):
+    """League-wide OT% (OT losses / team-games)."""
+    games = summary["GP"].sum()
+    return float((summary["OT%"] * summary["GP"]).sum() / games) if games else 0.0
+
+# --- Exports ---
+def team_summary_records(summary):
+    """JSON-ready list of per-team dicts with sanitize_keys() names."""
+    return [sanitize_keys({"team": team, **{k: (round(float(v), 4) if k != "GP" else int(v))
+                                            for k, v in row.items()}})
+            for team, row in summary.iterrows()]
+
+def export_team_summary(summary, path):
+    """Write the team summary to .parquet or .json (by file suffix)."""
+    path = str(path)
+    if path.endswith(".parquet"):
+        summary.reset_index().rename(columns=_json_key).to_parquet(path, index=False)
+    else:
+        with open(path, "w") as f:
+            json.dump(team_summary_records(summary), f, indent=2)
+    return path
+
+def export_game_results(game_results, path):
+    """Write the per-game results table to .parquet or .json (by file suffix)."""
+    df = game_results_frame(game_results).copy()
+    df["date"] = df["date"].astype(str)
+    path = str(path)
+    if path.endswith(".parquet"):
+        df.to_parquet(path, index=False)
+    else:
+        df.to_json(path, orient="records", indent=2)
+    return path
+
 # --- Printers ---
-def print_team_averages(season_stats, standings=None, season_notes=None):
+def print_team_averages(*, game_results):
+    """
+    Print per-team averages from the per-game results table
+    (simulate_full_league(game_results=[])). Keyword-only: the old positional
+    (season_stats, standings, season_notes) call fails loudly.
+    """
     print("\n=== Per-Team Season Shot Averages & Gambler Values ===")
-    ot_rates = []
-    for team, stats in season_stats.items():
-        games = (standings[team]["W"] + standings[team]["L"] + standings[team]["OT"]) if standings else 0
-        if games == 0:
-            continue
-        sf = stats["SF"]/games
-        sa = stats["SA"]/games
-        sh_pct = (stats["GF"]/stats["SF"]*100 if stats["SF"]>0 else 0)
-        sv_pct = (1 - stats["GA"]/stats["SA"] if stats["SA"]>0 else 0)
-        ot_pct = standings[team]["OT"] / games * 100 if standings else 0
-        diff_pg = (stats["GF"] - stats["GA"]) / games
-        pace = sf + sa
-        st_strength = team_stats[team]["PP"] + team_stats[team]["PK"]
-        mov = (stats["GF"] - stats["GA"]) / games
-        inj_factor = (season_injury_impact.get(team, 0.0) / games) if games > 0 else 0.0
-
-        # close/1‑goal/fatigue rates
-        close_games = fatigue_flags = one_goal_games = 0
-        if season_notes:
-            for (date,h,a), note in season_notes.items():
-                if team in (h,a):
-                    gf = season_stats[team]["GF"]; ga = season_stats[team]["GA"]
-                    if abs(gf-ga)==1:
-                        close_games+=1; one_goal_games+=1
-                    if "Fatigue" in note:
-                        fatigue_flags+=1
-        close_game_pct = close_games/games*100 if games else 0
-        fatigue_pct = fatigue_flags/games*100 if games else 0
-        one_goal_pct = one_goal_games/games*100 if games else 0
-
-        # H2H vs top tier
-        top_tier = {"Boston Bruins","Colorado Avalanche","Edmonton Oilers","Toronto Maple Leafs",
-                    "New York Rangers","Dallas Stars","Florida Panthers","Carolina Hurricanes"}
-        h2h_diff = []
-        if season_notes:
-            for (date,h,a), note in season_notes.items():
-                if team in (h,a):
-                    opp = a if team==h else h
-                    if opp in top_tier:
-                        gf = season_stats[team]["GF"]; ga = season_stats[team]["GA"]
-                        h2h_diff.append(gf-ga)
-        h2h_delta = np.mean(h2h_diff) if h2h_diff else 0
-
-        ot_rates.append((standings[team]["OT"], games))
+    summary = team_summary(game_results)
+    for team, r in summary.iterrows():
         print(
-            f"{team:20s}  SF/G:{sf:.1f} SA/G:{sa:.1f} Sh%:{sh_pct:.1f}% Sv%:{sv_pct:.3f} "
-            f"OT%:{ot_pct:.1f}% Diff/G:{diff_pg:+.2f} Pace/G:{pace:.1f} ST%:{st_strength:.1f} "
-            f"MOV:{mov:+.2f} InjAdj:{inj_factor:+.2f} CloseG%:{close_game_pct:.1f}% "
-            f"FatigueG%:{fatigue_pct:.1f}% 1G%:{one_goal_pct:.1f}% H2HΔ(top8):{h2h_delta:+.2f}"
+            f"{team:20s}  SF/G:{r['SF/G']:.1f} SA/G:{r['SA/G']:.1f} Sh%:{r['Sh%']:.1f}% Sv%:{r['Sv%']:.3f} "
+            f"OT%:{r['OT%']:.1f}% Diff/G:{r['Diff/G']:+.2f} Pace/G:{r['Pace/G']:.1f} ST%:{r['ST%']:.1f} "
+            f"MOV:{r['MOV']:+.2f} InjAdj:{r['InjAdj']:+.2f} CloseG%:{r['CloseG%']:.1f}% "
+            f"FatigueG%:{r['FatigueG%']:.1f}% 1G%:{r['1G%']:.1f}% H2HΔ(top8):{r['H2HΔ(top8)']:+.2f}"
         )
-    if ot_rates:
-        total_ot = sum(ot for ot,g in ot_rates)
-        total_games = sum(g for ot,g in ot_rates)
-        league_avg_ot = total_ot/total_games*100 if total_games else 0
-        print(f"\nNHL Average OT%: {league_avg_ot:.1f}%")
+    if len(summary):
+        print(f"\nNHL Average OT%: {league_ot_pct(summary):.1f}%")
+    return summary
 
 def print_streaks(season_streaks):
     print("\n=== Win/Loss/OT Streaks (per team) ===")
@@ -316,7 +382,9 @@ __all__ = [
     "print_team_averages", "print_streaks", "print_monte_carlo_streaks",
     "print_monte_carlo_playoff_odds",  # newly added export
     "print_sample_playbyplay", "print_sample_doctors_note",
-    "sanitize_keys", "get_doctors_note_json"
+    "sanitize_keys", "get_doctors_note_json",
+    "game_results_frame", "team_summary", "league_ot_pct", "team_summary_records",
+    "export_team_summary", "export_game_results",
 ]
 
 # ========== END OF SECTION 5 =================================
\ No newline at end of file
@@ -16,10 +16,12 @@ if __name__ == "__main__":
     master_schedule = load_master_schedule("master_schedule.csv")
 
     # Run a single full season WITH shots tracking
+    game_results = []
     standings, season_stats, season_logs, season_streaks, season_notes = simulate_full_league(
         master_schedule,
         verbose=False,
-        track_shots=True
+        track_shots=True,
+        game_results=game_results
     )
 
     # 1. Final standings
@@ -28,7 +30,7 @@ if __name__ == "__main__":
         print(f"{team}: {rec['W']}-{rec['L']}-{rec['OT']} ({rec['PTS']} pts)")
 
     # 2. Team averages & gambler values
-    print_team_averages(season_stats)
+    print_team_averages(game_results=game_results)
 
     # 3. Win/Loss/OT streaks
     print_streaks(season_streaks)
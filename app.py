@@ -1,22 +1,85 @@
 # app.py
-from flask import Flask, request, jsonify
-from simulation import run_simulation
+import atexit
+
+from flask import Flask, request, jsonify, url_for
+from sim_jobs import JobQueue, DONE, FAILED
 
 app = Flask(__name__)
 
+# Simulations run on a background process pool; finished results are cached
+# by (teams, runs, seed, data version) so repeat dashboard hits are instant.
+jobs = JobQueue()
+atexit.register(jobs.shutdown)
+
+
+def _job_response(job, code=None):
+    """Job record + URLs: 500 if it failed, else `code` (default 200 done / 202 pending)."""
+    body = job.to_dict()
+    body["status_url"] = url_for("job_status", job_id=job.job_id)
+    body["result_url"] = url_for("job_result", job_id=job.job_id)
+    if job.status == FAILED:
+        return jsonify(body), 500
+    return jsonify(body), code or (200 if job.status == DONE else 202)
+
+
+def _sim_params():
+    """Query-string parameters, overridden on POST by a JSON or form body."""
+    params = request.args.to_dict()
+    if request.method == "POST":
+        params.update(request.get_json(silent=True) or request.form.to_dict())
+    return params
+
+
+def _opt(value, cast):
+    return None if value in (None, "") else cast(value)
+
+
 @app.route("/")
 def home():
     return "🏒 Hockey Simulation API is running! Try /run-sim"
 
-@app.route("/run-sim")
+@app.route("/run-sim", methods=["GET", "POST"])
 def run_sim():
-    team_a = request.args.get("team_a", "Boston Bruins")
-    team_b = request.args.get("team_b", "Toronto Maple Leafs")
-    runs = int(request.args.get("runs", 100))
+    """
+    Submit a simulation job and return its ID (202), or the finished job (200)
+    when the result is already cached. ?wait=SECONDS blocks up to that long and
+    returns the results directly if the job finishes in time. POST takes the
+    same fields as a JSON or form body.
+    """
+    params = _sim_params()
+    team_a = params.get("team_a", "Boston Bruins")
+    team_b = params.get("team_b", "Toronto Maple Leafs")
+    runs = int(params.get("runs", 100))
+    seed = _opt(params.get("seed"), int)
+    wait = _opt(params.get("wait"), float)
+
+    job = jobs.submit(team_a, team_b, runs, seed=seed)
+    if wait:
+        job = jobs.wait(job.job_id, timeout=wait)
+        if job.status == DONE:
+            return jsonify(job.result)
+
+    return _job_response(job)
+
+@app.route("/jobs/<job_id>")
+def job_status(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"unknown job {job_id}"}), 404
+    return _job_response(job, 200)
 
-    results = run_simulation(team_a, team_b, runs)
+@app.route("/jobs/<job_id>/result")
+def job_result(job_id):
+    job = jobs.get(job_id)
+    if job is None:
+        return jsonify({"error": f"unknown job {job_id}"}), 404
+    if job.status != DONE:
+        return _job_response(job, 202)
+    return jsonify(job.result)
 
-    return jsonify(results)
+@app.route("/jobs")
+def job_stats():
+    return jsonify(jobs.stats())
 
 if __name__ == "__main__":
-    app.run(debug=True)
\ No newline at end of file
+    app.run(debug=True)
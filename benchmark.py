@@ -0,0 +1,339 @@
+# ============================================================
+# BENCHMARK: simulation core (Sec1–Sec4) speed, memory, drift
+# ============================================================
+#
+# Simulation.test.py and Debugschedule.py exercise the engine, but nothing
+# measured it. Each case below runs one entry point at a few sizes, seeded,
+# and records
+#
+#     seconds / games_per_sec   best of --repeat timed passes
+#     peak_kb                   tracemalloc peak of one extra pass
+#     metrics                   output statistics as {mean, se}
+#
+# Results go to bench_results/bench_<timestamp>.json. --compare checks them
+# against bench_results/baseline.json (written with --save-baseline):
+# speed / memory beyond --tolerance, and output drift as a z-test per
+# metric, Bonferroni-corrected over each case's metrics at --alpha.
+# A faster engine that draws random numbers differently still passes.
+# Only a shift in the outputs' distribution fails.
+#
+# Usage:
+#     python benchmark.py --save-baseline          # on the reference commit
+#     python benchmark.py --compare                # after a change (exit 1 on regression/drift,
+#                                                  #   2 if the baseline file is missing)
+#     python benchmark.py --quick --cases result full_league
+
+import argparse
+import contextlib
+import datetime
+import io
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from statistics import NormalDist
+
+import numpy as np
+
+BASE        = Path(__file__).resolve().parent
+RESULTS_DIR = BASE / "bench_results"
+BASELINE    = RESULTS_DIR / "baseline.json"
+SCHEDULE    = BASE / "master_schedule.csv"
+
+SEED        = 2025
+TOLERANCE   = 0.10      # allowed games/sec drop and peak memory growth
+ALPHA       = 0.01      # drift test level per case
+MC_GAMES    = 328       # schedule slice used by the Monte Carlo case (~quarter season)
+PAIR        = ("Boston Bruins", "Toronto Maple Leafs")
+
+
+# ============================================================
+# Helpers
+# ============================================================
+def _reseed(seed=SEED):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _reset_state():
+    """Clear Sec1 globals a previous case may have left behind."""
+    from Sec1_Core_Inj import injuries, season_injury_impact
+    injuries.clear()
+    season_injury_impact.clear()
+
+
+def _metric(values):
+    arr = np.asarray(values, dtype=float)
+    se = float(arr.std(ddof=1) / np.sqrt(len(arr))) if len(arr) > 1 else 0.0
+    return {"mean": float(arr.mean()), "se": se}
+
+
+def _pct_metric(pct, n):
+    p = pct / 100
+    return {"mean": float(pct), "se": float(100 * np.sqrt(max(p * (1 - p), 1e-12) / n))}
+
+
+_SCHEDULE = {}
+
+
+def _schedule_slice(n_games):
+    """First n_games of master_schedule.csv, as schedule_by_date."""
+    if "full" not in _SCHEDULE:
+        from Sec3_seasim import load_master_schedule
+        _SCHEDULE["full"] = load_master_schedule(SCHEDULE)
+    out, count = {}, 0
+    for date in sorted(_SCHEDULE["full"]):
+        for game in _SCHEDULE["full"][date]:
+            if count >= n_games:
+                return out
+            out.setdefault(date, []).append(game)
+            count += 1
+    return out
+
+
+def _dated(n):
+    """[(date, (home, visitor))] for the first n schedule games."""
+    sched = _schedule_slice(n)
+    return [(d, g) for d in sorted(sched) for g in sched[d]]
+
+
+def _pairs(n):
+    """n (home, visitor) pairs cycling through the schedule's matchups."""
+    games = [g for _, g in _dated(10 ** 6)]
+    return [games[i % len(games)] for i in range(n)]
+
+
+# ============================================================
+# Cases: fn(size) -> (games simulated, {metric: {mean, se}})
+# ============================================================
+def case_pregame(n):
+    """Sec1: update_injuries + choose_goalie for both teams, first n schedule games."""
+    from Sec1_Core_Inj import update_injuries, choose_goalie
+    history, backups = {}, []
+    for date, (home, visitor) in _dated(n):
+        update_injuries(home)
+        update_injuries(visitor)
+        backups.append(choose_goalie(home, date, history) == "backup")
+        backups.append(choose_goalie(visitor, date, history) == "backup")
+        history.setdefault(home, []).append(date)
+        history.setdefault(visitor, []).append(date)
+    return n, {"backup_rate": _metric(backups)}
+
+
+def case_game_shots(n):
+    """Sec2: simulate_game_shots at neutral expectations, n games."""
+    from Sec2_Simengine import simulate_game_shots
+    goals, shots = [], []
+    for home, visitor in _pairs(n):
+        hs, as_, h_shots, a_shots, _ = simulate_game_shots(3.0, 3.0, "starter", "starter", home, visitor)
+        goals.append(hs + as_)
+        shots.append(h_shots + a_shots)
+    return n, {"goals_per_game": _metric(goals), "shots_per_game": _metric(shots)}
+
+
+def case_result(n):
+    """Sec2: simulate_result (adjustments + shots + doctor's note), n games."""
+    from Sec2_Simengine import simulate_result
+    home_win, ot, margin = [], [], []
+    for home, visitor in _pairs(n):
+        result, hs, as_, *_ = simulate_result(home, visitor, "starter", "starter")
+        home_win.append(result in ("H", "OTW"))
+        ot.append(result in ("OTW", "OTL"))
+        margin.append(hs - as_)
+    return n, {"home_win": _metric(home_win), "ot_rate": _metric(ot), "margin": _metric(margin)}
+
+
+def case_full_league(n):
+    """Sec3: simulate_full_league over the first n schedule games, shots tracked."""
+    from Sec3_seasim import simulate_full_league
+    rows = []
+    simulate_full_league(_schedule_slice(n), verbose=False, track_shots=True, game_results=rows)
+    home = [r for r in rows if r["home"]]
+    return n, {"home_win": _metric([r["W"] for r in home]),
+               "goals_per_game": _metric([r["GF"] + r["GA"] for r in home])}
+
+
+def case_monte_carlo(runs):
+    """Sec4: monte_carlo_league, `runs` seasons of the first MC_GAMES games."""
+    from Sec4_analysisprob import monte_carlo_league
+    with contextlib.redirect_stdout(io.StringIO()):
+        res = monte_carlo_league(_schedule_slice(MC_GAMES), runs=runs)
+    # one metric per team: its average points (se = std / sqrt(runs))
+    return runs * MC_GAMES, {f"avg_pts:{team}": {"mean": r["avg"], "se": r["std"] / np.sqrt(runs)}
+                             for team, r in res.items()}
+
+
+def case_matchup(runs):
+    """Sec4: simulate_matchup_probs for one pair, `runs` games."""
+    from Sec4_analysisprob import simulate_matchup_probs
+    res = simulate_matchup_probs(*PAIR, runs=runs)
+    return runs, {"team1_wins": _pct_metric(res["team1_wins"], runs),
+                  "ot_pct": _pct_metric(res["close_games"]["ot_pct"], runs),
+                  "one_goal_pct": _pct_metric(res["close_games"]["one_goal_pct"], runs)}
+
+
+CASES = {
+    "pregame":     (case_pregame,     [328, 1312]),
+    "game_shots":  (case_game_shots,  [1000, 10000]),
+    "result":      (case_result,      [1000, 10000]),
+    "full_league": (case_full_league, [328, 1312]),
+    "monte_carlo": (case_monte_carlo, [5, 20]),
+    "matchup":     (case_matchup,     [500, 5000]),
+}
+
+
+# ============================================================
+# Runner
+# ============================================================
+def run_case(name, size, repeat=3, memory=True):
+    fn = CASES[name][0]
+    times, metrics, games = [], None, 0
+    for _ in range(repeat):
+        _reset_state()
+        _reseed()
+        t0 = time.perf_counter()
+        games, m = fn(size)
+        times.append(time.perf_counter() - t0)
+        metrics = metrics or m
+    out = {"case": name, "size": size, "games": games, "repeat": repeat,
+           "seconds": round(min(times), 4), "games_per_sec": round(games / min(times), 1),
+           "metrics": metrics}
+    if memory:
+        _reset_state()
+        _reseed()
+        tracemalloc.start()
+        fn(size)
+        out["peak_kb"] = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return out
+
+
+def _warm_up():
+    """Compile rosters / load the schedule outside the timed passes."""
+    from rosters import get_rosters
+    get_rosters()
+    _schedule_slice(1)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BASE,
+                              capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(cases=None, quick=False, repeat=3, memory=True, verbose=True):
+    _warm_up()
+    results = {}
+    for name in cases or CASES:
+        sizes = CASES[name][1][:1] if quick else CASES[name][1]
+        for size in sizes:
+            key = f"{name}[{size}]"
+            results[key] = run_case(name, size, repeat, memory)
+            if verbose:
+                r = results[key]
+                print(f"{key:22s} {r['seconds']:8.3f}s  {r['games_per_sec']:10.1f} games/s  "
+                      f"peak {r.get('peak_kb', float('nan')):10.1f} KB")
+    return {
+        "meta": {"timestamp": datetime.datetime.now().isoformat(timespec="seconds"),
+                 "commit": _git_commit(), "python": platform.python_version(),
+                 "numpy": np.__version__, "platform": platform.platform(),
+                 "seed": SEED, "repeat": repeat},
+        "cases": results,
+    }
+
+
+# ============================================================
+# Baseline comparison
+# ============================================================
+def compare(current, baseline, tolerance=TOLERANCE, alpha=ALPHA):
+    """
+    Per shared case: speed ratio, memory ratio and drift z-scores.
+    Returns {case: {...}} with "regressions" listing what failed.
+    """
+    report = {}
+    for key, cur in current["cases"].items():
+        base = baseline["cases"].get(key)
+        if base is None:
+            continue
+        row = {"speed_ratio": round(cur["games_per_sec"] / base["games_per_sec"], 3), "regressions": []}
+        if row["speed_ratio"] < 1 - tolerance:
+            row["regressions"].append(f"slower x{row['speed_ratio']}")
+        if cur.get("peak_kb") and base.get("peak_kb"):
+            row["memory_ratio"] = round(cur["peak_kb"] / base["peak_kb"], 3)
+            if row["memory_ratio"] > 1 + tolerance:
+                row["regressions"].append(f"memory x{row['memory_ratio']}")
+
+        shared = [m for m in cur["metrics"] if m in base["metrics"]]
+        z_crit = NormalDist().inv_cdf(1 - alpha / (2 * max(len(shared), 1)))
+        drift = {}
+        for m in shared:
+            a, b = cur["metrics"][m], base["metrics"][m]
+            diff, se = a["mean"] - b["mean"], np.hypot(a["se"], b["se"])
+            z = diff / se if se else (0.0 if diff == 0 else np.inf)
+            if abs(z) > z_crit:
+                drift[m] = round(float(z), 2)
+        if drift:
+            row["drift"] = drift
+            row["regressions"].append(f"drift in {sorted(drift)}")
+        report[key] = row
+    return report
+
+
+def print_compare(report):
+    print("\n=== Benchmark vs baseline ===")
+    for key, row in report.items():
+        mem = f"  mem x{row['memory_ratio']:.2f}" if "memory_ratio" in row else ""
+        status = "; ".join(row["regressions"]) or "ok"
+        print(f"{key:22s} speed x{row['speed_ratio']:.2f}{mem}  {status}")
+
+
+def save(results, path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2))
+    return path
+
+
+# ============================================================
+# CLI
+# ============================================================
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the simulation core (Sec1–Sec4)")
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=None)
+    parser.add_argument("--quick", action="store_true", help="smallest size per case only")
+    parser.add_argument("--repeat", type=int, default=3, help="timed passes per case (best is kept)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--out", default=None, help="results JSON (default bench_results/bench_<ts>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help=f"also write {BASELINE.name}")
+    parser.add_argument("--compare", nargs="?", const=str(BASELINE), default=None,
+                        help="baseline JSON to compare against (exit 1 on regression / drift)")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--alpha", type=float, default=ALPHA)
+    args = parser.parse_args(argv)
+    if args.compare and not Path(args.compare).is_file():
+        print(f"No baseline at {args.compare}: run `python benchmark.py --save-baseline` "
+              f"on the reference commit, or pass --compare <path>.", file=sys.stderr)
+        return 2
+
+    results = run_suite(args.cases, args.quick, args.repeat, not args.no_memory)
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    print(f"Saved {save(results, args.out or RESULTS_DIR / f'bench_{stamp}.json')}")
+    if args.save_baseline:
+        print(f"Saved {save(results, BASELINE)}")
+
+    if args.compare:
+        report = compare(results, json.loads(Path(args.compare).read_text()), args.tolerance, args.alpha)
+        print_compare(report)
+        if any(row["regressions"] for row in report.values()):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+# ============================================================
+# LEAGUE STATE: simulator inputs built from real data, as of a date
+# ============================================================
+#
+# Sec5_endstats ships hand-typed team_stats / goalies literals. This module
+# builds the same structures from the data we already maintain:
+#
+#     team_stats  GF/GA per game  <- Boxscores/game_outcomes.parquet (regular
+#                                    season), topped up with games only in
+#                                    goalie_features.parquet; each team's last
+#                                    WINDOW_GAMES games before as_of
+#                 PP / PK %       <- nhl_<year>_team_stats.csv of the latest
+#                                    season completed by as_of (season totals
+#                                    would leak the future otherwise)
+#     goalies     starter/backup  <- goalie_features.parquet: most starts in the
+#                                    team's last STARTER_WINDOW games; SV% over
+#                                    WINDOW_GAMES, shrunk toward league SV%
+#     rosters     shot shares     <- rosters.compile_rosters(as_of=...)
+#
+# Anything without data (a team not in the files, injury_profiles) keeps the
+# Sec5 literal (its import-time copy, never a previously applied state).
+# States are pickled to league_cache/league_<key>.pkl, where key hashes
+# as_of + (size, mtime) of every source file, so a warm start is a single
+# pickle load.
+#
+# Usage:
+#     state = load_league_state("2025-01-15")
+#     with apply_league_state(state):  # Sec5 dicts + engine rosters use it
+#         ...                          # until the block exits
+#
+#     python league_state.py --as-of 2025-01-15
+
+import argparse
+import contextlib
+import datetime
+import hashlib
+import pickle
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE      = Path(__file__).resolve().parent
+BOX       = BASE / "Boxscores"
+CACHE_DIR = BASE / "league_cache"
+
+GAME_OUTCOMES   = BOX / "game_outcomes.parquet"
+GOALIE_FEATURES = BOX / "goalie_features.parquet"
+TEAM_STATS_CSV  = "nhl_{year}_team_stats.csv"       # year = season end year
+
+LOADER_VERSION  = 2       # bump when the build logic changes
+WINDOW_GAMES    = 82      # team games feeding GF/GA and goalie SV%
+STARTER_WINDOW  = 20      # recent team games used to name the starter
+SV_PRIOR_SHOTS  = 400     # shots of league-average SV% mixed into each goalie
+GF_PRIOR_GAMES  = 10      # games of league-average GF/GA mixed into each team
+CSV_AVAILABLE   = (7, 1)  # a season's CSV counts as final from July 1 of its end year
+
+CSV_ALIASES = {"Utah Hockey Club": "Utah Mammoth"}
+
+
+@dataclass
+class LeagueState:
+    as_of:      datetime.date
+    team_stats: dict
+    goalies:    dict
+    rosters:    dict                      # {team: rosters.Roster}
+    sources:    dict = field(default_factory=dict)   # what fed each block
+
+    def summary(self):
+        return {"as_of": str(self.as_of), "teams": len(self.team_stats), **self.sources}
+
+
+# ============================================================
+# Helpers
+# ============================================================
+def _as_date(as_of):
+    if as_of is None:
+        return datetime.date.today()
+    if isinstance(as_of, datetime.datetime):
+        return as_of.date()
+    if isinstance(as_of, datetime.date):
+        return as_of
+    return datetime.date.fromisoformat(str(as_of))
+
+
+def _abbrev_to_team(teams):
+    from rosters import TEAM_ABBREV
+    return {TEAM_ABBREV[t]: t for t in teams if t in TEAM_ABBREV}
+
+
+def _csv_files():
+    return sorted(BASE.glob(TEAM_STATS_CSV.format(year="*")))
+
+
+def source_files():
+    """Every file a LeagueState is built from (the cache key covers all of them)."""
+    from rosters import SKATER_STATS
+    return [GAME_OUTCOMES, GOALIE_FEATURES, SKATER_STATS, *_csv_files()]
+
+
+def cache_key(as_of):
+    """Hash of as_of, loader version and (name, size, mtime) of every source."""
+    h = hashlib.sha1(f"{_as_date(as_of)}|v{LOADER_VERSION}".encode())
+    for path in source_files():
+        try:
+            st = path.stat()
+            h.update(f"|{path.name}:{st.st_size}:{st.st_mtime_ns}".encode())
+        except OSError:
+            h.update(f"|{path.name}:missing".encode())
+    return h.hexdigest()[:16]
+
+
+# ============================================================
+# Team results (GF / GA)
+# ============================================================
+def _team_games(as_of):
+    """Long table (date, game_pk, team, GF, GA) of regular-season games before as_of."""
+    import pandas as pd
+    frames = []
+    seen = set()
+    if GAME_OUTCOMES.exists():
+        go = pd.read_parquet(GAME_OUTCOMES)
+        go = go[(go["game_pk"] // 10000 % 100 == 2) & (go["game_date"] < pd.Timestamp(as_of))]
+        seen = set(go["game_pk"])
+        for side, opp in (("home", "away"), ("away", "home")):
+            frames.append(pd.DataFrame({
+                "date": go["game_date"], "game_pk": go["game_pk"], "team": go[f"{side}_team"],
+                "GF": go[f"{side}_goals"], "GA": go[f"{opp}_goals"]}))
+
+    if GOALIE_FEATURES.exists():
+        # games missing from game_outcomes (newer seasons): GA = goals on the team's goalies
+        gf = pd.read_parquet(GOALIE_FEATURES, columns=["game_pk", "game_date", "team",
+                                                       "opponent", "goalsAgainst"])
+        gf = gf[~gf["game_pk"].isin(seen) & (gf["game_date"] < pd.Timestamp(as_of))]
+        ga = gf.groupby(["game_pk", "game_date", "team", "opponent"], as_index=False)["goalsAgainst"].sum()
+        both = ga.merge(ga[["game_pk", "team", "goalsAgainst"]].rename(
+            columns={"team": "opponent", "goalsAgainst": "GF"}), on=["game_pk", "opponent"])
+        frames.append(pd.DataFrame({"date": both["game_date"], "game_pk": both["game_pk"],
+                                    "team": both["team"], "GF": both["GF"],
+                                    "GA": both["goalsAgainst"]}))
+
+    if not frames:
+        return pd.DataFrame(columns=["date", "game_pk", "team", "GF", "GA"])
+    return pd.concat(frames, ignore_index=True).sort_values(["date", "game_pk"])
+
+
+def _goal_rates(games, abbrev_team):
+    """{team: (GF/G, GA/G)} over each team's last WINDOW_GAMES, shrunk to league average."""
+    recent = games.groupby("team", sort=False).tail(WINDOW_GAMES)
+    if recent.empty:
+        return {}
+    league = recent["GF"].mean()
+    agg = recent.groupby("team").agg(gp=("GF", "size"), gf=("GF", "sum"), ga=("GA", "sum"))
+    gf = (agg["gf"] + GF_PRIOR_GAMES * league) / (agg["gp"] + GF_PRIOR_GAMES)
+    ga = (agg["ga"] + GF_PRIOR_GAMES * league) / (agg["gp"] + GF_PRIOR_GAMES)
+    return {abbrev_team[a]: (round(float(gf[a]), 3), round(float(ga[a]), 3))
+            for a in agg.index if a in abbrev_team}
+
+
+# ============================================================
+# Special teams (season CSVs)
+# ============================================================
+def _special_teams(as_of):
+    """({team: (PP%, PK%)}, csv name) from the latest season CSV final by as_of."""
+    import pandas as pd
+    usable = []
+    for path in _csv_files():
+        year = int(path.stem.split("_")[1])
+        if as_of >= datetime.date(year, *CSV_AVAILABLE):
+            usable.append((year, path))
+    if not usable:
+        return {}, None
+    _, path = max(usable)
+    df = pd.read_csv(path, encoding="utf-8-sig")
+    df["Team"] = df["Team"].str.rstrip("*").str.strip().replace(CSV_ALIASES)
+    return ({r.Team: (float(r["PP%"]), float(r["PK%"])) for _, r in df.iterrows()
+             if r.Team != "League Average"}, path.name)
+
+
+# ============================================================
+# Goalies
+# ============================================================
+def _goalie_table(as_of, abbrev_team):
+    """{team: {"starter": {...}, "backup": {...}}} from goalie_features before as_of."""
+    import pandas as pd
+    if not GOALIE_FEATURES.exists():
+        return {}
+    gl = pd.read_parquet(GOALIE_FEATURES, columns=["game_pk", "game_date", "team", "playerId",
+                                                   "goalie_name", "is_starter", "saves",
+                                                   "shotsAgainst"])
+    gl = gl[gl["game_date"] < pd.Timestamp(as_of)].sort_values(["game_date", "game_pk"])
+    if gl.empty:
+        return {}
+    league_sv = gl["saves"].sum() / max(gl["shotsAgainst"].sum(), 1)
+
+    out = {}
+    for abbr, g in gl.groupby("team", sort=False):
+        team = abbrev_team.get(abbr)
+        if team is None:
+            continue
+        pks = g["game_pk"].drop_duplicates()
+        window = g[g["game_pk"].isin(pks.tail(WINDOW_GAMES))]
+        recent = g[g["game_pk"].isin(pks.tail(STARTER_WINDOW))]
+        starts = recent[recent["is_starter"] == 1].groupby("playerId").size()
+        # rank by recent starts, then by window shots faced
+        shots = window.groupby("playerId").agg(name=("goalie_name", "last"),
+                                               sv=("saves", "sum"), sa=("shotsAgainst", "sum"))
+        shots["starts"] = starts.reindex(shots.index).fillna(0)
+        shots = shots.sort_values(["starts", "sa"], ascending=False)
+        slots = {}
+        for role, (_, r) in zip(("starter", "backup"), shots.iterrows()):
+            sv = (r["sv"] + SV_PRIOR_SHOTS * league_sv) / (r["sa"] + SV_PRIOR_SHOTS)
+            slots[role] = {"SV": round(float(sv), 4), "name": r["name"]}
+        if "starter" in slots:
+            slots.setdefault("backup", {"SV": round(float(league_sv) - 0.005, 4),
+                                        "name": "Generic Backup"})
+            out[team] = slots
+    return out
+
+
+# ============================================================
+# Build / cache
+# ============================================================
+def build_league_state(as_of=None):
+    """Build a LeagueState from the source files (no cache)."""
+    from Sec5_endstats import LITERAL_TEAM_STATS as sec5_stats, LITERAL_GOALIES as sec5_goalies
+    from rosters import compile_rosters
+
+    as_of = _as_date(as_of)
+    teams = list(sec5_stats)
+    abbrev_team = _abbrev_to_team(teams)
+
+    rates = _goal_rates(_team_games(as_of), abbrev_team)
+    st, csv_name = _special_teams(as_of)
+    gl = _goalie_table(as_of, abbrev_team)
+
+    team_stats, goalies = {}, {}
+    for t in teams:
+        base_row = dict(sec5_stats[t])
+        if t in rates:
+            base_row["GF"], base_row["GA"] = rates[t]
+        if t in st:
+            base_row["PP"], base_row["PK"] = st[t]
+        team_stats[t] = base_row
+        goalies[t] = gl.get(t) or {k: dict(g) for k, g in sec5_goalies[t].items()}
+
+    sources = {
+        "goal_rates": f"{len(rates)}/{len(teams)} teams from game results",
+        "special_teams": (f"{sum(t in st for t in teams)}/{len(teams)} teams from {csv_name}"
+                          if csv_name else "Sec5 literals"),
+        "goalies": f"{len(gl)}/{len(teams)} teams from goalie_features",
+    }
+    rosters = compile_rosters(teams, as_of=as_of)
+    sources["rosters"] = f"{sum(r.source == 'parquet' for r in rosters.values())}/{len(teams)} teams from skater_stats"
+    return LeagueState(as_of, team_stats, goalies, rosters, sources)
+
+
+def cache_path(key, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"league_{key}.pkl"
+
+
+def load_league_state(as_of=None, cache_dir=CACHE_DIR, rebuild=False):
+    """LeagueState for as_of (default today): cached pickle if the sources are unchanged."""
+    as_of = _as_date(as_of)
+    path = cache_path(cache_key(as_of), cache_dir)
+    if path.exists() and not rebuild:
+        try:
+            with open(path, "rb") as f:
+                return LeagueState(**pickle.load(f))
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError) as exc:
+            print(f"⚠️ League cache {path.name} unreadable ({exc}) — rebuilding")
+
+    state = build_league_state(as_of)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, "wb") as f:
+        # plain dict, so the file loads whether LeagueState came from __main__ or an import
+        pickle.dump(vars(state), f, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp.replace(path)
+    return state
+
+
+def _swap(target, values):
+    target.clear()
+    target.update(values)
+
+
+@contextlib.contextmanager
+def apply_league_state(state):
+    """
+    Swap the state into the running simulator for the `with` block: Sec5
+    team_stats / goalies are updated in place (every lazy `from Sec5_endstats
+    import ...` sees it) and the engine's shooter rosters are pinned to
+    state.rosters. On exit the previous dicts and roster pin are restored.
+    """
+    import Sec5_endstats
+    from rosters import use_rosters
+    saved = (dict(Sec5_endstats.team_stats), dict(Sec5_endstats.goalies))
+    _swap(Sec5_endstats.team_stats, {t: dict(v) for t, v in state.team_stats.items()})
+    _swap(Sec5_endstats.goalies, {t: {k: dict(g) for k, g in v.items()}
+                                  for t, v in state.goalies.items()})
+    prev_rosters = use_rosters(state.rosters)
+    try:
+        yield state
+    finally:
+        _swap(Sec5_endstats.team_stats, saved[0])
+        _swap(Sec5_endstats.goalies, saved[1])
+        use_rosters(prev_rosters)
+
+
+__all__ = ["LeagueState", "build_league_state", "load_league_state", "apply_league_state",
+           "cache_key", "source_files"]
+
+
+# ============================================================
+# CLI
+# ============================================================
+if __name__ == "__main__":
+    import time
+    parser = argparse.ArgumentParser(description="Build the simulator league state from data files")
+    parser.add_argument("--as-of", default=None, help="YYYY-MM-DD (default today)")
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    t0 = time.perf_counter()
+    state = load_league_state(args.as_of, rebuild=args.rebuild)
+    print(f"Loaded in {1000 * (time.perf_counter() - t0):.0f} ms")
+    for k, v in state.summary().items():
+        print(f"  {k:14s} {v}")
+    for t in sorted(state.team_stats)[:5]:
+        s, g = state.team_stats[t], state.goalies[t]
+        print(f"  {t:22s} GF {s['GF']:.2f} GA {s['GA']:.2f} PP {s['PP']:.1f} PK {s['PK']:.1f} "
+              f"G {g['starter']['name']} ({g['starter']['SV']:.3f})")
@@ -0,0 +1,361 @@
+# ============================================================
+# MATCHUP MATRIX: every home/away pair, precomputed
+# ============================================================
+#
+# simulate_matchup_probs answers one pair with 500 simulate_result calls,
+# one Python-level shot at a time. Dashboards and playoff series ask for
+# many pairs, over and over, from the same league data. This module runs
+# the same game model (Sec2.simulate_game_shots, healthy rosters, starters
+# in net, no rest effects — exactly what simulate_matchup_probs simulates)
+# for all N x N home/away pairs in numpy, and stores per-pair:
+#
+#     home / away regulation wins, home / away OT wins, mean margin,
+#     one-goal %, and the full scoreline histogram (0..MAX_GOALS each side)
+#
+# Results are saved as matchup_cache/matchup_<hash>.npz, where the hash
+# covers team_stats, goalies, the compiled shooter rosters, the engine
+# constants, the source of the shot model it mirrors (Sec1.predict_xg,
+# Sec2.simulate_game_shots) and the sim count — any data or model edit
+# produces a new file instead of a stale lookup.
+#
+# Usage:
+#     mm = load_or_build()                     # cached .npz or fresh build
+#     mm.home_win_prob("Boston Bruins", "Toronto Maple Leafs")
+#     mm.probs("Boston Bruins", "Toronto Maple Leafs")   # simulate_matchup_probs shape
+#
+#     python matchup_matrix.py --sims 2000 --seed 7
+
+import argparse
+import hashlib
+import inspect
+import json
+import time
+from pathlib import Path
+
+import numpy as np
+
+BASE      = Path(__file__).resolve().parent
+CACHE_DIR = BASE / "matchup_cache"
+
+DEFAULT_SIMS = 2000      # sims per ordered pair
+MAX_GOALS    = 10        # scoreline histogram is (MAX_GOALS + 1)^2; higher scores clipped
+SIM_CHUNK    = 500       # sims per vectorised block (bounds memory)
+EV_SHARE     = 0.85      # share of shots at even strength (Sec2)
+SHOT_TYPES   = 3         # wrist / slap / backhand — only wrist gets factor 1.0
+
+
+# ============================================================
+# Data hash
+# ============================================================
+def data_hash(team_stats, goalies, rosters, n_sims):
+    """Stable hash of everything the matrix depends on (rosters: {team: Roster})."""
+    from Sec1_Core_Inj import predict_xg
+    from Sec2_Simengine import HOME_ADVANTAGE, LEAGUE_AVG_SV, SHOTS_PER_GAME, simulate_game_shots
+    payload = {
+        "team_stats": team_stats, "goalies": goalies,
+        "rosters": {t: r.to_dict() for t, r in rosters.items()},
+        "engine": [HOME_ADVANTAGE, LEAGUE_AVG_SV, SHOTS_PER_GAME, EV_SHARE, MAX_GOALS],
+        "model_src": [inspect.getsource(predict_xg), inspect.getsource(simulate_game_shots)],
+        "n_sims": n_sims,
+    }
+    blob = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha1(blob).hexdigest()[:16]
+
+
+def _league_data():
+    from Sec5_endstats import team_stats, goalies
+    from rosters import get_rosters
+    return team_stats, goalies, get_rosters()
+
+
+# ============================================================
+# Lookup API
+# ============================================================
+class MatchupMatrix:
+    """
+    Precomputed home/away matchup outcomes. Row = home team, column = away.
+
+    Arrays (N x N, diagonal unused):
+        home_reg, away_reg, home_ot, away_ot   — outcome probabilities (sum to 1)
+        margin                                  — mean (home - away) goals
+        one_goal                                — P(|margin| == 1)
+        scores  (N x N x G x G)                 — P(home goals, away goals)
+    """
+
+    def __init__(self, teams, arrays, key=None, n_sims=None):
+        self.teams  = list(teams)
+        self.index  = {t: i for i, t in enumerate(self.teams)}
+        self.key    = key
+        self.n_sims = n_sims
+        self.home_reg = arrays["home_reg"]
+        self.away_reg = arrays["away_reg"]
+        self.home_ot  = arrays["home_ot"]
+        self.away_ot  = arrays["away_ot"]
+        self.margin   = arrays["margin"]
+        self.one_goal = arrays["one_goal"]
+        self.scores   = arrays["scores"]
+
+    def __contains__(self, team):
+        return team in self.index
+
+    def _ij(self, home, away):
+        if home == away:
+            raise ValueError(f"no matchup of {home!r} against itself (matrix diagonal is unused)")
+        return self.index[home], self.index[away]
+
+    def home_win_prob(self, home, away):
+        """P(home team wins, regulation or OT)."""
+        i, j = self._ij(home, away)
+        return float(self.home_reg[i, j] + self.home_ot[i, j])
+
+    def win_prob_matrix(self):
+        """N x N P(home wins) — for vectorised consumers (series, brackets)."""
+        return self.home_reg + self.home_ot
+
+    def probs(self, home, away, scoreline_top_n=5):
+        """Same dict shape (team1 = home) as Sec4.simulate_matchup_probs."""
+        i, j = self._ij(home, away)
+        grid = self.scores[i, j]
+        flat = np.argsort(grid, axis=None)[::-1][:scoreline_top_n]
+        score_dist = {}
+        for k in flat:
+            h, a = np.unravel_index(k, grid.shape)
+            if grid[h, a] > 0:
+                score_dist[f"{h}-{a}"] = round(float(grid[h, a]) * 100, 1)
+        ot = self.home_ot[i, j] + self.away_ot[i, j]
+        return {
+            "team1_wins": round(float(self.home_reg[i, j] + self.home_ot[i, j]) * 100, 1),
+            "team2_wins": round(float(self.away_reg[i, j] + self.away_ot[i, j]) * 100, 1),
+            "team1_OT":   round(float(self.away_ot[i, j]) * 100, 1),
+            "team2_OT":   round(float(self.home_ot[i, j]) * 100, 1),
+            "avg_margin": round(float(self.margin[i, j]), 2),
+            "score_dist": score_dist,
+            "close_games": {
+                "one_goal_pct": round(float(self.one_goal[i, j]) * 100, 1),
+                "ot_pct":       round(float(ot) * 100, 1),
+            },
+        }
+
+    # --- persistence ---
+    def save(self, path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(
+            path, teams=np.array(self.teams), key=np.array(self.key or ""),
+            n_sims=np.array(self.n_sims or 0),
+            home_reg=self.home_reg, away_reg=self.away_reg,
+            home_ot=self.home_ot, away_ot=self.away_ot,
+            margin=self.margin, one_goal=self.one_goal, scores=self.scores,
+        )
+        return path
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as z:
+            arrays = {k: z[k] for k in ("home_reg", "away_reg", "home_ot", "away_ot",
+                                        "margin", "one_goal", "scores")}
+            return cls([str(t) for t in z["teams"]], arrays,
+                       key=str(z["key"]), n_sims=int(z["n_sims"]))
+
+
+# ============================================================
+# Vectorised engine (mirrors Sec2.simulate_game_shots)
+# ============================================================
+def _roster_factors(rosters, teams):
+    """
+    Shot-weighted mean shooter factor per team (N,). A shot scores with
+    probability xg * factor * (1 - SV), linear in the factor, so drawing the
+    shooter and using the roster's expected factor give the same outcome law.
+    """
+    from rosters import generic_roster
+    return np.array([rosters.get(t, generic_roster(t)).mean_factor for t in teams])
+
+
+def _shot_features(rng, shape):
+    """Random non-EN shots as simulate_game_shots draws them: arrays keyed like predict_xg features."""
+    return {
+        "distance_ft": rng.uniform(5, 60, shape),
+        "angle_deg":   rng.uniform(0, 60, shape),
+        "wrist":       rng.integers(0, SHOT_TYPES, shape) == 0,
+        "rebound":     rng.random(shape) < 0.10,
+        "rush":        rng.random(shape) < 0.15,
+    }
+
+
+def _xg(f):
+    """Sec1.predict_xg over arrays of features (see test_matchup_matrix for the parity check)."""
+    base  = np.maximum(0.01, (60 - f["distance_ft"]) / 60.0)
+    prob  = (base * ((60 - f["angle_deg"]) / 60.0) * np.where(f["wrist"], 1.0, 0.9)
+             * np.where(f["rebound"], 1.25, 1.0) * np.where(f["rush"], 1.15, 1.0))
+    return np.round(np.minimum(prob, 0.9), 3)
+
+
+def _shot_xg(rng, shape):
+    """Sec1.predict_xg for `shape` random shots (before shooter / PP factors)."""
+    return _xg(_shot_features(rng, shape))
+
+
+def _en_xg():
+    """predict_xg of an empty-net shot (60-200 ft, so the distance term is at its floor)."""
+    from Sec1_Core_Inj import predict_xg
+    return predict_xg({"distance_ft": 60, "angle_deg": 0, "shot_type": "EN",
+                       "rebound": False, "rush": False})
+
+
+def _side_goals(rng, exp, opp_sv, pp_boost, factor, n):
+    """
+    Goals for one side of A games x n sims.
+    exp, opp_sv, pp_boost, factor (mean shooter factor): (A,) arrays.
+    """
+    A = len(exp)
+    shots = np.trunc(rng.normal(30, 5, (A, n)) * (exp[:, None] / 3.0)).astype(int)
+    shots = np.maximum(15, shots)
+    ev    = np.floor(shots * EV_SHARE).astype(int)
+
+    s_max = int(shots.max())
+    slot  = np.arange(s_max)[None, None, :]
+    live  = slot < shots[..., None]
+    is_pp = slot >= ev[..., None]
+
+    shape = (A, n, s_max)
+    xg = _shot_xg(rng, shape) * factor[:, None, None]
+    xg = np.where(is_pp, xg * (1 + pp_boost)[:, None, None], xg)
+    p_goal = xg * (1 - opp_sv)[:, None, None]
+    return ((rng.random(shape) < p_goal) & live).sum(axis=2)
+
+
+def _empty_net(rng, hg, ag, f_home, f_away):
+    """Leading team's single EN attempt when the gap is 1-2 goals."""
+    diff      = hg - ag
+    chance    = (diff != 0) & (np.abs(diff) <= 2)
+    lead_home = diff > 0
+    xg_en  = _en_xg() * np.where(lead_home, f_home[:, None], f_away[:, None])
+    scored = chance & (rng.random(hg.shape) < np.minimum(0.9, xg_en + 0.1))
+    return hg + (scored & lead_home), ag + (scored & ~lead_home)
+
+
+def build_matrix(n_sims=DEFAULT_SIMS, seed=None, team_stats=None, goalies=None,
+                 rosters=None, verbose=True):
+    """
+    Simulate every ordered (home, away) pair n_sims times.
+    League data defaults to Sec5_endstats + rosters.get_rosters(). Returns a MatchupMatrix.
+    """
+    from Sec2_Simengine import HOME_ADVANTAGE, LEAGUE_AVG_SV, SHOTS_PER_GAME
+
+    if team_stats is None or goalies is None or rosters is None:
+        ts, gl, rs = _league_data()
+        team_stats = ts if team_stats is None else team_stats
+        goalies    = gl if goalies is None else goalies
+        rosters    = rs if rosters is None else rosters
+
+    teams = sorted(team_stats)
+    N, G  = len(teams), MAX_GOALS + 1
+    rng   = np.random.default_rng(seed)
+
+    GF = np.array([team_stats[t]["GF"] for t in teams])
+    GA = np.array([team_stats[t]["GA"] for t in teams])
+    PP = np.array([team_stats[t]["PP"] for t in teams])
+    PK = np.array([team_stats[t]["PK"] for t in teams])
+    SV = np.array([goalies[t]["starter"]["SV"] for t in teams])
+    F  = _roster_factors(rosters, teams)
+
+    # [team, opp] adjustments, as simulate_result / simulate_game_shots apply them
+    st_adj   = (PP[:, None] - PK[None, :] + PK[:, None] - PP[None, :]) / 200.0
+    pp_boost = (PP[:, None] - PK[None, :]) / 200.0
+    g_adj    = (LEAGUE_AVG_SV - SV) * SHOTS_PER_GAME
+    h_exp = (GF[:, None] + GA[None, :]) / 2 + HOME_ADVANTAGE + st_adj - g_adj[:, None]
+    a_exp = (GF[None, :] + GA[:, None]) / 2 + st_adj.T - g_adj[None, :]
+
+    out = {k: np.zeros((N, N)) for k in ("home_reg", "away_reg", "home_ot",
+                                         "away_ot", "margin", "one_goal")}
+    scores = np.zeros((N, N, G, G))
+    t0 = time.perf_counter()
+
+    for i in range(N):
+        away = np.array([j for j in range(N) if j != i])
+        home = np.full(len(away), i)
+        done = 0
+        while done < n_sims:
+            n = min(SIM_CHUNK, n_sims - done)
+            # simulate_game_shots scores each side's shots against the SV of
+            # goalies[own team] (h_goalie_sv / a_goalie_sv are crossed) — kept as is
+            hg = _side_goals(rng, h_exp[i, away], SV[home], pp_boost[i, away], F[home], n)
+            ag = _side_goals(rng, a_exp[i, away], SV[away], pp_boost[away, i], F[away], n)
+            hg, ag = _empty_net(rng, hg, ag, F[home], F[away])
+
+            tie     = hg == ag
+            ot_home = tie & (rng.random(hg.shape) < 0.5)
+            out["home_reg"][i, away] += (hg > ag).sum(axis=1)
+            out["away_reg"][i, away] += (ag > hg).sum(axis=1)
+            out["home_ot"][i, away]  += ot_home.sum(axis=1)
+            out["away_ot"][i, away]  += (tie & ~ot_home).sum(axis=1)
+            out["margin"][i, away]   += (hg - ag).sum(axis=1)
+            out["one_goal"][i, away] += (np.abs(hg - ag) == 1).sum(axis=1)
+
+            cell = np.minimum(hg, MAX_GOALS) * G + np.minimum(ag, MAX_GOALS)
+            for k, j in enumerate(away):
+                scores[i, j] += np.bincount(cell[k], minlength=G * G).reshape(G, G)
+            done += n
+        if verbose:
+            print(f"\rMatchup matrix: {i + 1}/{N} home teams", end="", flush=True)
+    if verbose:
+        print(f"  ({time.perf_counter() - t0:.1f}s)")
+
+    for k in out:
+        out[k] /= n_sims
+    out["scores"] = scores / n_sims
+    key = data_hash(team_stats, goalies, rosters, n_sims)
+    return MatchupMatrix(teams, out, key=key, n_sims=n_sims)
+
+
+# ============================================================
+# Cache
+# ============================================================
+def matrix_path(key, cache_dir=CACHE_DIR):
+    return Path(cache_dir) / f"matchup_{key}.npz"
+
+
+_LOADED = {}
+
+
+def load_or_build(n_sims=DEFAULT_SIMS, seed=None, cache_dir=CACHE_DIR, rebuild=False,
+                  verbose=True):
+    """
+    The matrix for the current Sec5 league data: from memory, else from
+    matchup_cache/matchup_<hash>.npz, else built and saved.
+    """
+    team_stats, goalies, rosters = _league_data()
+    key = data_hash(team_stats, goalies, rosters, n_sims)
+    if not rebuild and key in _LOADED:
+        return _LOADED[key]
+
+    path = matrix_path(key, cache_dir)
+    if path.exists() and not rebuild:
+        mm = MatchupMatrix.load(path)
+    else:
+        mm = build_matrix(n_sims, seed, team_stats, goalies, rosters, verbose=verbose)
+        mm.save(path)
+        if verbose:
+            print(f"Saved matchup matrix -> {path}")
+    _LOADED[key] = mm
+    return mm
+
+
+# ============================================================
+# CLI
+# ============================================================
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute the home/away matchup matrix")
+    parser.add_argument("--sims", type=int, default=DEFAULT_SIMS, help="sims per ordered pair")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--rebuild", action="store_true", help="ignore a cached .npz")
+    parser.add_argument("--show", nargs=2, metavar=("HOME", "AWAY"))
+    args = parser.parse_args()
+
+    mm = load_or_build(args.sims, args.seed, rebuild=args.rebuild)
+    print(f"{len(mm.teams)} teams, {mm.n_sims} sims/pair, key {mm.key}")
+    if args.show:
+        print(json.dumps(mm.probs(*args.show), indent=2))
+
+
+__all__ = ["MatchupMatrix", "build_matrix", "load_or_build", "data_hash", "matrix_path"]
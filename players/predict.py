@@ -10,6 +10,7 @@ import pandas as pd
 import numpy as np
 import pickle
 import os
+import sys
 import argparse
 import requests
 from datetime import datetime, date
@@ -31,6 +32,15 @@ except ImportError:
     GOALIE_OVERRIDES = {}
 # ─────────────────────────────────────────────────────────────────────────
 
+# Warm model cache lives in Boxscores/ (appended so local modules win)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "Boxscores"))
+try:
+    from model_cache import load_pickle
+    MODEL_CACHE_AVAILABLE = True
+except ImportError:
+    MODEL_CACHE_AVAILABLE = False
+from goalie_index import index_for
+
 # ═══════════════════════════════════════════════════════════════
 #  PATHS
 # ═══════════════════════════════════════════════════════════════
@@ -191,6 +201,173 @@ def apply_goalie_overrides(scraped_goalies, overrides):
     return scraped_goalies, applied
 
 
+# ═══════════════════════════════════════════════════════════════
+#  OPPOSING-GOALIE LOOKUP
+# ═══════════════════════════════════════════════════════════════
+GOALIE_STAT_COLS = [
+    "g_goalsAgainst_avg3", "g_goalsAgainst_avg5", "g_goalsAgainst_avg10",
+    "g_goalsAgainst_season_avg",
+    "g_savePct_avg3", "g_savePct_avg5", "g_savePct_avg10", "g_savePct_season_avg",
+    "g_shotsAgainst_avg3", "g_shotsAgainst_avg5", "g_shotsAgainst_avg10",
+    "g_shotsAgainst_season_avg",
+    "g_win_rate_3", "g_win_rate_5", "g_win_rate_10", "g_win_rate_season",
+]
+
+
+def build_goalie_lookup(goalies, tonight_teams, scraped_goalies):
+    """
+    {team: goalie dict with opp_* features} for tonight's teams. Scraped
+    starters are matched through goalie_index (playerId, last-name match
+    over each team's goalies); otherwise the team's most recent starter.
+    """
+    # Starter rows indexed once by playerId (goalie_index, shared with Boxscores/)
+    gl_index = index_for(goalies)
+
+    goalie_lookup = {}
+    for team in tonight_teams:
+        scraped = scraped_goalies.get(team, {})
+        scraped_name = scraped.get('name', '')
+        scraped_status = str(scraped.get('status', 'Unknown'))
+
+        # This goalie's most recent start for the team (last-name match)
+        matched_row = gl_index.match_starter(team, scraped_name) if scraped_name else None
+
+        # Fallback: most recent starter for team (old behavior)
+        if matched_row is None:
+            matched_row = gl_index.latest_team_start(team)
+            if matched_row is not None:
+                scraped_status = "Fallback"
+
+        if matched_row is not None:
+            goalie_lookup[team] = {
+                "goalie_name": scraped_name if scraped_name else matched_row.get("goalie_name", "Unknown"),
+                "goalie_status": scraped_status,
+                "goalie_gaa_live": scraped.get('gaa'),
+                "goalie_svpct_live": scraped.get('svpct'),
+            }
+            for c in GOALIE_STAT_COLS:
+                goalie_lookup[team][f"opp_{c}"] = matched_row.get(c, np.nan)
+    return goalie_lookup
+
+
+# ═══════════════════════════════════════════════════════════════
+#  BUILD PREDICTION ROWS (columnar)
+# ═══════════════════════════════════════════════════════════════
+GOALIE_META_KEYS = ("goalie_name", "goalie_status",
+                    "goalie_gaa_live", "goalie_svpct_live")
+
+
+def build_prediction_rows(games, active, feature_cols, goalie_lookup,
+                          team_defense, pred_date):
+    """
+    Broadcast tonight's game context onto the active-player frame.
+
+    One row per (game, side, player): per game, home skaters first,
+    then away skaters, each in ``active`` order.
+
+    Parameters
+    ----------
+    games : list of dict
+        [{"away", "home", "home_ml", "away_ml", "home_implied", "away_implied"}, ...]
+    active : DataFrame
+        Latest feature row per skater on tonight's teams.
+    feature_cols : list of str
+        Model feature columns (missing ones are filled with NaN).
+    goalie_lookup : dict
+        {team: {"goalie_name", "goalie_status", ..., "opp_<stat>": value}}
+    team_defense : dict
+        {team: {"opp_ga_avg5": value, ...}}
+    pred_date : Timestamp
+
+    Returns
+    -------
+    pred_df : DataFrame
+        Feature columns followed by "_"-prefixed metadata columns.
+    """
+    # ── Game sides: (team, opponent, is_home) per game ──
+    sides = []
+    for game_idx, g in enumerate(games):
+        for side_idx, (team, opponent, is_home) in enumerate([
+            (g["home"], g["away"], 1),
+            (g["away"], g["home"], 0),
+        ]):
+            sides.append({
+                "_game_idx": game_idx, "_side_idx": side_idx,
+                "_team": team, "_opponent": opponent, "_is_home": is_home,
+                "_home_ml": g.get("home_ml"), "_away_ml": g.get("away_ml"),
+                "_home_implied": g.get("home_implied"),
+                "_away_implied": g.get("away_implied"),
+            })
+    if not sides or len(active) == 0:
+        return pd.DataFrame()
+    sides = pd.DataFrame(sides)
+
+    players = active.reset_index(drop=True)
+    players["_player_order"] = np.arange(len(players))
+    df = (
+        sides.merge(players, left_on="_team", right_on="team", how="inner")
+        .sort_values(["_game_idx", "_side_idx", "_player_order"], kind="stable")
+        .reset_index(drop=True)
+    )
+    if len(df) == 0:
+        return pd.DataFrame()
+
+    # ── Player's latest rolling features ──
+    pred_df = df.reindex(columns=feature_cols).copy()
+
+    # ── Context features for tonight ──
+    last_game = pd.to_datetime(df["game_date"])
+    rest_days = (pred_date - last_game).dt.days.clip(lower=0)
+    season_start = pd.to_datetime(
+        f"{pred_date.year if pred_date.month >= 10 else pred_date.year - 1}-10-10"
+    )
+    game_num = df["game_num"] if "game_num" in df.columns else pd.Series(40, index=df.index)
+
+    pred_df["is_home"]          = df["_is_home"].values
+    pred_df["rest_days"]        = rest_days.values
+    pred_df["back_to_back"]     = (rest_days <= 1).astype(int).values
+    pred_df["b2b_road"]         = ((rest_days <= 1) & (df["_is_home"] == 0)).astype(int).values
+    pred_df["days_into_season"] = (pred_date - season_start).days
+    pred_df["game_num"]         = game_num.fillna(40).astype(int).values + 1
+
+    # ── Opposing goalie + opponent defense, joined on opponent ──
+    # Only teams present in a lookup override the player's own values.
+    for lookup, skip in ((goalie_lookup, GOALIE_META_KEYS), (team_defense, ())):
+        if not lookup:
+            continue
+        ctx = pd.DataFrame.from_dict(lookup, orient="index")
+        ctx_cols = [c for c in ctx.columns if c not in skip and c in feature_cols]
+        if not ctx_cols:
+            continue
+        joined = ctx[ctx_cols].reindex(df["_opponent"].values)
+        has_ctx = df["_opponent"].isin(ctx.index).values
+        for c in ctx_cols:
+            pred_df[c] = np.where(has_ctx, joined[c].values, pred_df[c].values)
+
+    # ── Metadata (prefixed with _ so we can split later) ──
+    opp_goalie = {t: v.get("goalie_name", "?") for t, v in goalie_lookup.items()}
+    opp_status = {t: v.get("goalie_status", "?") for t, v in goalie_lookup.items()}
+
+    def _meta(col, default):
+        if col in df.columns:
+            return df[col].values
+        return np.full(len(df), default, dtype=object)
+
+    pred_df["_player_name"]       = _meta("player_name", "Unknown")
+    pred_df["_player_id"]         = _meta("player_id", 0)
+    pred_df["_team"]              = df["_team"].values
+    pred_df["_opponent"]          = df["_opponent"].values
+    pred_df["_is_home"]           = df["_is_home"].values
+    pred_df["_position"]          = _meta("position", "?")
+    pred_df["_opp_goalie"]        = df["_opponent"].map(opp_goalie).fillna("?").values
+    pred_df["_opp_goalie_status"] = df["_opponent"].map(opp_status).fillna("?").values
+    pred_df["_rest_days"]         = pred_df["rest_days"].values
+    for c in ("_home_ml", "_away_ml", "_home_implied", "_away_implied"):
+        pred_df[c] = df[c].values
+
+    return pred_df
+
+
 # ═══════════════════════════════════════════════════════════════
 #  MAIN
 # ═══════════════════════════════════════════════════════════════
@@ -207,8 +384,11 @@ def main():
 
     # ── 1. Load models ───────────────────────────────────────
     print("\nLoading models...")
-    with open(MODEL_PATH, "rb") as f:
-        saved = pickle.load(f)
+    if MODEL_CACHE_AVAILABLE:
+        saved = load_pickle(MODEL_PATH)
+    else:
+        with open(MODEL_PATH, "rb") as f:
+            saved = pickle.load(f)
 
     models       = saved["models"]
     feature_cols = saved["feature_cols"]
@@ -303,58 +483,7 @@ def main():
         return
 
     # ── 5. Opposing-goalie features (UPGRADED with live scraper) ──
-    goalie_stat_cols = [
-        "g_goalsAgainst_avg3", "g_goalsAgainst_avg5", "g_goalsAgainst_avg10",
-        "g_goalsAgainst_season_avg",
-        "g_savePct_avg3", "g_savePct_avg5", "g_savePct_avg10", "g_savePct_season_avg",
-        "g_shotsAgainst_avg3", "g_shotsAgainst_avg5", "g_shotsAgainst_avg10",
-        "g_shotsAgainst_season_avg",
-        "g_win_rate_3", "g_win_rate_5", "g_win_rate_10", "g_win_rate_season",
-    ]
-
-    # Get all starter rows from parquet, sorted by date
-    goalie_all_starters = (
-        goalies[goalies["is_starter"] == 1]
-        .sort_values("game_date")
-        .copy()
-    )
-
-    goalie_lookup = {}
-    for team in tonight_teams:
-        scraped = scraped_goalies.get(team, {})
-        scraped_name = scraped.get('name', '')
-        scraped_status = str(scraped.get('status', 'Unknown'))
-        matched_row = None
-
-        if scraped_name:
-            # Try to find this specific goalie in our parquet data
-            team_goalies = goalie_all_starters[goalie_all_starters["team"] == team]
-
-            # Match by last name (most reliable)
-            last_name = scraped_name.strip().split()[-1] if scraped_name.strip() else ''
-            if last_name:
-                name_match = team_goalies[
-                    team_goalies["goalie_name"].str.contains(last_name, case=False, na=False)
-                ]
-                if len(name_match) > 0:
-                    matched_row = name_match.iloc[-1]  # most recent game for THIS goalie
-
-        # Fallback: most recent starter for team (old behavior)
-        if matched_row is None:
-            team_goalies = goalie_all_starters[goalie_all_starters["team"] == team]
-            if len(team_goalies) > 0:
-                matched_row = team_goalies.iloc[-1]
-                scraped_status = "Fallback"
-
-        if matched_row is not None:
-            goalie_lookup[team] = {
-                "goalie_name": scraped_name if scraped_name else matched_row.get("goalie_name", "Unknown"),
-                "goalie_status": scraped_status,
-                "goalie_gaa_live": scraped.get('gaa'),
-                "goalie_svpct_live": scraped.get('svpct'),
-            }
-            for c in goalie_stat_cols:
-                goalie_lookup[team][f"opp_{c}"] = matched_row.get(c, np.nan)
+    goalie_lookup = build_goalie_lookup(goalies, tonight_teams, scraped_goalies)
 
     print(f"\n  🏒 Starting Goalies:")
     print(f"  {'─' * 65}")
@@ -421,73 +550,9 @@ def main():
     # ── 7. Build prediction rows ─────────────────────────────
     print("\nBuilding prediction rows...")
 
-    pred_rows = []
     pred_date = pd.to_datetime(game_date)
-
-    for g in games:
-        away_team, home_team = g["away"], g["home"]
-
-        for team, opponent, is_home in [
-            (home_team, away_team, 1),
-            (away_team, home_team, 0),
-        ]:
-            team_players = active[active["team"] == team]
-
-            for _, player in team_players.iterrows():
-                row = {}
-
-                # Copy the player's latest rolling features
-                for col in feature_cols:
-                    if col in player.index:
-                        row[col] = player[col]
-                    else:
-                        row[col] = np.nan
-
-                # Override context features for tonight
-                row["is_home"] = is_home
-
-                last_game = pd.to_datetime(player["game_date"])
-                row["rest_days"]    = max((pred_date - last_game).days, 0)
-                row["back_to_back"] = int(row["rest_days"] <= 1)
-                row["b2b_road"]     = int(row["rest_days"] <= 1 and is_home == 0)
-
-                season_start = pd.to_datetime(
-                    f"{pred_date.year if pred_date.month >= 10 else pred_date.year - 1}-10-10"
-                )
-                row["days_into_season"] = (pred_date - season_start).days
-                row["game_num"] = int(player.get("game_num", 40)) + 1
-
-                # Opposing goalie features
-                opp_g = goalie_lookup.get(opponent, {})
-                for k, v in opp_g.items():
-                    if k not in ("goalie_name", "goalie_status",
-                                 "goalie_gaa_live", "goalie_svpct_live") and k in feature_cols:
-                        row[k] = v
-
-                # Opponent team defense
-                opp_d = team_defense.get(opponent, {})
-                for k, v in opp_d.items():
-                    if k in feature_cols:
-                        row[k] = v
-
-                # Metadata (prefixed with _ so we can split later)
-                row["_player_name"] = player.get("player_name", "Unknown")
-                row["_player_id"]   = player.get("player_id", 0)
-                row["_team"]        = team
-                row["_opponent"]    = opponent
-                row["_is_home"]     = is_home
-                row["_position"]    = player.get("position", "?")
-                row["_opp_goalie"]  = opp_g.get("goalie_name", "?")
-                row["_opp_goalie_status"] = opp_g.get("goalie_status", "?")
-                row["_rest_days"]   = row["rest_days"]
-                row["_home_ml"]     = g.get("home_ml")
-                row["_away_ml"]     = g.get("away_ml")
-                row["_home_implied"] = g.get("home_implied")
-                row["_away_implied"] = g.get("away_implied")
-
-                pred_rows.append(row)
-
-    pred_df = pd.DataFrame(pred_rows)
+    pred_df = build_prediction_rows(games, active, feature_cols,
+                                    goalie_lookup, team_defense, pred_date)
     print(f"  {len(pred_df):,} prediction rows built")
 
     if len(pred_df) == 0:
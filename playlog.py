@@ -0,0 +1,312 @@
+# ============================================================
+# PLAY LOG: compact columnar play-by-play for simulated games
+# ============================================================
+#
+# simulate_game_shots used to append a 7-field dict per shot, so a tracked
+# season held ~80k dicts repeating team / goalie / shooter strings. Events
+# are now stored column-wise with integer codes:
+#
+#     team, goalie, shooter  -> int32 codes into the log's Codebook
+#     type                   -> int8  (EV / PP / EN)
+#     result                 -> int8  (0 = MISS, 1 = GOAL)
+#     xg, prob_goal          -> float64
+#
+# GameLog   : one game, built by the engine; reads back as dicts lazily.
+# SeasonLog : all tracked games of a season in one set of arrays, a
+#             Mapping {(date, home, visitor): game view} so existing callers
+#             (print_sample_playbyplay) keep working. .to_records() gives a
+#             NumPy structured array, .to_arrow() an Arrow RecordBatch.
+# write_parquet(logs, path) writes one batch per Monte Carlo run.
+#
+# Every log keeps a reference to the Codebook its codes index (the shared
+# process-wide NAMES unless given one), and that table travels with it when
+# pickled — a log sent back from a worker process decodes to the same
+# strings there. SeasonLog.add remaps codes from a GameLog with another book.
+
+from array import array
+from collections.abc import Mapping
+
+import numpy as np
+
+EVENT_TYPES = ("EV", "PP", "EN")
+RESULTS     = ("MISS", "GOAL")
+_TYPE_CODE  = {t: i for i, t in enumerate(EVENT_TYPES)}
+
+# column -> array typecode (NumPy dtype in RECORD_DTYPE)
+_COLUMNS = {"team": "i", "type": "b", "result": "b", "goalie": "i", "shooter": "i",
+            "xg": "d", "prob_goal": "d"}
+
+RECORD_DTYPE = np.dtype([
+    ("game", "i4"), ("team", "i4"), ("type", "i1"), ("result", "i1"),
+    ("goalie", "i4"), ("shooter", "i4"), ("xg", "f8"), ("prob_goal", "f8"),
+])
+
+
+# ============================================================
+# String table
+# ============================================================
+class Codebook:
+    """Interns strings to stable int codes (append-only)."""
+
+    def __init__(self):
+        self._codes = {}
+        self.names  = []
+
+    def code(self, name):
+        c = self._codes.get(name)
+        if c is None:
+            c = self._codes[name] = len(self.names)
+            self.names.append(name)
+        return c
+
+    def name(self, code):
+        return self.names[code]
+
+    def __len__(self):
+        return len(self.names)
+
+    def __reduce__(self):
+        return _codebook_from_names, (list(self.names),)
+
+
+def _codebook_from_names(names):
+    book = Codebook()
+    for name in names:
+        book.code(name)
+    return book
+
+
+NAMES = Codebook()      # default book for logs built in this process
+
+_NAME_COLUMNS = ("team", "goalie", "shooter")
+
+
+def _event_dict(names, team, etype, result, goalie, shooter, xg, prob_goal):
+    return {"team": names[team], "type": EVENT_TYPES[etype], "result": RESULTS[result],
+            "goalie": names[goalie], "shooter": names[shooter],
+            "xg": xg, "prob_goal": prob_goal}
+
+
+# ============================================================
+# Sequence view (shared by GameLog and SeasonLog games)
+# ============================================================
+class _EventView:
+    """Read-only sequence of event dicts over columns[start:stop], built on access."""
+
+    __slots__ = ()
+
+    def _cols(self):
+        raise NotImplementedError
+
+    def _bounds(self):
+        raise NotImplementedError
+
+    def _book(self):
+        raise NotImplementedError
+
+    def __len__(self):
+        start, stop = self._bounds()
+        return stop - start
+
+    def _event(self, i):
+        c = self._cols()
+        return _event_dict(self._book().names, c["team"][i], c["type"][i], c["result"][i], c["goalie"][i],
+                           c["shooter"][i], c["xg"][i], c["prob_goal"][i])
+
+    def __getitem__(self, idx):
+        start, stop = self._bounds()
+        if isinstance(idx, slice):
+            return [self._event(start + i) for i in range(*idx.indices(stop - start))]
+        n = stop - start
+        if idx < 0:
+            idx += n
+        if not 0 <= idx < n:
+            raise IndexError("event index out of range")
+        return self._event(start + idx)
+
+    def __iter__(self):
+        start, stop = self._bounds()
+        return (self._event(i) for i in range(start, stop))
+
+    def to_dicts(self):
+        return list(self)
+
+    def __repr__(self):
+        return f"<{type(self).__name__} {len(self)} events>"
+
+
+class GameLog(_EventView):
+    """Column buffers for one simulated game, filled by simulate_game_shots."""
+
+    __slots__ = (*_COLUMNS, "names")
+
+    def __init__(self, names=None):
+        self.names = NAMES if names is None else names
+        for col, code in _COLUMNS.items():
+            setattr(self, col, array(code))
+
+    def add(self, team, etype, is_goal, goalie, shooter, xg, prob_goal):
+        self.team.append(self.names.code(team))
+        self.type.append(_TYPE_CODE[etype])
+        self.result.append(1 if is_goal else 0)
+        self.goalie.append(self.names.code(goalie))
+        self.shooter.append(self.names.code(shooter))
+        self.xg.append(float(xg))
+        self.prob_goal.append(float(prob_goal))
+
+    def _cols(self):
+        return {col: getattr(self, col) for col in _COLUMNS}
+
+    def _book(self):
+        return self.names
+
+    def _bounds(self):
+        return 0, len(self.team)
+
+
+class _SeasonGame(_EventView):
+    __slots__ = ("_log", "_start", "_stop")
+
+    def __init__(self, log, start, stop):
+        self._log, self._start, self._stop = log, start, stop
+
+    def _cols(self):
+        return self._log._columns
+
+    def _bounds(self):
+        return self._start, self._stop
+
+    def _book(self):
+        return self._log.names
+
+
+# ============================================================
+# Season batch
+# ============================================================
+class SeasonLog(Mapping):
+    """
+    Every tracked game of one season in shared column arrays.
+    Mapping interface: keys are (date, home, visitor) in play order; values
+    are lazy per-game views (index / slice / iterate -> event dicts).
+    `names` is the Codebook the team / goalie / shooter codes index.
+    """
+
+    def __init__(self, names=None):
+        self.names    = NAMES if names is None else names
+        self._columns = {col: array(code) for col, code in _COLUMNS.items()}
+        self._games   = []          # (date, home, visitor)
+        self._offsets = [0]         # event offsets, len = games + 1
+        self._index   = {}          # key -> game number
+
+    def add(self, key, game_log):
+        """Append one GameLog under key (date, home, visitor)."""
+        same = game_log.names is self.names
+        for col, buf in self._columns.items():
+            src = getattr(game_log, col)
+            if col in _NAME_COLUMNS and not same:
+                src = [self.names.code(game_log.names.names[c]) for c in src]
+            buf.extend(src)
+        self._index[key] = len(self._games)
+        self._games.append(key)
+        self._offsets.append(len(self._columns["team"]))
+
+    # --- Mapping ---
+    def __getitem__(self, key):
+        g = self._index[key]
+        return _SeasonGame(self, self._offsets[g], self._offsets[g + 1])
+
+    def __iter__(self):
+        return iter(self._games)
+
+    def __len__(self):
+        return len(self._games)
+
+    @property
+    def n_events(self):
+        return self._offsets[-1]
+
+    # --- Columnar exports ---
+    def arrays(self):
+        """Zero-copy NumPy views of the event columns, plus the per-event game number."""
+        out = {col: np.frombuffer(buf, dtype=RECORD_DTYPE[col]) if len(buf) else np.empty(0, RECORD_DTYPE[col])
+               for col, buf in self._columns.items()}
+        out["game"] = np.repeat(np.arange(len(self._games), dtype=np.int32), np.diff(self._offsets))
+        return out
+
+    def to_records(self):
+        """
+        NumPy structured array (RECORD_DTYPE), one row per event. team /
+        goalie / shooter are codes into self.names.names.
+        """
+        cols = self.arrays()
+        rec = np.empty(self.n_events, dtype=RECORD_DTYPE)
+        for name in RECORD_DTYPE.names:
+            rec[name] = cols[name]
+        return rec
+
+    def to_arrow(self, run=None):
+        """
+        Arrow RecordBatch, one row per event. Strings are dictionary-encoded
+        against self.names so the batch is self-describing; `run` tags Monte Carlo runs.
+        """
+        import pyarrow as pa
+
+        cols  = self.arrays()
+        names = pa.array(self.names.names, type=pa.string())
+        games = np.asarray(self._games, dtype=object).reshape(-1, 3) if self._games else np.empty((0, 3), object)
+        g     = cols["game"]
+
+        def _dict(codes):
+            return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), names)
+
+        fields = {
+            "run":       pa.array(np.full(len(g), -1 if run is None else run, dtype=np.int32)),
+            "game":      pa.array(g),
+            "date":      pa.array(list(games[g, 0]), type=pa.date32()),
+            "home":      pa.array(list(games[g, 1]), type=pa.string()).dictionary_encode(),
+            "visitor":   pa.array(list(games[g, 2]), type=pa.string()).dictionary_encode(),
+            "team":      _dict(cols["team"]),
+            "type":      pa.DictionaryArray.from_arrays(pa.array(cols["type"]),
+                                                        pa.array(EVENT_TYPES)),
+            "goal":      pa.array(cols["result"].astype(bool)),
+            "goalie":    _dict(cols["goalie"]),
+            "shooter":   _dict(cols["shooter"]),
+            "xg":        pa.array(cols["xg"]),
+            "prob_goal": pa.array(cols["prob_goal"]),
+        }
+        return pa.RecordBatch.from_pydict(fields)
+
+    def to_parquet(self, path, run=None):
+        return write_parquet([self], path, runs=[run])
+
+
+def write_parquet(logs, path, runs=None):
+    """
+    Write SeasonLogs (e.g. one per Monte Carlo run) to a single Parquet file,
+    one row group per season. `runs` defaults to 0..n-1.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    logs = list(logs)
+    runs = list(range(len(logs))) if runs is None else list(runs)
+    writer = None
+    try:
+        for log, run in zip(logs, runs):
+            table = pa.Table.from_batches([log.to_arrow(run=run)])
+            # dictionaries differ per batch (books grow / differ); store plain strings
+            table = table.cast(pa.schema([
+                pa.field(f.name, f.type.value_type if pa.types.is_dictionary(f.type) else f.type)
+                for f in table.schema
+            ]))
+            if writer is None:
+                writer = pq.ParquetWriter(str(path), table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path
+
+
+__all__ = ["Codebook", "NAMES", "GameLog", "SeasonLog", "write_parquet",
+           "EVENT_TYPES", "RESULTS", "RECORD_DTYPE"]
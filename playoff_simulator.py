@@ -28,13 +28,28 @@ EAST_TEAMS = [
 ]
 WEST_TEAMS = [t for t in sample_standings if t not in EAST_TEAMS]
 
+# --- Home ice: 2-2-1-1-1 (team1 = higher seed hosts games 1, 2, 5, 7) ---
+HOME_ICE = [True, True, False, False, True, False, True]
+
 # --- Series Simulation ---
-def simulate_series(team1, team2, best_of=7):
-    """Simulate best-of-seven series and return winner + score line."""
+def game_win_prob(team1, team2, game_no, matrix=None):
+    """P(team1 wins game `game_no` (0-based) of the series)."""
+    if matrix is not None and team1 in matrix and team2 in matrix:
+        if HOME_ICE[game_no % len(HOME_ICE)]:
+            return matrix.home_win_prob(team1, team2)
+        return 1.0 - matrix.home_win_prob(team2, team1)
+    return sample_standings[team1] / (sample_standings[team1] + sample_standings[team2])
+
+def simulate_series(team1, team2, best_of=7, matrix=None):
+    """
+    Simulate best-of-seven series and return winner + score line.
+    With a MatchupMatrix, each game uses the precomputed home/away win
+    probability (team1 has home ice); otherwise the standings-points ratio.
+    """
     wins = {team1: 0, team2: 0}
     needed = best_of // 2 + 1
     while wins[team1] < needed and wins[team2] < needed:
-        chance1 = sample_standings[team1] / (sample_standings[team1] + sample_standings[team2])
+        chance1 = game_win_prob(team1, team2, wins[team1] + wins[team2], matrix)
         if random.random() < chance1:
             wins[team1] += 1
         else:
@@ -44,7 +59,7 @@ def simulate_series(team1, team2, best_of=7):
     return winner, f"{winner} defeats {loser} {wins[winner]}–{wins[loser]}"
 
 # --- Bracket Simulation ---
-def run_playoffs(standings):
+def run_playoffs(standings, matrix=None):
     east = sorted([t for t in standings if t in EAST_TEAMS],
                   key=lambda x: standings[x], reverse=True)[:8]
     west = sorted([t for t in standings if t in WEST_TEAMS],
@@ -54,32 +69,33 @@ def run_playoffs(standings):
     print("WEST seeds:", west)
 
     # Round 1
-    east_r1 = [simulate_series(east[i], east[-(i+1)]) for i in range(4)]
-    west_r1 = [simulate_series(west[i], west[-(i+1)]) for i in range(4)]
+    east_r1 = [simulate_series(east[i], east[-(i+1)], matrix=matrix) for i in range(4)]
+    west_r1 = [simulate_series(west[i], west[-(i+1)], matrix=matrix) for i in range(4)]
     print("\n--- Round 1 ---")
     for _, line in east_r1 + west_r1:
         print(line)
 
     # Round 2
-    east_r2 = [simulate_series(east_r1[i][0], east_r1[-(i+1)][0]) for i in range(2)]
-    west_r2 = [simulate_series(west_r1[i][0], west_r1[-(i+1)][0]) for i in range(2)]
+    east_r2 = [simulate_series(east_r1[i][0], east_r1[-(i+1)][0], matrix=matrix) for i in range(2)]
+    west_r2 = [simulate_series(west_r1[i][0], west_r1[-(i+1)][0], matrix=matrix) for i in range(2)]
     print("\n--- Round 2 ---")
     for _, line in east_r2 + west_r2:
         print(line)
 
     # Conference Finals
-    east_final = simulate_series(east_r2[0][0], east_r2[1][0])
-    west_final = simulate_series(west_r2[0][0], west_r2[1][0])
+    east_final = simulate_series(east_r2[0][0], east_r2[1][0], matrix=matrix)
+    west_final = simulate_series(west_r2[0][0], west_r2[1][0], matrix=matrix)
     print("\n--- Conference Finals ---")
     print(east_final[1])
     print(west_final[1])
 
     # Stanley Cup Final
-    cup_final = simulate_series(east_final[0], west_final[0])
+    cup_final = simulate_series(east_final[0], west_final[0], matrix=matrix)
     print("\n--- Stanley Cup Final ---")
     print(cup_final[1])
     print("\n=== Stanley Cup Champion:", cup_final[0], "===")
 
 # --- Run ---
 if __name__ == "__main__":
-    run_playoffs(sample_standings)
\ No newline at end of file
+    from matchup_matrix import load_or_build
+    run_playoffs(sample_standings, matrix=load_or_build())
\ No newline at end of file
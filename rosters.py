@@ -0,0 +1,197 @@
+# ============================================================
+# ROSTERS: compiled shooter tables for the shot engine
+# ============================================================
+#
+# simulate_game_shots used to pick every shooter with random.choice over the
+# 1-2 name stubs in Sec5 team_rosters (mixed str / dict entries). Rosters are
+# now compiled once from Boxscores/skater_stats.parquet into per-team arrays:
+#
+#     ids, names   — skaters whose latest game (this season) was for the team
+#     weights      — share of the team's shots
+#     cum          — cumulative weights, for searchsorted draws
+#     factors      — finishing multiplier on xg: shrunk shooting % / league %
+#
+# Roster.draw(n) picks the shooters for all n shots of a game in one call.
+# Teams missing from the parquet (or no parquet at all) fall back to the
+# Sec5 stubs with equal weights, then to a single "Generic Player".
+#
+# Usage:
+#     r = roster_for("Boston Bruins")
+#     idx = r.draw(35)                   # shooter index per shot
+#     r.names[idx[0]], r.factors[idx[0]]
+
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+
+BASE          = Path(__file__).resolve().parent
+SKATER_STATS  = BASE / "Boxscores" / "skater_stats.parquet"
+
+REGULAR_SEASON = 2       # skater_stats game_type
+MIN_GP         = 5       # skaters with fewer games this season are dropped
+SHRINK_SHOTS   = 200     # prior weight (shots) toward league shooting %
+FACTOR_RANGE   = (0.7, 1.4)
+WINDOW_DAYS    = 365     # as_of rosters: trailing window of games
+
+TEAM_ABBREV = {
+    "Anaheim Ducks": "ANA", "Arizona Coyotes": "ARI", "Boston Bruins": "BOS",
+    "Buffalo Sabres": "BUF", "Calgary Flames": "CGY", "Carolina Hurricanes": "CAR",
+    "Chicago Blackhawks": "CHI", "Colorado Avalanche": "COL", "Columbus Blue Jackets": "CBJ",
+    "Dallas Stars": "DAL", "Detroit Red Wings": "DET", "Edmonton Oilers": "EDM",
+    "Florida Panthers": "FLA", "Los Angeles Kings": "LAK", "Minnesota Wild": "MIN",
+    "Montreal Canadiens": "MTL", "Nashville Predators": "NSH", "New Jersey Devils": "NJD",
+    "New York Islanders": "NYI", "New York Rangers": "NYR", "Ottawa Senators": "OTT",
+    "Philadelphia Flyers": "PHI", "Pittsburgh Penguins": "PIT", "San Jose Sharks": "SJS",
+    "Seattle Kraken": "SEA", "St. Louis Blues": "STL", "Tampa Bay Lightning": "TBL",
+    "Toronto Maple Leafs": "TOR", "Utah Mammoth": "UTA", "Vancouver Canucks": "VAN",
+    "Vegas Golden Knights": "VGK", "Washington Capitals": "WSH", "Winnipeg Jets": "WPG",
+}
+
+
+# ============================================================
+# Roster
+# ============================================================
+@dataclass(frozen=True)
+class Roster:
+    team:    str
+    names:   tuple
+    ids:     np.ndarray
+    weights: np.ndarray
+    factors: np.ndarray
+    source:  str = "parquet"       # parquet / stub / generic
+
+    def __post_init__(self):
+        cum = np.cumsum(self.weights)
+        object.__setattr__(self, "cum", cum / cum[-1])
+
+    def draw(self, n, rng=None):
+        """Shooter indices for n shots, one weighted draw (global np.random, or a Generator)."""
+        u = np.random.random_sample(n) if rng is None else rng.random(n)
+        return np.minimum(np.searchsorted(self.cum, u, side="right"), len(self.names) - 1)
+
+    @property
+    def mean_factor(self):
+        """Shot-weighted finishing factor — E[factor] of one draw."""
+        return float(np.dot(self.weights, self.factors) / self.weights.sum())
+
+    def to_dict(self):
+        return {"team": self.team, "source": self.source, "names": list(self.names),
+                "weights": np.round(self.weights, 6).tolist(),
+                "factors": np.round(self.factors, 6).tolist()}
+
+
+def generic_roster(team):
+    return Roster(team, ("Generic Player",), np.array([-1]), np.ones(1), np.ones(1), "generic")
+
+
+def stub_roster(team, entries):
+    """Sec5 team_rosters entry (names or {"name", "factor"} dicts), equal weights."""
+    if not entries:
+        return generic_roster(team)
+    names   = tuple(e["name"] if isinstance(e, dict) else e for e in entries)
+    factors = np.array([e.get("factor", 1.0) if isinstance(e, dict) else 1.0 for e in entries])
+    return Roster(team, names, np.full(len(names), -1), np.ones(len(names)), factors, "stub")
+
+
+# ============================================================
+# Compile from skater_stats.parquet
+# ============================================================
+def _skater_table(path, season=None, as_of=None):
+    """
+    Per-skater totals: one season (default: latest), or with as_of the
+    WINDOW_DAYS before min(as_of, last game in the file).
+    """
+    import pandas as pd
+    df = pd.read_parquet(path, columns=["season", "game_type", "game_date", "team",
+                                        "player_id", "player_name", "goals", "shots"])
+    df = df[df["game_type"] == REGULAR_SEASON]
+    if as_of is not None:
+        dates = pd.to_datetime(df["game_date"])
+        end   = min(pd.Timestamp(as_of), dates.max() + pd.Timedelta(days=1))
+        df    = df[(dates < end) & (dates >= end - pd.Timedelta(days=WINDOW_DAYS))]
+    else:
+        season = season or int(df["season"].max())
+        df = df[df["season"] == season]
+    df = df.sort_values("game_date")
+
+    g = df.groupby("player_id", sort=False)
+    players = g.agg(name=("player_name", "last"), team=("team", "last"), gp=("shots", "size"),
+                    goals=("goals", "sum"), shots=("shots", "sum"))
+    players = players[(players["gp"] >= MIN_GP) & (players["shots"] > 0)]
+
+    lg_sh = df["goals"].sum() / max(df["shots"].sum(), 1)
+    finish = (players["goals"] + SHRINK_SHOTS * lg_sh) / (players["shots"] + SHRINK_SHOTS) / lg_sh
+    players["factor"] = finish.clip(*FACTOR_RANGE)
+    return players
+
+
+def compile_rosters(teams=None, path=SKATER_STATS, season=None, team_rosters=None, as_of=None):
+    """
+    {team: Roster} for `teams` (default: Sec5 team_stats). Parquet first,
+    then the Sec5 stub, then a generic single shooter. as_of (date) uses
+    only games before that date (see _skater_table).
+    """
+    from Sec5_endstats import team_stats, team_rosters as sec5_rosters
+    teams = list(team_stats) if teams is None else list(teams)
+    team_rosters = sec5_rosters if team_rosters is None else team_rosters
+
+    players = None
+    try:
+        if Path(path).exists():
+            players = _skater_table(path, season, as_of)
+    except (ImportError, OSError, ValueError, KeyError) as exc:
+        print(f"⚠️ Could not compile rosters from {path}: {exc} — using Sec5 stubs")
+
+    out = {}
+    for team in teams:
+        sub = None
+        if players is not None and team in TEAM_ABBREV:
+            sub = players[players["team"] == TEAM_ABBREV[team]].sort_values("shots", ascending=False)
+        if sub is not None and len(sub):
+            out[team] = Roster(team, tuple(sub["name"]), sub.index.to_numpy(),
+                               sub["shots"].to_numpy(float), sub["factor"].to_numpy(float))
+        else:
+            out[team] = stub_roster(team, team_rosters.get(team, []))
+    return out
+
+
+# --- Process-wide cache (recompiled when the parquet changes) ---
+_CACHE = {"key": None, "rosters": {}, "pinned": None}
+
+
+def _cache_key(path):
+    try:
+        st = Path(path).stat()
+        return (str(path), st.st_size, st.st_mtime_ns)
+    except OSError:
+        return (str(path), None, None)
+
+
+def use_rosters(rosters):
+    """Pin a compiled {team: Roster} (e.g. from league_state); None unpins. Returns the previous pin."""
+    prev, _CACHE["pinned"] = _CACHE["pinned"], rosters
+    return prev
+
+
+def get_rosters(path=SKATER_STATS):
+    if _CACHE.get("pinned") is not None:
+        return _CACHE["pinned"]
+    key = _cache_key(path)
+    if _CACHE["key"] != key:
+        _CACHE["rosters"] = compile_rosters(path=path)
+        _CACHE["key"] = key
+    return _CACHE["rosters"]
+
+
+def roster_for(team):
+    """Compiled Roster for team; unknown teams get a generic shooter."""
+    rosters = get_rosters()
+    r = rosters.get(team)
+    if r is None:
+        r = rosters[team] = generic_roster(team)
+    return r
+
+
+__all__ = ["Roster", "compile_rosters", "get_rosters", "use_rosters", "roster_for", "generic_roster",
+           "stub_roster", "TEAM_ABBREV", "SKATER_STATS"]
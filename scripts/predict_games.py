@@ -11,12 +11,20 @@ from __future__ import annotations
 
 import argparse
 import json
+import sys
 from pathlib import Path
 from typing import List
 
 import lightgbm as lgb
 import pandas as pd
 
+# Warm model cache lives in Boxscores/ (keyed on model path + mtime)
+sys.path.append(str(Path(__file__).resolve().parent.parent / "Boxscores"))
+try:
+    from model_cache import load_lgbm_booster
+except ImportError:
+    load_lgbm_booster = None
+
 TARGET_COL = "targets_fantasy_pts"
 PARQUET_SUFFIXES = {".parquet", ".pq"}
 CSV_SUFFIXES = {".csv", ".txt"}
@@ -136,7 +144,10 @@ def run_predictions(args: argparse.Namespace) -> None:
 
     if not args.model.exists():
         raise FileNotFoundError(f"Model file not found: {args.model}")
-    model = lgb.Booster(model_file=str(args.model))
+    if load_lgbm_booster is not None:
+        model = load_lgbm_booster(args.model)
+    else:
+        model = lgb.Booster(model_file=str(args.model))
     print(f"Loaded model from {args.model}")
 
     preds = model.predict(
@@ -0,0 +1,167 @@
+# ============================================================
+# SEASON STATE: real results so far -> rest-of-season simulation
+# ============================================================
+#
+# monte_carlo_league used to replay the whole master_schedule from zero
+# points, even mid-season. This module reads the games actually played
+# before a date and returns
+#
+#     SeasonState   standings (W/L/OT/PTS), streak state + streak history,
+#                   game_history (dates played, for rest / goalie choice)
+#     remaining     the schedule_by_date entries still to be played
+#
+# simulate_full_league(remaining, initial_state=state) then starts from the
+# real table, so Monte Carlo cost scales with the games left.
+#
+# Results source: Boxscores/goalie_features.parquet (per-goalie decisions,
+# so W / L / OTL are exact), with game_outcomes.parquet filling any game it
+# lacks (winner only — those losses count as regulation). Played games are
+# matched to the schedule by (home, visitor), so rescheduled games still
+# come off the remaining list; schedule games before as_of with no result
+# stay in it and get simulated.
+#
+# Usage:
+#     state, remaining = season_state_as_of(schedule_by_date, "2026-01-15")
+#     standings = simulate_full_league(remaining, initial_state=state)
+
+import copy
+import datetime
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE            = Path(__file__).resolve().parent
+GOALIE_FEATURES = BASE / "Boxscores" / "goalie_features.parquet"
+GAME_OUTCOMES   = BASE / "Boxscores" / "game_outcomes.parquet"
+
+
+@dataclass
+class SeasonState:
+    as_of:          datetime.date
+    standings:      dict
+    season_streaks: dict
+    streak_state:   dict
+    game_history:   dict
+    games_played:   int = 0
+    results:        list = field(default_factory=list, repr=False)   # (date, home, visitor, code)
+
+    def copy(self):
+        """Fresh mutable copy for one simulated season (results list shared)."""
+        return SeasonState(self.as_of, copy.deepcopy(self.standings),
+                           copy.deepcopy(self.season_streaks), copy.deepcopy(self.streak_state),
+                           {t: list(d) for t, d in self.game_history.items()},
+                           self.games_played, self.results)
+
+
+# ============================================================
+# Real results
+# ============================================================
+def load_results(start, as_of):
+    """
+    [(date, home_abbr, visitor_abbr, code)] for games in [start, as_of),
+    code in H / A / OTW / OTL (Sec2 simulate_result codes), date-ordered.
+    """
+    import pandas as pd
+    start, end = pd.Timestamp(start), pd.Timestamp(as_of)
+    games = {}
+
+    if GOALIE_FEATURES.exists():
+        gl = pd.read_parquet(GOALIE_FEATURES, columns=["game_pk", "game_date", "team", "opponent",
+                                                       "is_home", "wins", "otLosses"])
+        gl = gl[(gl["game_date"] >= start) & (gl["game_date"] < end) & (gl["game_pk"] // 10000 % 100 == 2)]
+        home = gl[gl["is_home"] == 1].groupby(["game_pk", "game_date", "team", "opponent"],
+                                               as_index=False)[["wins", "otLosses"]].sum()
+        away_otl = gl[gl["is_home"] == 0].groupby("game_pk")["otLosses"].sum()
+        for r in home.itertuples(index=False):
+            if r.wins:
+                code = "OTW" if away_otl.get(r.game_pk, 0) else "H"
+            else:
+                code = "OTL" if r.otLosses else "A"
+            games[r.game_pk] = (r.game_date.date(), r.team, r.opponent, code)
+
+    if GAME_OUTCOMES.exists():
+        go = pd.read_parquet(GAME_OUTCOMES)
+        go = go[(go["game_date"] >= start) & (go["game_date"] < end) & (go["game_pk"] // 10000 % 100 == 2)]
+        for r in go.itertuples(index=False):
+            if r.game_pk not in games:
+                games[r.game_pk] = (r.game_date.date(), r.home_team, r.away_team,
+                                    "H" if r.home_win else "A")
+
+    return sorted(games.values(), key=lambda g: g[0])
+
+
+# ============================================================
+# State builder
+# ============================================================
+def _apply_result(code, home, visitor, standings, streak_state, season_streaks):
+    """Mirror of the standings / streak update in Sec3 simulate_full_league."""
+    from Sec3_seasim import update_streak
+    if code in ("H", "OTW"):
+        winner, loser = home, visitor
+    else:
+        winner, loser = visitor, home
+    standings[winner]["W"] += 1; standings[winner]["PTS"] += 2
+    if code in ("OTW", "OTL"):
+        standings[loser]["OT"] += 1; standings[loser]["PTS"] += 1
+        update_streak(loser, "OT", streak_state, season_streaks)
+    else:
+        standings[loser]["L"] += 1
+        update_streak(loser, "L", streak_state, season_streaks)
+    update_streak(winner, "W", streak_state, season_streaks)
+
+
+def season_state_as_of(schedule_by_date, as_of, results=None):
+    """
+    (SeasonState, remaining schedule_by_date) for the season in schedule_by_date
+    as of `as_of` (date or "YYYY-MM-DD"). `results` overrides load_results().
+    """
+    from Sec5_endstats import team_stats
+    from rosters import TEAM_ABBREV
+
+    if isinstance(as_of, str):
+        as_of = datetime.date.fromisoformat(as_of)
+    start = min(schedule_by_date) if schedule_by_date else as_of
+    if results is None:
+        results = load_results(start, as_of)
+
+    full = {a: t for t, a in TEAM_ABBREV.items()}
+    teams = set(team_stats)
+    for games in schedule_by_date.values():
+        for h, v in games:
+            teams.update((h, v))
+
+    standings      = {t: {"W": 0, "L": 0, "OT": 0, "PTS": 0} for t in teams}
+    season_streaks = {t: {"W": [], "L": [], "OT": [], "maxW": 0, "maxL": 0, "maxOT": 0} for t in teams}
+    streak_state   = {t: {"current_type": None, "length": 0} for t in teams}
+    game_history   = defaultdict(list)
+
+    applied = []
+    for date, h_abbr, v_abbr, code in results:
+        home, visitor = full.get(h_abbr, h_abbr), full.get(v_abbr, v_abbr)
+        if home not in standings or visitor not in standings:
+            continue
+        _apply_result(code, home, visitor, standings, streak_state, season_streaks)
+        game_history[home].append(date)
+        game_history[visitor].append(date)
+        applied.append((date, home, visitor, code))
+
+    # each played (home, visitor) takes that pairing's earliest scheduled game off
+    played = Counter((h, v) for _, h, v, _ in applied)
+    remaining = {}
+    for date in sorted(schedule_by_date):
+        for game in schedule_by_date[date]:
+            if played[game] > 0:
+                played[game] -= 1
+                continue
+            remaining.setdefault(date, []).append(game)
+
+    state = SeasonState(as_of, standings, season_streaks, streak_state, dict(game_history),
+                        games_played=len(applied), results=applied)
+    return state, remaining
+
+
+def games_left(schedule_by_date):
+    return sum(len(g) for g in schedule_by_date.values())
+
+
+__all__ = ["SeasonState", "load_results", "season_state_as_of", "games_left"]
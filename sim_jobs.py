@@ -0,0 +1,269 @@
+# ============================================================
+# SIMULATION JOBS: background worker pool + cached results
+# ============================================================
+#
+# app.py used to call run_simulation() inside the Flask request, so every
+# /run-sim blocked for minutes and identical requests recomputed everything.
+# A JobQueue runs simulations on a process pool (the sim engine keeps its
+# RNG and injury state in module globals, so jobs must not share a process
+# concurrently) and keeps finished results in an LRU cache keyed by
+#
+#     (team_a, team_b, runs, seed, data_version)
+#
+# data_version changes whenever an input the simulation reads (schedule,
+# skater_stats rosters, the league_state parquets / CSVs) or the sim code
+# itself changes, so a stale result is never served after either is edited.
+#
+# Usage:
+#     jobs = JobQueue(max_workers=2)
+#     job  = jobs.submit("Boston Bruins", "Toronto Maple Leafs", runs=100, seed=7)
+#     jobs.get(job.job_id).status          # queued / running / done / failed
+#     jobs.result(job.job_id)              # dict once done
+
+import hashlib
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+
+BASE = Path(__file__).resolve().parent
+
+# --- Config ---
+SIM_WORKERS       = int(os.environ.get("SIM_WORKERS", 2))
+RESULT_CACHE_SIZE = int(os.environ.get("SIM_CACHE_SIZE", 32))
+MAX_JOBS          = 256        # finished job records kept for status lookups
+
+# Files the simulation reads; any edit bumps the data version. The roster /
+# game / goalie sources come from league_state.source_files().
+DATA_FILES = ("master_schedule.csv",)
+
+# Simulation code; any edit bumps the version too (CODE_VERSION covers
+# changes elsewhere that alter results, e.g. a dependency upgrade).
+CODE_FILES   = ("simulation.py", "Sec1_Core_Inj.py", "Sec2_Simengine.py", "Sec3_seasim.py",
+                "Sec4_analysisprob.py", "Sec5_endstats.py", "rosters.py", "league_state.py",
+                "sim_jobs.py")
+CODE_VERSION = 1
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+# ============================================================
+# Data version
+# ============================================================
+def input_files(base=BASE):
+    """Every file whose contents can change a simulation result."""
+    from league_state import source_files
+    return [*(Path(base) / n for n in DATA_FILES + CODE_FILES), *source_files()]
+
+
+def data_version(files=None, base=BASE):
+    """Short hash of CODE_VERSION + (path, size, mtime) for each input file."""
+    h = hashlib.sha1(f"code:{CODE_VERSION};".encode())
+    for path in (input_files(base) if files is None else [Path(base) / f for f in files]):
+        try:
+            st = path.stat()
+            h.update(f"{path}:{st.st_size}:{st.st_mtime_ns};".encode())
+        except OSError:
+            h.update(f"{path}:missing;".encode())
+    return h.hexdigest()[:12]
+
+
+# ============================================================
+# Worker (runs in the pool process)
+# ============================================================
+def run_job(team_a, team_b, runs, seed):
+    """Top-level so it pickles into a ProcessPoolExecutor worker."""
+    from simulation import run_simulation
+    cwd = os.getcwd()
+    os.chdir(BASE)                        # run_simulation opens master_schedule.csv relatively
+    try:
+        return run_simulation(team_a, team_b, runs, seed=seed)
+    finally:
+        os.chdir(cwd)
+
+
+# ============================================================
+# Jobs + LRU result cache
+# ============================================================
+@dataclass
+class Job:
+    job_id:       str
+    key:          tuple
+    status:       str   = QUEUED
+    submitted_at: float = field(default_factory=time.time)
+    finished_at:  float = None
+    cached:       bool  = False
+    error:        str   = None
+    result:       dict  = field(default=None, repr=False)
+    future:       Future = field(default=None, repr=False)
+
+    def refresh(self):
+        """queued -> running once the pool has picked the job up."""
+        if self.status == QUEUED and self.future is not None and self.future.running():
+            self.status = RUNNING
+        return self
+
+    def to_dict(self):
+        team_a, team_b, runs, seed, version = self.key
+        out = {
+            "job_id": self.job_id, "status": self.status, "cached": self.cached,
+            "team_a": team_a, "team_b": team_b, "runs": runs, "seed": seed,
+            "data_version": version, "submitted_at": self.submitted_at,
+            "finished_at": self.finished_at,
+        }
+        if self.finished_at:
+            out["elapsed_s"] = round(self.finished_at - self.submitted_at, 2)
+        if self.error:
+            out["error"] = self.error
+        return out
+
+
+class ResultCache:
+    """Thread-safe LRU of finished results."""
+
+    def __init__(self, maxsize=RESULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __len__(self):
+        return len(self._data)
+
+
+class JobQueue:
+    """
+    Submit simulations to a background pool; poll status / fetch results.
+
+    Identical requests share work: a cached result returns a finished job at
+    once, and a request matching a queued/running job returns that job.
+    `runner` and `executor` are injectable (tests, thread pools).
+    """
+
+    def __init__(self, max_workers=SIM_WORKERS, cache_size=RESULT_CACHE_SIZE,
+                 runner=run_job, executor=None, version_fn=data_version):
+        self.cache      = ResultCache(cache_size)
+        self._runner    = runner
+        self._executor  = executor
+        self._workers   = max_workers
+        self._version   = version_fn
+        self._jobs      = OrderedDict()      # job_id -> Job
+        self._inflight  = {}                 # key -> job_id
+        self._lock      = threading.Lock()
+
+    def _pool(self):
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    def make_key(self, team_a, team_b, runs, seed=None):
+        return (team_a, team_b, int(runs), seed, self._version())
+
+    # --- submit / lookup ---
+    def submit(self, team_a, team_b, runs=100, seed=None):
+        key = self.make_key(team_a, team_b, runs, seed)
+        with self._lock:
+            live = self._inflight.get(key)
+            if live is not None:
+                return self._jobs[live]
+
+            job = Job(job_id=uuid.uuid4().hex[:12], key=key)
+            cached = self.cache.get(key)
+            if cached is not None:
+                job.status, job.cached, job.result = DONE, True, cached
+                job.finished_at = job.submitted_at
+                self._remember(job)
+                return job
+
+            self._remember(job)
+            self._inflight[key] = job.job_id
+
+        try:
+            job.future = self._pool().submit(self._runner, team_a, team_b, int(runs), seed)
+        except Exception as exc:               # broken / shut-down pool
+            job.status, job.error, job.finished_at = FAILED, f"{type(exc).__name__}: {exc}", time.time()
+            with self._lock:
+                self._inflight.pop(key, None)
+            return job
+        job.future.add_done_callback(lambda f, job=job: self._finish(job, f))
+        return job.refresh()
+
+    def _finish(self, job, future: Future):
+        # cache + drop from in-flight before the status flips, so a caller
+        # polling for DONE never resubmits into a stale in-flight entry
+        try:
+            job.result = future.result()
+            status = DONE
+            self.cache.put(job.key, job.result)
+        except Exception as exc:
+            status = FAILED
+            job.error = f"{type(exc).__name__}: {exc}"
+        with self._lock:
+            self._inflight.pop(job.key, None)
+        job.finished_at = time.time()
+        job.future = None
+        job.status = status
+
+    def _remember(self, job):
+        self._jobs[job.job_id] = job
+        while len(self._jobs) > MAX_JOBS:
+            oldest = next((jid for jid, j in self._jobs.items()
+                           if j.status in (DONE, FAILED)), None)
+            if oldest is None:
+                break
+            del self._jobs[oldest]
+
+    def get(self, job_id):
+        job = self._jobs.get(job_id)
+        return job.refresh() if job is not None else None
+
+    def result(self, job_id):
+        job = self._jobs.get(job_id)
+        return job.result if job is not None and job.status == DONE else None
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job finishes (or timeout). Returns the Job."""
+        deadline = None if timeout is None else time.time() + timeout
+        job = self._jobs.get(job_id)
+        while job is not None and job.status in (QUEUED, RUNNING):
+            if deadline is not None and time.time() >= deadline:
+                break
+            time.sleep(0.05)
+        return job
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for j in self._jobs.values():
+                counts[j.status] = counts.get(j.status, 0) + 1
+        return {"jobs": counts, "cache_entries": len(self.cache),
+                "cache_hits": self.cache.hits, "cache_misses": self.cache.misses,
+                "data_version": self._version()}
+
+    def shutdown(self, wait=False):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+__all__ = ["JobQueue", "Job", "ResultCache", "data_version", "input_files", "run_job"]
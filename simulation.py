@@ -1,5 +1,9 @@
 # simulation.py
 
+import random
+
+import numpy as np
+
 # Import your section modules
 from Sec3_seasim import simulate_full_league, load_master_schedule
 from Sec4_analysisprob import monte_carlo_league, simulate_matchup_probs
@@ -8,27 +12,54 @@ from Sec5_endstats import (
     print_streaks,
     print_sample_playbyplay,
     print_sample_doctors_note,
-    print_monte_carlo_playoff_odds
+    print_monte_carlo_playoff_odds,
+    team_summary,
+    team_summary_records
 )
 
-def run_simulation(team_a: str = "Boston Bruins", team_b: str = "Toronto Maple Leafs", runs: int = 100):
+def run_simulation(team_a: str = "Boston Bruins", team_b: str = "Toronto Maple Leafs", runs: int = 100,
+                   seed: int = None, as_of=None, target_se=None, time_budget=None):
     """
     Run a simulation season + Monte Carlo + head-to-head matchup.
     Returns a dictionary of results that can be returned as JSON via Flask.
+
+    seed (int or None): seeds both `random` and `np.random` up front, so the
+        whole run (season, Monte Carlo, H2H) is reproducible.
+    as_of (date / "YYYY-MM-DD" or None): build team, goalie and roster inputs
+        from the data files as of that date (league_state) instead of the
+        Sec5 literals, for this call only, and run the Monte Carlo from the
+        real standings on that date (rest of season only).
+    target_se / time_budget: adaptive Monte Carlo stopping (see
+        Sec4.monte_carlo_league); `runs` is then the cap.
     """
+    if as_of is None:
+        return _run(team_a, team_b, runs, seed, as_of, target_se, time_budget)
+    from league_state import load_league_state, apply_league_state
+    with apply_league_state(load_league_state(as_of)):
+        return _run(team_a, team_b, runs, seed, as_of, target_se, time_budget)
+
+
+def _run(team_a, team_b, runs, seed, as_of, target_se, time_budget):
+    """run_simulation body, against whatever Sec5 / roster inputs are live."""
+    if seed is not None:
+        random.seed(seed)
+        np.random.seed(seed)
 
     # Load season schedule
     master_schedule = load_master_schedule("master_schedule.csv")
 
     # Run full season with stats tracking
+    game_results = []
     standings, season_stats, season_logs, season_streaks, season_notes = simulate_full_league(
         master_schedule,
         verbose=False,
-        track_shots=True
+        track_shots=True,
+        game_results=game_results
     )
 
     # Monte Carlo sim
-    avg_points = monte_carlo_league(master_schedule, runs=runs)
+    avg_points = monte_carlo_league(master_schedule, runs=runs, as_of=as_of,
+                                    target_se=target_se, time_budget=time_budget)
 
     # Head-to-head matchups
     matchup = simulate_matchup_probs(team_a, team_b)
@@ -40,6 +71,7 @@ def run_simulation(team_a: str = "Boston Bruins", team_b: str = "Toronto Maple L
         },
         "streaks": season_streaks,
         "team_stats": season_stats,
+        "team_summary": team_summary_records(team_summary(game_results)),
         "monte_carlo_results": avg_points,
         "head_to_head": matchup
     }
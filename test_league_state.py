@@ -0,0 +1,104 @@
+"""
+test_league_state.py
+--------------------
+Tests for league_state.apply_league_state (scoped swap of the Sec5 dicts and
+engine rosters) and the Sec5-literal fallback of build_league_state.
+
+Run:
+    python test_league_state.py -v
+"""
+
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import league_state
+import rosters
+import Sec5_endstats
+from league_state import LeagueState, apply_league_state, build_league_state
+
+TEAM = "Boston Bruins"
+
+
+def _state(gf=9.9):
+    stats = {t: dict(v, GF=gf) for t, v in Sec5_endstats.LITERAL_TEAM_STATS.items()}
+    goalies = {t: {"starter": {"SV": 0.95, "name": "Test Starter"},
+                   "backup": {"SV": 0.90, "name": "Test Backup"}} for t in stats}
+    return LeagueState(datetime.date(2025, 1, 15), stats, goalies, {TEAM: "pinned"})
+
+
+class TestApplyLeagueState(unittest.TestCase):
+
+    def test_swapped_in_for_the_block_only(self):
+        before_stats = dict(Sec5_endstats.team_stats)
+        before_goalies = dict(Sec5_endstats.goalies)
+        state = _state()
+        with apply_league_state(state):
+            self.assertEqual(Sec5_endstats.team_stats[TEAM]["GF"], 9.9)
+            self.assertEqual(Sec5_endstats.goalies[TEAM]["starter"]["name"], "Test Starter")
+            self.assertIs(rosters.get_rosters(), state.rosters)
+        self.assertEqual(Sec5_endstats.team_stats, before_stats)
+        self.assertEqual(Sec5_endstats.goalies, before_goalies)
+        self.assertIsNone(rosters._CACHE["pinned"])
+
+    def test_restored_when_the_block_raises(self):
+        with self.assertRaises(RuntimeError):
+            with apply_league_state(_state()):
+                raise RuntimeError("sim failed")
+        self.assertEqual(Sec5_endstats.team_stats[TEAM], Sec5_endstats.LITERAL_TEAM_STATS[TEAM])
+        self.assertIsNone(rosters._CACHE["pinned"])
+
+    def test_nested_blocks_restore_outer_state(self):
+        outer = _state(gf=1.0)
+        with apply_league_state(outer):
+            with apply_league_state(_state(gf=2.0)):
+                self.assertEqual(Sec5_endstats.team_stats[TEAM]["GF"], 2.0)
+            self.assertEqual(Sec5_endstats.team_stats[TEAM]["GF"], 1.0)
+            self.assertIs(rosters._CACHE["pinned"], outer.rosters)
+
+
+class TestCacheKey(unittest.TestCase):
+
+    def test_key_follows_every_source(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            tmp = Path(tmp)
+            files = {n: tmp / f"{n}.parquet" for n in ("outcomes", "goalies", "skaters")}
+            for f in files.values():
+                f.write_bytes(b"x")
+            with patch.object(league_state, "GAME_OUTCOMES", files["outcomes"]), \
+                    patch.object(league_state, "GOALIE_FEATURES", files["goalies"]), \
+                    patch("rosters.SKATER_STATS", files["skaters"]), \
+                    patch.object(league_state, "BASE", tmp):
+                before = league_state.cache_key("2025-01-15")
+                self.assertEqual(league_state.cache_key("2025-01-15"), before)
+                self.assertNotEqual(league_state.cache_key("2025-01-16"), before)
+                for f in files.values():
+                    f.write_bytes(b"xy")
+                    key = league_state.cache_key("2025-01-15")
+                    self.assertNotEqual(key, before)
+                    before = key
+
+
+class TestLiteralFallback(unittest.TestCase):
+
+    def test_build_falls_back_to_import_time_literals(self):
+        """With no data files, build_league_state returns the Sec5 literals — even
+        while another state is applied."""
+        with tempfile.TemporaryDirectory() as tmp, \
+                patch.object(league_state, "GAME_OUTCOMES", Path(tmp) / "none.parquet"), \
+                patch.object(league_state, "GOALIE_FEATURES", Path(tmp) / "none.parquet"), \
+                patch.object(league_state, "BASE", Path(tmp)), \
+                patch("rosters.compile_rosters", lambda teams, as_of=None: {}), \
+                apply_league_state(_state()):
+            built = build_league_state("2025-01-15")
+        self.assertEqual(built.team_stats, Sec5_endstats.LITERAL_TEAM_STATS)
+        self.assertEqual(built.goalies, Sec5_endstats.LITERAL_GOALIES)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
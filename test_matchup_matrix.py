@@ -0,0 +1,86 @@
+"""
+test_matchup_matrix.py
+----------------------
+Tests for matchup_matrix.py: the vectorised xG copy stays equal to
+Sec1.predict_xg, the cache key follows the shot model, and a team is never
+looked up against itself.
+
+Run:
+    python test_matchup_matrix.py -v
+"""
+
+import sys
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import matchup_matrix
+from matchup_matrix import build_matrix, data_hash
+from Sec1_Core_Inj import predict_xg
+from Sec4_analysisprob import simulate_matchup_probs
+from Sec5_endstats import LITERAL_GOALIES, LITERAL_TEAM_STATS
+
+TEAMS = ["Boston Bruins", "Toronto Maple Leafs", "Florida Panthers"]
+
+
+def _small_matrix():
+    stats   = {t: LITERAL_TEAM_STATS[t] for t in TEAMS}
+    goalies = {t: LITERAL_GOALIES[t] for t in TEAMS}
+    return build_matrix(n_sims=20, seed=1, team_stats=stats, goalies=goalies,
+                        rosters={}, verbose=False)
+
+
+class TestShotModelParity(unittest.TestCase):
+
+    def test_shot_xg_matches_predict_xg(self):
+        f  = matchup_matrix._shot_features(np.random.default_rng(3), 2000)
+        xg = matchup_matrix._xg(f)
+        expected = [predict_xg({"distance_ft": d, "angle_deg": a,
+                                "shot_type": "wrist" if w else "slap",
+                                "rebound": bool(r), "rush": bool(u)})
+                    for d, a, w, r, u in zip(f["distance_ft"], f["angle_deg"], f["wrist"],
+                                             f["rebound"], f["rush"])]
+        np.testing.assert_allclose(xg, expected, atol=1e-3 + 1e-9)
+
+    def test_empty_net_xg_matches_predict_xg(self):
+        for dist in (60, 110.5, 200):
+            self.assertEqual(matchup_matrix._en_xg(),
+                             predict_xg({"distance_ft": dist, "angle_deg": 0, "shot_type": "EN",
+                                         "rebound": False, "rush": False}))
+
+    def test_hash_follows_model_source(self):
+        stats = {t: LITERAL_TEAM_STATS[t] for t in TEAMS}
+        before = data_hash(stats, LITERAL_GOALIES, {}, 20)
+        real = matchup_matrix.inspect.getsource
+        with patch.object(matchup_matrix.inspect, "getsource",
+                          lambda obj: real(obj) + ("# edited" if obj is predict_xg else "")):
+            self.assertNotEqual(data_hash(stats, LITERAL_GOALIES, {}, 20), before)
+
+
+class TestSelfMatchup(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.mm = _small_matrix()
+
+    def test_lookup_rejects_same_team(self):
+        with self.assertRaises(ValueError):
+            self.mm.probs(TEAMS[0], TEAMS[0])
+        with self.assertRaises(ValueError):
+            self.mm.home_win_prob(TEAMS[0], TEAMS[0])
+
+    def test_outcomes_sum_to_one_off_diagonal(self):
+        p = self.mm.probs(TEAMS[0], TEAMS[1])
+        self.assertAlmostEqual(p["team1_wins"] + p["team2_wins"], 100.0, delta=0.2)
+
+    def test_simulate_matchup_probs_simulates_self_matchup(self):
+        p = simulate_matchup_probs(TEAMS[0], TEAMS[0], runs=20, matrix=self.mm)
+        self.assertAlmostEqual(p["team1_wins"] + p["team2_wins"], 100.0, delta=0.2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
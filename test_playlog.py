@@ -0,0 +1,120 @@
+"""
+test_playlog.py
+---------------
+Round-trip tests for playlog.py: events added to GameLogs come back as the
+same dicts from a SeasonLog, its structured records, its Parquet file, and
+after pickling across a process boundary (a fresh interpreter interns names
+in a different order).
+
+Run:
+    python test_playlog.py -v
+"""
+
+import multiprocessing
+import pickle
+import sys
+import tempfile
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from playlog import EVENT_TYPES, RESULTS, Codebook, GameLog, SeasonLog, write_parquet
+
+GAMES = {
+    (date(2025, 10, 7), "Boston Bruins", "Toronto Maple Leafs"): [
+        ("Boston Bruins", "EV", True, "Joseph Woll", "David Pastrnak", 0.12, 0.011),
+        ("Toronto Maple Leafs", "PP", False, "Jeremy Swayman", "Auston Matthews", 0.2, 0.016),
+        ("Boston Bruins", "EN", True, "Empty Net", "Brad Marchand", 0.009, 0.109),
+    ],
+    (date(2025, 10, 9), "Florida Panthers", "Boston Bruins"): [
+        ("Florida Panthers", "EV", False, "Jeremy Swayman", "Matthew Tkachuk", 0.31, 0.025),
+    ],
+}
+
+
+def _expected():
+    return {key: [{"team": t, "type": e, "result": "GOAL" if g else "MISS", "goalie": gl,
+                   "shooter": sh, "xg": xg, "prob_goal": p}
+                  for t, e, g, gl, sh, xg, p in events]
+            for key, events in GAMES.items()}
+
+
+def _season(names=None):
+    log = SeasonLog(names)
+    for key, events in GAMES.items():
+        game = GameLog(names)
+        for ev in events:
+            game.add(*ev)
+        log.add(key, game)
+    return log
+
+
+def _built_in_worker():
+    """Runs in a spawned process: intern unrelated names first so codes differ."""
+    from playlog import NAMES
+    for i in range(50):
+        NAMES.code(f"worker-only-{i}")
+    return _season()
+
+
+def _as_dicts(log):
+    return {key: list(log[key]) for key in log}
+
+
+class TestRoundTrip(unittest.TestCase):
+
+    def test_season_views(self):
+        self.assertEqual(_as_dicts(_season()), _expected())
+
+    def test_records_decode_through_log_names(self):
+        log = _season(Codebook())
+        rec = log.to_records()
+        names, keys = log.names.names, list(log)
+        got = {k: [] for k in keys}
+        for r in rec:
+            got[keys[r["game"]]].append({
+                "team": names[r["team"]], "type": EVENT_TYPES[r["type"]],
+                "result": RESULTS[r["result"]], "goalie": names[r["goalie"]],
+                "shooter": names[r["shooter"]], "xg": float(r["xg"]),
+                "prob_goal": float(r["prob_goal"])})
+        self.assertEqual(got, _expected())
+
+    def test_parquet(self):
+        import pyarrow.parquet as pq
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "log.parquet"
+            write_parquet([_season(), _season(Codebook())], path)
+            rows = pq.read_table(path).to_pylist()
+        for run in (0, 1):
+            got = {}
+            for r in (r for r in rows if r["run"] == run):
+                key = (r["date"], r["home"], r["visitor"])
+                got.setdefault(key, []).append({
+                    "team": r["team"], "type": r["type"], "result": "GOAL" if r["goal"] else "MISS",
+                    "goalie": r["goalie"], "shooter": r["shooter"], "xg": r["xg"],
+                    "prob_goal": r["prob_goal"]})
+            self.assertEqual(got, _expected())
+
+    def test_pickle(self):
+        self.assertEqual(_as_dicts(pickle.loads(pickle.dumps(_season()))), _expected())
+
+    def test_log_from_another_process(self):
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=ctx) as pool:
+            log = pool.submit(_built_in_worker).result(timeout=60)
+        self.assertEqual(_as_dicts(log), _expected())
+
+    def test_add_remaps_other_book(self):
+        other = GameLog(Codebook())
+        other.add("New York Rangers", "EV", True, "Ilya Sorokin", "Artemi Panarin", 0.2, 0.02)
+        log = _season()
+        log.add((date(2025, 10, 11), "New York Rangers", "New York Islanders"), other)
+        self.assertEqual(log[(date(2025, 10, 11), "New York Rangers", "New York Islanders")][0]["shooter"],
+                         "Artemi Panarin")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,107 @@
+"""
+test_season_state.py
+--------------------
+Tests for season_state.py on tiny fixture parquets: W / L / OTL decoding
+from per-goalie decisions, games only in game_outcomes, and rescheduled
+games coming off the remaining schedule.
+
+Run:
+    python test_season_state.py -v
+"""
+
+import datetime
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import season_state
+from season_state import load_results, season_state_as_of
+
+BOS, TOR, NYR, FLA = "Boston Bruins", "Toronto Maple Leafs", "New York Rangers", "Florida Panthers"
+D = datetime.date
+AS_OF = D(2025, 10, 12)
+
+
+def _goalie(pk, day, team, opp, home, wins=0, otl=0):
+    return {"game_pk": pk, "game_date": pd.Timestamp(day), "team": team, "opponent": opp,
+            "is_home": int(home), "wins": wins, "otLosses": otl}
+
+
+GOALIE_ROWS = [
+    # 1: regulation loss for the home side
+    _goalie(2025020001, "2025-10-08", "BOS", "TOR", True),
+    _goalie(2025020001, "2025-10-08", "TOR", "BOS", False, wins=1),
+    # 2: home OT loss; the home starter was pulled, the reliever took the OTL
+    _goalie(2025020002, "2025-10-09", "NYR", "BOS", True),
+    _goalie(2025020002, "2025-10-09", "NYR", "BOS", True, otl=1),
+    _goalie(2025020002, "2025-10-09", "BOS", "NYR", False, wins=1),
+    # 3: home OT win
+    _goalie(2025020003, "2025-10-10", "FLA", "TOR", True, wins=1),
+    _goalie(2025020003, "2025-10-10", "TOR", "FLA", False, otl=1),
+    # preseason and on-or-after as_of: ignored
+    _goalie(2025010005, "2025-10-09", "BOS", "FLA", True, wins=1),
+    _goalie(2025020009, "2025-10-12", "BOS", "FLA", True, wins=1),
+]
+
+OUTCOME_ROWS = [
+    # also in goalie_features: that decoding wins
+    {"game_pk": 2025020001, "game_date": pd.Timestamp("2025-10-08"), "home_team": "BOS",
+     "away_team": "TOR", "home_goals": 1, "away_goals": 3, "winner": "TOR", "home_win": 0},
+    # 4: only in game_outcomes
+    {"game_pk": 2025020004, "game_date": pd.Timestamp("2025-10-11"), "home_team": "TOR",
+     "away_team": "NYR", "home_goals": 4, "away_goals": 2, "winner": "TOR", "home_win": 1},
+]
+
+
+class TestSeasonState(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        gf, go = root / "goalie_features.parquet", root / "game_outcomes.parquet"
+        pd.DataFrame(GOALIE_ROWS).to_parquet(gf)
+        pd.DataFrame(OUTCOME_ROWS).to_parquet(go)
+        self.patches = [patch.object(season_state, "GOALIE_FEATURES", gf),
+                        patch.object(season_state, "GAME_OUTCOMES", go)]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in reversed(self.patches):
+            p.stop()
+        self.tmp.cleanup()
+
+    def test_codes_from_goalie_decisions_and_outcomes(self):
+        self.assertEqual(load_results(D(2025, 10, 1), AS_OF), [
+            (D(2025, 10, 8), "BOS", "TOR", "A"),       # regulation loss
+            (D(2025, 10, 9), "NYR", "BOS", "OTL"),     # OT loss
+            (D(2025, 10, 10), "FLA", "TOR", "OTW"),    # OT win
+            (D(2025, 10, 11), "TOR", "NYR", "H"),      # game_outcomes only
+        ])
+
+    def test_standings_and_remaining_schedule(self):
+        schedule = {
+            D(2025, 10, 5):  [(BOS, TOR)],              # played 10-08 instead (rescheduled)
+            D(2025, 10, 9):  [(NYR, BOS)],
+            D(2025, 10, 10): [(FLA, TOR)],
+            D(2025, 10, 11): [(TOR, NYR), (FLA, BOS)],  # FLA-BOS: no result -> still simulated
+            D(2025, 10, 20): [(BOS, TOR)],              # rematch stays
+        }
+        state, remaining = season_state_as_of(schedule, AS_OF)
+        self.assertEqual(state.games_played, 4)
+        self.assertEqual(state.standings[BOS], {"W": 1, "L": 1, "OT": 0, "PTS": 2})
+        self.assertEqual(state.standings[NYR], {"W": 0, "L": 1, "OT": 1, "PTS": 1})
+        self.assertEqual(state.standings[TOR], {"W": 2, "L": 0, "OT": 1, "PTS": 5})
+        self.assertEqual(state.standings[FLA], {"W": 1, "L": 0, "OT": 0, "PTS": 2})
+        self.assertEqual(remaining, {D(2025, 10, 11): [(FLA, BOS)], D(2025, 10, 20): [(BOS, TOR)]})
+        self.assertEqual(state.game_history[BOS], [D(2025, 10, 8), D(2025, 10, 9)])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,83 @@
+"""
+test_sec5_endstats.py
+---------------------
+Tests for Sec5_endstats.team_summary / print_team_averages on a hand-built
+per-game results table (the rows Sec3._result_rows appends).
+
+Run:
+    python test_sec5_endstats.py -v
+"""
+
+import contextlib
+import io
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from Sec5_endstats import league_ot_pct, print_team_averages, team_summary
+
+BOS, TOR, NYR = "Boston Bruins", "Toronto Maple Leafs", "New York Rangers"
+
+
+def _rows(date, home, away, hs, vs, result, hshots=30, ashots=30):
+    """Both sides of one game, as Sec3._result_rows builds them."""
+    ot, h_win = result in ("OTW", "OTL"), result in ("H", "OTW")
+    return [
+        {"date": date, "team": home, "opponent": away, "home": True, "GF": hs, "GA": vs,
+         "SF": hshots, "SA": ashots, "W": h_win, "OT": ot, "fatigue": False},
+        {"date": date, "team": away, "opponent": home, "home": False, "GF": vs, "GA": hs,
+         "SF": ashots, "SA": hshots, "W": not h_win, "OT": ot, "fatigue": False},
+    ]
+
+
+GAMES = (
+    _rows("2025-10-01", BOS, TOR, 4, 1, "H")       # regulation, 3-goal margin
+    + _rows("2025-10-03", TOR, BOS, 2, 2, "OTW")   # OT: tied after regulation, TOR wins
+    + _rows("2025-10-05", BOS, NYR, 2, 3, "A")     # regulation one-goal loss
+)
+
+
+class TestTeamSummary(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.s = team_summary(GAMES)
+
+    def test_games_and_shots(self):
+        self.assertEqual(int(self.s.loc[BOS, "GP"]), 3)
+        self.assertAlmostEqual(self.s.loc[BOS, "SF/G"], 30.0)
+        self.assertAlmostEqual(self.s.loc[BOS, "Sh%"], 8 / 90 * 100)
+
+    def test_ot_loss_counts_only_for_loser(self):
+        self.assertAlmostEqual(self.s.loc[BOS, "OT%"], 100 / 3)   # lost in OT once
+        self.assertAlmostEqual(self.s.loc[TOR, "OT%"], 0.0)       # won in OT
+        self.assertAlmostEqual(league_ot_pct(self.s), 100 / 6)    # 1 OTL in 6 team-games
+
+    def test_ot_games_count_as_one_goal(self):
+        # BOS: 4-1 (no), 2-2 OT (yes), 2-3 (yes)
+        self.assertAlmostEqual(self.s.loc[BOS, "1G%"], 200 / 3)
+        self.assertAlmostEqual(self.s.loc[TOR, "CloseG%"], 50.0)
+        self.assertAlmostEqual(self.s.loc[NYR, "1G%"], 100.0)
+
+    def test_empty_table(self):
+        self.assertEqual(len(team_summary([])), 0)
+
+
+class TestPrintTeamAverages(unittest.TestCase):
+
+    def test_prints_every_team(self):
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            summary = print_team_averages(game_results=GAMES)
+        self.assertEqual(set(summary.index), {BOS, TOR, NYR})
+        self.assertIn(NYR, out.getvalue())
+
+    def test_old_positional_call_rejected(self):
+        with self.assertRaises(TypeError):
+            print_team_averages({}, {}, {})
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
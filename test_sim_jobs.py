@@ -0,0 +1,133 @@
+"""
+test_sim_jobs.py
+----------------
+Tests for sim_jobs.py (background simulation jobs + LRU result cache).
+
+Jobs run on a ThreadPoolExecutor with a fake runner, so no simulation is
+executed; a threading.Event holds a job "running" where a test needs it.
+
+Run:
+    python test_sim_jobs.py -v
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import sim_jobs
+from sim_jobs import DONE, JobQueue, ResultCache, data_version, input_files
+
+
+class _FakeRunner:
+    """Stands in for run_job: counts calls, optionally blocks until released."""
+
+    def __init__(self, block=False):
+        self.calls   = 0
+        self.release = threading.Event()
+        if not block:
+            self.release.set()
+        self._lock = threading.Lock()
+
+    def __call__(self, team_a, team_b, runs, seed):
+        with self._lock:
+            self.calls += 1
+        self.release.wait(5)
+        return {"team_a": team_a, "team_b": team_b, "runs": runs, "seed": seed}
+
+
+def _queue(runner, cache_size=4, version="v1"):
+    return JobQueue(cache_size=cache_size, runner=runner,
+                    executor=ThreadPoolExecutor(max_workers=2),
+                    version_fn=lambda: version)
+
+
+class TestDataVersion(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp  = tempfile.TemporaryDirectory()
+        self.base = Path(self.tmp.name)
+        (self.base / "a.csv").write_text("x")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_file_edit_changes_version(self):
+        before = data_version(["a.csv"], self.base)
+        self.assertEqual(data_version(["a.csv"], self.base), before)
+        path = self.base / "a.csv"
+        path.write_text("xy")
+        os.utime(path, ns=(1, 1))
+        self.assertNotEqual(data_version(["a.csv"], self.base), before)
+
+    def test_code_version_is_part_of_the_key(self):
+        before = data_version(["a.csv"], self.base)
+        with patch.object(sim_jobs, "CODE_VERSION", sim_jobs.CODE_VERSION + 1):
+            self.assertNotEqual(data_version(["a.csv"], self.base), before)
+
+    def test_inputs_cover_rosters_parquets_and_code(self):
+        names = {p.name for p in input_files()}
+        for name in ("master_schedule.csv", "skater_stats.parquet", "game_outcomes.parquet",
+                     "goalie_features.parquet", "simulation.py", "Sec2_Simengine.py"):
+            self.assertIn(name, names)
+
+    def test_key_includes_version(self):
+        runner = _FakeRunner()
+        q1, q2 = _queue(runner, version="v1"), _queue(runner, version="v2")
+        self.assertEqual(q1.make_key("A", "B", "100", 7), ("A", "B", 100, 7, "v1"))
+        self.assertNotEqual(q1.make_key("A", "B", 100, 7), q2.make_key("A", "B", 100, 7))
+        q1.shutdown()
+        q2.shutdown()
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def test_inflight_requests_share_one_job(self):
+        runner = _FakeRunner(block=True)
+        jobs = _queue(runner)
+        first  = jobs.submit("A", "B", 100, seed=1)
+        second = jobs.submit("A", "B", 100, seed=1)
+        self.assertIs(first, second)
+        runner.release.set()
+        self.assertEqual(jobs.wait(first.job_id, timeout=5).status, DONE)
+        self.assertEqual(runner.calls, 1)
+        jobs.shutdown(wait=True)
+
+    def test_finished_result_served_from_cache(self):
+        runner = _FakeRunner()
+        jobs = _queue(runner)
+        job = jobs.wait(jobs.submit("A", "B", 100, seed=1).job_id, timeout=5)
+        again = jobs.submit("A", "B", 100, seed=1)
+        self.assertTrue(again.cached)
+        self.assertEqual(again.status, DONE)
+        self.assertEqual(again.result, job.result)
+        self.assertEqual(runner.calls, 1)
+        jobs.shutdown(wait=True)
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = ResultCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        self.assertEqual(len(cache), 2)
+
+    def test_evicted_result_is_recomputed(self):
+        runner = _FakeRunner()
+        jobs = _queue(runner, cache_size=1)
+        for seed in (1, 2, 1):
+            jobs.wait(jobs.submit("A", "B", 100, seed=seed).job_id, timeout=5)
+        self.assertEqual(runner.calls, 3)
+        jobs.shutdown(wait=True)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+"""
+test_whatif.py
+--------------
+Tests for whatif.py on a tiny schedule: a null scenario reproduces the
+baseline exactly, a real scenario changes only the games it affects, and
+the caller's global RNG state survives a baseline and a scenario run.
+
+Run:
+    python test_whatif.py -v
+"""
+
+import random
+import sys
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from whatif import Scenario, adjust_team, run_baseline, scenario_codes, starter_out, whatif
+
+BOS, TOR, NYR, FLA = "Boston Bruins", "Toronto Maple Leafs", "New York Rangers", "Florida Panthers"
+PAIRS = [(BOS, TOR), (NYR, FLA), (TOR, NYR), (FLA, BOS), (BOS, NYR), (TOR, FLA)]
+SCHEDULE = {date(2026, 1, 10) + timedelta(days=2 * i): [pair] for i, pair in enumerate(PAIRS * 2)}
+
+
+class TestWhatIf(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.base = run_baseline(SCHEDULE, runs=6, seed=3, verbose=False)
+
+    def test_null_scenario_reproduces_baseline(self):
+        codes, touched = scenario_codes(self.base, Scenario(BOS))
+        self.assertTrue(touched)
+        np.testing.assert_array_equal(codes, self.base.codes)
+        out = whatif(self.base, Scenario(BOS))
+        self.assertEqual(out["teams"][BOS]["pts_delta"], 0)
+        self.assertEqual(out["teams"][BOS]["playoff_delta"], 0)
+
+    def test_only_affected_games_change(self):
+        scenario = adjust_team(BOS, start=date(2026, 1, 20), games=2, GF=-2.5, GA=2.5)
+        codes, touched = scenario_codes(self.base, scenario)
+        self.assertEqual(touched, scenario.affected(self.base.games))
+        untouched = [g for g in range(len(self.base.games)) if g not in touched]
+        np.testing.assert_array_equal(codes[:, untouched], self.base.codes[:, untouched])
+        self.assertFalse(np.array_equal(codes[:, touched], self.base.codes[:, touched]))
+
+    def test_global_rng_state_restored(self):
+        random.seed(11)
+        np.random.seed(11)
+        py_state, np_state = random.getstate(), np.random.get_state()
+        base = run_baseline(SCHEDULE, runs=2, seed=5, verbose=False)
+        whatif(base, starter_out(TOR, games=3))
+        self.assertEqual(random.getstate(), py_state)
+        self.assertEqual(np.random.get_state()[1].tolist(), np_state[1].tolist())
+        self.assertEqual(np.random.get_state()[2:], np_state[2:])
+
+    def test_seed_none_draws_a_seed(self):
+        base = run_baseline(SCHEDULE, runs=2, seed=None, verbose=False)
+        self.assertIsInstance(base.seed, int)
+        again = run_baseline(SCHEDULE, runs=2, seed=base.seed, verbose=False)
+        np.testing.assert_array_equal(again.codes, base.codes)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,343 @@
+# ============================================================
+# WHAT-IF: scenario deltas with common random numbers
+# ============================================================
+#
+# "What happens to playoff odds if Boston's starter misses 10 games?" used
+# to mean two independent monte_carlo_league runs, whose noise swamps the
+# effect. Here every game of every run gets its own seeds
+#
+#     injury phase : update_injuries(home), update_injuries(visitor)
+#     game phase   : choose_goalie x2, simulate_result
+#
+# so a game's outcome depends only on (run, game) and its inputs. A scenario
+# changes the inputs of a known set of games (one team, a date range); every
+# other game — and every team's injury path — is identical, so only the
+# affected games are re-simulated, on the same seeds, and the per-run
+# differences are paired. Points / playoff% follow monte_carlo_league
+# (playoff = top 8 by points), optionally from real standings (as_of).
+# The caller's `random` / `np.random` state is restored afterwards.
+#
+# Usage:
+#     base = run_baseline(schedule_by_date, runs=400, seed=7, as_of="2026-01-15")
+#     out  = whatif(base, starter_out("Boston Bruins", games=10, start="2026-01-15"))
+#     print_whatif(out)
+
+import copy
+import datetime
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+import numpy as np
+
+CODES     = ("H", "A", "OTW", "OTL")          # Sec2 simulate_result codes
+_CODE     = {c: i for i, c in enumerate(CODES)}
+HOME_PTS  = np.array([2, 0, 2, 1])            # by code
+AWAY_PTS  = np.array([0, 2, 1, 2])
+PLAYOFF_N = 8
+Z_95      = 1.96
+
+
+# ============================================================
+# Scenarios
+# ============================================================
+@dataclass
+class Scenario:
+    """
+    A change to one team's inputs over a run of its games.
+
+    team:   team affected
+    start:  first date (None = from the first remaining game)
+    games:  number of the team's games from start (None = rest of season)
+    goalie: force this goalie role ("starter" / "backup") for the team
+    deltas: team_stats changes for those games, e.g. {"GF": -0.25}
+    """
+    team:   str
+    start:  datetime.date = None
+    games:  int = None
+    goalie: str = None
+    deltas: dict = field(default_factory=dict)
+    name:   str = None
+
+    def __post_init__(self):
+        if isinstance(self.start, str):
+            self.start = datetime.date.fromisoformat(self.start)
+        if self.name is None:
+            span = f"{self.games} games" if self.games else "rest of season"
+            what = ", ".join([f"{self.goalie} in net"] * bool(self.goalie) +
+                             [f"{k} {v:+g}" for k, v in self.deltas.items()])
+            self.name = f"{self.team}: {what or 'no change'} ({span})"
+
+    def affected(self, games):
+        """Indices into games [(date, home, visitor)] this scenario touches."""
+        idx = [i for i, (d, h, v) in enumerate(games)
+               if self.team in (h, v) and (self.start is None or d >= self.start)]
+        return idx if self.games is None else idx[:self.games]
+
+
+def starter_out(team, games=10, start=None):
+    """Team's starter unavailable: the backup plays its next `games` games."""
+    return Scenario(team, start=start, games=games, goalie="backup",
+                    name=f"{team}: starter out {games} games")
+
+
+def adjust_team(team, start=None, games=None, **deltas):
+    """Team_stats deltas (GF / GA / PP / PK) for a run of the team's games."""
+    return Scenario(team, start=start, games=games, deltas=deltas)
+
+
+@contextmanager
+def _patched(scenarios, home, visitor):
+    """Apply the scenarios' team_stats deltas for one game, then restore."""
+    from Sec5_endstats import team_stats
+    saved = {}
+    for s in scenarios:
+        if s.deltas and s.team in (home, visitor):
+            saved.setdefault(s.team, dict(team_stats[s.team]))
+            for k, v in s.deltas.items():
+                team_stats[s.team][k] += v
+    try:
+        yield
+    finally:
+        for t, row in saved.items():
+            team_stats[t] = row
+
+
+# ============================================================
+# Per-game seeding
+# ============================================================
+def _seed(base, run, game, phase):
+    return int(np.random.SeedSequence([base, run, game, phase]).generate_state(1)[0])
+
+
+def _reseed(s):
+    random.seed(s)
+    np.random.seed(s)
+
+
+@contextmanager
+def _rng_preserved():
+    """Restore the global `random` / `np.random` state that per-game reseeding overwrites."""
+    py_state, np_state = random.getstate(), np.random.get_state()
+    try:
+        yield
+    finally:
+        random.setstate(py_state)
+        np.random.set_state(np_state)
+
+
+def _play(home, visitor, date, history, seed, scenarios=()):
+    """Game phase of one game (goalies + simulate_result) on its own seed."""
+    from Sec1_Core_Inj import choose_goalie
+    from Sec2_Simengine import simulate_result
+    _reseed(seed)
+    h_g = choose_goalie(home, date, history)
+    a_g = choose_goalie(visitor, date, history)
+    for s in scenarios:
+        if s.goalie and s.team == home:
+            h_g = s.goalie
+        if s.goalie and s.team == visitor:
+            a_g = s.goalie
+    with _patched(scenarios, home, visitor):
+        result, *_ = simulate_result(home, visitor, h_g, a_g, date, history)
+    return _CODE[result]
+
+
+# ============================================================
+# Baseline
+# ============================================================
+@dataclass
+class Baseline:
+    games:    list                 # [(date, home, visitor)] in play order
+    teams:    list
+    runs:     int
+    seed:     int
+    codes:    np.ndarray           # (runs, games) int8 result codes
+    base_pts: np.ndarray           # (teams,) points before the first game (as_of)
+    history0: dict                 # game_history before the first game
+    injuries: list                 # per run: {game: (home_inj, visitor_inj)} when non-empty
+    elapsed:  float = 0.0
+
+    def points(self, codes=None):
+        """(runs, teams) final points for result codes (default: the baseline's)."""
+        codes = self.codes if codes is None else codes
+        h, a = self._onehots()
+        return self.base_pts + HOME_PTS[codes] @ h + AWAY_PTS[codes] @ a
+
+    def _onehots(self):
+        if not hasattr(self, "_oh"):
+            col = {t: i for i, t in enumerate(self.teams)}
+            h = np.zeros((len(self.games), len(self.teams)))
+            a = np.zeros_like(h)
+            for g, (_, home, visitor) in enumerate(self.games):
+                h[g, col[home]] = 1
+                a[g, col[visitor]] = 1
+            self._oh = (h, a)
+        return self._oh
+
+    def history_before(self, g):
+        """game_history as Sec3 would hold it just before game g."""
+        hist = {t: list(d) for t, d in self.history0.items()}
+        for date, home, visitor in self.games[:g]:
+            hist.setdefault(home, []).append(date)
+            hist.setdefault(visitor, []).append(date)
+        return hist
+
+
+def run_baseline(schedule_by_date, runs=400, seed=0, as_of=None, verbose=True):
+    """
+    Simulate the (remaining) schedule `runs` times with per-game seeds —
+    the same steps as Sec3 simulate_full_league — and keep every result.
+    seed=None draws a fresh base seed (kept on the Baseline for whatif).
+    """
+    from Sec1_Core_Inj import injuries, update_injuries
+    from Sec5_endstats import team_stats
+
+    state = None
+    if as_of is not None:
+        from season_state import season_state_as_of
+        state, schedule_by_date = season_state_as_of(schedule_by_date, as_of)
+
+    games = [(d, h, v) for d in sorted(schedule_by_date) for h, v in schedule_by_date[d]]
+    teams = sorted(set(team_stats) | {t for _, h, v in games for t in (h, v)})
+    missing = [t for t in teams if t not in team_stats]
+    if missing:
+        raise ValueError(f"No team_stats for {missing}")
+
+    base_pts = np.array([state.standings.get(t, {"PTS": 0})["PTS"] if state else 0 for t in teams])
+    history0 = copy.deepcopy(state.game_history) if state else {}
+    if seed is None:
+        seed = int(np.random.SeedSequence().entropy)
+
+    codes = np.empty((runs, len(games)), dtype=np.int8)
+    inj_snaps = []
+    t0 = time.perf_counter()
+    with _rng_preserved():
+        for r in range(runs):
+            injuries.clear()
+            history = copy.deepcopy(history0)
+            snaps = {}
+            for g, (date, home, visitor) in enumerate(games):
+                _reseed(_seed(seed, r, g, 0))
+                update_injuries(home)
+                update_injuries(visitor)
+                h_inj = {p: n for p, n in injuries.get(home, {}).items() if n > 0}
+                v_inj = {p: n for p, n in injuries.get(visitor, {}).items() if n > 0}
+                if h_inj or v_inj:
+                    snaps[g] = (h_inj, v_inj)
+                codes[r, g] = _play(home, visitor, date, history, _seed(seed, r, g, 1))
+                history.setdefault(home, []).append(date)
+                history.setdefault(visitor, []).append(date)
+            inj_snaps.append(snaps)
+            if verbose and ((r + 1) % (runs // 10 or 1) == 0 or r + 1 == runs):
+                print(f"\rWhat-if baseline: {r + 1}/{runs} ({(r + 1) / runs * 100:.0f}%)", end="", flush=True)
+    if verbose:
+        print()
+
+    return Baseline(games, teams, runs, seed, codes, base_pts, history0, inj_snaps,
+                    elapsed=time.perf_counter() - t0)
+
+
+# ============================================================
+# Scenario evaluation
+# ============================================================
+def _ci(diff):
+    """Mean and normal 95% CI of paired per-run differences."""
+    m = float(diff.mean())
+    half = Z_95 * float(diff.std(ddof=1)) / np.sqrt(len(diff)) if len(diff) > 1 else 0.0
+    return m, (float(m - half), float(m + half))
+
+
+def _playoffs(pts):
+    """(runs, teams) 0/1 top-PLAYOFF_N by points (ties: team order, as sorted() would)."""
+    order = np.argsort(-pts, axis=1, kind="stable")[:, :PLAYOFF_N]
+    out = np.zeros_like(pts, dtype=float)
+    np.put_along_axis(out, order, 1.0, axis=1)
+    return out
+
+
+def scenario_codes(baseline, scenarios):
+    """
+    (runs, games) result codes with the scenario(s) applied: the baseline's
+    codes, with only the affected games re-simulated on their baseline seeds.
+    """
+    from Sec1_Core_Inj import injuries
+
+    scenarios = [scenarios] if isinstance(scenarios, Scenario) else list(scenarios)
+    touched = sorted({g for s in scenarios for g in s.affected(baseline.games)})
+    codes = baseline.codes.copy()
+    histories = {g: baseline.history_before(g) for g in touched}
+    with _rng_preserved():
+        for r in range(baseline.runs):
+            snaps = baseline.injuries[r]
+            for g in touched:
+                date, home, visitor = baseline.games[g]
+                h_inj, v_inj = snaps.get(g, ({}, {}))
+                injuries.clear()
+                injuries[home], injuries[visitor] = dict(h_inj), dict(v_inj)
+                codes[r, g] = _play(home, visitor, date, histories[g],
+                                    _seed(baseline.seed, r, g, 1), scenarios)
+        injuries.clear()
+    return codes, touched
+
+
+def whatif(baseline, scenarios, teams=None):
+    """
+    Re-simulate only the games the scenario(s) touch, on the baseline's
+    seeds, and report per-team points / playoff% deltas with 95% CIs.
+    teams: restrict the report (default: every team whose numbers moved,
+    plus the scenario teams).
+    """
+    scenarios = [scenarios] if isinstance(scenarios, Scenario) else list(scenarios)
+    t0 = time.perf_counter()
+    codes, touched = scenario_codes(baseline, scenarios)
+    elapsed = time.perf_counter() - t0
+
+    pts0, pts1 = baseline.points(), baseline.points(codes)
+    po0, po1 = _playoffs(pts0), _playoffs(pts1)
+
+    report = {}
+    focus = {s.team for s in scenarios}
+    for k, team in enumerate(baseline.teams):
+        dp, dp_ci = _ci(pts1[:, k] - pts0[:, k])
+        dq, dq_ci = _ci((po1[:, k] - po0[:, k]) * 100)
+        if teams is not None and team not in teams:
+            continue
+        if teams is None and team not in focus and dp == 0 and dq == 0:
+            continue
+        report[team] = {
+            "pts_base": round(float(pts0[:, k].mean()), 2),
+            "pts_scenario": round(float(pts1[:, k].mean()), 2),
+            "pts_delta": round(dp, 2), "pts_ci95": [round(x, 2) for x in dp_ci],
+            "playoff_base": round(float(po0[:, k].mean() * 100), 1),
+            "playoff_scenario": round(float(po1[:, k].mean() * 100), 1),
+            "playoff_delta": round(dq, 1), "playoff_ci95": [round(x, 1) for x in dq_ci],
+        }
+
+    return {
+        "scenario": [s.name for s in scenarios],
+        "runs": baseline.runs,
+        "games_resimulated": len(touched),
+        "games_total": len(baseline.games),
+        "elapsed_s": {"baseline": round(baseline.elapsed, 2), "scenario": round(elapsed, 2)},
+        "teams": report,
+    }
+
+
+def print_whatif(out):
+    print(f"\n=== What-if: {'; '.join(out['scenario'])} ===")
+    print(f"{out['runs']} paired runs, {out['games_resimulated']}/{out['games_total']} games "
+          f"re-simulated ({out['elapsed_s']['scenario']}s vs {out['elapsed_s']['baseline']}s baseline)")
+    rows = sorted(out["teams"].items(), key=lambda kv: abs(kv[1]["playoff_delta"]), reverse=True)
+    for team, r in rows:
+        lo, hi = r["pts_ci95"]
+        plo, phi = r["playoff_ci95"]
+        print(f"{team:22s} Pts {r['pts_base']:6.1f} -> {r['pts_scenario']:6.1f} "
+              f"({r['pts_delta']:+.2f} [{lo:+.2f}, {hi:+.2f}])  "
+              f"Playoff% {r['playoff_base']:5.1f} -> {r['playoff_scenario']:5.1f} "
+              f"({r['playoff_delta']:+.1f} [{plo:+.1f}, {phi:+.1f}])")
+
+
+__all__ = ["Scenario", "starter_out", "adjust_team", "Baseline", "run_baseline",
+           "scenario_codes", "whatif", "print_whatif"]